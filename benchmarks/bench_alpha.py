@@ -0,0 +1,82 @@
+"""
+Benchmark: Alpha-Rekonstruktion (GDI-Fallback)
+==============================================
+Vergleicht die frühere Berechnung pro Icon (float32, np.where pro Kanal)
+mit recover_alpha, das alle Icons als (N, H, W, 3)-Stapel in einem Aufruf
+ganzzahlig verarbeitet. Die Korrektheit prüft tests/test_recover_alpha.py.
+
+Aufruf:
+    python benchmarks/bench_alpha.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from desktop_folder_widget import recover_alpha  # noqa: E402
+
+ICON_SIZE = 32
+COUNTS = (1, 50, 500)
+REPEAT = 5
+
+
+def legacy_recover_alpha(black, white):
+    """Die frühere Berechnung aus extract_windows_icon (ein Icon, (H, W, 3))"""
+    black_arr = np.array(black, dtype=np.float32)
+    white_arr = np.array(white, dtype=np.float32)
+
+    diff = white_arr - black_arr
+    alpha = 255.0 - np.mean(diff, axis=2)
+    alpha = np.clip(alpha, 0, 255).astype(np.uint8)
+
+    h, w = alpha.shape
+    rgba = np.zeros((h, w, 4), dtype=np.uint8)
+    mask = alpha > 0
+    for c in range(3):
+        rgba[:, :, c] = np.where(
+            mask,
+            np.clip(black_arr[:, :, c] * 255.0 / np.maximum(alpha, 1), 0, 255),
+            0
+        ).astype(np.uint8)
+    rgba[:, :, 3] = alpha
+    return rgba
+
+
+def synthetic_icons(n, size=ICON_SIZE, seed=1):
+    """Zufällige RGBA-Icons, gezeichnet auf Schwarz und auf Weiß (wie DrawIcon)"""
+    rng = np.random.default_rng(seed)
+    rgb = rng.integers(0, 256, (n, size, size, 3), dtype=np.int32)
+    alpha = rng.integers(0, 256, (n, size, size, 1), dtype=np.int32)
+    alpha[:, :4] = 0      # vollständig transparente Zeilen
+    alpha[:, -4:] = 255   # vollständig deckende Zeilen
+    black = (rgb * alpha + 127) // 255
+    white = black + ((255 - alpha) * 255 + 127) // 255
+    rgba = np.concatenate([rgb, alpha], axis=-1)
+    return black.astype(np.uint8), white.astype(np.uint8), rgba
+
+
+def best_of(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def main():
+    print(f"{'Icons':>6} | {'pro Icon (alt)':>15} | {'gestapelt (neu)':>15} | {'Faktor':>7}")
+    print("-" * 54)
+    for n in COUNTS:
+        black, white, _ = synthetic_icons(n)
+        legacy_ms = best_of(lambda: [legacy_recover_alpha(b, w) for b, w in zip(black, white)])
+        batched_ms = best_of(lambda: recover_alpha(black, white))
+        print(f"{n:>6} | {legacy_ms:>12.2f} ms | {batched_ms:>12.2f} ms | {legacy_ms / batched_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: Hidden-Attribut sequentiell vs. Thread-Pool
+======================================================
+Simuliert einen umgeleiteten Netzwerk-Desktop (MemoryAttributeBackend mit
+künstlicher Latenz pro Aufruf) und misst das Wiederherstellen aller Icons
+mit 1, 4, 8 und 16 Threads. Falls das Dateisystem user-xattrs unterstützt,
+wird zusätzlich das xattr-Backend an echten Dateien gemessen.
+
+Aufruf:
+    python benchmarks/bench_attributes.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from desktop_folder_widget import (  # noqa: E402
+    BulkAttributeEngine, MemoryAttributeBackend, XattrAttributeBackend,
+)
+
+FILE_COUNT = 200
+LATENCY = 0.01  # 10 ms pro Aufruf
+WORKERS = (1, 4, 8, 16)
+
+
+def bench_memory():
+    paths = [f"C:\\Users\\bench\\Desktop\\Programm {i}.lnk" for i in range(FILE_COUNT)]
+    print(f"Memory-Backend, {FILE_COUNT} Dateien, {LATENCY * 1000:.0f} ms Latenz pro Aufruf")
+    for workers in WORKERS:
+        backend = MemoryAttributeBackend(paths, latency=LATENCY)
+        engine = BulkAttributeEngine(backend, max_workers=workers, refresh=lambda paths: None)
+        engine.hide(paths)
+        report = engine.unhide(paths)
+        print(f"  {workers:>2} Thread(s): {report.elapsed * 1000:>8.1f} ms  {report!r}")
+
+
+def bench_xattr():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(FILE_COUNT):
+            path = Path(tmp) / f"Programm {i}.lnk"
+            path.touch()
+            paths.append(str(path))
+        backend = XattrAttributeBackend()
+        try:
+            backend.set_hidden(paths[0], True)
+            backend.set_hidden(paths[0], False)
+        except OSError as e:
+            print(f"xattr-Backend übersprungen: {e}")
+            return
+        print(f"xattr-Backend, {FILE_COUNT} echte Dateien")
+        for workers in WORKERS:
+            engine = BulkAttributeEngine(backend, max_workers=workers, refresh=lambda paths: None)
+            engine.hide(paths)
+            report = engine.unhide(paths)
+            print(f"  {workers:>2} Thread(s): {report.elapsed * 1000:>8.1f} ms  {report!r}")
+
+
+def main():
+    bench_memory()
+    print()
+    bench_xattr()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: Icon-Hilfsprozess (Fake-Backend)
+===========================================
+Misst Start, Durchsatz pro Anfrage-Stapel und das Verhalten bei hängenden
+(Frist) und abstürzenden Extraktionen — ohne Windows, über FakeIconBackend.
+
+Aufruf:
+    python benchmarks/bench_icon_worker.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from desktop_folder_widget import IconWorkerClient  # noqa: E402
+
+ICON_SIZE = 48
+BATCH = 200
+DEADLINE = 0.5
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    client = IconWorkerClient("fake", deadline=DEADLINE)
+    try:
+        _, start_ms = timed(lambda: client.request_many(["start"], ICON_SIZE))
+        print(f"Start + erste Anfrage:        {start_ms:>8.1f} ms")
+
+        paths = [f"C:\\Apps\\Programm {i}.lnk" for i in range(BATCH)]
+        images, batch_ms = timed(lambda: client.request_many(paths, ICON_SIZE))
+        assert all(img is not None and img.size == (ICON_SIZE, ICON_SIZE) for img in images)
+        print(f"{BATCH} Icons ({ICON_SIZE}px):          {batch_ms:>8.1f} ms "
+              f"({batch_ms * 1000 / BATCH:.0f} µs/Icon)")
+
+        images, hang_ms = timed(lambda: client.request_many(["vorher", "sleep:10:netz", "nachher"],
+                                                             ICON_SIZE))
+        assert images[0] is not None and images[1] is None and client.timeouts == 1
+        print(f"Hängende Extraktion:          {hang_ms:>8.1f} ms (Frist {DEADLINE * 1000:.0f} ms)")
+
+        images, crash_ms = timed(lambda: client.request_many(["crash:"], ICON_SIZE))
+        assert images == [None] and client.crashes == 1
+        print(f"Absturz erkannt nach:         {crash_ms:>8.1f} ms")
+
+        images, restart_ms = timed(lambda: client.request_many(["wieder da"], ICON_SIZE))
+        assert images[0] is not None
+        print(f"Neustart + Anfrage:           {restart_ms:>8.1f} ms")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: JSON (Snapshot + Journal) vs. SQLite
+================================================
+Misst Laden, vollständiges Speichern und eine einzelne Änderung
+(Verknüpfung hinzufügen) bei 10, 1.000 und 10.000 Verknüpfungen.
+
+Aufruf:
+    python benchmarks/bench_persistence.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from desktop_folder_widget import ConfigJournal, JsonConfigStore, SQLiteConfigStore  # noqa: E402
+
+SIZES = (10, 1_000, 10_000)
+SHORTCUTS_PER_TILE = 50
+REPEAT = 5
+
+
+def make_config(total_shortcuts):
+    """Erzeugt eine Konfiguration mit total_shortcuts Verknüpfungen"""
+    tiles = {}
+    tile_count = max(1, total_shortcuts // SHORTCUTS_PER_TILE)
+    for t in range(tile_count):
+        tiles[str(t)] = {
+            "name": f"Ordner {t}",
+            "pos_x": (t % 20) * 75,
+            "pos_y": (t // 20) * 75,
+            "collapsed_tile_w": 150,
+            "collapsed_tile_h": 150,
+            "shortcuts": [],
+        }
+    for i in range(total_shortcuts):
+        tile = tiles[str(i % tile_count)]
+        tile["shortcuts"].append({
+            "name": f"Programm {i}",
+            "path": f"C:\\Users\\bench\\Desktop\\Programm {i}.lnk",
+        })
+    return {"tiles": tiles}
+
+
+def best_of(fn, repeat=REPEAT):
+    """Bester Wert aus mehreren Läufen in Millisekunden"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def add_op(i):
+    return {
+        "op": ConfigJournal.OP_ADD_SHORTCUT,
+        "tile": "0",
+        "index": 0,
+        "shortcut": {"name": f"Neu {i}", "path": f"C:\\neu\\{i}.lnk"},
+    }
+
+
+def bench_json(workdir, config):
+    store = JsonConfigStore(workdir / "config.json", workdir / "config.journal")
+    save_ms = best_of(lambda: store.save(config))
+    load_ms = best_of(lambda: store.load())
+    counter = iter(range(10**9))
+    record_ms = best_of(lambda: store.record(config, [add_op(next(counter))]))
+    return load_ms, save_ms, record_ms
+
+
+def bench_sqlite(workdir, config):
+    store = SQLiteConfigStore(workdir / "config.sqlite3")
+    try:
+        save_ms = best_of(lambda: store.save(config))
+        load_ms = best_of(lambda: store.load())
+        # Nur die Kacheln im Bereich 1920x1080 laden
+        visible_ms = best_of(lambda: store.load((0, 0, 1920, 1080)))
+        counter = iter(range(10**9))
+        record_ms = best_of(lambda: store.record(config, [add_op(next(counter))]))
+    finally:
+        store.close()
+    return load_ms, save_ms, record_ms, visible_ms
+
+
+def main():
+    print(f"{'Verknüpfungen':>14} | {'Backend':<7} | {'Laden':>9} | {'Sichtbar':>9} | "
+          f"{'Speichern':>9} | {'1 Änderung':>10}")
+    print("-" * 74)
+    for size in SIZES:
+        config = make_config(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            load_ms, save_ms, record_ms = bench_json(workdir, config)
+            print(f"{size:>14} | {'json':<7} | {load_ms:>7.2f}ms | {'-':>9} | "
+                  f"{save_ms:>7.2f}ms | {record_ms:>8.2f}ms")
+            load_ms, save_ms, record_ms, visible_ms = bench_sqlite(workdir, config)
+            print(f"{size:>14} | {'sqlite':<7} | {load_ms:>7.2f}ms | {visible_ms:>7.2f}ms | "
+                  f"{save_ms:>7.2f}ms | {record_ms:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: .lnk-Parser und ShellLinkCache
+=========================================
+Erzeugt ein Verzeichnis mit einigen tausend Shell-Links (LinkInfo mit
+lokalem Pfad, StringData, teils mit IconLocation) und misst:
+
+  • Kaltes Parsen aller Dateien (Cache leer)
+  • Warmes Nachschlagen (nur stat() + Cache-Treffer)
+  • Wie viele verschiedene Icons tatsächlich extrahiert werden müssten
+
+Die .lnk-Dateien baut tests/lnk_builder.py (wie in den Tests).
+
+Aufruf:
+    python benchmarks/bench_shell_links.py [Anzahl]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from desktop_folder_widget import IconExtractor, ShellLinkCache  # noqa: E402
+from tests.lnk_builder import build_shell_link  # noqa: E402
+
+import desktop_folder_widget.icons as icons  # noqa: E402
+
+LINK_COUNT = 5_000
+TARGET_COUNT = 50  # viele Links zeigen auf dieselben Programme
+
+
+def make_links(directory, count):
+    paths = []
+    for i in range(count):
+        t = i % TARGET_COUNT
+        icon = "C:\\Windows\\System32\\shell32.dll" if t % 5 == 0 else ""
+        data = build_shell_link(f"C:\\Program Files\\App {t}\\app{t}.exe",
+                                arguments=f"--profile {i}",
+                                working_dir=f"C:\\Program Files\\App {t}",
+                                icon_location=icon, icon_index=t % 3)
+        path = Path(directory) / f"Programm {i}.lnk"
+        path.write_bytes(data)
+        paths.append(str(path))
+    return paths
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Misst .lnk-Parser und ShellLinkCache")
+    parser.add_argument("count", nargs="?", type=int, default=LINK_COUNT,
+                        help=f"Anzahl Shell-Links (Standard {LINK_COUNT})")
+    count = parser.parse_args().count
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_links(tmp, count)
+        cache = ShellLinkCache()
+
+        links, cold_ms = timed(lambda: [cache.get(p) for p in paths])
+        _, warm_ms = timed(lambda: [cache.get(p) for p in paths])
+        if not all(links):
+            sys.exit("Parser hat Links nicht erkannt (siehe tests/test_shell_links.py)")
+
+        icons.SHELL_LINK_CACHE = cache
+        keys = {IconExtractor.cache_key(p, 48) for p in paths}
+
+        print(f"{count} Shell-Links")
+        print(f"  Kalt (parsen):        {cold_ms:>8.1f} ms  ({cold_ms * 1000 / count:.1f} µs/Link)")
+        print(f"  Warm (stat + Cache):  {warm_ms:>8.1f} ms  ({warm_ms * 1000 / count:.1f} µs/Link)")
+        print(f"  Icons zu extrahieren: {len(keys):>8} statt {count}")
+
+
+if __name__ == "__main__":
+    main()
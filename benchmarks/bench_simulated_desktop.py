@@ -0,0 +1,79 @@
+"""
+Benchmark: Ausblenden und Wiederherstellen auf dem simulierten Desktop
+=====================================================================
+Misst den kompletten Weg ohne Windows — Hidden-Attribut (Thread-Pool),
+Shell-Benachrichtigung, Explorer liest neu ein, Icons zurück an ihre
+Plätze — gegen verschiedene Latenz-Profile des SimulatedDesktop:
+
+    lokal        keine künstliche Latenz (nur der Python-Anteil)
+    explorer     langsamer Explorer (ListView-Zugriffe, Benachrichtigungen)
+    netzwerk     umgeleiteter Netzwerk-Desktop (Dateiattribute, Icons)
+
+Aufruf:
+    python benchmarks/bench_simulated_desktop.py
+"""
+
+import ntpath
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from desktop_folder_widget import (  # noqa: E402
+    BulkAttributeEngine, IconExtractor, SimulatedDesktop, WindowsDesktopAPI,
+)
+
+DESKTOP = "C:\\Users\\bench\\Desktop"
+ICON_COUNT = 120     # Icons auf dem Desktop
+MOVED_COUNT = 40     # davon in Kacheln verschoben
+SCREEN_SIZE = (1920, 1080)
+
+PROFILES = {
+    "lokal": 0.0,
+    "explorer": {"listview": 0.0005, "notify": 0.01, "window": 0.001},
+    "netzwerk": {"attributes": 0.005, "icons": 0.02, "notify": 0.002},
+}
+
+
+def bench_profile(name, latency):
+    paths = [f"{DESKTOP}\\Programm {i}.lnk" for i in range(ICON_COUNT)]
+    desktop = SimulatedDesktop(DESKTOP, paths, latency=latency)
+    WindowsDesktopAPI.set_backend(desktop)
+    moved = paths[:MOVED_COUNT]
+    engine = BulkAttributeEngine(desktop.create_attribute_backend())
+
+    # Gemerkte Positionen wie beim Verschieben in eine Kachel
+    names = [ntpath.basename(p) for p in moved]
+    remembered = WindowsDesktopAPI.get_desktop_icon_positions(names)
+
+    start = time.perf_counter()
+    engine.hide(moved)
+    WindowsDesktopAPI.notifications().flush()
+    hide_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    engine.unhide(moved)
+    WindowsDesktopAPI.notifications().flush()
+    placed = WindowsDesktopAPI.restore_desktop_icon_positions(
+        [(n, remembered.get(n)) for n in names], SCREEN_SIZE)
+    restore_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    IconExtractor.extract_icons(moved[:10], 48)
+    icons_ms = (time.perf_counter() - start) * 1000
+
+    calls = ", ".join(f"{kind} {desktop.calls[kind]}" for kind in desktop.KINDS)
+    print(f"  {name:<9} ausblenden {hide_ms:>7.1f} ms   wiederherstellen {restore_ms:>7.1f} ms "
+          f"({placed}/{MOVED_COUNT})   10 Icons {icons_ms:>6.1f} ms")
+    print(f"            Aufrufe: {calls}")
+
+
+def main():
+    print(f"Simulierter Desktop: {ICON_COUNT} Icons, {MOVED_COUNT} in Kacheln")
+    for name, latency in PROFILES.items():
+        bench_profile(name, latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark: Kaltstart
+====================
+Misst in frischen Python-Prozessen:
+
+  • Importzeit (python -X importtime) für das Paket, den Starter (app) und die
+    Oberfläche (ui) — also alles, was vor der ersten Kachel geladen wird
+  • welche schweren Abhängigkeiten dabei schon geladen werden (numpy, pywin32,
+    windnd und win32com dürfen erst bei Bedarf kommen)
+  • Wanduhrzeit vom Prozessstart bis zur ersten sichtbaren Kachel und bis
+    zum Ende der Start-Pipeline, dazu die Zeitmarken der einzelnen Stufen
+    (nur mit Bildschirm; mit leerem Home-Verzeichnis, also genau einer Kachel)
+
+Überschreitet ein Wert sein Budget, endet das Skript mit Exit-Code 1 und kann
+so als Regressionsprüfung laufen.
+
+Aufruf:
+    python benchmarks/bench_startup.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+REPEAT = 5
+
+# Budgets in Millisekunden (bestes von REPEAT Läufen)
+IMPORT_BUDGET_MS = {
+    "desktop_folder_widget": 20,
+    "desktop_folder_widget.app": 25,
+    "desktop_folder_widget.ui": 250,
+}
+FIRST_TILE_BUDGET_MS = 1500
+
+# Dürfen vor der ersten Kachel nicht importiert sein
+LAZY_MODULES = ("numpy", "win32gui", "win32ui", "win32con", "win32api", "windnd", "win32com")
+
+FIRST_TILE_SCRIPT = r"""
+import json, sys, time
+start = time.perf_counter()
+from desktop_folder_widget.ui import DesktopFolderManager
+imported = time.perf_counter()
+manager = DesktopFolderManager()
+while not any(t.window.winfo_ismapped() for t in manager.tiles.values()):
+    manager.root.update()
+mapped = time.perf_counter()
+while not manager.startup_done:
+    manager.root.update()
+ready = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "first_tile_ms": (mapped - start) * 1000,
+                  "ready_ms": (ready - start) * 1000, "stages": manager.timeline.as_dict()}))
+manager.root.destroy()
+"""
+
+
+def run_python(args, env=None):
+    return subprocess.run([sys.executable] + args, cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=60)
+
+
+def import_time(module):
+    """Kumulierte Importzeit (ms) des Moduls und alle dabei geladenen Module"""
+    result = run_python(["-X", "importtime", "-c", f"import {module}"])
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    loaded = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line.split(":", 1)[1].split("|")
+            loaded[name.strip()] = int(cumulative) / 1000
+        except ValueError:
+            continue  # Kopfzeile
+    return loaded[module], loaded
+
+
+def first_tile():
+    """Startet die Oberfläche mit leerem Home-Verzeichnis, None ohne Bildschirm"""
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, USERPROFILE=home, DESKTOP_FOLDER_ICON_WORKER="0",
+                   DESKTOP_FOLDER_WATCHER="off")
+        result = run_python(["-c", FIRST_TILE_SCRIPT], env)
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    failed = False
+    print(f"{'Modul':<28} | {'Import':>9} | {'Budget':>7}")
+    print("-" * 52)
+    for module, budget in IMPORT_BUDGET_MS.items():
+        times = []
+        loaded = {}
+        for _ in range(REPEAT):
+            ms, loaded = import_time(module)
+            times.append(ms)
+        best = min(times)
+        over = best > budget
+        failed |= over
+        print(f"{module:<28} | {best:>7.1f}ms | {budget:>5}ms{'  ÜBERSCHRITTEN' if over else ''}")
+
+    eager = [name for name in loaded if name.split(".")[0] in LAZY_MODULES]
+    if eager:
+        failed = True
+        print(f"\nVor der ersten Kachel geladen (sollte erst bei Bedarf passieren): {', '.join(sorted(eager))}")
+    heaviest = sorted(loaded.items(), key=lambda item: item[1], reverse=True)[1:6]
+    print("\nSchwerste Importe der Oberfläche: " + ", ".join(f"{n} {ms:.1f}ms" for n, ms in heaviest))
+
+    timings = [first_tile() for _ in range(REPEAT)]
+    timings = [t for t in timings if t]
+    if not timings:
+        print("\nErste Kachel: übersprungen (kein Bildschirm / Tk nicht verfügbar)")
+    else:
+        best = min(t["first_tile_ms"] for t in timings)
+        over = best > FIRST_TILE_BUDGET_MS
+        failed |= over
+        print(f"\nErste Kachel sichtbar nach {best:.0f} ms (Budget {FIRST_TILE_BUDGET_MS} ms)"
+              f"{'  ÜBERSCHRITTEN' if over else ''}")
+        fastest = min(timings, key=lambda t: t["ready_ms"])
+        print(f"Start-Pipeline fertig nach {fastest['ready_ms']:.0f} ms")
+        for stage, ms in fastest["stages"].items():
+            print(f"  {stage:<34} {ms:>8.1f} ms (ab Manager)")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,455 @@
+"""
+Benchmark-Suite: Rendering, Layout, Persistenz, Massen-Operationen
+==================================================================
+Läuft ohne Windows (simulierter Desktop, backend.py) und meldet pro Fall
+Median und p95 über mehrere Läufe:
+
+    render       create_3d_tile_background (mehrere Größen),
+                 create_3d_folder_icon, IconExtractor.get_default_icon
+    layout       draw_icon_grid, create_desktop_icon_grid, on_drop_files mit
+                 300 Pfaden — braucht Tk mit Bildschirm; unter Linux ohne
+                 $DISPLAY startet die Suite selbst Xvfb (falls installiert)
+    persistence  save_config / load_config wie im Manager (JSON und SQLite,
+                 10 bis 10.000 Verknüpfungen)
+    bulk         Ausblenden und Wiederherstellen (mit Icon-Positionen) über
+                 das Attribut-Backend des simulierten Desktops
+
+Die Suite läuft mit einem leeren temporären Home-Verzeichnis und fasst die
+echte Konfiguration nicht an.
+
+Aufruf:
+    python benchmarks/bench_suite.py                   # messen, mit Baseline vergleichen
+    python benchmarks/bench_suite.py --save-baseline   # Ergebnis als Baseline ablegen
+    python benchmarks/bench_suite.py -k render -o neu.json
+    python benchmarks/bench_suite.py --compare alt.json neu.json
+
+Baselines liegen in benchmarks/baselines/<plattform>-py<version>.json. Ein
+Fall gilt als Regression, wenn sein Median um mehr als --threshold (Standard
+10 %) und mehr als NOISE_MS langsamer ist; dann endet das Skript mit
+Exit-Code 1. Fehlt eine ganze Gruppe (layout ohne Bildschirm), ist das
+Ergebnis unvollständig: Exit-Code 2, außer mit --allow-skip.
+"""
+
+import argparse
+import json
+import math
+import ntpath
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Vor dem ersten Import des Pakets: Konfiguration, Ledger und Kachelbilder
+# landen im temporären Home-Verzeichnis
+HOME = tempfile.mkdtemp(prefix="dfw-bench-")
+os.environ.update(HOME=HOME, USERPROFILE=HOME, DESKTOP_FOLDER_ICON_WORKER="0",
+                  DESKTOP_FOLDER_WATCHER="off")
+os.environ.pop("DESKTOP_FOLDER_ATTR_BACKEND", None)
+os.environ.pop("DESKTOP_FOLDER_STORE", None)
+sys.path.insert(0, str(ROOT))
+
+from desktop_folder_widget import (  # noqa: E402
+    BulkAttributeEngine, IconExtractor, SimulatedDesktop, WindowsDesktopAPI, config_from_dict,
+    create_3d_folder_icon, create_3d_tile_background, create_config_store, migrate_config,
+)
+
+REPEAT = 15
+MIN_RUNS = 5
+MAX_CASE_SECONDS = 3.0   # langsame Fälle brechen nach MIN_RUNS Läufen und dieser Zeit ab
+THRESHOLD = 0.10
+NOISE_MS = 0.05          # kleinere Unterschiede sind Messrauschen
+
+TILE_SIZES = ((75, 75), (150, 150), (300, 225), (600, 450))
+CONFIG_SIZES = (10, 100, 1_000, 10_000)
+SHORTCUTS_PER_TILE = 50
+DROP_COUNT = 300
+BULK_COUNT = 500
+SCREEN_SIZE = (1920, 1080)
+DESKTOP_DIR = Path(HOME) / "Desktop"
+
+
+class Case:
+    """
+    Ein Messfall. prepare() läuft vor jedem Lauf ungemessen und liefert das
+    Argument für run(); teardown() räumt nach allen Läufen auf.
+    """
+
+    def __init__(self, name, run, prepare=None, teardown=None):
+        self.name = name
+        self.run = run
+        self.prepare = prepare or (lambda: None)
+        self.teardown = teardown
+
+    def measure(self, repeat):
+        self.run(self.prepare())  # Aufwärmen (Importe, Caches)
+        times = []
+        started = time.perf_counter()
+        while len(times) < repeat:
+            arg = self.prepare()
+            start = time.perf_counter()
+            self.run(arg)
+            times.append((time.perf_counter() - start) * 1000)
+            if len(times) >= MIN_RUNS and time.perf_counter() - started > MAX_CASE_SECONDS:
+                break
+        if self.teardown:
+            self.teardown()
+        return summarize(times)
+
+
+def percentile(values, p):
+    """Nearest-Rank-Perzentil"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(times):
+    return {
+        "median_ms": round(statistics.median(times), 4),
+        "p95_ms": round(percentile(times, 95), 4),
+        "min_ms": round(min(times), 4),
+        "runs": len(times),
+    }
+
+
+def make_config(total_shortcuts):
+    """Konfiguration wie im Manager (TileConfig-Objekte) mit total_shortcuts Verknüpfungen"""
+    tile_count = max(1, total_shortcuts // SHORTCUTS_PER_TILE)
+    tiles = {str(t): {"name": f"Ordner {t}", "pos_x": (t % 20) * 75, "pos_y": (t // 20) * 75,
+                      "shortcuts": []}
+             for t in range(tile_count)}
+    for i in range(total_shortcuts):
+        tiles[str(i % tile_count)]["shortcuts"].append(
+            {"name": f"Programm {i}", "path": f"C:\\Users\\bench\\Desktop\\Programm {i}.lnk"})
+    return config_from_dict({"tiles": tiles})
+
+
+def use_desktop(paths, latency=0.0):
+    """Frischer simulierter Desktop mit diesen Dateien"""
+    desktop = SimulatedDesktop(DESKTOP_DIR, paths, latency=latency)
+    WindowsDesktopAPI.set_backend(desktop)
+    return desktop
+
+
+# ============================================================================
+# Fälle
+# ============================================================================
+
+def render_cases():
+    cases = [Case(f"render.tile_background.{w}x{h}", lambda _, w=w, h=h: create_3d_tile_background(w, h))
+             for w, h in TILE_SIZES]
+    cases += [Case(f"render.folder_icon.{size}", lambda _, s=size: create_3d_folder_icon(s, s))
+              for size in (48, 96)]
+    cases += [Case(f"render.default_icon.{size}",
+                   lambda _, s=size: IconExtractor.get_default_icon("C:\\Programm.exe", s))
+              for size in (32, 48, 96)]
+    return cases
+
+
+def persistence_cases(workdir):
+    cases = []
+    for size in CONFIG_SIZES:
+        config = make_config(size)
+        for backend in ("json", "sqlite"):
+            base = workdir / f"{backend}-{size}"
+            store = create_config_store(backend, base.with_suffix(".json"), base.with_suffix(".journal"),
+                                        base.with_suffix(".sqlite3"))
+            store.save(config)
+
+            def load_config(_, store=store):
+                # wie DesktopFolderManager.load_config
+                data = store.load((0, 0) + SCREEN_SIZE)
+                migrate_config(data)
+                return config_from_dict(data)
+
+            close = getattr(store, "close", None)
+            cases.append(Case(f"persistence.save_config.{backend}.{size}",
+                              lambda _, store=store, config=config: store.save(config)))
+            cases.append(Case(f"persistence.load_config.{backend}.{size}", load_config, teardown=close))
+    return cases
+
+
+def bulk_cases():
+    paths = [str(DESKTOP_DIR / f"Programm {i}.lnk") for i in range(BULK_COUNT)]
+    names = [ntpath.basename(p) for p in paths]
+
+    def prepare_hide():
+        desktop = use_desktop(paths)
+        return BulkAttributeEngine(desktop.create_attribute_backend())
+
+    def hide(engine):
+        engine.hide(paths)
+        WindowsDesktopAPI.notifications().flush()
+
+    def prepare_restore():
+        engine = prepare_hide()
+        positions = WindowsDesktopAPI.get_desktop_icon_positions(names)
+        hide(engine)
+        return engine, [(name, positions.get(name)) for name in names]
+
+    def restore(arg):
+        engine, items = arg
+        engine.unhide(paths)
+        WindowsDesktopAPI.notifications().flush()
+        WindowsDesktopAPI.restore_desktop_icon_positions(items, SCREEN_SIZE)
+
+    return [
+        Case(f"bulk.hide.{BULK_COUNT}", hide, prepare_hide),
+        Case(f"bulk.restore.{BULK_COUNT}", restore, prepare_restore),
+    ]
+
+
+class GroupSkipped(Exception):
+    """Eine Gruppe kann hier nicht laufen (z.B. kein Bildschirm)"""
+
+
+def start_virtual_display():
+    """
+    Unter Linux ohne $DISPLAY: Xvfb auf einer freien Nummer starten und
+    DISPLAY setzen. Gibt den Prozess zurück, None wenn nicht nötig/möglich.
+    """
+    if not sys.platform.startswith("linux") or os.environ.get("DISPLAY") or not shutil.which("Xvfb"):
+        return None
+    for number in range(99, 120):
+        socket_path = f"/tmp/.X11-unix/X{number}"
+        if os.path.exists(socket_path) or os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        proc = subprocess.Popen(["Xvfb", f":{number}", "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and proc.poll() is None:
+            if os.path.exists(socket_path):
+                os.environ["DISPLAY"] = f":{number}"
+                print(f"Xvfb gestartet (DISPLAY=:{number})")
+                return proc
+            time.sleep(0.05)
+        proc.kill()
+        proc.wait()
+    return None
+
+
+def layout_cases():
+    """Tk-Fälle; GroupSkipped ohne Bildschirm"""
+    try:
+        import tkinter as tk
+        tk.Tk().destroy()
+    except Exception as e:
+        raise GroupSkipped(f"kein Bildschirm / Tk nicht verfügbar: {e}") from None
+    from desktop_folder_widget import DesktopFolderManager, Shortcut
+
+    DESKTOP_DIR.mkdir(exist_ok=True)
+    paths = []
+    for i in range(DROP_COUNT):
+        path = DESKTOP_DIR / f"Programm {i}.lnk"
+        path.touch()
+        paths.append(str(path))
+    use_desktop(paths)
+    manager = DesktopFolderManager()
+    deadline = time.monotonic() + 10
+    while not manager.startup_done and time.monotonic() < deadline:
+        manager.root.update()
+    tile = next(iter(manager.tiles.values()))
+    shortcuts = [Shortcut(ntpath.basename(p)[:-4], p) for p in paths]
+
+    def prepare_collapsed():
+        tile.canvas.delete("all")
+        tile._collapsed_icon_images = []
+
+    def draw_collapsed(_):
+        tile.draw_icon_grid(shortcuts[:4], tile.tile_width, tile.tile_height)
+        tile.canvas.update_idletasks()
+
+    def prepare_expanded():
+        if getattr(tile, "icons_frame", None) is None:
+            tile.icons_frame = tk.Frame(tile.window)
+        for child in tile.icons_frame.winfo_children():
+            child.destroy()
+        tile._expanded_icon_images.clear()
+
+    def draw_expanded(_):
+        tile.create_desktop_icon_grid(shortcuts[:60])
+        tile.icons_frame.update_idletasks()
+
+    encoded = [p.encode("utf-8") for p in paths]
+
+    def prepare_drop():
+        # Vorherigen Drop rückgängig machen
+        manager.path_index.discard_tile(tile.tile_id, tile.config.shortcuts)
+        manager.attributes.unhide(paths)
+        WindowsDesktopAPI.notifications().flush()
+        tile.config.shortcuts = []
+
+    def teardown():
+        prepare_drop()
+        manager.root.destroy()
+
+    return [
+        Case("layout.draw_icon_grid.4", draw_collapsed, prepare_collapsed),
+        Case("layout.create_desktop_icon_grid.60", draw_expanded, prepare_expanded),
+        Case(f"layout.on_drop_files.{DROP_COUNT}", lambda _: tile.on_drop_files(encoded), prepare_drop,
+             teardown),
+    ]
+
+
+# ============================================================================
+# Ausführen und vergleichen
+# ============================================================================
+
+def run_suite(pattern, repeat):
+    workdir = Path(HOME) / "persistence"
+    workdir.mkdir()
+    groups = (("render", render_cases), ("persistence", lambda: persistence_cases(workdir)),
+              ("bulk", bulk_cases), ("layout", layout_cases))
+    results = {}
+    skipped = {}
+    print(f"{'Fall':<44} | {'Median':>10} | {'p95':>10} | {'Läufe':>5}")
+    print("-" * 78)
+    for group_name, group in groups:
+        try:
+            cases = group()
+        except GroupSkipped as e:
+            # Nur melden, wenn -k Fälle dieser Gruppe verlangt hätte
+            if not pattern or pattern in group_name or pattern.startswith(group_name + "."):
+                skipped[group_name] = str(e)
+                print(f"{group_name}: ÜBERSPRUNGEN ({e})")
+            continue
+        for case in cases:
+            if pattern and pattern not in case.name:
+                if case.teardown:
+                    case.teardown()
+                continue
+            stats = case.measure(repeat)
+            results[case.name] = stats
+            print(f"{case.name:<44} | {stats['median_ms']:>8.3f}ms | {stats['p95_ms']:>8.3f}ms | "
+                  f"{stats['runs']:>5}", flush=True)
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.node(),
+            "repeat": repeat,
+            "pattern": pattern or "",
+            "skipped": skipped,
+        },
+        "results": results,
+    }
+
+
+def warn_skipped(results):
+    """Unübersehbarer Hinweis auf fehlende Gruppen; gibt True zurück, wenn welche fehlen"""
+    skipped = results["meta"].get("skipped") or {}
+    if not skipped:
+        return False
+    print("\n" + "!" * 78)
+    print(f"!! UNVOLLSTÄNDIG — übersprungene Gruppen: {', '.join(sorted(skipped))}")
+    for name, reason in sorted(skipped.items()):
+        print(f"!!   {name}: {reason}")
+    if "layout" in skipped:
+        print("!! Unter Linux mit Xvfb (wird automatisch gestartet, wenn installiert) oder:")
+        print("!!   xvfb-run -a python benchmarks/bench_suite.py")
+    print("!" * 78)
+    return True
+
+
+def compare(old, new, threshold=THRESHOLD):
+    """Vergleicht zwei Läufe; gibt die Namen der Regressionen zurück"""
+    regressions = []
+    print(f"{'Fall':<44} | {'alt':>10} | {'neu':>10} | {'Änderung':>9}")
+    print("-" * 82)
+    for name, stats in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            print(f"{name:<44} | {'-':>10} | {stats['median_ms']:>8.3f}ms | {'neu':>9}")
+            continue
+        old_ms, new_ms = before["median_ms"], stats["median_ms"]
+        change = (new_ms - old_ms) / old_ms if old_ms else 0.0
+        flag = ""
+        if change > threshold and new_ms - old_ms > NOISE_MS:
+            flag = "  LANGSAMER"
+            regressions.append(name)
+        elif change < -threshold and old_ms - new_ms > NOISE_MS:
+            flag = "  schneller"
+        print(f"{name:<44} | {old_ms:>8.3f}ms | {new_ms:>8.3f}ms | {change:>+8.1%}{flag}")
+    pattern = new["meta"].get("pattern", "")
+    missing = sorted(name for name in set(old["results"]) - set(new["results"]) if pattern in name)
+    if missing:
+        print(f"\nWARNUNG: {len(missing)} Fall/Fälle fehlen in der neuen Messung: {', '.join(missing)}")
+    warn_skipped(new)
+    if old["meta"].get("machine") != new["meta"].get("machine"):
+        print("Hinweis: Läufe von verschiedenen Rechnern — Zeiten nur bedingt vergleichbar")
+    print(f"\n{len(regressions)} Regression(en) (Schwelle {threshold:.0%})")
+    return regressions
+
+
+def default_baseline():
+    return BASELINE_DIR / f"{sys.platform}-py{sys.version_info[0]}{sys.version_info[1]}.json"
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_results(path, results):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"Ergebnis gespeichert: {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-Suite (Median/p95, Baseline-Vergleich)")
+    parser.add_argument("-k", dest="pattern", help="nur Fälle, deren Name dies enthält")
+    parser.add_argument("-n", "--repeat", type=int, default=REPEAT, help=f"Läufe pro Fall (Standard {REPEAT})")
+    parser.add_argument("-o", "--output", help="Ergebnis als JSON speichern")
+    parser.add_argument("--baseline", type=Path, default=default_baseline(), help="Baseline-Datei")
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnis als Baseline speichern")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Regressionsschwelle (0.1 = 10 %%)")
+    parser.add_argument("--compare", nargs=2, metavar=("ALT", "NEU"), help="zwei gespeicherte Läufe vergleichen")
+    parser.add_argument("--allow-skip", action="store_true",
+                        help="übersprungene Gruppen (z.B. layout ohne Bildschirm) nicht als Fehler werten")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        regressions = compare(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold)
+        return 1 if regressions else 0
+
+    display = start_virtual_display()
+    try:
+        results = run_suite(args.pattern, max(1, args.repeat))
+    finally:
+        if display is not None:
+            display.terminate()
+            display.wait()
+    if args.output:
+        write_results(args.output, results)
+    regressions = []
+    if args.save_baseline:
+        write_results(args.baseline, results)
+        warn_skipped(results)
+    elif args.baseline.exists():
+        print(f"\nVergleich mit {args.baseline}:")
+        regressions = compare(load_results(args.baseline), results, args.threshold)
+    else:
+        print(f"\nKeine Baseline ({args.baseline}) — mit --save-baseline anlegen")
+        warn_skipped(results)
+    incomplete = bool(results["meta"]["skipped"])
+    if regressions:
+        return 1
+    return 2 if incomplete and not args.allow_skip else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    finally:
+        shutil.rmtree(HOME, ignore_errors=True)
@@ -0,0 +1,119 @@
+"""
+Benchmark: Pfadprüfung pro Datei vs. ein scandir pro Verzeichnis
+================================================================
+Legt einen synthetischen Baum mit 10.000 Verknüpfungen in 40 Verzeichnissen
+an (10 % davon fehlen) und misst:
+
+  • os.path.exists pro Pfad (bisheriges Verhalten beim Beenden)
+  • os.stat pro Pfad (gleiche Information wie der Validator: mtime, Größe)
+  • ShortcutValidator mit 1 und 8 Threads, mit Details (mtime, Größe) und
+    nur Existenz (wie beim Beenden)
+
+Zusätzlich mit simulierter Netzwerk-Latenz pro Dateisystem-Aufruf (umgeleiteter
+Desktop): jedes stat() bzw. scandir() wartet LATENCY Sekunden. Unter Windows
+liefert scandir() Attribute und mtime gleich mit, dort kostet ein Verzeichnis
+also genau einen Roundtrip — das bildet die Simulation ab.
+
+Aufruf:
+    python benchmarks/bench_validation.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from desktop_folder_widget import ShortcutValidator  # noqa: E402
+
+ENTRIES = 10_000
+DIRECTORIES = 40
+MISSING_RATIO = 0.1
+LATENCY = 0.0005  # 0,5 ms pro Aufruf
+REPEAT = 3
+
+
+def make_tree(root):
+    """Erzeugt den Baum und gibt alle (auch fehlende) Pfade zurück"""
+    paths = []
+    per_dir = ENTRIES // DIRECTORIES
+    missing_every = int(1 / MISSING_RATIO)
+    for d in range(DIRECTORIES):
+        directory = root / f"Desktop {d}"
+        directory.mkdir()
+        for i in range(per_dir):
+            path = directory / f"Programm {i}.lnk"
+            if i % missing_every:
+                path.write_bytes(b"L")
+            paths.append(str(path))
+    return paths
+
+
+def best_of(fn, repeat=REPEAT):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times), result
+
+
+def delayed(fn, latency):
+    def wrapper(*args, **kwargs):
+        time.sleep(latency)
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def per_path(check, paths):
+    return {p: check(p) for p in paths}
+
+
+def stat_exists(stat):
+    def check(path):
+        try:
+            stat(path)
+            return True
+        except FileNotFoundError:
+            return False
+    return check
+
+
+def run(paths, latency):
+    exists = os.path.exists if not latency else delayed(os.path.exists, latency)
+    stat = os.stat if not latency else delayed(os.stat, latency)
+    repeat = REPEAT if not latency else 1
+
+    exists_ms, expected = best_of(lambda: per_path(exists, paths), repeat)
+    stat_ms, _ = best_of(lambda: per_path(stat_exists(stat), paths), repeat)
+    print(f"  {'exists pro Pfad':<28} {exists_ms:>9.1f} ms")
+    print(f"  {'stat pro Pfad':<28} {stat_ms:>9.1f} ms")
+
+    for details in (True, False):
+        for workers in (1, 8):
+            validator = ShortcutValidator(max_workers=workers)
+            if latency:
+                validator.scandir = delayed(os.scandir, latency)
+                validator.stat = stat
+            scan_ms, states = best_of(lambda: validator.scan(paths, details), repeat)
+            assert {k: v.exists for k, v in states.items()} == expected, "Ergebnis weicht ab"
+            label = f"Validator{'' if details else ' (exists)'}, {workers} Thr."
+            print(f"  {label:<28} {scan_ms:>9.1f} ms  ({exists_ms / scan_ms:.1f}x gegenüber exists)")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_tree(Path(tmp))
+        print(f"{len(paths)} Pfade in {DIRECTORIES} Verzeichnissen, "
+              f"{int(MISSING_RATIO * 100)} % fehlen")
+        print("Lokales Dateisystem:")
+        run(paths, 0)
+        print(f"Simulierte Latenz {LATENCY * 1000:.1f} ms pro Aufruf:")
+        run(paths, LATENCY)
+
+
+if __name__ == "__main__":
+    main()
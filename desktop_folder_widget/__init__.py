@@ -0,0 +1,101 @@
+"""
+Desktop Folder Widget für Windows - Version 3.0
+================================================
+Tiefe Desktop-Integration:
+- Widget wird in Desktop-Ebene (WorkerW) eingebettet
+- Verschobene Verknüpfungen werden auf Desktop versteckt (Hidden-Attribut)
+- Im Explorer bleiben sie sichtbar
+- Kacheln rasten auf Desktop-Icon-Grid ein
+- Icon-Ansicht wie auf dem Desktop
+
+Aufteilung:
+    model        Konfigurationsmodell, Pfad-Index, Pfadprüfung
+    persistence  JSON + Journal / SQLite
+    attributes   Hidden-Attribut (Backends, Massen-Engine, Ledger)
+    desktop      WorkerW/ListView, Icon-Positionen, Shell-Benachrichtigungen
+    backend      Desktop-Backends: Win32 oder simulierter Desktop im Speicher
+    watcher      Überwachung des Desktop-Ordners
+    icons        Icon-Extraktion und -Cache
+    iconworker   Icon-Hilfsprozess
+    rendering    3D-Kachelhintergrund, gecachte Kachelbilder
+    timing       Zeitmarken der Start-Pipeline, Spans (Chrome-Trace)
+    diagnostics  Hänger der Tk-Schleife, Kennzahlen, Speicher-Aufnahmen
+    winapi       ctypes-Prototypen und Konstanten
+    ui           Kacheln und Manager (Tk)
+    instance     Einzelinstanz: Sperrdatei und Befehls-Socket
+    cli          Kommandozeile ohne Oberfläche
+    app          Einstiegspunkt (python -m desktop_folder_widget)
+
+Die Untermodule werden erst beim ersten Zugriff geladen: Die Namen unten
+sind über das Paket erreichbar, ohne dass "import desktop_folder_widget"
+Tk, Pillow oder pywin32 lädt.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "model": (
+        "CONFIG_SCHEMA_VERSION", "PathState", "Shortcut", "ShortcutPathIndex", "ShortcutValidator",
+        "TileConfig", "config_from_dict", "config_to_dict", "migrate_config", "normalize_path",
+    ),
+    "persistence": ("ConfigJournal", "JsonConfigStore", "SQLiteConfigStore", "create_config_store"),
+    "attributes": (
+        "ATTRIBUTE_BACKENDS", "AttributeBackend", "BulkAttributeEngine", "BulkAttributeReport",
+        "DEFAULT_LEDGER_FILE", "HiddenFileLedger", "MemoryAttributeBackend", "Win32AttributeBackend",
+        "XattrAttributeBackend", "create_attribute_backend",
+    ),
+    "desktop": (
+        "DesktopGridPlacer", "DesktopListView", "DesktopListViewSession", "MemoryDesktopListView",
+        "RecordingShellNotifier", "ShellNotificationCoalescer", "ShellNotifier", "Win32DesktopListView",
+        "Win32ShellNotifier", "WindowsDesktopAPI",
+    ),
+    "backend": (
+        "DESKTOP_BACKENDS", "DesktopBackend", "SimulatedAttributeBackend", "SimulatedDesktop",
+        "SimulatedListView", "SimulatedShellNotifier", "Win32DesktopBackend", "create_desktop_backend",
+    ),
+    "watcher": (
+        "DIRECTORY_WATCHERS", "ChangeDebouncer", "DirectoryWatcher", "FileChange",
+        "InotifyDirectoryWatcher", "PollingDirectoryWatcher", "Win32DirectoryWatcher",
+        "create_directory_watcher",
+    ),
+    "icons": (
+        "SHELL_LINK_CACHE", "IconExtractor", "IconResourceDecoder", "ShellLink", "ShellLinkCache",
+        "ShellLinkParser", "recover_alpha",
+    ),
+    "iconworker": (
+        "ICON_WORKER_BACKENDS", "FakeIconBackend", "IconWorkerClient", "IconWorkerProtocol",
+        "ShellIconBackend", "icon_worker_main",
+    ),
+    "rendering": (
+        "TileFace", "TileFaceCache", "create_3d_folder_icon", "create_3d_tile_background", "faded_icon",
+    ),
+    "timing": ("TRACER", "Span", "SpanTracer", "StartupTimeline", "traced"),
+    "diagnostics": (
+        "METRICS", "MemoryTracker", "MetricsRegistry", "MetricsWriter", "StallDetector", "timed",
+    ),
+    "winapi": ("IS_WINDOWS",),
+    "ui": ("DesktopFolderManager", "FolderTile"),
+    "instance": (
+        "CommandServer", "InstanceClient", "InstanceError", "InstanceLock", "InstanceProtocol",
+        "SingleInstance",
+    ),
+    "cli": ("LayoutEditor", "cli_main"),
+    "app": ("main", "restore_hidden_files", "run"),
+}
+
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULE_OF)
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,197 @@
+"""
+Einstiegspunkt: Start der Oberfläche, --restore und --icon-worker
+=================================================================
+Die schweren Module (Tk, Pillow, pywin32) werden erst geladen, wenn der
+jeweilige Modus sie braucht — "--restore" kommt ohne sie aus.
+
+Es läuft nur eine Instanz: Jeder weitere Start leitet seinen Befehl über den
+lokalen Socket an sie weiter (siehe instance.py) und endet sofort.
+
+    (ohne Argumente)          Oberfläche starten bzw. laufende nach vorne holen
+    --focus [KACHEL]          laufende Instanz nach vorne holen / Kachel öffnen
+    --add KACHEL DATEI…       Dateien in Kachel übernehmen (startet bei Bedarf)
+    --restore                 versteckte Dateien wiederherstellen
+    --quit                    laufende Instanz beenden
+    cli …                     Kacheln ohne Oberfläche bearbeiten (siehe cli.py)
+"""
+
+import atexit
+import os
+import queue
+import sys
+
+from .timing import StartupTimeline
+
+
+# Globale Variable für Cleanup
+_app_instance = None
+_cleanup_done = False
+
+
+def cleanup_on_exit():
+    """Wird beim Beenden aufgerufen - stellt alle Icons wieder her"""
+    global _app_instance, _cleanup_done
+    
+    if _cleanup_done:
+        return
+    _cleanup_done = True
+    
+    # quit() hat schon alles wiederhergestellt — nur nach Absturz/Strg+C nötig
+    if _app_instance and hasattr(_app_instance, 'config') and not _app_instance.hidden_restored:
+        print("\n[Cleanup] Stelle Desktop-Icons wieder her...")
+        try:
+            # Die Tk-Schleife läuft nicht mehr: Icon-Positionen blockierend setzen
+            report = _app_instance.restore_all_hidden(background=False)
+            print(f"[Cleanup] {report.ok} Icons wiederhergestellt.")
+        except Exception as e:
+            print(f"[Cleanup] Fehler: {e}")
+
+
+def restore_hidden_files(ledger_file=None, backend=None):
+    """
+    Eigenständige Wiederherstellung (ohne Oberfläche): macht genau die Dateien
+    wieder sichtbar, die laut Ledger vom Widget versteckt wurden.
+    Gibt den Exit-Code zurück (0 = alles wiederhergestellt).
+    """
+    from .attributes import DEFAULT_LEDGER_FILE, BulkAttributeEngine, HiddenFileLedger
+    
+    ledger = HiddenFileLedger(ledger_file or DEFAULT_LEDGER_FILE)
+    print(f"Ledger: {ledger.path} ({len(ledger)} Einträge)")
+    if not len(ledger):
+        print("Keine versteckten Dateien vermerkt.")
+        return 0
+    
+    engine = BulkAttributeEngine(backend, ledger=ledger)
+    report = engine.unhide(ledger.paths())
+    for path in report.missing:
+        print(f"  ? Datei nicht gefunden: {path}")
+    for path, error in report.failed:
+        print(f"  ✗ Fehler bei {path}: {error}")
+    print(f"{report.ok} Datei(en) wiederhergestellt.")
+    return 1 if report.failed else 0
+
+
+def main(instance=None, request=None):
+    """
+    Startet die Oberfläche. instance: SingleInstance mit Sperre — dann nimmt
+    der Befehls-Socket schon während des Starts Anfragen an. request: Befehl
+    aus der eigenen Kommandozeile, wird wie ein weitergeleiteter ausgeführt.
+    """
+    global _app_instance
+    
+    timeline = StartupTimeline()
+    print("=" * 55)
+    print("  Desktop Folder Widget v3.0")
+    print("=" * 55)
+    print()
+    print("Die Kachel sollte jetzt oben links erscheinen")
+    print("(tuerkiser Rand zur besseren Sichtbarkeit)")
+    print()
+    print("Bedienung:")
+    print("  • Linksklick         → Kachel oeffnen")
+    print("  • Rechtsklick        → Kontextmenue")
+    print("  • Dateien hinziehen  → In Kachel verschieben")
+    print("  • Icon wegziehen     → Auf Desktop wiederherstellen")
+    print()
+    print("WICHTIG: Beim Beenden werden alle Icons wiederhergestellt!")
+    print("-" * 55)
+    print()
+    
+    # Cleanup-Handler registrieren
+    atexit.register(cleanup_on_exit)
+    
+    commands = queue.Queue()
+    if request is not None:
+        commands.put(request)
+    if instance is not None:
+        instance.serve(lambda r: _queue_command(commands, r))
+    
+    from .winapi import enable_dpi_awareness
+    enable_dpi_awareness()
+    from .ui import DesktopFolderManager
+    timeline.mark("Oberfläche importiert")
+    
+    try:
+        _app_instance = DesktopFolderManager(timeline=timeline, commands=commands)
+        _app_instance.run()
+    except KeyboardInterrupt:
+        print("\n[Beendet durch Benutzer]")
+    except Exception as e:
+        print(f"\n[Fehler] {e}")
+    finally:
+        cleanup_on_exit()
+        if instance is not None:
+            instance.release()
+
+
+def _queue_command(commands, request):
+    """Läuft im Socket-Thread: nur einreihen, ausgeführt wird in der Tk-Schleife"""
+    if request["cmd"] == "ping":
+        return {"ok": True, "pid": os.getpid()}
+    commands.put(request)
+    return {"ok": True}
+
+
+def parse_instance_request(argv):
+    """Befehl für die (laufende) Instanz aus der Kommandozeile, None = nur starten"""
+    if not argv:
+        return None
+    option, args = argv[0], argv[1:]
+    if option == "--focus" and len(args) <= 1:
+        return {"cmd": "focus", **({"tile": args[0]} if args else {})}
+    if option == "--add" and len(args) >= 2:
+        return {"cmd": "add", "tile": args[0], "paths": [os.path.abspath(p) for p in args[1:]]}
+    if option in ("--restore", "--quit") and not args:
+        return {"cmd": option[2:]}
+    raise ValueError(f"Unbekannte Argumente: {' '.join(argv)}")
+
+
+def forward_request(instance, request):
+    """Schickt den Befehl an die laufende Instanz, gibt den Exit-Code zurück"""
+    from .instance import InstanceError
+    
+    try:
+        reply = instance.forward(**request)
+    except InstanceError as e:
+        print(e)
+        return 1
+    if not reply.get("ok"):
+        print(f"Abgelehnt: {reply.get('error')}")
+        return 1
+    print(f"An laufendes Widget weitergeleitet: {request['cmd']}")
+    return 0
+
+
+def run(argv=None):
+    """Kommandozeile (siehe Modul-Docstring); gibt den Exit-Code zurück"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "--icon-worker":
+        from .iconworker import icon_worker_main
+        return icon_worker_main(argv[1] if len(argv) > 1 else "shell")
+    if argv and argv[0] == "cli":
+        from .cli import cli_main
+        return cli_main(argv[1:])
+    try:
+        request = parse_instance_request(argv)
+    except ValueError as e:
+        print(e)
+        print(__doc__)
+        return 2
+    
+    from .instance import SingleInstance
+    instance = SingleInstance()
+    if not instance.acquire():
+        # Es läuft schon ein Widget: dort ausführen (ohne Befehl: nach vorne holen)
+        return forward_request(instance, request or {"cmd": "focus"})
+    
+    if request is not None and request["cmd"] in ("restore", "quit"):
+        try:
+            if request["cmd"] == "quit":
+                print("Kein laufendes Widget.")
+                return 1
+            # Kein Widget läuft: versteckte Dateien laut Ledger zurücksetzen
+            return restore_hidden_files()
+        finally:
+            instance.release()
+    main(instance, request)
+    return 0
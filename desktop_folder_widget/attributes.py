@@ -0,0 +1,443 @@
+"""
+Hidden-Attribut: austauschbare Backends, Massen-Engine und Ledger
+"""
+
+import errno
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .desktop import WindowsDesktopAPI
+from .diagnostics import METRICS
+from .model import normalize_path
+from .winapi import FILE_ATTRIBUTE_HIDDEN, kernel32
+
+
+class AttributeBackend:
+    """
+    Liest/setzt das "versteckt"-Merkmal einer Datei.
+
+    get_hidden/set_hidden werfen FileNotFoundError für fehlende Dateien und
+    OSError für alle anderen Fehler; sie müssen threadsicher sein.
+
+    get_attributes/set_attributes arbeiten mit den vollständigen Attribut-Bits
+    (für den Ledger); ohne eigene Attribute besteht der Wert nur aus
+    FILE_ATTRIBUTE_HIDDEN.
+    """
+
+    name = "base"
+
+    def get_hidden(self, path):
+        raise NotImplementedError
+
+    def set_hidden(self, path, hidden):
+        raise NotImplementedError
+
+    def get_attributes(self, path):
+        return FILE_ATTRIBUTE_HIDDEN if self.get_hidden(path) else 0
+
+    def set_attributes(self, path, attrs):
+        """Setzt die Attribute (der Aufrufer hat sie vorher gelesen); True wenn geändert"""
+        return self.set_hidden(path, bool(attrs & FILE_ATTRIBUTE_HIDDEN))
+
+
+class Win32AttributeBackend(AttributeBackend):
+    """FILE_ATTRIBUTE_HIDDEN über GetFileAttributesW/SetFileAttributesW"""
+
+    name = "win32"
+    INVALID_FILE_ATTRIBUTES = 0xFFFFFFFF
+
+    def _get_attrs(self, path):
+        attrs = kernel32.GetFileAttributesW(path)
+        if attrs == self.INVALID_FILE_ATTRIBUTES:
+            if not os.path.lexists(path):
+                raise FileNotFoundError(errno.ENOENT, "Datei nicht gefunden", path)
+            raise OSError(f"Konnte Attribute nicht lesen für {path}")
+        return attrs
+
+    def get_hidden(self, path):
+        return bool(self._get_attrs(path) & FILE_ATTRIBUTE_HIDDEN)
+
+    def get_attributes(self, path):
+        return self._get_attrs(path)
+
+    def set_attributes(self, path, attrs):
+        if not kernel32.SetFileAttributesW(path, attrs):
+            raise OSError(f"SetFileAttributes fehlgeschlagen für {path}")
+        return True
+
+    def set_hidden(self, path, hidden):
+        attrs = self._get_attrs(path)
+        if hidden:
+            new_attrs = attrs | FILE_ATTRIBUTE_HIDDEN
+        else:
+            new_attrs = attrs & ~FILE_ATTRIBUTE_HIDDEN
+        if new_attrs == attrs:
+            return False
+        if not kernel32.SetFileAttributesW(path, new_attrs):
+            raise OSError(f"SetFileAttributes fehlgeschlagen für {path}")
+        return True
+
+
+class XattrAttributeBackend(AttributeBackend):
+    """
+    Linux-Ersatz: Merkmal als erweitertes Attribut (user.*) an echten Dateien.
+    Benötigt ein Dateisystem mit user-xattrs (ext4, btrfs, tmpfs ab Linux 6.6).
+    """
+
+    name = "xattr"
+    XATTR_NAME = "user.desktop_folder.hidden"
+
+    def get_hidden(self, path):
+        try:
+            return os.getxattr(path, self.XATTR_NAME) == b"1"
+        except OSError as e:
+            if e.errno in (errno.ENODATA, getattr(errno, "ENOATTR", errno.ENODATA)):
+                return False
+            raise
+
+    def set_hidden(self, path, hidden):
+        if self.get_hidden(path) == hidden:
+            return False
+        if hidden:
+            os.setxattr(path, self.XATTR_NAME, b"1")
+        else:
+            os.removexattr(path, self.XATTR_NAME)
+        return True
+
+
+class MemoryAttributeBackend(AttributeBackend):
+    """
+    Rein im Speicher (Tests/Benchmarks ohne Windows).
+    latency simuliert die Dauer eines Aufrufs, z.B. auf einem umgeleiteten
+    Netzwerk-Desktop (Sekunden pro get/set).
+    """
+
+    name = "memory"
+
+    def __init__(self, files=None, latency=0.0):
+        self.hidden = {}
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.add_files(files or ())
+
+    def add_files(self, paths):
+        """Meldet Dateien an (sichtbar); bereits bekannte behalten ihren Zustand"""
+        with self._lock:
+            for path in paths:
+                self.hidden.setdefault(normalize_path(path), False)
+
+    def _check(self, key, path):
+        if self.latency:
+            time.sleep(self.latency)
+        if key not in self.hidden:
+            raise FileNotFoundError(errno.ENOENT, "Datei nicht gefunden", path)
+
+    def get_hidden(self, path):
+        key = normalize_path(path)
+        self._check(key, path)
+        return self.hidden[key]
+
+    def set_hidden(self, path, hidden):
+        key = normalize_path(path)
+        self._check(key, path)
+        with self._lock:
+            changed = self.hidden[key] != hidden
+            self.hidden[key] = hidden
+        return changed
+
+
+ATTRIBUTE_BACKENDS = {
+    "win32": Win32AttributeBackend,
+    "xattr": XattrAttributeBackend,
+    "memory": MemoryAttributeBackend,
+}
+
+
+def create_attribute_backend(name=None):
+    """
+    Backend nach Name (Umgebungsvariable DESKTOP_FOLDER_ATTR_BACKEND), sonst
+    das des aktiven Desktop-Backends (WindowsDesktopAPI.backend())
+    """
+    name = name or os.environ.get("DESKTOP_FOLDER_ATTR_BACKEND")
+    if not name:
+        return WindowsDesktopAPI.backend().create_attribute_backend()
+    backend_cls = ATTRIBUTE_BACKENDS.get(name)
+    if backend_cls is None:
+        print(f"Unbekanntes Attribut-Backend '{name}', verwende 'memory'")
+        backend_cls = MemoryAttributeBackend
+    return backend_cls()
+
+
+class BulkAttributeReport:
+    """Ergebnis eines Massen-Aufrufs: Pfade nach Ausgang sortiert"""
+
+    def __init__(self):
+        self.changed = []      # Attribut wurde geändert
+        self.unchanged = []    # war bereits im gewünschten Zustand
+        self.missing = []      # Datei existiert nicht
+        self.failed = []       # (Pfad, Fehlermeldung)
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        """Anzahl erfolgreicher Dateien (geändert oder bereits korrekt)"""
+        return len(self.changed) + len(self.unchanged)
+
+    def __repr__(self):
+        return (f"BulkAttributeReport(changed={len(self.changed)}, unchanged={len(self.unchanged)}, "
+                f"missing={len(self.missing)}, failed={len(self.failed)}, elapsed={self.elapsed:.3f}s)")
+
+
+DEFAULT_LEDGER_FILE = Path.home() / ".desktop_folder_widget_v3.hidden"
+
+
+class HiddenFileLedger:
+    """
+    Absturzsicheres Verzeichnis aller Dateien, die das Widget versteckt hat.
+
+    Vor dem Verstecken wird jede Datei mit ihren bis dahin gelesenen
+    Attribut-Bits als "hide" angehängt (ein fsync pro Stapel), nach dem
+    Wiederherstellen als "forget"; wiederhergestellt wird auf diese Bits
+    (siehe BulkAttributeEngine). War eine Datei schon vorher versteckt (vom
+    Benutzer), wird sie gar nicht erst vermerkt und bei der Wiederherstellung
+    nicht angefasst. Stirbt der Prozess
+    zwischen den beiden Schritten, bleibt der Eintrag stehen: lieber ein Icon
+    zu viel sichtbar als eines verloren.
+
+    Die Wiederherstellung nach einem Absturz kostet damit O(versteckte Dateien)
+    statt eines rekursiven Durchlaufs über den ganzen Desktop.
+    """
+
+    COMPACT_THRESHOLD = 64 * 1024  # Bytes
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}  # normalisierter Pfad → Original-Pfad
+        self.originals = {}  # normalisierter Pfad → Attribute vor dem Verstecken (falls bekannt)
+        self.size = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, path):
+        return normalize_path(path) in self.entries
+
+    def paths(self):
+        return list(self.entries.values())
+
+    def original(self, path):
+        """Attribut-Bits vor dem Verstecken oder None (Eintrag unbekannt bzw. ältere Ledger-Datei)"""
+        return self.originals.get(normalize_path(path))
+
+    @staticmethod
+    def _hide_record(path, attrs):
+        record = {"op": "hide", "path": path}
+        if attrs is not None:
+            record["attrs"] = attrs
+        return record
+
+    def _load(self):
+        try:
+            with open(self.path, "r+b") as f:
+                data = f.read()
+                end = data.rfind(b"\n") + 1
+                if end != len(data):
+                    f.truncate(end)  # Absturz mitten im Schreiben
+        except OSError:
+            return
+        self.size = end
+        for raw in data[:end].splitlines():
+            try:
+                record = json.loads(raw.decode("utf-8"))
+            except ValueError:
+                continue
+            key = normalize_path(record.get("path", ""))
+            if record.get("op") == "hide":
+                self.entries[key] = record["path"]
+                if record.get("attrs") is not None:
+                    self.originals[key] = record["attrs"]
+            else:
+                self.entries.pop(key, None)
+                self.originals.pop(key, None)
+
+    def _append(self, records):
+        data = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n"
+                       for r in records).encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.size += len(data)
+        if self.size >= self.COMPACT_THRESHOLD:
+            self._compact()
+
+    def _compact(self):
+        """Schreibt nur noch die offenen Einträge (atomar)"""
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        data = "".join(json.dumps(self._hide_record(p, self.originals.get(key)), ensure_ascii=False,
+                                  separators=(",", ":")) + "\n"
+                       for key, p in self.entries.items()).encode("utf-8")
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.size = len(data)
+
+    def record_hide(self, paths, originals=None):
+        """
+        Vermerkt Dateien VOR dem Verstecken, originals: {Pfad: Attribut-Bits}.
+        Gibt die neu vermerkten Pfade zurück.
+        """
+        originals = originals or {}
+        with self._lock:
+            new = []
+            for path in paths:
+                key = normalize_path(path)
+                if key not in self.entries:
+                    self.entries[key] = path
+                    if originals.get(path) is not None:
+                        self.originals[key] = originals[path]
+                    new.append(path)
+            if new:
+                self._append(self._hide_record(p, originals.get(p)) for p in new)
+            return new
+
+    def forget(self, paths):
+        """Entfernt Einträge (wiederhergestellt, nicht von uns versteckt oder verschwunden)"""
+        with self._lock:
+            gone = []
+            for p in paths:
+                key = normalize_path(p)
+                self.originals.pop(key, None)
+                if self.entries.pop(key, None) is not None:
+                    gone.append(p)
+            if gone:
+                self._append({"op": "forget", "path": p} for p in gone)
+
+
+class BulkAttributeEngine:
+    """
+    Setzt das Hidden-Merkmal für viele Dateien auf einmal.
+
+    Die Einzelaufrufe laufen über einen begrenzten Thread-Pool (die Win32-
+    Aufrufe geben die GIL frei und warten v.a. auf das Dateisystem), am Ende
+    werden die geänderten Pfade gesammelt gemeldet (refresh(paths)).
+    """
+
+    MAX_WORKERS = 8
+
+    def __init__(self, backend=None, max_workers=MAX_WORKERS, refresh=None, ledger=None):
+        self.backend = backend or create_attribute_backend()
+        self.ledger = ledger
+        self.max_workers = max(1, max_workers)
+        if refresh is None:
+            refresh = WindowsDesktopAPI.notify_paths_changed
+        self.refresh = refresh  # refresh(geänderte Pfade)
+
+    def _map(self, fn, items):
+        if len(items) <= 1 or self.max_workers == 1:
+            return list(map(fn, items))
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items)),
+                                thread_name_prefix="attr") as pool:
+            return list(pool.map(fn, items))
+
+    def _read_one(self, path):
+        METRICS.inc("attributes.calls")
+        try:
+            return path, self.backend.get_attributes(path)
+        except Exception:
+            return path, None  # Fehler meldet der Schreibschritt
+
+    def _restore(self, path, original):
+        """
+        Zurück auf die Attribute vor dem Verstecken. Hat inzwischen jemand
+        andere Bits geändert (z.B. Schreibschutz), bleiben diese erhalten und
+        nur das Hidden-Bit wird entfernt.
+        """
+        current = self.backend.get_attributes(path)
+        if current == original | FILE_ATTRIBUTE_HIDDEN:
+            target = original
+        else:
+            target = current & ~FILE_ATTRIBUTE_HIDDEN
+        return target != current and self.backend.set_attributes(path, target)
+
+    def _apply_one(self, change):
+        path, hidden, original = change
+        METRICS.inc("attributes.calls")
+        try:
+            if original is None:
+                changed = self.backend.set_hidden(path, hidden)
+            elif hidden:
+                target = original | FILE_ATTRIBUTE_HIDDEN
+                changed = target != original and self.backend.set_attributes(path, target)
+            else:
+                changed = self._restore(path, original)
+            return path, ("changed" if changed else "unchanged"), None
+        except FileNotFoundError:
+            return path, "missing", None
+        except Exception as e:
+            return path, "failed", str(e)
+
+    def apply(self, changes, refresh=True):
+        """
+        changes: Iterable von (Pfad, hidden). Doppelte Pfade: der letzte gewinnt.
+        Gibt einen BulkAttributeReport zurück.
+        """
+        start = time.perf_counter()
+        latest = {}
+        for path, hidden in changes:
+            if path:
+                latest[path] = hidden
+        items = list(latest.items())
+
+        # Zu versteckende Dateien vorher mit ihren Attributen im Ledger vermerken;
+        # schon (vom Benutzer) versteckte gar nicht erst
+        recorded = set()
+        untouched = []
+        changes = [(path, hidden, None) for path, hidden in items]
+        if self.ledger is not None:
+            to_hide = [path for path, hidden in items if hidden]
+            originals = {path: attrs for path, attrs in self._map(self._read_one, to_hide)
+                         if attrs is not None}
+            recorded.update(self.ledger.record_hide(
+                [p for p in to_hide if not originals.get(p, 0) & FILE_ATTRIBUTE_HIDDEN], originals))
+            # Nicht im Ledger = nicht von uns versteckt (z.B. vom Benutzer): bleibt, wie es ist
+            untouched = [(path, "unchanged", None) for path, hidden in items
+                         if not hidden and path not in self.ledger]
+            changes = [(path, hidden, originals.get(path) if hidden else self.ledger.original(path))
+                       for path, hidden in items if hidden or path in self.ledger]
+
+        report = BulkAttributeReport()
+        results = self._map(self._apply_one, changes) + untouched
+
+        if self.ledger is not None:
+            # Wiederhergestellte Dateien und solche, die wir gar nicht versteckt haben
+            self.ledger.forget([
+                path for path, status, _ in results
+                if (not latest[path] and status != "failed")
+                or (path in recorded and status != "changed")
+            ])
+
+        for path, status, error in results:
+            if status == "failed":
+                report.failed.append((path, error))
+            else:
+                getattr(report, status).append(path)
+
+        if refresh and (report.changed or report.failed):
+            self.refresh(report.changed + [path for path, _ in report.failed])
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def hide(self, paths, refresh=True):
+        return self.apply(((p, True) for p in paths), refresh)
+
+    def unhide(self, paths, refresh=True):
+        return self.apply(((p, False) for p in paths), refresh)
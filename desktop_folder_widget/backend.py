@@ -0,0 +1,511 @@
+"""
+Desktop-Backends: echte Win32-Aufrufe oder ein simulierter Desktop
+==================================================================
+WindowsDesktopAPI und IconExtractor gehen für alles, was den Windows-Desktop
+betrifft, über ein DesktopBackend:
+
+    Fenster      Desktop-Fenster (WorkerW) finden, Kacheln einbetten/lösen,
+                 ganz nach unten in der Z-Reihenfolge
+    Dateien      Desktop-Pfad, Hidden-Attribut (AttributeBackend)
+    Explorer     Icon-Liste (DesktopListView), Shell-Benachrichtigungen
+    Icons        Shell-Icons für Dateien, die der Ressourcen-Dekoder nicht kann
+
+SimulatedDesktop bildet das komplett im Speicher nach — mit einstellbarer
+Dauer pro Aufruf. So laufen Layout, Persistenz, Drop- und Restore-Logik auch
+auf Linux und lassen sich dort messen, etwa mit einem langsamen Explorer oder
+einem Netzwerk-Desktop.
+
+Auswahl: create_desktop_backend(name) bzw. Umgebungsvariable
+DESKTOP_FOLDER_BACKEND ("win32", "simulated"); Standard ist "win32" unter
+Windows, sonst "simulated". DESKTOP_FOLDER_SIM_LATENCY_MS setzt die Dauer
+pro Aufruf des simulierten Desktops (alle Bereiche).
+"""
+
+import ctypes
+import ntpath
+import os
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+
+from .attributes import MemoryAttributeBackend, Win32AttributeBackend
+from .desktop import (
+    DESKTOP_GRID_X, DESKTOP_GRID_Y, DESKTOP_MARGIN_X, DESKTOP_MARGIN_Y, DesktopListView,
+    RecordingShellNotifier, Win32DesktopListView, Win32ShellNotifier,
+)
+from .deps import HAS_SHELL
+from .model import normalize_path
+from .winapi import (
+    GWL_EXSTYLE, GWL_STYLE, HWND, HWND_BOTTOM, LONG_PTR, SWP_NOACTIVATE, SWP_NOMOVE, SWP_NOSIZE,
+    WNDENUMPROC, WS_CHILD, WS_EX_NOACTIVATE, WS_EX_TOOLWINDOW, WS_POPUP, IS_WINDOWS, user32,
+)
+
+
+class DesktopBackend:
+    """Schnittstelle; Fenster-Handles sind ganze Zahlen"""
+
+    name = "base"
+
+    # --- Fenster ---
+
+    def desktop_window(self):
+        """Fenster hinter den Desktop-Icons (WorkerW) oder None"""
+        raise NotImplementedError
+
+    def window_handle(self, widget_id):
+        """Top-Level-Handle eines Tk-Fensters (winfo_id)"""
+        raise NotImplementedError
+
+    def embed_window(self, hwnd):
+        """Macht das Fenster zum Kind des Desktop-Fensters; True bei Erfolg"""
+        raise NotImplementedError
+
+    def detach_window(self, hwnd):
+        """Löst das Fenster wieder vom Desktop"""
+        raise NotImplementedError
+
+    def send_to_bottom(self, hwnd):
+        """Ganz nach unten in der Z-Reihenfolge (ohne Aktivierung)"""
+        raise NotImplementedError
+
+    # --- Dateien ---
+
+    def desktop_path(self):
+        raise NotImplementedError
+
+    def create_attribute_backend(self):
+        raise NotImplementedError
+
+    # --- Explorer ---
+
+    def create_listview(self):
+        """Neue DesktopListView (für DesktopListViewSession)"""
+        raise NotImplementedError
+
+    def create_notifier(self):
+        """ShellNotifier für ShellNotificationCoalescer"""
+        raise NotImplementedError
+
+    # --- Icons ---
+
+    def shell_icons(self, paths, size):
+        """Ein PIL-Bild oder None pro Pfad"""
+        raise NotImplementedError
+
+
+class Win32DesktopBackend(DesktopBackend):
+    """Der echte Desktop über user32/kernel32/shell32 und pywin32"""
+
+    name = "win32"
+
+    def __init__(self):
+        self._workerw = None
+
+    def desktop_window(self):
+        if self._workerw:
+            return self._workerw
+
+        try:
+            # Progman finden
+            progman = user32.FindWindowW("Progman", None)
+
+            if not progman:
+                return None
+
+            # Nachricht senden um WorkerW zu erstellen
+            result = ctypes.c_ulong()
+            user32.SendMessageTimeoutW(
+                HWND(progman),
+                0x052C,  # Spezielle Nachricht für Desktop
+                0, 0,
+                0x0000,  # SMTO_NORMAL
+                1000,
+                ctypes.byref(result)
+            )
+
+            # WorkerW mit SHELLDLL_DefView finden
+            workerw_list = []
+
+            def enum_callback(hwnd, lparam):
+                shell_view = user32.FindWindowExW(hwnd, HWND(0), "SHELLDLL_DefView", None)
+                if shell_view:
+                    # Das nächste WorkerW nach diesem ist unser Ziel
+                    next_worker = user32.FindWindowExW(HWND(0), hwnd, "WorkerW", None)
+                    if next_worker:
+                        workerw_list.append(next_worker)
+                return True
+
+            enum_func = WNDENUMPROC(enum_callback)
+            user32.EnumWindows(enum_func, None)
+
+            # Fallback: Progman verwenden
+            self._workerw = workerw_list[0] if workerw_list else progman
+            return self._workerw
+
+        except Exception as e:
+            print(f"Fehler beim Finden des Desktop-Fensters: {e}")
+            return None
+
+    def window_handle(self, widget_id):
+        return user32.GetParent(HWND(widget_id))
+
+    def embed_window(self, hwnd):
+        desktop_hwnd = self.desktop_window()
+        if not desktop_hwnd:
+            return False
+        try:
+            hwnd = HWND(hwnd) if not isinstance(hwnd, HWND) else hwnd
+            desktop_hwnd = HWND(desktop_hwnd) if not isinstance(desktop_hwnd, HWND) else desktop_hwnd
+
+            # Als Child des Desktops setzen
+            user32.SetParent(hwnd, desktop_hwnd)
+
+            # Style anpassen
+            style = user32.GetWindowLongPtrW(hwnd, GWL_STYLE)
+            style = (style & ~WS_POPUP) | WS_CHILD
+            user32.SetWindowLongPtrW(hwnd, GWL_STYLE, LONG_PTR(style))
+
+            # Extended Style
+            ex_style = user32.GetWindowLongPtrW(hwnd, GWL_EXSTYLE)
+            ex_style = ex_style | WS_EX_TOOLWINDOW | WS_EX_NOACTIVATE
+            user32.SetWindowLongPtrW(hwnd, GWL_EXSTYLE, LONG_PTR(ex_style))
+
+            return True
+        except Exception as e:
+            print(f"Fehler beim Setzen des Parents: {e}")
+            return False
+
+    def detach_window(self, hwnd):
+        user32.SetParent(HWND(hwnd), HWND(0))
+
+    def send_to_bottom(self, hwnd):
+        try:
+            hwnd = HWND(hwnd) if not isinstance(hwnd, HWND) else hwnd
+            user32.SetWindowPos(
+                hwnd, HWND_BOTTOM, 0, 0, 0, 0,
+                SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE
+            )
+        except:
+            pass
+
+    def desktop_path(self):
+        try:
+            if HAS_SHELL:
+                from win32com.shell import shell, shellcon
+                return shell.SHGetFolderPath(0, shellcon.CSIDL_DESKTOP, None, 0)
+        except:
+            pass
+
+        # Fallback
+        return str(Path.home() / "Desktop")
+
+    def create_attribute_backend(self):
+        return Win32AttributeBackend()
+
+    def create_listview(self):
+        return Win32DesktopListView()
+
+    def create_notifier(self):
+        return Win32ShellNotifier()
+
+    def shell_icons(self, paths, size):
+        from .icons import IconExtractor
+        return IconExtractor.extract_windows_icons(paths, size)
+
+
+# ============================================================================
+# Simulierter Desktop
+# ============================================================================
+
+class SimulatedAttributeBackend(MemoryAttributeBackend):
+    """Hidden-Merkmal der Dateien eines SimulatedDesktop (zählt als "attributes"-Aufruf)"""
+
+    name = "simulated"
+
+    def __init__(self, desktop):
+        self.desktop = desktop
+        self.paths = {}  # normalisierter Pfad → Pfad (für die Anzeigenamen)
+        super().__init__()
+
+    def add_files(self, paths):
+        paths = list(paths)
+        with self._lock:
+            for path in paths:
+                self.paths.setdefault(normalize_path(path), path)
+        super().add_files(paths)
+
+    def _check(self, key, path):
+        self.desktop.call("attributes")
+        if key not in self.hidden:
+            raise FileNotFoundError(2, "Datei nicht gefunden", path)
+
+
+class SimulatedListView(DesktopListView):
+    """Icon-Liste des simulierten Explorers — jeder Aufruf kostet "listview"-Latenz"""
+
+    def __init__(self, desktop):
+        self.desktop = desktop
+        self.generation = desktop.explorer_generation
+
+    def is_valid(self):
+        # Nach einem Explorer-Neustart sind alte Handles ungültig
+        return self.generation == self.desktop.explorer_generation
+
+    def origin(self):
+        return self.desktop.origin
+
+    def item_count(self):
+        self.desktop.call("listview")
+        return len(self.desktop.items)
+
+    def item_text(self, index):
+        self.desktop.call("listview")
+        items = self.desktop.items
+        return items[index] if 0 <= index < len(items) else ""
+
+    def item_position(self, index):
+        self.desktop.call("listview")
+        items = self.desktop.items
+        if not 0 <= index < len(items):
+            return None
+        return self.desktop.positions.get(items[index])
+
+    def set_item_position(self, index, x, y):
+        self.desktop.call("listview")
+        items = self.desktop.items
+        if not 0 <= index < len(items):
+            return False
+        self.desktop.positions[items[index]] = (x, y)
+        return True
+
+
+class SimulatedShellNotifier(RecordingShellNotifier):
+    """
+    Zeichnet Meldungen auf (events) und lässt den simulierten Explorer seine
+    Icon-Liste neu einlesen — wie der echte erst nach der Benachrichtigung.
+    """
+
+    def __init__(self, desktop):
+        super().__init__()
+        self.desktop = desktop
+
+    def attributes_changed(self, path):
+        self.desktop.call("notify")
+        super().attributes_changed(path)
+        self.desktop.refresh_items()
+
+    def item_updated(self, path):
+        self.desktop.call("notify")
+        super().item_updated(path)
+        self.desktop.refresh_items()
+
+    def dir_updated(self, path):
+        self.desktop.call("notify")
+        super().dir_updated(path)
+        self.desktop.refresh_items()
+
+    def assoc_changed(self):
+        self.desktop.call("notify")
+        super().assoc_changed()
+        self.desktop.refresh_items()
+
+
+class SimulatedDesktop(DesktopBackend):
+    """
+    Vollständiger Desktop im Speicher:
+
+      • Dateien mit Hidden-Merkmal (files / add_file / remove_file)
+      • Fenster mit Parent und Z-Reihenfolge (windows, z_order: unten → oben)
+      • Explorer-Icon-Liste: zeigt die sichtbaren Dateien des Desktop-
+        Verzeichnisses (.lnk/.url ohne Endung) und liest sie erst nach einer
+        Shell-Benachrichtigung neu ein; neue Icons landen auf der nächsten
+        freien Rasterzelle
+      • Shell-Icons: eine Farbfläche pro Datei (Pillow nötig, sonst None)
+
+    latency: Sekunden pro Aufruf — eine Zahl für alle Bereiche oder ein dict
+    mit Einträgen aus KINDS, z.B. {"listview": 0.002, "notify": 0.02} für einen
+    langsamen Explorer oder {"attributes": 0.005, "icons": 0.05} für einen
+    Netzwerk-Desktop. calls zählt die Aufrufe pro Bereich.
+    """
+
+    name = "simulated"
+    KINDS = ("window", "attributes", "listview", "notify", "icons")
+    DESKTOP_WINDOW = 0x10010
+    SCREEN_SIZE = (1920, 1080)
+    HIDDEN_EXTENSIONS = (".lnk", ".url")
+
+    def __init__(self, desktop_path=None, files=(), latency=0.0, origin=(0, 0)):
+        self.path = str(desktop_path or Path.home() / "Desktop")
+        if not isinstance(latency, dict):
+            latency = dict.fromkeys(self.KINDS, latency)
+        self.latency = {kind: latency.get(kind, 0.0) for kind in self.KINDS}
+        self.calls = Counter()
+        self.origin = origin
+        self.explorer_generation = 0
+        self.attributes = SimulatedAttributeBackend(self)
+        self.windows = {}   # Handle → Parent-Handle (0 = Top-Level)
+        self.z_order = []   # unten → oben
+        self.items = []     # Anzeigenamen in der Icon-Liste
+        self.positions = {}  # Anzeigename → (x, y) relativ zur ListView
+        self._next_handle = self.DESKTOP_WINDOW + 0x10
+        self._lock = threading.Lock()
+        for path in files:
+            self.add_file(path)
+        self.refresh_items()
+
+    def call(self, kind):
+        """Ein Aufruf an den "Desktop": zählen und die eingestellte Zeit warten"""
+        self.calls[kind] += 1
+        delay = self.latency[kind]
+        if delay:
+            time.sleep(delay)
+
+    # --- Dateien ---
+
+    def add_file(self, path, hidden=False):
+        """Legt eine Datei an (im Explorer sichtbar erst nach einer Benachrichtigung)"""
+        self.attributes.add_files([path])
+        self.attributes.hidden[normalize_path(path)] = hidden
+
+    def remove_file(self, path):
+        key = normalize_path(path)
+        self.attributes.hidden.pop(key, None)
+        self.attributes.paths.pop(key, None)
+
+    def is_hidden(self, path):
+        return self.attributes.hidden.get(normalize_path(path))
+
+    def desktop_path(self):
+        return self.path
+
+    def create_attribute_backend(self):
+        return self.attributes
+
+    # --- Explorer ---
+
+    @classmethod
+    def display_name(cls, path):
+        name = ntpath.basename(path)  # Windows- und POSIX-Trenner
+        stem, ext = os.path.splitext(name)
+        return stem if ext.lower() in cls.HIDDEN_EXTENSIONS else name
+
+    def refresh_items(self):
+        """Explorer liest das Desktop-Verzeichnis neu ein (nach SHChangeNotify)"""
+        desktop_key = normalize_path(self.path)
+        with self._lock:
+            visible = [self.display_name(path)
+                       for key, path in self.attributes.paths.items()
+                       if not self.attributes.hidden.get(key, True)
+                       and key.rpartition("\\")[0] == desktop_key]
+            current = set(visible)
+            # Ausgeblendete Icons verlieren ihren Platz, neue bekommen den nächsten freien
+            self.positions = {name: pos for name, pos in self.positions.items() if name in current}
+            self.items = [name for name in self.items if name in current]
+            known = set(self.items)
+            for name in visible:
+                if name not in known:
+                    self.items.append(name)
+                    known.add(name)
+                    self.positions[name] = self._free_cell()
+
+    def _free_cell(self):
+        # Spaltenweise wie die automatische Anordnung des Explorers
+        taken = set(self.positions.values())
+        rows = max(1, (self.SCREEN_SIZE[1] - DESKTOP_MARGIN_Y) // DESKTOP_GRID_Y)
+        index = 0
+        while True:
+            col, row = divmod(index, rows)
+            point = (DESKTOP_MARGIN_X + col * DESKTOP_GRID_X, DESKTOP_MARGIN_Y + row * DESKTOP_GRID_Y)
+            if point not in taken:
+                return point
+            index += 1
+
+    def restart_explorer(self):
+        """Simuliert einen Explorer-Neustart: offene ListViews werden ungültig"""
+        self.explorer_generation += 1
+
+    def create_listview(self):
+        return SimulatedListView(self)
+
+    def create_notifier(self):
+        return SimulatedShellNotifier(self)
+
+    # --- Fenster ---
+
+    def create_window(self):
+        """Neues Top-Level-Fenster (steht in der Z-Reihenfolge oben)"""
+        with self._lock:
+            hwnd = self._next_handle
+            self._next_handle += 1
+            self.windows[hwnd] = 0
+            self.z_order.append(hwnd)
+        return hwnd
+
+    def desktop_window(self):
+        self.call("window")
+        return self.DESKTOP_WINDOW
+
+    def window_handle(self, widget_id):
+        self.call("window")
+        with self._lock:
+            if widget_id not in self.windows:
+                self.windows[widget_id] = 0
+                self.z_order.append(widget_id)
+        return widget_id
+
+    def embed_window(self, hwnd):
+        self.call("window")
+        with self._lock:
+            self.windows[hwnd] = self.DESKTOP_WINDOW
+        return True
+
+    def detach_window(self, hwnd):
+        self.call("window")
+        with self._lock:
+            self.windows[hwnd] = 0
+
+    def send_to_bottom(self, hwnd):
+        self.call("window")
+        with self._lock:
+            if hwnd in self.z_order:
+                self.z_order.remove(hwnd)
+            self.z_order.insert(0, hwnd)
+
+    # --- Icons ---
+
+    def shell_icons(self, paths, size):
+        try:
+            from PIL import Image
+        except ImportError:
+            Image = None
+        images = []
+        for path in paths:
+            self.call("icons")
+            if Image is None or normalize_path(path) not in self.attributes.hidden:
+                images.append(None)
+                continue
+            crc = zlib.crc32(normalize_path(path).encode("utf-8"))
+            color = (crc & 0xFF, (crc >> 8) & 0xFF, (crc >> 16) & 0xFF, 255)
+            images.append(Image.new("RGBA", (size, size), color))
+        return images
+
+
+DESKTOP_BACKENDS = {
+    "win32": Win32DesktopBackend,
+    "simulated": SimulatedDesktop,
+}
+
+
+def create_desktop_backend(name=None):
+    """Backend nach Name (Umgebungsvariable DESKTOP_FOLDER_BACKEND), sonst Plattform-Standard"""
+    name = name or os.environ.get("DESKTOP_FOLDER_BACKEND") or ("win32" if IS_WINDOWS else "simulated")
+    if name == "simulated":
+        latency = float(os.environ.get("DESKTOP_FOLDER_SIM_LATENCY_MS", "0")) / 1000
+        return SimulatedDesktop(latency=latency)
+    backend_cls = DESKTOP_BACKENDS.get(name)
+    if backend_cls is None:
+        print(f"Unbekanntes Desktop-Backend '{name}', verwende 'simulated'")
+        return SimulatedDesktop()
+    return backend_cls()
@@ -0,0 +1,419 @@
+"""
+Kommandozeile ohne Oberfläche
+=============================
+Bearbeitet die gespeicherte Konfiguration direkt — ohne Tk und ohne Fenster.
+Gleiche Modelle, gleiche Journal-Operationen und gleiche Massen-Engine für das
+Hidden-Attribut wie die Oberfläche. Alle Änderungen eines Aufrufs werden
+gemeinsam geschrieben (eine Journal-Zeile pro Änderung, ein fsync bzw. eine
+Transaktion).
+
+    python -m desktop_folder_widget cli list [-v] [--json]
+    python -m desktop_folder_widget cli new NAME
+    python -m desktop_folder_widget cli add KACHEL DATEI… [--no-hide]
+    python -m desktop_folder_widget cli remove DATEI… [--keep-hidden]
+    python -m desktop_folder_widget cli move KACHEL DATEI…
+    python -m desktop_folder_widget cli restore [KACHEL…]
+    python -m desktop_folder_widget cli validate [--prune]
+    python -m desktop_folder_widget cli apply MANIFEST.json
+
+KACHEL ist die Kachel-ID oder ihr Name. Das Manifest für "apply" ordnet
+Kachelnamen Dateilisten zu ({"Apps": ["C:\\\\…\\\\App.lnk", …], …}); fehlende
+Kacheln werden angelegt — so wird ein neuer Arbeitsplatz mit einem Aufruf
+eingerichtet.
+
+Unter Linux übernimmt der simulierte Desktop (backend.py) das Hidden-Attribut
+(oder --attr-backend). Desktop-Icon-Positionen werden ohne Oberfläche weder
+gemerkt noch wiederhergestellt.
+
+Läuft das Widget, verweigern ändernde Befehle die Arbeit — es würde die
+Änderungen beim nächsten Speichern überschreiben.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from .attributes import (
+    ATTRIBUTE_BACKENDS, DEFAULT_LEDGER_FILE, BulkAttributeEngine, HiddenFileLedger,
+    MemoryAttributeBackend, create_attribute_backend,
+)
+from .desktop import DESKTOP_GRID_X, DESKTOP_MARGIN_X, DESKTOP_MARGIN_Y, WindowsDesktopAPI
+from .instance import InstanceLock
+from .model import (
+    Shortcut, ShortcutPathIndex, ShortcutValidator, TileConfig, config_from_dict, migrate_config,
+    normalize_path,
+)
+from .persistence import ConfigJournal, create_config_store
+
+
+class LayoutEditor:
+    """
+    Kacheln und Verknüpfungen der gespeicherten Konfiguration bearbeiten.
+
+    Die Methoden ändern self.config und sammeln die Journal-Operationen;
+    commit() schreibt sie gemeinsam. Dateien auf dem Desktop werden beim
+    Hinzufügen versteckt und beim Entfernen wieder sichtbar gemacht, jeweils
+    gesammelt über die BulkAttributeEngine.
+    """
+
+    def __init__(self, store, attributes, desktop_path=None, validator=None):
+        self.store = store
+        self.attributes = attributes
+        self.validator = validator or ShortcutValidator()
+        self.desktop_dir = normalize_path(desktop_path or WindowsDesktopAPI.get_desktop_path())
+
+        data = store.load()
+        migrated = migrate_config(data)
+        self.config = config_from_dict(data)
+        for tile_id, tile in self.config["tiles"].items():
+            if tile.shortcuts is None:
+                tile.shortcuts = [Shortcut.from_dict(s) for s in store.load_shortcuts(tile_id)]
+        if migrated:
+            store.save(self.config)
+        self.path_index = ShortcutPathIndex()
+        self.path_index.rebuild(self.config["tiles"])
+        self.ops = []
+
+    @property
+    def tiles(self):
+        return self.config["tiles"]
+
+    def resolve_tile(self, ref):
+        """Kachel-ID oder Name (ohne Groß-/Kleinschreibung) → ID; KeyError wenn unbekannt"""
+        ref = str(ref)
+        if ref in self.tiles:
+            return ref
+        matches = [tile_id for tile_id, tile in self.tiles.items() if tile.name.lower() == ref.lower()]
+        if len(matches) != 1:
+            raise KeyError(f"Kachel '{ref}' {'nicht eindeutig' if matches else 'nicht gefunden'}")
+        return matches[0]
+
+    def on_desktop(self, path):
+        return normalize_path(os.path.dirname(path)) == self.desktop_dir
+
+    def _track(self, paths):
+        # Das Ersatz-Backend kennt nur angemeldete Dateien
+        if isinstance(self.attributes.backend, MemoryAttributeBackend):
+            self.attributes.backend.add_files(paths)
+
+    def create_tile(self, name):
+        """Neue Kachel neben der letzten (wie "Neue Kachel" im Menü), gibt die ID zurück"""
+        existing = [int(i) for i in self.tiles if i.isdigit()]
+        tile_id = str(max(existing) + 1 if existing else 0)
+        last = list(self.tiles.values())[-1] if self.tiles else None
+        if last is not None and last.pos_x is not None:
+            x, y = last.pos_x + DESKTOP_GRID_X, last.pos_y or DESKTOP_MARGIN_Y
+        else:
+            x, y = DESKTOP_MARGIN_X, DESKTOP_MARGIN_Y
+        x, y = WindowsDesktopAPI.snap_to_grid(x, y)
+        tile = TileConfig(name=name, pos_x=x, pos_y=y)
+        self.tiles[tile_id] = tile
+        self.ops.append({"op": ConfigJournal.OP_CREATE_TILE, "tile": tile_id, "config": tile.to_dict()})
+        return tile_id
+
+    def add(self, tile_id, paths, hide=True):
+        """
+        Hängt Dateien an die Kachel an. Gibt (hinzugefügt, übersprungen) zurück;
+        übersprungen: Liste von (Pfad, Grund) für fehlende Dateien und Duplikate.
+        """
+        shortcuts = self.tiles[tile_id].shortcuts
+        states = self.validator.scan(paths, details=False)
+        added, skipped = [], []
+        for path in paths:
+            if not states[path].exists:
+                skipped.append((path, "nicht gefunden"))
+                continue
+            existing = self.path_index.lookup(path)
+            if existing is not None:
+                skipped.append((path, f"bereits in Kachel {existing[0]}"))
+                continue
+            shortcut = Shortcut(Path(path).stem, path)
+            shortcuts.append(shortcut)
+            self.path_index.reindex_tile(tile_id, shortcuts, len(shortcuts) - 1)
+            self.ops.append({"op": ConfigJournal.OP_ADD_SHORTCUT, "tile": tile_id,
+                             "index": len(shortcuts) - 1, "shortcut": shortcut.to_dict()})
+            added.append(path)
+        if hide:
+            to_hide = [path for path in added if self.on_desktop(path)]
+            self._track(to_hide)
+            self._report(self.attributes.hide(to_hide))
+        return added, skipped
+
+    def _take(self, paths):
+        """
+        Entfernt Verknüpfungen aus ihren Kacheln (je Kachel ein Durchlauf) und
+        gibt die entfernten Shortcut-Objekte in Eingabereihenfolge zurück.
+        """
+        by_tile = {}
+        for path in paths:
+            entry = self.path_index.lookup(path)
+            if entry is not None:
+                by_tile.setdefault(entry[0], set()).add(entry[1])
+        taken = {}
+        for tile_id, indices in by_tile.items():
+            tile = self.tiles[tile_id]
+            # Absteigend, damit jede Journal-Position beim Nachspielen stimmt
+            for index in sorted(indices, reverse=True):
+                shortcut = tile.shortcuts[index]
+                self.path_index.discard(tile_id, shortcut)
+                self.ops.append({"op": ConfigJournal.OP_REMOVE_SHORTCUT, "tile": tile_id,
+                                 "index": index, "path": shortcut.path})
+                taken[shortcut.norm_path] = shortcut
+            tile.shortcuts = [s for i, s in enumerate(tile.shortcuts) if i not in indices]
+            self.path_index.reindex_tile(tile_id, tile.shortcuts, min(indices))
+        return [taken[key] for key in dict.fromkeys(map(normalize_path, paths)) if key in taken]
+
+    def remove(self, paths, unhide=True):
+        """Entfernt Verknüpfungen aus allen Kacheln, gibt die entfernten Pfade zurück"""
+        removed = [shortcut.path for shortcut in self._take(paths)]
+        if unhide:
+            self._track(removed)
+            self._report(self.attributes.unhide(removed))
+        return removed
+
+    def move(self, tile_id, paths):
+        """Verschiebt Verknüpfungen ans Ende einer anderen Kachel (Attribut bleibt)"""
+        moved = self._take(paths)
+        shortcuts = self.tiles[tile_id].shortcuts
+        start = len(shortcuts)
+        shortcuts.extend(moved)
+        self.path_index.reindex_tile(tile_id, shortcuts, start)
+        self.ops.extend({"op": ConfigJournal.OP_ADD_SHORTCUT, "tile": tile_id,
+                         "index": start + i, "shortcut": s.to_dict()}
+                        for i, s in enumerate(moved))
+        return [s.path for s in moved]
+
+    def restore(self, tile_ids=None):
+        """Alle Verknüpfungen (der Kacheln) auf den Desktop zurück, Kacheln leeren"""
+        tile_ids = list(self.tiles) if tile_ids is None else tile_ids
+        paths = []
+        for tile_id in tile_ids:
+            tile = self.tiles[tile_id]
+            if not tile.shortcuts:
+                continue
+            paths.extend(s.path for s in tile.shortcuts)
+            self.path_index.discard_tile(tile_id, tile.shortcuts)
+            tile.shortcuts = []
+            self.ops.append({"op": ConfigJournal.OP_CLEAR_SHORTCUTS, "tile": tile_id})
+        states = self.validator.scan(paths, details=False)
+        existing = [p for p in paths if states[p].exists]
+        self._track(existing)
+        report = self.attributes.unhide(existing)
+        report.missing.extend(p for p in paths if not states[p].exists)
+        if self.attributes.ledger is not None:
+            self.attributes.ledger.forget(report.missing)
+        self._report(report)
+        return report
+
+    def validate(self, prune=False):
+        """Prüft alle Pfade (ein scandir pro Verzeichnis), gibt die fehlenden zurück"""
+        paths = [s.path for tile in self.tiles.values() for s in tile.shortcuts]
+        states = self.validator.scan(paths, details=False)
+        missing = [p for p in paths if not states[p].exists]
+        if prune and missing:
+            self._take(missing)
+            if self.attributes.ledger is not None:
+                self.attributes.ledger.forget(missing)
+        return missing
+
+    @staticmethod
+    def _report(report):
+        for path, error in report.failed:
+            print(f"  ✗ Fehler bei {Path(path).stem}: {error}")
+
+    def commit(self):
+        """Schreibt alle gesammelten Änderungen und meldet sie dem Explorer"""
+        if self.ops:
+            self.store.record(self.config, self.ops)
+            self.ops = []
+        WindowsDesktopAPI.notifications().flush()
+
+    def close(self):
+        self.store.close()
+
+
+# --- Befehle ---
+
+def _cmd_list(editor, args):
+    if args.json:
+        data = {tile_id: {"name": tile.name, "pos": [tile.pos_x, tile.pos_y],
+                          "shortcuts": [s.path for s in tile.shortcuts]}
+                for tile_id, tile in editor.tiles.items()}
+        print(json.dumps(data, indent=2, ensure_ascii=False))
+        return 0
+    for tile_id, tile in editor.tiles.items():
+        print(f"{tile_id:>4}  {tile.name:<24} ({tile.pos_x}, {tile.pos_y})  "
+              f"{len(tile.shortcuts)} Verknüpfung(en)")
+        if args.verbose:
+            for shortcut in tile.shortcuts:
+                print(f"        {shortcut.name:<28} {shortcut.path}")
+    return 0
+
+
+def _print_skipped(skipped):
+    for path, reason in skipped:
+        print(f"  − übersprungen ({reason}): {path}")
+
+
+def _cmd_new(editor, args):
+    tile_id = editor.create_tile(args.name)
+    print(f"Kachel {tile_id} '{args.name}' angelegt")
+    return 0
+
+
+def _cmd_add(editor, args):
+    added, skipped = editor.add(editor.resolve_tile(args.tile), _absolute(args.paths), hide=not args.no_hide)
+    _print_skipped(skipped)
+    print(f"{len(added)} Verknüpfung(en) hinzugefügt")
+    return 0 if not skipped else 1
+
+
+def _cmd_remove(editor, args):
+    removed = editor.remove(_absolute(args.paths), unhide=not args.keep_hidden)
+    print(f"{len(removed)} Verknüpfung(en) entfernt")
+    return 0 if len(removed) == len(args.paths) else 1
+
+
+def _cmd_move(editor, args):
+    moved = editor.move(editor.resolve_tile(args.tile), _absolute(args.paths))
+    print(f"{len(moved)} Verknüpfung(en) verschoben")
+    return 0 if len(moved) == len(args.paths) else 1
+
+
+def _cmd_restore(editor, args):
+    tile_ids = [editor.resolve_tile(t) for t in args.tiles] if args.tiles else None
+    report = editor.restore(tile_ids)
+    for path in report.missing:
+        print(f"  ? Datei nicht gefunden: {path}")
+    print(f"{report.ok} Datei(en) wiederhergestellt.")
+    return 1 if report.failed else 0
+
+
+def _cmd_validate(editor, args):
+    missing = editor.validate(prune=args.prune)
+    for path in missing:
+        print(f"  ? {path}")
+    total = sum(len(tile.shortcuts) for tile in editor.tiles.values()) + (len(missing) if args.prune else 0)
+    action = "entfernt" if args.prune else "fehlen"
+    print(f"{len(missing)} von {total} Verknüpfung(en) {action}")
+    return 0 if args.prune or not missing else 1
+
+
+def _cmd_apply(editor, args):
+    if args.manifest == "-":
+        manifest = json.load(sys.stdin)
+    else:
+        with open(args.manifest, encoding="utf-8") as f:
+            manifest = json.load(f)
+    if not isinstance(manifest, dict):
+        raise ValueError("Manifest muss ein Objekt {Kachelname: [Pfade]} sein")
+    total, skipped_all = 0, []
+    for name, paths in manifest.items():
+        try:
+            tile_id = editor.resolve_tile(name)
+        except KeyError:
+            tile_id = editor.create_tile(name)
+        added, skipped = editor.add(tile_id, _absolute(paths), hide=not args.no_hide)
+        total += len(added)
+        skipped_all.extend(skipped)
+    _print_skipped(skipped_all)
+    print(f"{total} Verknüpfung(en) in {len(manifest)} Kachel(n) übernommen")
+    return 0 if not skipped_all else 1
+
+
+def _absolute(paths):
+    return [os.path.abspath(p) for p in paths]
+
+
+def is_read_only(args):
+    """Befehle, die nur lesen, dürfen neben dem laufenden Widget laufen (validate ohne --prune)"""
+    return args.command == "list" or (args.command == "validate" and not args.prune)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="desktop_folder_widget cli",
+        description="Kacheln und Verknüpfungen ohne Oberfläche bearbeiten")
+    parser.add_argument("--store", choices=("json", "sqlite"),
+                        help="Persistenz (Standard: DESKTOP_FOLDER_STORE bzw. json)")
+    parser.add_argument("--attr-backend", choices=sorted(ATTRIBUTE_BACKENDS),
+                        help="Hidden-Attribut (Standard: DESKTOP_FOLDER_ATTR_BACKEND bzw. Plattform)")
+    parser.add_argument("--desktop", help="Desktop-Verzeichnis (Standard: Desktop des Benutzers)")
+    parser.add_argument("--ledger", default=DEFAULT_LEDGER_FILE, help=argparse.SUPPRESS)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="Kacheln auflisten")
+    p.add_argument("-v", "--verbose", action="store_true", help="auch die Verknüpfungen")
+    p.add_argument("--json", action="store_true", help="maschinenlesbar")
+    p.set_defaults(handler=_cmd_list)
+
+    p = sub.add_parser("new", help="Kachel anlegen")
+    p.add_argument("name")
+    p.set_defaults(handler=_cmd_new)
+
+    p = sub.add_parser("add", help="Dateien in Kachel übernehmen")
+    p.add_argument("tile")
+    p.add_argument("paths", nargs="+")
+    p.add_argument("--no-hide", action="store_true", help="Desktop-Dateien nicht verstecken")
+    p.set_defaults(handler=_cmd_add)
+
+    p = sub.add_parser("remove", help="Verknüpfungen entfernen (Datei wird wieder sichtbar)")
+    p.add_argument("paths", nargs="+")
+    p.add_argument("--keep-hidden", action="store_true", help="Hidden-Attribut nicht zurücksetzen")
+    p.set_defaults(handler=_cmd_remove)
+
+    p = sub.add_parser("move", help="Verknüpfungen in eine andere Kachel verschieben")
+    p.add_argument("tile")
+    p.add_argument("paths", nargs="+")
+    p.set_defaults(handler=_cmd_move)
+
+    p = sub.add_parser("restore", help="alles (bzw. die Kacheln) auf den Desktop zurücklegen")
+    p.add_argument("tiles", nargs="*")
+    p.set_defaults(handler=_cmd_restore)
+
+    p = sub.add_parser("validate", help="fehlende Dateien melden")
+    p.add_argument("--prune", action="store_true", help="fehlende aus den Kacheln entfernen")
+    p.set_defaults(handler=_cmd_validate)
+
+    p = sub.add_parser("apply", help="Manifest {Kachelname: [Pfade]} übernehmen ('-' = stdin)")
+    p.add_argument("manifest")
+    p.add_argument("--no-hide", action="store_true", help="Desktop-Dateien nicht verstecken")
+    p.set_defaults(handler=_cmd_apply)
+    return parser
+
+
+def cli_main(argv=None):
+    """Einstieg für "python -m desktop_folder_widget cli …"; gibt den Exit-Code zurück"""
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+
+    lock = InstanceLock()
+    if not is_read_only(args) and not lock.acquire():
+        print("Das Widget läuft — es würde diese Änderungen beim nächsten Speichern überschreiben.")
+        print("Zuerst beenden (--quit) oder Dateien mit --add KACHEL DATEI… an das Widget schicken.")
+        return 1
+    try:
+        engine = BulkAttributeEngine(create_attribute_backend(args.attr_backend),
+                                     ledger=HiddenFileLedger(args.ledger))
+        editor = LayoutEditor(create_config_store(args.store), engine, args.desktop)
+        try:
+            try:
+                code = args.handler(editor, args)
+            except (KeyError, ValueError, OSError) as e:
+                print(f"Fehler: {e.args[0] if isinstance(e, KeyError) else e}")
+                code = 1
+            # Auch nach einem Fehler: was schon geändert (z.B. versteckt) wurde, festhalten
+            editor.commit()
+        finally:
+            editor.close()
+    finally:
+        lock.release()
+    print(f"({(time.perf_counter() - start) * 1000:.0f} ms)", file=sys.stderr)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(cli_main())
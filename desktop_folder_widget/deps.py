@@ -0,0 +1,25 @@
+"""
+Optionale Abhängigkeiten
+========================
+Hier wird nur nachgesehen, ob ein Paket installiert ist (find_spec, ohne es
+zu importieren). Geladen wird es erst an der Stelle, die es braucht.
+"""
+
+import importlib.util
+
+
+def _installed(*names):
+    try:
+        return all(importlib.util.find_spec(name) is not None for name in names)
+    except (ImportError, ValueError):
+        return False
+
+
+# Für Drag & Drop
+HAS_WINDND = _installed("windnd")
+# Für Icon-Extraktion (GDI-Fallback)
+HAS_WIN32 = _installed("PIL", "win32gui", "win32ui", "win32con", "win32api")
+# Für die Alpha-Rekonstruktion im GDI-Fallback
+HAS_NUMPY = _installed("numpy")
+# Für Shell-Operationen (.lnk-Dateien liest ShellLinkCache direkt, ohne COM)
+HAS_SHELL = _installed("win32com")
@@ -0,0 +1,870 @@
+"""
+Desktop-Integration: WorkerW/ListView, Icon-Positionen und Shell-Benachrichtigungen
+"""
+
+import ctypes
+import ntpath
+import os
+import threading
+import time
+
+from .model import normalize_path
+from .winapi import HWND, RECT, WNDENUMPROC, kernel32, user32
+
+
+# Desktop Grid (Windows 11 typische Werte bei 100% Skalierung)
+DESKTOP_GRID_X = 75  # Horizontaler Abstand
+DESKTOP_GRID_Y = 75  # Vertikaler Abstand  
+DESKTOP_MARGIN_X = 0  # Linker Rand (kein Offset)
+DESKTOP_MARGIN_Y = 0  # Oberer Rand (kein Offset)
+
+
+class WindowsDesktopAPI:
+    """
+    Desktop-Integration für das Widget. Die eigentlichen Aufrufe macht das
+    DesktopBackend (backend.py) — der echte Windows-Desktop oder ein
+    simulierter (set_backend).
+    """
+    
+    _backend = None
+    _listview_session = None
+    _notifications = None
+    
+    @classmethod
+    def backend(cls):
+        """Aktives DesktopBackend (beim ersten Zugriff nach Plattform/Umgebung gewählt)"""
+        if cls._backend is None:
+            from .backend import create_desktop_backend
+            cls._backend = create_desktop_backend()
+        return cls._backend
+    
+    @classmethod
+    def set_backend(cls, backend):
+        """Wechselt das Backend; ListView-Sitzung und Benachrichtigungen beginnen neu"""
+        if cls._listview_session is not None:
+            cls._listview_session.close()
+        if cls._notifications is not None:
+            cls._notifications.flush()
+        cls._backend = backend
+        cls._listview_session = None
+        cls._notifications = None
+        return backend
+    
+    @classmethod
+    def find_desktop_window(cls):
+        """Findet das Desktop-Fenster (WorkerW hinter den Icons)"""
+        return cls.backend().desktop_window()
+    
+    @classmethod
+    def window_handle(cls, widget_id):
+        """Top-Level-Handle zu einem Tk-Fenster (winfo_id)"""
+        return cls.backend().window_handle(widget_id)
+    
+    @classmethod
+    def set_parent_to_desktop(cls, hwnd):
+        """Setzt ein Fenster als Kind des Desktops"""
+        return cls.backend().embed_window(hwnd)
+    
+    @classmethod
+    def detach_from_desktop(cls, hwnd):
+        """Löst ein Fenster wieder vom Desktop (vor dem Schließen)"""
+        cls.backend().detach_window(hwnd)
+    
+    @classmethod
+    def set_file_hidden(cls, filepath, hidden=True):
+        """Setzt oder entfernt das Hidden-Attribut einer Datei"""
+        try:
+            cls.backend().create_attribute_backend().set_hidden(filepath, hidden)
+            return True
+        except Exception as e:
+            print(f"    Fehler in set_file_hidden: {e}")
+            return False
+    
+    @classmethod
+    def notifications(cls):
+        """Gemeinsamer Sammler für Shell-Benachrichtigungen"""
+        if cls._notifications is None:
+            cls._notifications = ShellNotificationCoalescer(
+                cls.backend().create_notifier(), on_flush=cls.invalidate_listview)
+        return cls._notifications
+    
+    @classmethod
+    def invalidate_listview(cls):
+        """Desktop hat sich geändert: Name→Index-Cache beim nächsten Zugriff neu aufbauen"""
+        if cls._listview_session is not None:
+            cls._listview_session.invalidate()
+    
+    @staticmethod
+    def notify_paths_changed(paths):
+        """Meldet geänderte Dateien (z.B. Hidden-Attribut) gesammelt an den Explorer"""
+        WindowsDesktopAPI.notifications().add_paths(paths)
+    
+    @staticmethod
+    def refresh_desktop(full=False):
+        """
+        Aktualisiert die Desktop-Ansicht (gesammelt, ein UPDATEDIR).
+        full=True schickt zusätzlich SHCNE_ASSOCCHANGED — das lässt den Explorer
+        alle Icon-Zuordnungen neu bewerten und ist nur selten nötig.
+        """
+        notifications = WindowsDesktopAPI.notifications()
+        if full:
+            notifications.request_full_refresh()
+        desktop_path = WindowsDesktopAPI.get_desktop_path()
+        if desktop_path:
+            notifications.add_dir(desktop_path)
+    
+    @classmethod
+    def get_desktop_path(cls):
+        """Gibt den Desktop-Pfad zurück"""
+        return cls.backend().desktop_path()
+    
+    @staticmethod
+    def snap_to_grid(x, y):
+        """Rastet Koordinaten auf dem Desktop-Grid ein"""
+        grid_x = round((x - DESKTOP_MARGIN_X) / DESKTOP_GRID_X) * DESKTOP_GRID_X + DESKTOP_MARGIN_X
+        grid_y = round((y - DESKTOP_MARGIN_Y) / DESKTOP_GRID_Y) * DESKTOP_GRID_Y + DESKTOP_MARGIN_Y
+        return max(DESKTOP_MARGIN_X, grid_x), max(DESKTOP_MARGIN_Y, grid_y)
+    
+    @classmethod
+    def set_window_bottom(cls, hwnd):
+        """Setzt Fenster in den Hintergrund"""
+        cls.backend().send_to_bottom(hwnd)
+    
+    @classmethod
+    def listview_session(cls):
+        """Gemeinsame ListView-Sitzung (Handles, Explorer-Speicher, Name→Index)"""
+        if cls._listview_session is None:
+            cls._listview_session = DesktopListViewSession(cls.backend().create_listview)
+        return cls._listview_session
+    
+    @staticmethod
+    def get_desktop_icon_positions(filenames):
+        """Aktuelle Bildschirmpositionen von Desktop-Icons: {filename: (x, y)}"""
+        if not filenames:
+            return {}
+        try:
+            return WindowsDesktopAPI.listview_session().get_positions(filenames)
+        except Exception as e:
+            print(f"  ⚠ Icon-Positionen konnten nicht gelesen werden: {e}")
+            WindowsDesktopAPI.listview_session().close()
+            return {}
+    
+    RETRY_MS = 100
+    
+    @staticmethod
+    def restore_desktop_icon_positions(items, screen_size, timeout=1.5, scheduler=None, on_done=None):
+        """
+        Platziert wiederhergestellte Icons in einem Durchlauf.
+        
+        items: Liste von (filename, gemerkte Position oder None).
+        Gemerkte Positionen werden bevorzugt, Kollisionen mit anderen Icons
+        (und untereinander) auf die nächste freie Rasterzelle verschoben.
+        Der Explorer nimmt eingeblendete Dateien verzögert in die Liste auf —
+        fehlende Icons werden alle RETRY_MS bis timeout Sekunden erneut
+        versucht. Mit scheduler(ms, callback) (z.B. Tk root.after) laufen die
+        Wiederholungen in der Ereignisschleife, sonst blockierend.
+        
+        Gibt die Anzahl platzierter Icons zurück — oder None, wenn noch
+        Wiederholungen geplant sind. on_done(Anzahl) wird in jedem Fall genau
+        einmal aufgerufen, sobald das Ergebnis feststeht.
+        """
+        def finish(placed):
+            if on_done is not None:
+                on_done(placed)
+            return placed
+        
+        if not items:
+            return finish(0)
+        try:
+            session = WindowsDesktopAPI.listview_session()
+            ours = set()
+            for filename, _ in items:
+                ours.update(DesktopListViewSession._keys(filename))
+            
+            placer = DesktopGridPlacer(*screen_size)
+            for name, (x, y) in session.all_positions().items():
+                if name.casefold() not in ours:
+                    placer.occupy(x, y)
+            
+            placements = {}
+            for filename, pos in sorted(items, key=lambda item: item[1] is None):
+                point = placer.place(*pos) if pos else placer.place()
+                if point:
+                    placements[filename] = point
+        except Exception as e:
+            print(f"  ⚠ Icon-Positionen konnten nicht gesetzt werden: {e}")
+            WindowsDesktopAPI.listview_session().close()
+            return finish(0)
+        
+        deadline = time.monotonic() + timeout
+        
+        def attempt(pending, retry=False):
+            try:
+                if retry:
+                    session.invalidate()  # einmal pro Versuch, nicht pro Name
+                missing = session.set_positions(pending)
+                while missing and time.monotonic() < deadline:
+                    pending = {f: placements[f] for f in missing}
+                    if scheduler is not None:
+                        scheduler(WindowsDesktopAPI.RETRY_MS, lambda: attempt(pending, retry=True))
+                        return None
+                    time.sleep(WindowsDesktopAPI.RETRY_MS / 1000)
+                    session.invalidate()
+                    missing = session.set_positions(pending)
+            except Exception as e:
+                print(f"  ⚠ Icon-Positionen konnten nicht gesetzt werden: {e}")
+                WindowsDesktopAPI.listview_session().close()
+                missing = list(pending)
+            if missing:
+                print(f"  ⚠ {len(missing)} Icon(s) nicht auf dem Desktop gefunden")
+            return finish(len(placements) - len(missing))
+        
+        return attempt(placements)
+    
+    @staticmethod
+    def set_desktop_icon_position(filename, screen_x, screen_y):
+        """
+        Setzt die Position eines Desktop-Icons über die ListView API.
+        Unterstützt Multi-Monitor-Setups.
+        
+        Args:
+            filename: Name der Datei (z.B. "Chrome.lnk")
+            screen_x, screen_y: Absolute Bildschirmkoordinaten
+        
+        Returns:
+            True bei Erfolg, False bei Fehler
+        """
+        try:
+            return WindowsDesktopAPI.listview_session().set_position(filename, screen_x, screen_y)
+        except Exception as e:
+            print(f"  ⚠ Fehler beim Setzen der Icon-Position: {e}")
+            # Beim nächsten Mal mit frischen Handles neu versuchen
+            WindowsDesktopAPI.listview_session().close()
+            return False
+
+
+# ============================================================================
+# Desktop-ListView: Sitzung mit Name→Index-Cache
+# ============================================================================
+
+class DesktopListView:
+    """
+    Zugriff auf die Icon-Liste des Desktops (SysListView32 im Explorer).
+
+    Jeder Aufruf ist beim echten Desktop ein prozessübergreifender Zugriff;
+    DesktopListViewSession hält die Anzahl dieser Aufrufe klein.
+    """
+
+    def is_valid(self):
+        raise NotImplementedError
+
+    def origin(self):
+        """Bildschirmposition (links, oben) der ListView"""
+        raise NotImplementedError
+
+    def item_count(self):
+        raise NotImplementedError
+
+    def item_text(self, index):
+        raise NotImplementedError
+
+    def item_position(self, index):
+        """(x, y) relativ zur ListView oder None"""
+        raise NotImplementedError
+
+    def set_item_position(self, index, x, y):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class Win32DesktopListView(DesktopListView):
+    """
+    Echte Desktop-ListView. Fenster-Handles, Explorer-Prozess-Handle und der
+    Speicher im Explorer werden einmal pro Sitzung geholt, nicht pro Aufruf.
+    """
+
+    LVM_FIRST = 0x1000
+    LVM_GETITEMCOUNT = LVM_FIRST + 4
+    LVM_SETITEMPOSITION = LVM_FIRST + 15
+    LVM_GETITEMPOSITION = LVM_FIRST + 16
+    LVM_GETITEMTEXTW = LVM_FIRST + 115
+    LVIF_TEXT = 0x0001
+
+    # Nur die Rechte, die für Lesen/Schreiben im Explorer-Speicher nötig sind
+    PROCESS_VM_ACCESS = 0x0008 | 0x0010 | 0x0020 | 0x0400
+    MEM_COMMIT = 0x1000
+    MEM_RESERVE = 0x2000
+    MEM_RELEASE = 0x8000
+    PAGE_READWRITE = 0x04
+    TEXT_CHARS = 260
+
+    class LVITEMW(ctypes.Structure):
+        _fields_ = [
+            ("mask", ctypes.c_uint),
+            ("iItem", ctypes.c_int),
+            ("iSubItem", ctypes.c_int),
+            ("state", ctypes.c_uint),
+            ("stateMask", ctypes.c_uint),
+            ("pszText", ctypes.c_void_p),
+            ("cchTextMax", ctypes.c_int),
+            ("iImage", ctypes.c_int),
+            ("lParam", ctypes.c_void_p),
+            ("iIndent", ctypes.c_int),
+            ("iGroupId", ctypes.c_int),
+            ("cColumns", ctypes.c_uint),
+            ("puColumns", ctypes.c_void_p),
+            ("piColFmt", ctypes.c_void_p),
+            ("iGroup", ctypes.c_int),
+        ]
+
+    def __init__(self):
+        self.listview = self._find_listview()
+        if not self.listview:
+            raise OSError("Desktop-ListView (SysListView32) nicht gefunden")
+        
+        pid = ctypes.c_ulong()
+        user32.GetWindowThreadProcessId(self.listview, ctypes.byref(pid))
+        self.process = kernel32.OpenProcess(self.PROCESS_VM_ACCESS, False, pid.value)
+        if not self.process:
+            raise OSError("Konnte Explorer-Prozess nicht öffnen")
+        
+        # Ein Block im Explorer: LVITEM, direkt dahinter der Text-Puffer
+        self.lvitem_size = ctypes.sizeof(self.LVITEMW)
+        self.remote = kernel32.VirtualAllocEx(
+            self.process, None, self.lvitem_size + self.TEXT_CHARS * 2,
+            self.MEM_COMMIT | self.MEM_RESERVE, self.PAGE_READWRITE
+        )
+        if not self.remote:
+            kernel32.CloseHandle(self.process)
+            raise OSError("Konnte keinen Speicher im Explorer allozieren")
+        
+        self.lvitem = self.LVITEMW()
+        self.lvitem.mask = self.LVIF_TEXT
+        self.lvitem.pszText = self.remote + self.lvitem_size
+        self.lvitem.cchTextMax = self.TEXT_CHARS
+        self.text_buffer = ctypes.create_unicode_buffer(self.TEXT_CHARS)
+
+    @staticmethod
+    def _find_listview():
+        progman = user32.FindWindowW("Progman", None)
+        if not progman:
+            return None
+        
+        # SHELLDLL_DefView finden (kann unter Progman oder WorkerW sein)
+        defview = user32.FindWindowExW(HWND(progman), HWND(0), "SHELLDLL_DefView", None)
+        if not defview:
+            def find_defview_callback(hwnd, lparam):
+                shell = user32.FindWindowExW(hwnd, HWND(0), "SHELLDLL_DefView", None)
+                if shell:
+                    find_defview_callback.result = shell
+                    return False
+                return True
+            
+            find_defview_callback.result = None
+            enum_func = WNDENUMPROC(find_defview_callback)
+            user32.EnumWindows(enum_func, None)
+            defview = find_defview_callback.result
+        if not defview:
+            return None
+        
+        listview = user32.FindWindowExW(HWND(defview), HWND(0), "SysListView32", None)
+        return int(listview) if listview else None
+
+    def is_valid(self):
+        # Explorer-Neustart → Fenster weg, Sitzung muss neu aufgebaut werden
+        return bool(ctypes.windll.user32.IsWindow(self.listview))
+
+    def origin(self):
+        rect = RECT()
+        user32.GetWindowRect(self.listview, ctypes.byref(rect))
+        return rect.left, rect.top
+
+    def item_count(self):
+        return ctypes.windll.user32.SendMessageW(self.listview, self.LVM_GETITEMCOUNT, 0, 0)
+
+    def item_text(self, index):
+        written = ctypes.c_size_t()
+        kernel32.WriteProcessMemory(self.process, self.remote, ctypes.byref(self.lvitem),
+                                    self.lvitem_size, ctypes.byref(written))
+        length = ctypes.windll.user32.SendMessageW(self.listview, self.LVM_GETITEMTEXTW,
+                                                   index, self.remote)
+        if length <= 0:
+            return ""
+        # Nur so viele Zeichen lesen wie geliefert
+        kernel32.ReadProcessMemory(self.process, self.remote + self.lvitem_size, self.text_buffer,
+                                   min(length + 1, self.TEXT_CHARS) * 2, ctypes.byref(written))
+        return self.text_buffer.value
+
+    def item_position(self, index):
+        # POINT landet im selben Explorer-Speicherblock
+        if not ctypes.windll.user32.SendMessageW(self.listview, self.LVM_GETITEMPOSITION,
+                                                 index, self.remote):
+            return None
+        point = (ctypes.c_long * 2)()
+        written = ctypes.c_size_t()
+        kernel32.ReadProcessMemory(self.process, self.remote, point, ctypes.sizeof(point),
+                                   ctypes.byref(written))
+        return point[0], point[1]
+
+    def set_item_position(self, index, x, y):
+        # MAKELPARAM: y in high word, x in low word
+        pos_lparam = (int(y) << 16) | (int(x) & 0xFFFF)
+        return bool(ctypes.windll.user32.SendMessageW(self.listview, self.LVM_SETITEMPOSITION,
+                                                      index, pos_lparam))
+
+    def close(self):
+        if self.remote:
+            kernel32.VirtualFreeEx(self.process, self.remote, 0, self.MEM_RELEASE)
+            self.remote = None
+        if self.process:
+            kernel32.CloseHandle(self.process)
+            self.process = None
+
+
+class MemoryDesktopListView(DesktopListView):
+    """
+    In-Memory-Ersatz für Tests ohne Windows. Zählt die Aufrufe, die beim
+    echten Desktop prozessübergreifend wären (calls).
+    """
+
+    def __init__(self, names=(), origin=(0, 0)):
+        self.names = list(names)
+        self.positions = {}
+        self._origin = origin
+        self.valid = True
+        self.calls = 0
+
+    def is_valid(self):
+        return self.valid
+
+    def origin(self):
+        return self._origin
+
+    def item_count(self):
+        self.calls += 1
+        return len(self.names)
+
+    def item_text(self, index):
+        self.calls += 1
+        return self.names[index] if 0 <= index < len(self.names) else ""
+
+    def item_position(self, index):
+        self.calls += 1
+        if not 0 <= index < len(self.names):
+            return None
+        return self.positions.get(self.names[index])
+
+    def set_item_position(self, index, x, y):
+        self.calls += 1
+        if not 0 <= index < len(self.names):
+            return False
+        self.positions[self.names[index]] = (x, y)
+        return True
+
+
+class DesktopListViewSession:
+    """
+    Hält eine DesktopListView offen und merkt sich Name → Index.
+
+    Die Zuordnung entsteht in einem Durchlauf über alle Icons. Danach:
+      • Anzahl gewachsen (z.B. Icon wieder eingeblendet) → nur die neuen
+        Einträge am Ende lesen
+      • Anzahl geschrumpft oder invalidate() (Shell-Benachrichtigung) →
+        beim nächsten Zugriff neu aufbauen
+      • Jeder Treffer wird mit einem einzelnen item_text geprüft; passt er
+        nicht mehr (Icons umsortiert) oder fehlt der Name, wird neu aufgebaut —
+        höchstens einmal pro Durchlauf (find, get_positions, set_positions),
+        danach gilt ein fehlender Name als nicht vorhanden.
+    """
+
+    def __init__(self, factory=None):
+        self.factory = factory or Win32DesktopListView
+        self.view = None
+        self._index = {}
+        self._names = []
+        self._count = 0
+        self._dirty = True
+        self._fresh = False  # in diesem Durchlauf schon neu aufgebaut
+        self.rebuilds = 0
+
+    def _ensure_view(self):
+        if self.view is not None and not self.view.is_valid():
+            self.close()
+        if self.view is None:
+            self.view = self.factory()
+            self._dirty = True
+        return self.view
+
+    def invalidate(self):
+        """Von außen bei Änderungen am Desktop aufrufen (Shell-Benachrichtigung)"""
+        self._dirty = True
+
+    @staticmethod
+    def _keys(name):
+        key = name.casefold()
+        stem, ext = os.path.splitext(key)
+        # Der Desktop zeigt .lnk/.url ohne Endung, andere je nach Explorer-Einstellung
+        return (key, stem) if ext else (key,)
+
+    def _add(self, start, count):
+        for i in range(start, count):
+            name = self.view.item_text(i)
+            self._names.append(name)
+            for key in self._keys(name):
+                self._index.setdefault(key, i)
+
+    def _rebuild(self, count):
+        self._index = {}
+        self._names = []
+        self._add(0, count)
+        self._count = count
+        self._dirty = False
+        self._fresh = True
+        self.rebuilds += 1
+
+    def _sync(self):
+        count = self.view.item_count()
+        if self._dirty or count < self._count:
+            self._rebuild(count)
+        elif count > self._count:
+            self._add(self._count, count)
+            self._count = count
+        return count
+
+    def _lookup(self, keys):
+        for key in keys:
+            index = self._index.get(key)
+            if index is not None:
+                return index
+        return -1
+
+    def _begin(self):
+        """Beginn eines Durchlaufs: Handles prüfen, Cache abgleichen"""
+        view = self._ensure_view()
+        self._fresh = False
+        self._sync()
+        return view
+
+    def _find(self, filename):
+        key = filename.casefold()
+        wanted = (key, os.path.splitext(key)[0])
+        index = self._lookup(wanted)
+        if index >= 0 and (self._fresh or self.view.item_text(index).casefold() in wanted):
+            return index
+        if self._fresh:
+            return -1
+        # Veraltet (umsortiert/umbenannt) oder nicht gefunden → einmal neu aufbauen
+        self._rebuild(self.view.item_count())
+        return self._lookup(wanted)
+
+    def find(self, filename):
+        """Index des Desktop-Icons für filename (z.B. "Chrome.lnk") oder -1"""
+        self._begin()
+        return self._find(filename)
+
+    def set_position(self, filename, screen_x, screen_y):
+        """
+        Setzt die Position eines Desktop-Icons (Bildschirmkoordinaten,
+        Multi-Monitor: relativ zum Ursprung der ListView).
+        Gibt True bei Erfolg zurück.
+        """
+        index = self.find(filename)
+        if index < 0:
+            print(f"  ⚠ Icon '{filename}' nicht auf Desktop gefunden")
+            return False
+        
+        left, top = self.view.origin()
+        x_pos = int(screen_x) - left
+        y_pos = int(screen_y) - top
+        # Falls relative Koordinaten negativ, verwende absolute
+        if x_pos < 0 or y_pos < 0:
+            x_pos, y_pos = int(screen_x), int(screen_y)
+        
+        if self.view.set_item_position(index, x_pos, y_pos):
+            print(f"  ✓ Icon-Position gesetzt auf ({x_pos}, {y_pos})")
+            return True
+        print(f"  ⚠ LVM_SETITEMPOSITION fehlgeschlagen")
+        print(f"    (Tipp: 'Icons automatisch anordnen' deaktivieren)")
+        return False
+
+    def close(self):
+        if self.view is not None:
+            self.view.close()
+            self.view = None
+        self._index = {}
+        self._names = []
+        self._count = 0
+        self._dirty = True
+
+    def _to_screen(self, pos):
+        left, top = self.view.origin()
+        return pos[0] + left, pos[1] + top
+
+    def get_positions(self, filenames):
+        """Bildschirmpositionen der angegebenen Icons: {filename: (x, y)}"""
+        self._begin()
+        result = {}
+        for filename in filenames:
+            index = self._find(filename)
+            pos = self.view.item_position(index) if index >= 0 else None
+            if pos is not None:
+                result[filename] = self._to_screen(pos)
+        return result
+
+    def all_positions(self):
+        """Bildschirmpositionen aller Icons: {Anzeigename: (x, y)} — ein Durchlauf"""
+        self._begin()
+        result = {}
+        for index, name in enumerate(self._names):
+            pos = self.view.item_position(index)
+            if pos is not None:
+                result[name] = self._to_screen(pos)
+        return result
+
+    def set_positions(self, placements):
+        """
+        Setzt mehrere Icons in einem Durchlauf ({filename: (x, y)} in
+        Bildschirmkoordinaten). Gibt die nicht gefundenen Dateinamen zurück.
+        """
+        self._begin()
+        left, top = self.view.origin()
+        missing = []
+        for filename, (screen_x, screen_y) in placements.items():
+            index = self._find(filename)
+            if index < 0:
+                missing.append(filename)
+                continue
+            self.view.set_item_position(index, int(screen_x) - left, int(screen_y) - top)
+        return missing
+
+
+class DesktopGridPlacer:
+    """
+    Kollisionsfreie Platzierung auf dem Desktop-Raster.
+
+    Belegte Zellen werden gemerkt; place() gibt für einen Wunschpunkt die
+    nächste freie Zelle zurück (Suche in Ringen um den Punkt), ohne Wunsch
+    die erste freie Zelle in Desktop-Reihenfolge (spaltenweise von links oben).
+    """
+
+    def __init__(self, width, height, cell_w=DESKTOP_GRID_X, cell_h=DESKTOP_GRID_Y,
+                 margin_x=DESKTOP_MARGIN_X, margin_y=DESKTOP_MARGIN_Y):
+        self.cell_w = cell_w
+        self.cell_h = cell_h
+        self.margin_x = margin_x
+        self.margin_y = margin_y
+        self.cols = max(1, (width - margin_x) // cell_w)
+        self.rows = max(1, (height - margin_y) // cell_h)
+        self.occupied = set()
+        self._next_free = 0  # Startpunkt für place() ohne Wunsch
+
+    def cell_of(self, x, y):
+        col = round((x - self.margin_x) / self.cell_w)
+        row = round((y - self.margin_y) / self.cell_h)
+        return min(max(col, 0), self.cols - 1), min(max(row, 0), self.rows - 1)
+
+    def cell_to_point(self, cell):
+        col, row = cell
+        return self.margin_x + col * self.cell_w, self.margin_y + row * self.cell_h
+
+    def occupy(self, x, y):
+        self.occupied.add(self.cell_of(x, y))
+
+    def place(self, x=None, y=None):
+        """Belegt und liefert (x, y) der gewählten Zelle, None wenn alles voll ist"""
+        if x is None or y is None:
+            cell = self._first_free()
+        else:
+            cell = self._nearest_free(self.cell_of(x, y))
+        if cell is None:
+            return None
+        self.occupied.add(cell)
+        return self.cell_to_point(cell)
+
+    def _first_free(self):
+        total = self.cols * self.rows
+        while self._next_free < total:
+            cell = divmod(self._next_free, self.rows)  # spaltenweise: (Spalte, Zeile)
+            if cell not in self.occupied:
+                return cell
+            self._next_free += 1
+        return None
+
+    def _nearest_free(self, start):
+        if start not in self.occupied:
+            return start
+        col0, row0 = start
+        for radius in range(1, max(self.cols, self.rows)):
+            ring = []
+            for col in range(col0 - radius, col0 + radius + 1):
+                for row in (row0 - radius, row0 + radius):
+                    ring.append((col, row))
+            for row in range(row0 - radius + 1, row0 + radius):
+                ring.append((col0 - radius, row))
+                ring.append((col0 + radius, row))
+            free = [(c, r) for c, r in ring
+                    if 0 <= c < self.cols and 0 <= r < self.rows and (c, r) not in self.occupied]
+            if free:
+                return min(free, key=lambda cell: (cell[0] - col0) ** 2 + (cell[1] - row0) ** 2)
+        return self._first_free()
+
+
+# ============================================================================
+# Shell-Benachrichtigungen (gesammelt)
+# ============================================================================
+
+class ShellNotifier:
+    """Schickt Änderungsmeldungen an die Shell (SHChangeNotify)"""
+
+    def attributes_changed(self, path):
+        raise NotImplementedError
+
+    def item_updated(self, path):
+        raise NotImplementedError
+
+    def dir_updated(self, path):
+        raise NotImplementedError
+
+    def assoc_changed(self):
+        raise NotImplementedError
+
+
+class Win32ShellNotifier(ShellNotifier):
+    SHCNE_ATTRIBUTES = 0x00000800
+    SHCNE_UPDATEDIR = 0x00001000
+    SHCNE_UPDATEITEM = 0x00002000
+    SHCNE_ASSOCCHANGED = 0x08000000
+    SHCNF_IDLIST = 0x0000
+    SHCNF_PATHW = 0x0005
+    SHCNF_FLUSHNOWAIT = 0x3000
+
+    def _notify(self, event, path):
+        try:
+            ctypes.windll.shell32.SHChangeNotify(
+                event, self.SHCNF_PATHW | self.SHCNF_FLUSHNOWAIT, ctypes.c_wchar_p(path), None)
+        except Exception as e:
+            print(f"    Warnung bei SHChangeNotify: {e}")
+
+    def attributes_changed(self, path):
+        self._notify(self.SHCNE_ATTRIBUTES, path)
+
+    def item_updated(self, path):
+        self._notify(self.SHCNE_UPDATEITEM, path)
+
+    def dir_updated(self, path):
+        self._notify(self.SHCNE_UPDATEDIR, path)
+
+    def assoc_changed(self):
+        try:
+            ctypes.windll.shell32.SHChangeNotify(self.SHCNE_ASSOCCHANGED, self.SHCNF_IDLIST, None, None)
+        except Exception as e:
+            print(f"    Warnung bei SHChangeNotify: {e}")
+
+
+class RecordingShellNotifier(ShellNotifier):
+    """Zeichnet Meldungen nur auf (Tests, andere Systeme): events = [(art, pfad)]"""
+
+    def __init__(self):
+        self.events = []
+
+    def attributes_changed(self, path):
+        self.events.append(("attributes", path))
+
+    def item_updated(self, path):
+        self.events.append(("item", path))
+
+    def dir_updated(self, path):
+        self.events.append(("dir", path))
+
+    def assoc_changed(self):
+        self.events.append(("assoc", None))
+
+
+class ShellNotificationCoalescer:
+    """
+    Sammelt Änderungen für WINDOW_MS und schickt dann gezielte Meldungen:
+
+      • bis MAX_ITEMS Dateien: je eine SHCNE_ATTRIBUTES- bzw. UPDATEITEM-Meldung
+      • mehr Dateien: ein SHCNE_UPDATEDIR pro betroffenem Verzeichnis
+      • SHCNE_ASSOCCHANGED nur nach request_full_refresh()
+
+    scheduler(ms, callback) plant das Senden (z.B. Tk root.after). Ohne
+    scheduler wird sofort gesendet — der Aufrufer fasst dann selbst zusammen.
+    on_flush() wird nach jedem Senden aufgerufen, bei dem Meldungen rausgingen
+    (z.B. um den ListView-Cache zu verwerfen).
+    """
+
+    WINDOW_MS = 50
+    MAX_ITEMS = 16
+
+    def __init__(self, notifier, scheduler=None, window_ms=WINDOW_MS, max_items=MAX_ITEMS,
+                 on_flush=None):
+        self.notifier = notifier
+        self.scheduler = scheduler
+        self.on_flush = on_flush
+        self.window_ms = window_ms
+        self.max_items = max_items
+        self._paths = {}   # normalisierter Pfad → (Pfad, Art)
+        self._dirs = {}    # normalisierter Pfad → Pfad
+        self._full = False
+        self._scheduled = False
+        self._lock = threading.Lock()
+
+    def add_paths(self, paths, kind="attributes"):
+        with self._lock:
+            for path in paths:
+                self._paths.setdefault(normalize_path(path), (path, kind))
+        self._schedule()
+
+    def add_dir(self, path):
+        with self._lock:
+            self._dirs.setdefault(normalize_path(path), path)
+        self._schedule()
+
+    def request_full_refresh(self):
+        with self._lock:
+            self._full = True
+        self._schedule()
+
+    def _schedule(self):
+        if self.scheduler is None:
+            self.flush()
+            return
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.scheduler(self.window_ms, self.flush)
+
+    def flush(self):
+        """Sendet alle gesammelten Meldungen"""
+        with self._lock:
+            paths, self._paths = self._paths, {}
+            dirs, self._dirs = self._dirs, {}
+            full, self._full = self._full, False
+            self._scheduled = False
+        
+        if full:
+            self.notifier.assoc_changed()
+        
+        if len(paths) > self.max_items:
+            # Viele Einzeldateien → ein Update pro Verzeichnis
+            for path, _ in paths.values():
+                parent = ntpath.dirname(path)
+                dirs.setdefault(normalize_path(parent), parent)
+        else:
+            for key, (path, kind) in paths.items():
+                if ntpath.dirname(key) in dirs:  # Schlüssel sind mit \\ normalisiert
+                    continue  # Verzeichnis wird ohnehin komplett aktualisiert
+                if kind == "attributes":
+                    self.notifier.attributes_changed(path)
+                else:
+                    self.notifier.item_updated(path)
+        
+        for path in dirs.values():
+            self.notifier.dir_updated(path)
+        
+        if self.on_flush is not None and (full or paths or dirs):
+            self.on_flush()
@@ -0,0 +1,532 @@
+"""
+Diagnose für lange Laufzeiten: Hänger der Tk-Schleife, Kennzahlen, Speicher
+===========================================================================
+Alles, was auf dem Tk-Thread synchron läuft (Icon-Extraktion, PIL-Rendering,
+Konfiguration schreiben, Shell-Aufrufe), hält die Oberfläche an. Der
+StallDetector misst, wie verspätet ein regelmäßiger after()-Rückruf kommt;
+dauert das länger als die Schwelle, nimmt ein Wachhund-Thread den Python-Stack
+des Tk-Threads auf (sys._current_frames). Hänger werden nach Stack-Signatur
+zusammengefasst — ein Stichproben-Profiler genau für die Ruckler, die man
+bemerkt.
+
+MetricsRegistry sammelt Zähler (Cache-Treffer, Schreibvorgänge, Aufrufe) und
+Messwerte (Cache-Größe, lebende Tk-Bilder und -Widgets, offene Timer); der
+MetricsWriter schreibt sie regelmäßig in eine Textdatei — für Speicherbudgets
+und Lecks über Wochen Laufzeit.
+
+MemoryTracker nimmt in großen Abständen tracemalloc-Snapshots, zählt lebende
+Objekte pro Typ und merkt sich die Tk-/Kachel-Messwerte; der Bericht zeigt,
+welche Allokationsstellen, Typen und Kacheln seit dem Start wachsen.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+
+from .timing import TRACER
+
+DEFAULT_STALL_REPORT = Path.home() / ".desktop_folder_widget_v3.stalls.txt"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class StallDetector:
+    """
+    Wachhund für die Tk-Schleife:
+
+        detector = StallDetector(root.after)   # im Tk-Thread anlegen
+        detector.start()
+        ...
+        print(detector.report())
+        detector.stop()
+
+    scheduler ist root.after (ms, Rückruf). Gemessen wird die Verspätung des
+    Rückrufs gegenüber interval_ms; ab threshold_ms gilt sie als Hänger.
+    """
+
+    MAX_SAMPLES = 50      # Stacks pro Hänger (bei sehr langen Hängern)
+    MAX_FRAMES = 40
+    SUSPEND_GAP = 2.0     # so spät wacht der Wachhund nur nach Standby auf → verwerfen
+    HISTORY = 500
+
+    def __init__(self, scheduler, threshold_ms=100, interval_ms=50, clock=time.perf_counter):
+        self.scheduler = scheduler
+        self.threshold = threshold_ms / 1000
+        self.interval_ms = interval_ms
+        self.clock = clock
+        self.thread_id = threading.get_ident()
+        self.stalls = {}   # Signatur → {"count", "total_ms", "max_ms", "samples", "stack"}
+        self.history = deque(maxlen=self.HISTORY)  # (Zeitpunkt, Dauer ms, Signatur)
+        self.stall_count = 0
+        self.sample_count = 0
+        self._lock = threading.Lock()
+        self._expected = None
+        self._samples = []
+        self._discard = False
+        self._stop = threading.Event()
+        self._thread = None
+        self._job = None
+
+    @classmethod
+    def from_environment(cls, scheduler):
+        """DESKTOP_FOLDER_STALL_MS: Schwelle in ms (Standard 100, "0" = aus); None wenn aus"""
+        try:
+            threshold = int(os.environ.get("DESKTOP_FOLDER_STALL_MS", "100"))
+        except ValueError:
+            threshold = 100
+        if threshold <= 0:
+            return None
+        return cls(scheduler, threshold_ms=threshold, interval_ms=max(10, threshold // 2))
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._expected = self.clock() + self.interval_ms / 1000
+        self._job = self.scheduler(self.interval_ms, self._tick)
+        self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # --- Tk-Thread ---
+
+    def _tick(self):
+        if self._stop.is_set():
+            return
+        now = self.clock()
+        with self._lock:
+            due = self._expected
+            samples, self._samples = self._samples, []
+            discard, self._discard = self._discard, False
+            self._expected = now + self.interval_ms / 1000
+        late = now - due
+        if late > self.threshold and not discard:
+            self._record(due, late, samples)
+        self._job = self.scheduler(self.interval_ms, self._tick)
+
+    def _record(self, start, late, samples):
+        late_ms = late * 1000
+        stack = samples[0] if samples else ()
+        signature = self.signature(stack)
+        with self._lock:
+            self.stall_count += 1
+            entry = self.stalls.get(signature)
+            if entry is None:
+                entry = self.stalls[signature] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                                  "samples": 0, "stack": stack}
+            entry["count"] += 1
+            entry["total_ms"] += late_ms
+            if late_ms > entry["max_ms"]:
+                entry["max_ms"] = late_ms
+                entry["stack"] = stack
+            # Weitere Stichproben desselben Hängers zählen bei ihrer eigenen Signatur
+            for sample in samples:
+                sample_entry = self.stalls.setdefault(
+                    self.signature(sample),
+                    {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "samples": 0, "stack": sample})
+                sample_entry["samples"] += 1
+            self.history.append((time.time(), round(late_ms, 1), signature))
+        TRACER.add("stall", start, late, thread=self.thread_id, samples=len(samples),
+                   where=self.describe(stack))
+
+    # --- Wachhund-Thread ---
+
+    def _watch(self):
+        poll = self.threshold / 2
+        last = self.clock()
+        while not self._stop.wait(poll):
+            now = self.clock()
+            if now - last > poll + self.SUSPEND_GAP:
+                # Rechner war im Standby — kein Hänger der Oberfläche
+                with self._lock:
+                    self._discard = True
+            last = now
+            with self._lock:
+                stalled = self._expected is not None and now - self._expected > self.threshold
+                full = len(self._samples) >= self.MAX_SAMPLES
+            if stalled and not full:
+                stack = self.capture()
+                with self._lock:
+                    self._samples.append(stack)
+                    self.sample_count += 1
+
+    def capture(self):
+        """Aktueller Python-Stack des Tk-Threads als Tupel (Datei, Zeile, Funktion, Quelltext)"""
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return ()
+        return tuple((f.filename, f.lineno, f.name, f.line or "")
+                     for f in traceback.extract_stack(frame, limit=self.MAX_FRAMES))
+
+    # --- Auswertung ---
+
+    @staticmethod
+    def signature(stack):
+        """Aufrufpfad ohne Zeilennummern — Stichproben aus derselben Funktion fallen zusammen"""
+        return tuple((os.path.basename(filename), name) for filename, _, name, _ in stack)
+
+    @staticmethod
+    def describe(stack):
+        """Innerster Aufruf aus dem Paket (sonst der innerste überhaupt) als Kurzname"""
+        if not stack:
+            return "(ohne Stack)"
+        ours = [frame for frame in stack if frame[0].startswith(PACKAGE_DIR)]
+        filename, lineno, name, _ = (ours or stack)[-1]
+        return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+    def snapshot(self):
+        """Zusammengefasste Hänger, die teuersten zuerst"""
+        with self._lock:
+            entries = [dict(entry, signature=signature) for signature, entry in self.stalls.items()]
+        return sorted(entries, key=lambda e: (e["total_ms"], e["samples"]), reverse=True)
+
+    def report(self, top=10):
+        entries = self.snapshot()
+        total_ms = sum(e["total_ms"] for e in entries)
+        lines = [f"Hänger über {self.threshold * 1000:.0f} ms: {self.stall_count}, "
+                 f"zusammen {total_ms:.0f} ms, {self.sample_count} Stack-Stichprobe(n)"]
+        for entry in entries[:top]:
+            lines.append("")
+            lines.append(f"{entry['count']}× Hänger, {entry['total_ms']:.0f} ms gesamt, "
+                         f"längster {entry['max_ms']:.0f} ms, {entry['samples']} Stichprobe(n) — "
+                         f"{self.describe(entry['stack'])}")
+            for filename, lineno, name, line in entry["stack"][-12:]:
+                lines.append(f"    {os.path.basename(filename)}:{lineno} {name}")
+                if line:
+                    lines.append(f"        {line}")
+        return "\n".join(lines)
+
+    def write_report(self, path=None):
+        path = Path(path or os.environ.get("DESKTOP_FOLDER_STALL_FILE") or DEFAULT_STALL_REPORT)
+        path.write_text(self.report(top=25) + "\n", encoding="utf-8")
+        return path
+
+
+# ============================================================================
+# Kennzahlen: Zähler und Messwerte
+# ============================================================================
+
+DEFAULT_METRICS_FILE = Path.home() / ".desktop_folder_widget_v3.metrics.txt"
+
+
+class MetricsRegistry:
+    """
+    Zähler (inc, fortlaufend) und Messwerte (gauge: Funktion, die beim
+    Auslesen aufgerufen wird — eine Zahl oder ein dict {Kennung: Zahl}).
+
+        METRICS.inc("config.snapshots")
+        METRICS.gauge("icons.cache.entries", lambda: len(IconExtractor.ICON_CACHE))
+        print(METRICS.render())
+
+    render() zeigt bei Zählern zusätzlich die Rate seit dem letzten render().
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started = clock()
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+        self._previous = ({}, self.started)
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def counter(self, name):
+        return self._counters.get(name, 0)
+
+    def gauge(self, name, fn):
+        self._gauges[name] = fn
+
+    def remove_gauges(self, prefix):
+        for name in [name for name in self._gauges if name.startswith(prefix)]:
+            del self._gauges[name]
+
+    def collect(self):
+        """Alle Zähler und Messwerte: {Name: Zahl}; fehlerhafte Messwerte fehlen"""
+        with self._lock:
+            values = dict(self._counters)
+        for name, fn in list(self._gauges.items()):
+            try:
+                value = fn()
+            except Exception:
+                continue
+            if isinstance(value, dict):
+                for label, item in value.items():
+                    values[f"{name}{{{label}}}"] = item
+            elif value is not None:
+                values[name] = value
+        return values
+
+    def render(self):
+        values = self.collect()
+        now = self.clock()
+        previous, since = self._previous
+        elapsed = max(now - since, 1e-9)
+        with self._lock:
+            counters = set(self._counters)
+            self._previous = ({name: values[name] for name in counters}, now)
+        lines = [f"# desktop_folder_widget Kennzahlen, Laufzeit {now - self.started:.0f} s, "
+                 f"{time.strftime('%Y-%m-%d %H:%M:%S')}"]
+        for name in sorted(values):
+            value = values[name]
+            text = f"{value:.3f}".rstrip("0").rstrip(".") if isinstance(value, float) else str(value)
+            if name in counters:
+                rate = (value - previous.get(name, 0)) / elapsed
+                lines.append(f"{name} {text}  (+{rate:.2f}/s)")
+            else:
+                lines.append(f"{name} {text}")
+        return "\n".join(lines)
+
+    def write(self, path=None):
+        """Schreibt render() atomar in die Kennzahlen-Datei und gibt den Pfad zurück"""
+        path = Path(path or os.environ.get("DESKTOP_FOLDER_METRICS_FILE") or DEFAULT_METRICS_FILE)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.render() + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+
+METRICS = MetricsRegistry()
+
+
+def timed(name):
+    """Dekorator: zählt Aufrufe (<name>.calls) und Zeit in ms (<name>.ms)"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                METRICS.inc(f"{name}.calls")
+                METRICS.inc(f"{name}.ms", (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorate
+
+
+class MetricsWriter:
+    """
+    Schreibt die Kennzahlen regelmäßig über den Tk-Scheduler (root.after).
+    DESKTOP_FOLDER_METRICS_S: Abstand in Sekunden (Standard 60, "0" = aus).
+    """
+
+    def __init__(self, scheduler, interval_s=60, registry=METRICS, path=None):
+        self.scheduler = scheduler
+        self.interval_ms = int(interval_s * 1000)
+        self.registry = registry
+        self.path = path
+        self.writes = 0
+        self._stopped = False
+
+    @classmethod
+    def from_environment(cls, scheduler):
+        try:
+            interval = float(os.environ.get("DESKTOP_FOLDER_METRICS_S", "60"))
+        except ValueError:
+            interval = 60
+        if interval <= 0:
+            return None
+        return cls(scheduler, interval)
+
+    def start(self):
+        self._stopped = False
+        self.scheduler(self.interval_ms, self._tick)
+
+    def _tick(self):
+        if self._stopped:
+            return
+        self.write()
+        self.scheduler(self.interval_ms, self._tick)
+
+    def write(self):
+        try:
+            path = self.registry.write(self.path)
+        except OSError as e:
+            print(f"Kennzahlen konnten nicht geschrieben werden: {e}")
+            return None
+        self.writes += 1
+        return path
+
+    def stop(self):
+        self._stopped = True
+
+
+# ============================================================================
+# Speicher: tracemalloc-Aufnahmen und Zuwachs über die Laufzeit
+# ============================================================================
+
+DEFAULT_MEMORY_REPORT = Path.home() / ".desktop_folder_widget_v3.memory.txt"
+
+# Messwerte, deren Zuwachs im Speicherbericht erscheint (Kachel-Zuordnung)
+MEMORY_GAUGES = ("tk.", "tiles.", "icons.cache.entries", "icons.cache.bytes", "icons.shell_links")
+
+
+class MemorySample:
+    """Eine Aufnahme: tracemalloc-Snapshot, Objekte pro Typ, Messwerte"""
+
+    def __init__(self, snapshot, types, metrics, traced, peak):
+        self.time = time.time()
+        self.snapshot = snapshot
+        self.types = types
+        self.metrics = metrics
+        self.traced = traced
+        self.peak = peak
+
+
+class MemoryTracker:
+    """
+    Regelmäßige Aufnahmen über tracemalloc (nur frames Ebenen pro Allokation)
+    plus Anzahl lebender Objekte pro Typ und die Tk-/Kachel-Messwerte aus
+    METRICS. report() vergleicht die letzte Aufnahme mit der ersten und der
+    vorletzten: am stärksten wachsende Allokationsstellen, Objekttypen und
+    Messwerte pro Kachel (Widgets, PhotoImages).
+
+    tracemalloc kann nicht stichprobenartig messen — günstig wird es durch
+    eine flache Aufzeichnung (frames=1) und seltene Aufnahmen.
+    """
+
+    def __init__(self, scheduler=None, interval_s=900, frames=1, registry=METRICS):
+        self.scheduler = scheduler
+        self.interval_ms = int(interval_s * 1000)
+        self.frames = frames
+        self.registry = registry
+        self.baseline = None
+        self.previous = None
+        self.latest = None
+        self.samples = 0
+        self._started_tracing = False
+        self._stopped = True
+
+    @classmethod
+    def from_environment(cls, scheduler):
+        """DESKTOP_FOLDER_MEMORY_MIN: Minuten zwischen Aufnahmen (Standard 0 = aus)"""
+        try:
+            minutes = float(os.environ.get("DESKTOP_FOLDER_MEMORY_MIN", "0"))
+        except ValueError:
+            minutes = 0
+        if minutes <= 0:
+            return None
+        return cls(scheduler, interval_s=minutes * 60)
+
+    @property
+    def running(self):
+        return not self._stopped
+
+    def start(self):
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._stopped = False
+        self.take()
+        if self.scheduler is not None:
+            self.scheduler(self.interval_ms, self._tick)
+
+    def stop(self):
+        import tracemalloc
+        self._stopped = True
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _tick(self):
+        if self._stopped:
+            return
+        self.take()
+        try:
+            self.write_report()
+        except OSError as e:
+            print(f"Speicherbericht konnte nicht geschrieben werden: {e}")
+        self.scheduler(self.interval_ms, self._tick)
+
+    @staticmethod
+    def count_types():
+        """Lebende (vom GC verfolgte) Objekte pro Typ"""
+        import gc
+        counts = {}
+        for obj in gc.get_objects():
+            cls = type(obj)
+            name = f"{cls.__module__}.{cls.__qualname__}"
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def take(self):
+        """Neue Aufnahme; die erste bleibt als Ausgangspunkt"""
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        metrics = {name: value for name, value in self.registry.collect().items()
+                   if name.startswith(MEMORY_GAUGES)}
+        traced, peak = tracemalloc.get_traced_memory()
+        sample = MemorySample(snapshot, self.count_types(), metrics, traced, peak)
+        if self.baseline is None:
+            self.baseline = sample
+        self.previous, self.latest = self.latest, sample
+        self.samples += 1
+        return sample
+
+    @staticmethod
+    def _growth(old, new, top):
+        grown = [(name, new.get(name, 0) - old.get(name, 0), new.get(name, 0))
+                 for name in set(old) | set(new)]
+        grown = [item for item in grown if item[1] > 0]
+        return sorted(grown, key=lambda item: item[1], reverse=True)[:top]
+
+    def diff(self, older, newer, top=15):
+        """Zuwachs zwischen zwei Aufnahmen: (Allokationsstellen, Typen, Messwerte)"""
+        sites = [stat for stat in newer.snapshot.compare_to(older.snapshot, "lineno")
+                 if stat.size_diff > 0][:top]
+        return sites, self._growth(older.types, newer.types, top), \
+            self._growth(older.metrics, newer.metrics, top)
+
+    def _section(self, title, older, newer, top):
+        sites, types, metrics = self.diff(older, newer, top)
+        minutes = (newer.time - older.time) / 60
+        lines = [f"{title} ({minutes:.0f} min): verfolgt {older.traced / 1e6:.1f} → "
+                 f"{newer.traced / 1e6:.1f} MB, Spitze {newer.peak / 1e6:.1f} MB"]
+        lines.append("  Wachsende Allokationsstellen:")
+        for stat in sites:
+            frame = stat.traceback[0]
+            lines.append(f"    {stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+7d} Blöcke  "
+                         f"{os.path.basename(frame.filename)}:{frame.lineno}")
+        lines.append("  Wachsende Objekttypen:")
+        for name, grown, total in types:
+            lines.append(f"    {grown:+8d}  {name} ({total})")
+        lines.append("  Wachsende Messwerte (Tk, Kacheln, Icons):")
+        for name, grown, total in metrics:
+            lines.append(f"    {grown:+10g}  {name} ({total:g})")
+        return lines
+
+    def report(self, top=15):
+        if self.latest is None:
+            return "Keine Speicher-Aufnahme vorhanden"
+        lines = [f"Speicher-Aufnahmen: {self.samples}"]
+        if self.baseline is not self.latest:
+            lines += [""] + self._section("Seit der ersten Aufnahme", self.baseline, self.latest, top)
+        if self.previous is not None and self.previous is not self.baseline:
+            lines += [""] + self._section("Seit der vorletzten Aufnahme", self.previous, self.latest, top)
+        return "\n".join(lines)
+
+    def write_report(self, path=None):
+        path = Path(path or os.environ.get("DESKTOP_FOLDER_MEMORY_FILE") or DEFAULT_MEMORY_REPORT)
+        path.write_text(self.report(top=25) + "\n", encoding="utf-8")
+        return path
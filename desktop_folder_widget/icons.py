@@ -0,0 +1,905 @@
+"""
+Icons: Shell-Links ohne COM, .ico/PE-Ressourcen, GDI-Fallback und Icon-Cache
+============================================================================
+Pillow, numpy und pywin32 werden erst bei der ersten Extraktion geladen.
+"""
+
+import ctypes
+import io
+import mmap
+import ntpath
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .deps import HAS_NUMPY, HAS_WIN32
+from .diagnostics import METRICS
+from .model import normalize_path
+from .timing import TRACER
+from .winapi import IS_WINDOWS, ensure_com_initialized
+
+
+@dataclass(slots=True)
+class ShellLink:
+    """Inhalt einer .lnk-Datei (MS-SHLLINK), soweit für das Widget relevant"""
+    target_path: str = ""
+    arguments: str = ""
+    working_dir: str = ""
+    icon_location: str = ""
+    icon_index: int = 0
+    description: str = ""
+    relative_path: str = ""
+
+    @property
+    def icon_key(self):
+        """Gleicher Schlüssel = gleiches Icon (Icon-Quelle + Index bzw. Ziel)"""
+        if self.icon_location:
+            return (normalize_path(self.icon_location), self.icon_index)
+        if self.target_path:
+            return (normalize_path(self.target_path), None)
+        return None
+
+    @property
+    def display_name(self):
+        """Anzeigename ohne COM: Beschreibung, sonst Name des Ziels"""
+        if self.description:
+            return self.description
+        target = self.target_path or self.relative_path
+        return Path(target.replace("\\", "/")).stem if target else ""
+
+
+class ShellLinkParser:
+    """
+    Liest das binäre Shell-Link-Format direkt aus den Bytes.
+
+    Unterstützt: Header, LinkTargetIDList (übersprungen), LinkInfo (lokaler
+    Pfad und Netzwerkpfad), StringData und die ExtraData-Blöcke mit
+    Umgebungsvariablen für Ziel und Icon. Fehlerhafte Dateien → ValueError.
+    """
+
+    HEADER_SIZE = 0x4C
+    LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+
+    # LinkFlags
+    HAS_LINK_TARGET_ID_LIST = 0x01
+    HAS_LINK_INFO = 0x02
+    HAS_NAME = 0x04
+    HAS_RELATIVE_PATH = 0x08
+    HAS_WORKING_DIR = 0x10
+    HAS_ARGUMENTS = 0x20
+    HAS_ICON_LOCATION = 0x40
+    IS_UNICODE = 0x80
+
+    # ExtraData-Signaturen
+    ENVIRONMENT_BLOCK = 0xA0000001
+    ICON_ENVIRONMENT_BLOCK = 0xA0000007
+
+    # ANSI-Teile verwenden die System-Codepage
+    ANSI_ENCODING = "mbcs" if IS_WINDOWS else "cp1252"
+
+    @classmethod
+    def parse(cls, data):
+        if len(data) < cls.HEADER_SIZE or struct.unpack_from("<I", data, 0)[0] != cls.HEADER_SIZE \
+                or data[4:20] != cls.LINK_CLSID:
+            raise ValueError("Keine Shell-Link-Datei")
+        flags, = struct.unpack_from("<I", data, 20)
+        icon_index, = struct.unpack_from("<i", data, 56)
+        link = ShellLink(icon_index=icon_index)
+        offset = cls.HEADER_SIZE
+
+        try:
+            if flags & cls.HAS_LINK_TARGET_ID_LIST:
+                id_list_size, = struct.unpack_from("<H", data, offset)
+                offset += 2 + id_list_size
+
+            if flags & cls.HAS_LINK_INFO:
+                info_size, = struct.unpack_from("<I", data, offset)
+                link.target_path = cls._parse_link_info(data[offset:offset + info_size])
+                offset += info_size
+
+            unicode = bool(flags & cls.IS_UNICODE)
+            for flag, attr in ((cls.HAS_NAME, "description"),
+                               (cls.HAS_RELATIVE_PATH, "relative_path"),
+                               (cls.HAS_WORKING_DIR, "working_dir"),
+                               (cls.HAS_ARGUMENTS, "arguments"),
+                               (cls.HAS_ICON_LOCATION, "icon_location")):
+                if flags & flag:
+                    value, offset = cls._read_string_data(data, offset, unicode)
+                    setattr(link, attr, value)
+
+            cls._parse_extra_data(data, offset, link)
+        except struct.error as e:
+            raise ValueError(f"Shell-Link abgeschnitten: {e}") from None
+
+        # %VAR% wie unter Windows — ntpath auch auf anderen Systemen
+        link.icon_location = ntpath.expandvars(link.icon_location)
+        return link
+
+    @classmethod
+    def _cstring(cls, data, offset, unicode=False):
+        """Null-terminierter String ab offset"""
+        if unicode:
+            end = offset
+            while end + 1 < len(data) and data[end:end + 2] != b"\x00\x00":
+                end += 2
+            return data[offset:end].decode("utf-16-le", "replace")
+        end = data.find(b"\x00", offset)
+        if end < 0:
+            end = len(data)
+        return data[offset:end].decode(cls.ANSI_ENCODING, "replace")
+
+    @classmethod
+    def _parse_link_info(cls, info):
+        header_size, flags, _, local_base_offset, network_offset, suffix_offset = \
+            struct.unpack_from("<6I", info, 4)
+        local_base_unicode = suffix_unicode = 0
+        if header_size >= 0x24:
+            local_base_unicode, suffix_unicode = struct.unpack_from("<2I", info, 28)
+
+        if suffix_unicode:
+            suffix = cls._cstring(info, suffix_unicode, unicode=True)
+        else:
+            suffix = cls._cstring(info, suffix_offset)
+
+        if flags & 0x1:  # VolumeIDAndLocalBasePath
+            if local_base_unicode:
+                base = cls._cstring(info, local_base_unicode, unicode=True)
+            else:
+                base = cls._cstring(info, local_base_offset)
+            return base + suffix
+        if flags & 0x2:  # CommonNetworkRelativeLinkAndPathSuffix
+            net_name_offset, = struct.unpack_from("<I", info, network_offset + 8)
+            net_name = cls._cstring(info, network_offset + net_name_offset)
+            if net_name_offset > 0x14:
+                net_name_unicode, = struct.unpack_from("<I", info, network_offset + 20)
+                net_name = cls._cstring(info, network_offset + net_name_unicode, unicode=True)
+            return net_name + "\\" + suffix if suffix else net_name
+        return ""
+
+    @classmethod
+    def _read_string_data(cls, data, offset, unicode):
+        count, = struct.unpack_from("<H", data, offset)
+        offset += 2
+        size = count * 2 if unicode else count
+        if offset + size > len(data):
+            raise ValueError("StringData abgeschnitten")
+        raw = data[offset:offset + size]
+        value = raw.decode("utf-16-le", "replace") if unicode else raw.decode(cls.ANSI_ENCODING, "replace")
+        return value, offset + size
+
+    @classmethod
+    def _parse_extra_data(cls, data, offset, link):
+        while offset + 8 <= len(data):
+            block_size, signature = struct.unpack_from("<2I", data, offset)
+            if block_size < 8:
+                break  # TerminalBlock
+            if signature in (cls.ENVIRONMENT_BLOCK, cls.ICON_ENVIRONMENT_BLOCK) and block_size >= 0x314:
+                value = cls._cstring(data, offset + 268, unicode=True) \
+                    or cls._cstring(data, offset + 8)
+                if value:
+                    value = ntpath.expandvars(value)
+                    if signature == cls.ENVIRONMENT_BLOCK:
+                        if not link.target_path:
+                            link.target_path = value
+                    else:
+                        link.icon_location = value
+            offset += block_size
+
+
+class ShellLinkCache:
+    """
+    Geparste .lnk-Dateien, Schlüssel (Pfad, mtime, Größe).
+
+    Ein einzelnes stat() entscheidet, ob die Datei neu gelesen werden muss.
+    Ungültige Dateien werden ebenfalls gemerkt (als None), damit sie nicht bei
+    jedem Neuzeichnen erneut geparst werden.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return normalize_path(path) in self._entries
+
+    def get(self, path):
+        """Gibt den ShellLink zurück oder None (kein/defekter Shell-Link)"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = normalize_path(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        try:
+            with open(path, "rb") as f:
+                link = ShellLinkParser.parse(f.read())
+            if not link.target_path and link.relative_path:
+                link.target_path = os.path.normpath(
+                    os.path.join(os.path.dirname(path), link.relative_path))
+        except (OSError, ValueError):
+            link = None
+        with self._lock:
+            self._entries[key] = (stamp, link)
+        return link
+
+    def peek(self, path):
+        """Zuletzt gelesener ShellLink (ohne stat(), auch wenn die Datei inzwischen fehlt)"""
+        entry = self._entries.get(normalize_path(path))
+        return entry[1] if entry else None
+
+    def discard(self, path):
+        with self._lock:
+            self._entries.pop(normalize_path(path), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+SHELL_LINK_CACHE = ShellLinkCache()
+
+
+class IconResourceDecoder:
+    """
+    Liest Icons direkt aus .ico-Dateien und aus den RT_GROUP_ICON/RT_ICON-
+    Ressourcen von PE-Dateien (.exe/.dll), ohne GDI.
+
+    Gewählt wird der eingebettete Eintrag, der am besten zur gewünschten
+    Größe passt (kleinster ≥ Zielgröße, sonst größter; bei Gleichstand die
+    höhere Farbtiefe). PNG- und BMP-Einträge (inkl. AND-Maske) dekodiert
+    Pillow mit echtem Alpha-Kanal. Nicht lesbare Dateien → None.
+    """
+
+    ICO_EXTENSIONS = {".ico"}
+    PE_EXTENSIONS = {".exe", ".dll", ".cpl", ".scr", ".ocx", ".mun"}
+
+    RT_ICON = 3
+    RT_GROUP_ICON = 14
+    PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+    @classmethod
+    def can_decode(cls, path):
+        ext = os.path.splitext(path)[1].lower()
+        return ext in cls.ICO_EXTENSIONS or ext in cls.PE_EXTENSIONS
+
+    @classmethod
+    def load(cls, path, size=48, index=0):
+        """Icon aus .ico oder PE-Datei als RGBA-Bild in size×size, sonst None"""
+        ext = os.path.splitext(path)[1].lower()
+        try:
+            with open(path, "rb") as f:
+                if ext in cls.ICO_EXTENSIONS:
+                    entries = cls._ico_entries(f.read())
+                elif ext in cls.PE_EXTENSIONS:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        entries = cls._pe_entries(data, index)
+                else:
+                    return None
+        except (OSError, ValueError, struct.error):
+            return None
+        if not entries:
+            return None
+        return cls.decode_entry(cls.best_entry(entries, size), size)
+
+    @staticmethod
+    def best_entry(entries, size):
+        """entries: Liste von (Breite, Höhe, Farbtiefe, Bytes)"""
+        larger = [e for e in entries if e[0] >= size]
+        if larger:
+            return min(larger, key=lambda e: (e[0], -e[2]))
+        return max(entries, key=lambda e: (e[0], e[2]))
+
+    @classmethod
+    def decode_entry(cls, entry, size):
+        try:
+            from PIL import Image
+        except ImportError:
+            return None
+        width, height, bit_count, image = entry
+        try:
+            if image.startswith(cls.PNG_MAGIC):
+                img = Image.open(io.BytesIO(image))
+            else:
+                # BMP-Eintrag: als .ico mit genau einem Eintrag an Pillow geben
+                header = struct.pack("<3H", 0, 1, 1) + struct.pack(
+                    "<4B2H2I", width % 256, height % 256, 0, 0, 1, bit_count, len(image), 22)
+                img = Image.open(io.BytesIO(header + image))
+            img.load()
+        except Exception:
+            return None
+        img = img.convert("RGBA")
+        if img.size != (size, size):
+            resample = Image.Resampling.LANCZOS if hasattr(Image, 'Resampling') else Image.LANCZOS
+            img = img.resize((size, size), resample)
+        return img
+
+    @staticmethod
+    def _dir_entry_size(width, height):
+        return width or 256, height or 256
+
+    @classmethod
+    def _ico_entries(cls, data):
+        reserved, kind, count = struct.unpack_from("<3H", data, 0)
+        if reserved != 0 or kind != 1:
+            raise ValueError("Keine .ico-Datei")
+        entries = []
+        for i in range(count):
+            w, h, _, _, _, bit_count, length, offset = struct.unpack_from("<4B2H2I", data, 6 + i * 16)
+            image = bytes(data[offset:offset + length])
+            if len(image) == length:
+                entries.append(cls._dir_entry_size(w, h) + (bit_count, image))
+        return entries
+
+    # --- PE-Ressourcen ---
+
+    @classmethod
+    def _pe_entries(cls, data, index):
+        if data[:2] != b"MZ":
+            raise ValueError("Keine PE-Datei")
+        pe_offset, = struct.unpack_from("<I", data, 0x3C)
+        if data[pe_offset:pe_offset + 4] != b"PE\x00\x00":
+            raise ValueError("Keine PE-Datei")
+        coff = pe_offset + 4
+        section_count, = struct.unpack_from("<H", data, coff + 2)
+        optional_size, = struct.unpack_from("<H", data, coff + 16)
+        optional = coff + 20
+        magic, = struct.unpack_from("<H", data, optional)
+        dir_offset = optional + (112 if magic == 0x20B else 96)
+        resource_rva, _ = struct.unpack_from("<2I", data, dir_offset + 2 * 8)
+        if not resource_rva:
+            return []
+
+        sections = []
+        section_table = optional + optional_size
+        for i in range(section_count):
+            vsize, vaddr, raw_size, raw_ptr = struct.unpack_from("<4I", data, section_table + i * 40 + 8)
+            sections.append((vaddr, max(vsize, raw_size), raw_ptr))
+
+        def rva_to_offset(rva):
+            for vaddr, vsize, raw_ptr in sections:
+                if vaddr <= rva < vaddr + vsize:
+                    return rva - vaddr + raw_ptr
+            raise ValueError(f"RVA {rva:#x} außerhalb der Sektionen")
+
+        root = rva_to_offset(resource_rva)
+
+        def directory(offset):
+            """[(Name/ID, Offset, ist_Verzeichnis)] — benannte Einträge zuerst, wie von Windows sortiert"""
+            named, ids = struct.unpack_from("<2H", data, offset + 12)
+            result = []
+            for i in range(named + ids):
+                name, target = struct.unpack_from("<2I", data, offset + 16 + i * 8)
+                key = ("name", name & 0x7FFFFFFF) if name & 0x80000000 else name
+                result.append((key, root + (target & 0x7FFFFFFF), bool(target & 0x80000000)))
+            return result
+
+        def first_data(offset, is_dir):
+            """Steigt bis zum ersten Datenblock ab (Sprache egal)"""
+            while is_dir:
+                entries = directory(offset)
+                if not entries:
+                    return None
+                _, offset, is_dir = entries[0]
+            rva, size = struct.unpack_from("<2I", data, offset)
+            start = rva_to_offset(rva)
+            return bytes(data[start:start + size])
+
+        types = {key: (offset, is_dir) for key, offset, is_dir in directory(root)}
+        if cls.RT_GROUP_ICON not in types or cls.RT_ICON not in types:
+            return []
+        groups = directory(types[cls.RT_GROUP_ICON][0])
+        icons = {key: (offset, is_dir) for key, offset, is_dir in directory(types[cls.RT_ICON][0])}
+
+        # Index ≥ 0: n-te Gruppe; negativ: Ressourcen-ID (wie ExtractIconEx)
+        if index < 0:
+            group = next((g for g in groups if g[0] == -index), None)
+        else:
+            group = groups[index] if index < len(groups) else None
+        if group is None:
+            return []
+        group_data = first_data(group[1], group[2])
+        if not group_data:
+            return []
+
+        _, kind, count = struct.unpack_from("<3H", group_data, 0)
+        entries = []
+        for i in range(count):
+            w, h, _, _, _, bit_count, _, icon_id = struct.unpack_from("<4B2HIH", group_data, 6 + i * 14)
+            if icon_id not in icons:
+                continue
+            image = first_data(*icons[icon_id])
+            if image:
+                entries.append(cls._dir_entry_size(w, h) + (bit_count, image))
+        return entries
+
+
+class SHFILEINFOW(ctypes.Structure):
+    _fields_ = [
+        ('hIcon', ctypes.c_void_p),
+        ('iIcon', ctypes.c_int),
+        ('dwAttributes', ctypes.c_uint),
+        ('szDisplayName', ctypes.c_wchar * 260),
+        ('szTypeName', ctypes.c_wchar * 80),
+    ]
+
+
+# Kehrwerte: schwarz * 255 // alpha == (schwarz * K[alpha]) >> 16 — für alle
+# 256×256 Kombinationen exakt; K[0] = 0 ergibt Farbe 0 bei alpha = 0.
+# Wird beim ersten Aufruf angelegt (numpy erst bei Bedarf laden).
+_ALPHA_RECIPROCAL = None
+
+
+def _alpha_reciprocal():
+    global _ALPHA_RECIPROCAL
+    if _ALPHA_RECIPROCAL is None:
+        import numpy as np
+        table = np.zeros(256, dtype=np.uint32)
+        table[1:] = (255 << 16) // np.arange(1, 256) + 1
+        _ALPHA_RECIPROCAL = table
+    return _ALPHA_RECIPROCAL
+
+
+def recover_alpha(black, white):
+    """
+    Rekonstruiert Alpha aus einem Icon, das auf Schwarz und auf Weiß gezeichnet wurde.
+
+    black, white: uint8-Arrays (N, H, W, 3) bzw. (H, W, 3) in RGB.
+    Rückgabe: uint8 (N, H, W, 4) mit geradem (nicht vormultipliziertem) Alpha.
+
+        alpha = 255 - mittlere Differenz (weiß - schwarz)
+        rgb   = schwarz * 255 / alpha   (0 wo alpha = 0)
+
+    Rein ganzzahlig (Division als Multiplikation mit Kehrwert-Tabelle),
+    ohne Schleife über Kanäle oder Bilder.
+    """
+    import numpy as np
+    black = np.asarray(black, dtype=np.uint8)
+    white = np.asarray(white, dtype=np.uint8)
+    if black.shape != white.shape or black.shape[-1] != 3:
+        raise ValueError(f"Ungültige Formen: {black.shape} / {white.shape}")
+    
+    w = white.astype(np.int16)
+    b = black.astype(np.int16)
+    diff = (w[..., 0] + w[..., 1] + w[..., 2]) - (b[..., 0] + b[..., 1] + b[..., 2])
+    alpha = 255 + (-diff) // 3  # = 255 - ceil(diff / 3), wie das frühere Abschneiden
+    np.clip(alpha, 0, 255, out=alpha)
+    alpha = alpha.astype(np.uint8)
+    
+    rgb = black * _alpha_reciprocal()[alpha][..., None]
+    rgb >>= 16
+    np.minimum(rgb, 255, out=rgb)
+    
+    rgba = np.empty(black.shape[:-1] + (4,), dtype=np.uint8)
+    rgba[..., :3] = rgb
+    rgba[..., 3] = alpha
+    return rgba
+
+
+class IconExtractor:
+    """Extrahiert echte Windows-Icons aus Dateien"""
+    
+    ICON_CACHE = {}
+    
+    # Fehlgeschlagene bzw. nicht rechtzeitig gelieferte Icons (Frist des
+    # Hilfsprozesses, langsame Netzfreigabe): Schlüssel → (Zeitpunkt,
+    # Standard-Icon). Nicht in ICON_CACHE — nach FAILED_RETRY_S wird erneut
+    # extrahiert, bis dahin das Standard-Icon angezeigt.
+    FAILED = {}
+    FAILED_RETRY_S = 30
+    
+    # IconWorkerClient (vom Manager gesetzt) — dann laufen alle Shell-Aufrufe
+    # im Hilfsprozess; None = im eigenen Prozess extrahieren
+    worker = None
+    
+    @staticmethod
+    def get_icon(filepath, size=48):
+        """Holt das Icon — zuerst echtes Windows-Icon, dann Fallback"""
+        cache_key = IconExtractor.cache_key(filepath, size)
+        if cache_key in IconExtractor.ICON_CACHE:
+            METRICS.inc("icons.cache.hits")
+            return IconExtractor.ICON_CACHE[cache_key]
+        return IconExtractor.get_icons([filepath], size)[0]
+    
+    @staticmethod
+    def cache_key(filepath, size):
+        """
+        Verknüpfungen mit gleichem Ziel bzw. gleicher Icon-Quelle teilen sich
+        ein Icon (die .lnk wird dafür ohne COM gelesen). Schon gelesene Links
+        kommen ohne stat() aus dem Cache — Änderungen melden Watcher und
+        Validator über invalidate().
+        """
+        if filepath and filepath.lower().endswith(".lnk"):
+            if filepath in SHELL_LINK_CACHE:
+                link = SHELL_LINK_CACHE.peek(filepath)
+            else:
+                link = SHELL_LINK_CACHE.get(filepath)
+            icon_key = link.icon_key if link else None
+            if icon_key is not None:
+                return ("lnk",) + icon_key + (size,)
+        return f"{filepath}_{size}"
+    
+    @staticmethod
+    def invalidate(filepaths):
+        """
+        Verwirft gecachte Icons der Dateien (gelöscht, umbenannt, geändert) —
+        bei Verknüpfungen auch das über das alte Link-Ziel geteilte Icon.
+        """
+        prefixes = set()
+        link_keys = set()
+        for filepath in filepaths:
+            prefixes.add(f"{filepath}_")
+            link = SHELL_LINK_CACHE.peek(filepath)
+            if link is not None and link.icon_key is not None:
+                link_keys.add(("lnk",) + link.icon_key)
+            SHELL_LINK_CACHE.discard(filepath)
+        def is_stale(key):
+            return ((isinstance(key, tuple) and key[:-1] in link_keys)
+                    or (isinstance(key, str) and key.rpartition("_")[0] + "_" in prefixes))
+        
+        for key in [key for key in IconExtractor.FAILED if is_stale(key)]:
+            del IconExtractor.FAILED[key]
+        cache = IconExtractor.ICON_CACHE
+        stale = [key for key in cache if is_stale(key)]
+        for key in stale:
+            del cache[key]
+        METRICS.inc("icons.cache.evictions", len(stale))
+        return len(stale)
+    
+    @staticmethod
+    def extract_resource_icon(filepath, size=48):
+        """Icon aus der Datei selbst bzw. aus Ziel/IconLocation einer Verknüpfung"""
+        if not filepath:
+            return None
+        source, index = filepath, 0
+        if filepath.lower().endswith(".lnk"):
+            link = SHELL_LINK_CACHE.get(filepath)
+            if link is None:
+                return None
+            if link.icon_location:
+                source, index = link.icon_location, link.icon_index
+            else:
+                source = link.target_path
+        if not source or not IconResourceDecoder.can_decode(source):
+            return None
+        return IconResourceDecoder.load(source, size, index)
+    
+    @staticmethod
+    def extract_windows_icon(filepath, size=48):
+        """Extrahiert das echte Windows-Icon über SHGetFileInfoW"""
+        return IconExtractor.extract_windows_icons([filepath], size)[0]
+    
+    @staticmethod
+    def _capture_gdi_icon(filepath):
+        """
+        Zeichnet das Shell-Icon einmal auf Schwarz und einmal auf Weiß.
+        Gibt (schwarz, weiß, Breite, Höhe) als BGRX-Bytes zurück oder None.
+        """
+        import win32gui, win32ui, win32con, win32api
+        
+        # SHGetFileInfo — funktioniert mit .lnk, .exe, Ordnern, etc.
+        info = SHFILEINFOW()
+        SHGFI_ICON = 0x100
+        SHGFI_LARGEICON = 0x0
+        
+        result = ctypes.windll.shell32.SHGetFileInfoW(
+            filepath, 0, ctypes.byref(info), ctypes.sizeof(info),
+            SHGFI_ICON | SHGFI_LARGEICON
+        )
+        
+        if not result or not info.hIcon:
+            return None
+        
+        hicon = info.hIcon
+        
+        # Icon-Größe (System-Standard, meist 32x32)
+        ico_x = win32api.GetSystemMetrics(win32con.SM_CXICON)
+        ico_y = win32api.GetSystemMetrics(win32con.SM_CYICON)
+        
+        # Device Context + Bitmap erstellen
+        hdc_screen = win32gui.GetDC(0)
+        try:
+            hdc = win32ui.CreateDCFromHandle(hdc_screen)
+            hdc_mem = hdc.CreateCompatibleDC()
+            
+            hbmp = win32ui.CreateBitmap()
+            hbmp.CreateCompatibleBitmap(hdc, ico_x, ico_y)
+            hdc_mem.SelectObject(hbmp)
+            
+            # Schwarzer Hintergrund
+            hdc_mem.FillSolidRect((0, 0, ico_x, ico_y), 0)
+            hdc_mem.DrawIcon((0, 0), hicon)
+            black = hbmp.GetBitmapBits(True)
+            
+            # Weißer Hintergrund für Alpha-Berechnung
+            hdc_mem.FillSolidRect((0, 0, ico_x, ico_y), 0x00FFFFFF)
+            hdc_mem.DrawIcon((0, 0), hicon)
+            white = hbmp.GetBitmapBits(True)
+            
+            hdc_mem.DeleteDC()
+        finally:
+            win32gui.DestroyIcon(hicon)
+            win32gui.ReleaseDC(0, hdc_screen)
+        
+        return black, white, ico_x, ico_y
+    
+    @staticmethod
+    def extract_windows_icons(filepaths, size=48):
+        """
+        GDI-Fallback für mehrere Dateien: alle Icons werden erst gezeichnet,
+        dann in einem einzigen recover_alpha-Aufruf freigestellt.
+        Gibt eine Liste (ein Bild oder None pro Datei) zurück.
+        """
+        images = [None] * len(filepaths)
+        if not HAS_WIN32:
+            return images
+        from PIL import Image
+        resample = Image.Resampling.LANCZOS if hasattr(Image, 'Resampling') else Image.LANCZOS
+        ensure_com_initialized()
+        
+        # Nach Bildgröße gruppieren (in der Regel alle gleich: SM_CXICON)
+        captures = {}
+        for i, filepath in enumerate(filepaths):
+            try:
+                capture = IconExtractor._capture_gdi_icon(filepath)
+            except Exception:
+                capture = None
+            if capture:
+                black, white, ico_x, ico_y = capture
+                captures.setdefault((ico_x, ico_y), []).append((i, black, white))
+        
+        for (ico_x, ico_y), group in captures.items():
+            if HAS_NUMPY:
+                import numpy as np
+                # BGRX → RGB, gestapelt zu (N, H, W, 3)
+                black = np.stack([np.frombuffer(b, np.uint8).reshape(ico_y, ico_x, 4)[..., 2::-1]
+                                  for _, b, _ in group])
+                white = np.stack([np.frombuffer(w, np.uint8).reshape(ico_y, ico_x, 4)[..., 2::-1]
+                                  for _, _, w in group])
+                rgba = recover_alpha(black, white)
+                frames = [Image.fromarray(rgba[k], 'RGBA') for k in range(len(group))]
+            else:
+                # Numpy nicht verfügbar — einfacher Fallback ohne Alpha
+                frames = [Image.frombuffer('RGB', (ico_x, ico_y), b, 'raw', 'BGRX', 0, 1).convert('RGBA')
+                          for _, b, _ in group]
+            
+            for (i, _, _), img in zip(group, frames):
+                # Auf Zielgröße skalieren
+                if ico_x != size or ico_y != size:
+                    img = img.resize((size, size), resample)
+                images[i] = img
+        return images
+    
+    @staticmethod
+    def get_icons(filepaths, size=48):
+        """
+        Holt viele Icons auf einmal (z.B. beim Aufbau der Kachel-Ansicht).
+        Nicht gecachte Icons werden gemeinsam extrahiert — über den
+        Hilfsprozess (mit Frist) oder im eigenen Prozess; was dabei fehlt
+        oder zu lange dauert, bekommt vorläufig das generierte Standard-Icon
+        (siehe FAILED).
+        """
+        cache = IconExtractor.ICON_CACHE
+        failed = IconExtractor.FAILED
+        now = time.monotonic()
+        keys = [IconExtractor.cache_key(p, size) for p in filepaths]
+        pending = {}
+        for filepath, key in zip(filepaths, keys):
+            if key in cache:
+                continue
+            if key in failed and now - failed[key][0] < IconExtractor.FAILED_RETRY_S:
+                continue
+            pending.setdefault(key, filepath)
+        METRICS.inc("icons.cache.hits", len(keys) - len(pending))
+        METRICS.inc("icons.cache.misses", len(pending))
+        
+        if pending:
+            paths = list(pending.values())
+            with TRACER.span("icons.extract", items=len(paths), size=size,
+                             worker=IconExtractor.worker is not None):
+                if IconExtractor.worker is not None:
+                    images = IconExtractor.worker.request_many(paths, size)
+                else:
+                    images = IconExtractor.extract_icons(paths, size)
+                for (key, filepath), img in zip(pending.items(), images):
+                    if img:
+                        cache[key] = img
+                        failed.pop(key, None)
+                    else:
+                        default = failed[key][1] if key in failed else \
+                            IconExtractor.get_default_icon(filepath, size)
+                        failed[key] = (now, default)
+                        METRICS.inc("icons.failed")
+        return [cache[key] if key in cache else failed.get(key, (None, None))[1] for key in keys]
+    
+    @staticmethod
+    def extract_icons(filepaths, size=48, on_result=None):
+        """
+        Extrahiert Icons im aktuellen Prozess: direkte Dekodierung, dann ein
+        gemeinsamer Durchlauf des Desktop-Backends (GDI) für den Rest. on_result(i, img) wird für
+        jedes fertige Icon sofort aufgerufen. Gibt eine Liste (Bild/None) zurück.
+        """
+        images = [None] * len(filepaths)
+        remaining = []
+        for i, filepath in enumerate(filepaths):
+            try:
+                images[i] = IconExtractor.extract_resource_icon(filepath, size)
+            except Exception:
+                images[i] = None
+            if images[i] is None:
+                remaining.append(i)
+            elif on_result:
+                on_result(i, images[i])
+        
+        if remaining:
+            from .desktop import WindowsDesktopAPI
+            backend = WindowsDesktopAPI.backend()
+            gdi_images = backend.shell_icons([filepaths[i] for i in remaining], size)
+            for i, img in zip(remaining, gdi_images):
+                images[i] = img
+                if on_result:
+                    on_result(i, img)
+        return images
+    
+    @staticmethod
+    def get_default_icon(filepath, size=48):
+        """Erstellt ein 3D-Icon mit Licht, Schatten und Glaseffekt"""
+        try:
+            from PIL import Image, ImageDraw, ImageFont, ImageFilter
+        except:
+            return None
+        
+        # Größer rendern für Anti-Aliasing
+        scale = 2
+        s = size * scale
+        
+        img = Image.new('RGBA', (s, s), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        
+        ext = Path(filepath).suffix.lower() if filepath else ""
+        name = Path(filepath).stem if filepath else ""
+        
+        # Windows 11 ähnliche Farben pro Dateityp
+        type_colors = {
+            '.exe': (0, 120, 212), '.msi': (0, 120, 212), '.lnk': (0, 120, 212),
+            '.bat': (255, 165, 0), '.cmd': (255, 165, 0), '.ps1': (1, 36, 86),
+            '.py': (55, 118, 171), '.txt': (107, 107, 107), '.pdf': (220, 30, 30),
+            '.doc': (43, 87, 154), '.docx': (43, 87, 154),
+            '.xls': (33, 115, 70), '.xlsx': (33, 115, 70),
+            '.ppt': (210, 71, 38), '.pptx': (210, 71, 38),
+            '.jpg': (0, 188, 242), '.jpeg': (0, 188, 242), '.png': (0, 188, 242),
+            '.mp3': (255, 64, 129), '.mp4': (255, 64, 129),
+            '.zip': (255, 215, 0), '.rar': (255, 215, 0), '.7z': (255, 215, 0),
+            '.html': (228, 77, 38), '.css': (38, 77, 228), '.js': (247, 223, 30),
+        }
+        
+        cr, cg, cb = type_colors.get(ext, (0, 120, 212))
+        
+        margin = 4 * scale
+        radius = 8 * scale
+        
+        # --- Drop Shadow ---
+        shadow = Image.new('RGBA', (s, s), (0, 0, 0, 0))
+        s_draw = ImageDraw.Draw(shadow)
+        s_draw.rounded_rectangle(
+            [margin + 3*scale, margin + 3*scale, s - margin + 1*scale, s - margin + 1*scale],
+            radius=radius,
+            fill=(0, 0, 0, 70)
+        )
+        shadow = shadow.filter(ImageFilter.GaussianBlur(radius=3*scale))
+        img = Image.alpha_composite(img, shadow)
+        
+        # --- Hauptrechteck mit Gradient ---
+        main = Image.new('RGBA', (s, s), (0, 0, 0, 0))
+        m_draw = ImageDraw.Draw(main)
+        # Basis
+        m_draw.rounded_rectangle(
+            [margin, margin, s - margin, s - margin],
+            radius=radius,
+            fill=(cr, cg, cb, 240)
+        )
+        # Dunkler unten
+        dark = Image.new('RGBA', (s, s), (0, 0, 0, 0))
+        d_draw = ImageDraw.Draw(dark)
+        d_draw.rounded_rectangle(
+            [margin, s//2, s - margin, s - margin],
+            radius=radius,
+            fill=(0, 0, 0, 40)
+        )
+        main = Image.alpha_composite(main, dark)
+        img = Image.alpha_composite(img, main)
+        
+        # --- Glasglanz oben ---
+        gloss = Image.new('RGBA', (s, s), (0, 0, 0, 0))
+        g_draw = ImageDraw.Draw(gloss)
+        g_draw.rounded_rectangle(
+            [margin + 2*scale, margin + 2*scale, s - margin - 2*scale, margin + s//3],
+            radius=radius - 2*scale,
+            fill=(255, 255, 255, 45)
+        )
+        gloss = gloss.filter(ImageFilter.GaussianBlur(radius=2*scale))
+        img = Image.alpha_composite(img, gloss)
+        
+        # --- Feiner heller Rand oben (3D-Kante) ---
+        edge = Image.new('RGBA', (s, s), (0, 0, 0, 0))
+        e_draw = ImageDraw.Draw(edge)
+        e_draw.rounded_rectangle(
+            [margin, margin, s - margin, s - margin],
+            radius=radius,
+            outline=(255, 255, 255, 50),
+            width=scale
+        )
+        img = Image.alpha_composite(img, edge)
+        
+        # --- Buchstabe ---
+        letter = name[0].upper() if name else "?"
+        
+        font = None
+        font_size = s // 2
+        try:
+            font = ImageFont.truetype("segoeui.ttf", font_size)
+        except:
+            try:
+                font = ImageFont.truetype("arial.ttf", font_size)
+            except:
+                try:
+                    font = ImageFont.load_default()
+                except:
+                    pass
+        
+        if font:
+            # Temporäres Bild für Text
+            txt_layer = Image.new('RGBA', (s, s), (0, 0, 0, 0))
+            txt_draw = ImageDraw.Draw(txt_layer)
+            
+            bbox = txt_draw.textbbox((0, 0), letter, font=font)
+            text_width = bbox[2] - bbox[0]
+            text_height = bbox[3] - bbox[1]
+            
+            x = (s - text_width) // 2
+            y = (s - text_height) // 2 - 2 * scale
+            
+            # Text-Schatten
+            txt_draw.text((x + scale, y + scale), letter, fill=(0, 0, 0, 80), font=font)
+            # Text
+            txt_draw.text((x, y), letter, fill=(255, 255, 255, 230), font=font)
+            img = Image.alpha_composite(img, txt_layer)
+        
+        # Herunterskalieren für Anti-Aliasing
+        if hasattr(Image, 'Resampling'):
+            img = img.resize((size, size), Image.Resampling.LANCZOS)
+        else:
+            img = img.resize((size, size), Image.LANCZOS)
+        
+        return img
+
+
+def _icon_cache_bytes():
+    """Ungefährer Speicher der gecachten Icons (unkomprimierte Pixel)"""
+    return sum(img.width * img.height * len(img.getbands())
+               for img in list(IconExtractor.ICON_CACHE.values()) if img is not None)
+
+
+def _icon_cache_hit_rate():
+    hits, misses = METRICS.counter("icons.cache.hits"), METRICS.counter("icons.cache.misses")
+    return round(hits / (hits + misses), 4) if hits + misses else None
+
+
+METRICS.gauge("icons.cache.entries", lambda: len(IconExtractor.ICON_CACHE))
+METRICS.gauge("icons.cache.bytes", _icon_cache_bytes)
+METRICS.gauge("icons.cache.hit_rate", _icon_cache_hit_rate)
+METRICS.gauge("icons.failed_entries", lambda: len(IconExtractor.FAILED))
+METRICS.gauge("icons.shell_links", lambda: len(SHELL_LINK_CACHE))
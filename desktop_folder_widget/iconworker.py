@@ -0,0 +1,278 @@
+"""
+Icon-Hilfsprozess: Shell-Aufrufe außerhalb des UI-Prozesses, mit Frist
+"""
+
+import os
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+from .icons import IconExtractor
+from .winapi import IS_WINDOWS, ensure_com_initialized
+
+# Verzeichnis, das das Paket enthält (für "python -m desktop_folder_widget")
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class IconWorkerProtocol:
+    """
+    Binärprotokoll über stdin/stdout des Hilfsprozesses.
+
+    Anfrage:  <batch_id u32> <größe u16> <anzahl u16>, dann pro Pfad
+              <länge u16> <UTF-8-Bytes>
+    Antwort:  pro Pfad <batch_id u32> <nr u16> <status u8> <breite u16> <höhe u16>,
+              bei Status OK gefolgt von breite*höhe*4 Bytes RGBA
+    Antworten kommen einzeln, sobald ein Icon fertig ist.
+    """
+
+    REQUEST = struct.Struct("<IHH")
+    PATH = struct.Struct("<H")
+    RESPONSE = struct.Struct("<IHBHH")
+    OK = 0
+    NONE = 1
+
+    @staticmethod
+    def read_exact(stream, size):
+        """Liest genau size Bytes, b"" bei Dateiende"""
+        chunks = []
+        while size:
+            chunk = stream.read(size)
+            if not chunk:
+                return b""
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    @classmethod
+    def encode_request(cls, batch_id, size, paths):
+        parts = [cls.REQUEST.pack(batch_id, size, len(paths))]
+        for path in paths:
+            raw = path.encode("utf-8")
+            parts.append(cls.PATH.pack(len(raw)))
+            parts.append(raw)
+        return b"".join(parts)
+
+    @classmethod
+    def encode_response(cls, batch_id, index, img):
+        if img is None:
+            return cls.RESPONSE.pack(batch_id, index, cls.NONE, 0, 0)
+        img = img.convert("RGBA")
+        width, height = img.size
+        return cls.RESPONSE.pack(batch_id, index, cls.OK, width, height) + img.tobytes()
+
+
+class ShellIconBackend:
+    """Echte Extraktion (Ressourcen-Dekoder, dann GDI) — läuft im Hilfsprozess"""
+
+    def extract_many(self, paths, size, on_result):
+        IconExtractor.extract_icons(paths, size, on_result)
+
+
+class FakeIconBackend:
+    """
+    Für Tests/Benchmarks ohne Windows. Pfad-Präfixe steuern das Verhalten:
+
+        sleep:<sekunden>:…   hängt so lange (simuliert nicht erreichbare Freigabe)
+        crash:…              beendet den Prozess sofort
+        none:…               kein Icon
+        alles andere         einfarbiges Icon (Farbe aus dem Pfad)
+    """
+
+    def extract_many(self, paths, size, on_result):
+        from PIL import Image
+        for i, path in enumerate(paths):
+            if path.startswith("sleep:"):
+                time.sleep(float(path.split(":", 2)[1]))
+            elif path.startswith("crash:"):
+                os._exit(3)
+            if path.startswith("none:"):
+                on_result(i, None)
+                continue
+            color = tuple(path.encode("utf-8")[-3:].rjust(3, b"\x00")) + (255,)
+            on_result(i, Image.new("RGBA", (size, size), color))
+
+
+ICON_WORKER_BACKENDS = {
+    "shell": ShellIconBackend,
+    "fake": FakeIconBackend,
+}
+
+
+def icon_worker_main(backend_name="shell"):
+    """Hauptschleife des Hilfsprozesses (Aufruf: --icon-worker [backend])"""
+    ensure_com_initialized()
+    backend = ICON_WORKER_BACKENDS[backend_name]()
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    # stdout gehört dem Protokoll — print()-Ausgaben gehen nach stderr
+    sys.stdout = sys.stderr
+    proto = IconWorkerProtocol
+    
+    while True:
+        header = proto.read_exact(stdin, proto.REQUEST.size)
+        if not header:
+            return 0
+        batch_id, size, count = proto.REQUEST.unpack(header)
+        paths = []
+        for _ in range(count):
+            length, = proto.PATH.unpack(proto.read_exact(stdin, proto.PATH.size))
+            paths.append(proto.read_exact(stdin, length).decode("utf-8", "replace"))
+        
+        sent = set()
+        
+        def on_result(index, img):
+            stdout.write(proto.encode_response(batch_id, index, img))
+            stdout.flush()
+            sent.add(index)
+        
+        try:
+            backend.extract_many(paths, size, on_result)
+        except Exception as e:
+            print(f"[Icon-Worker] Fehler: {e}")
+        for index in range(count):
+            if index not in sent:
+                on_result(index, None)
+
+
+class IconWorkerClient:
+    """
+    Langlebiger Hilfsprozess für die Icon-Extraktion.
+
+    Shell-Aufrufe (SHGetFileInfoW, Zugriff auf Verknüpfungsziele) können auf
+    nicht erreichbaren Netzlaufwerken sekundenlang hängen; im Hilfsprozess
+    blockieren sie die Tk-Oberfläche höchstens bis zur Frist. Was bis dahin
+    nicht geliefert wurde, fällt auf das Standard-Icon zurück und der
+    (vermutlich hängende) Prozess wird beendet. Abgestürzte Prozesse werden
+    bei der nächsten Anfrage neu gestartet — höchstens MAX_RESTARTS mal pro
+    RESTART_WINDOW Sekunden, danach gibt es nur noch Standard-Icons.
+    """
+
+    DEADLINE = 1.5  # Sekunden pro Anfrage
+    MAX_RESTARTS = 5
+    RESTART_WINDOW = 60.0
+
+    def __init__(self, backend="shell", deadline=DEADLINE, command=None):
+        self.backend = backend
+        self.deadline = deadline
+        self.command = command or [sys.executable, "-m", "desktop_folder_widget", "--icon-worker", backend]
+        self._proc = None
+        self._cond = threading.Condition()
+        self._results = {}
+        self._next_batch = 0
+        self._starts = []
+        self.timeouts = 0
+        self.crashes = 0
+
+    @staticmethod
+    def _environment():
+        """Umgebung für den Hilfsprozess — das Paket muss per -m auffindbar sein"""
+        paths = [PACKAGE_ROOT] + [p for p in os.environ.get("PYTHONPATH", "").split(os.pathsep) if p]
+        return dict(os.environ, PYTHONPATH=os.pathsep.join(paths))
+    
+    def _start(self):
+        now = time.monotonic()
+        self._starts = [t for t in self._starts if now - t < self.RESTART_WINDOW]
+        if len(self._starts) >= self.MAX_RESTARTS:
+            return None
+        self._starts.append(now)
+        try:
+            proc = subprocess.Popen(
+                self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=self._environment(),
+                creationflags=0x08000000 if IS_WINDOWS else 0,  # CREATE_NO_WINDOW
+            )
+        except OSError as e:
+            print(f"Icon-Hilfsprozess konnte nicht gestartet werden: {e}")
+            return None
+        self._proc = proc
+        threading.Thread(target=self._read_responses, args=(proc,), daemon=True,
+                         name="icon-worker-reader").start()
+        return proc
+
+    def _read_responses(self, proc):
+        proto = IconWorkerProtocol
+        stream = proc.stdout
+        while True:
+            header = proto.read_exact(stream, proto.RESPONSE.size)
+            if not header:
+                break
+            batch_id, index, status, width, height = proto.RESPONSE.unpack(header)
+            data = None
+            if status == proto.OK:
+                data = proto.read_exact(stream, width * height * 4)
+                if not data:
+                    break
+            with self._cond:
+                if self._proc is proc:
+                    self._results[(batch_id, index)] = (width, height, data)
+                    self._cond.notify_all()
+        with self._cond:
+            if self._proc is proc:
+                # Unerwartetes Ende → abgestürzt
+                self.crashes += 1
+                self._proc = None
+                print(f"Icon-Hilfsprozess beendet (Code {proc.wait()}), wird bei Bedarf neu gestartet")
+                self._cond.notify_all()
+
+    def _kill(self, proc):
+        if self._proc is proc:
+            self._proc = None
+        try:
+            proc.kill()
+        except OSError:
+            pass
+
+    @property
+    def running(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def request_many(self, paths, size, deadline=None):
+        """Liefert eine Liste (RGBA-Bild oder None) — spätestens nach deadline Sekunden"""
+        if not paths:
+            return []
+        end = time.monotonic() + (self.deadline if deadline is None else deadline)
+        with self._cond:
+            proc = self._proc if self.running else self._start()
+            if proc is None:
+                return [None] * len(paths)
+            self._next_batch = (self._next_batch + 1) & 0xFFFFFFFF
+            batch_id = self._next_batch
+            try:
+                proc.stdin.write(IconWorkerProtocol.encode_request(batch_id, size, paths))
+                proc.stdin.flush()
+            except OSError:
+                self._kill(proc)
+                return [None] * len(paths)
+            
+            wanted = [(batch_id, i) for i in range(len(paths))]
+            while self._proc is proc and any(k not in self._results for k in wanted):
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    print("Icon-Hilfsprozess: Frist überschritten, wird neu gestartet")
+                    self._kill(proc)
+                    break
+                self._cond.wait(remaining)
+            results = [self._results.pop(k, None) for k in wanted]
+        
+        from PIL import Image
+        images = []
+        for result in results:
+            if result is None or result[2] is None:
+                images.append(None)
+            else:
+                width, height, data = result
+                images.append(Image.frombytes("RGBA", (width, height), data))
+        return images
+
+    def close(self):
+        with self._cond:
+            proc = self._proc
+            self._proc = None
+        if proc is not None:
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=1)
+            except Exception:
+                proc.kill()
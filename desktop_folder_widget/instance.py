@@ -0,0 +1,354 @@
+"""
+Einzelinstanz: Sperrdatei + lokaler Befehls-Socket
+==================================================
+Die erste Instanz hält eine Sperrdatei und lauscht auf einem lokalen Socket
+(Unix-Domain-Socket, unter Windows 127.0.0.1 mit freiem Port). Wo er zu finden
+ist, steht in der Endpunkt-Datei. Jeder weitere Start leitet seinen Befehl
+dorthin weiter und beendet sich sofort.
+
+Die Sperre ist eine Betriebssystem-Sperre (flock / msvcrt.locking) und
+verschwindet mit dem Prozess — ein Absturz hinterlässt also keine hängende
+Sperre, höchstens eine veraltete Endpunkt-Datei, die der nächste Start
+überschreibt.
+"""
+
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+from pathlib import Path
+
+from .winapi import IS_WINDOWS
+
+DEFAULT_LOCK_FILE = Path.home() / ".desktop_folder_widget_v3.lock"
+DEFAULT_ENDPOINT_FILE = Path.home() / ".desktop_folder_widget_v3.endpoint"
+
+
+class InstanceError(Exception):
+    """Laufende Instanz nicht erreichbar oder Antwort ungültig"""
+
+
+class InstanceProtocol:
+    """
+    Zeilenweises JSON (UTF-8, eine Nachricht pro Zeile) über den lokalen Socket.
+
+    Anfrage:  {"cmd": "add", "tile": "0", "paths": ["C:\\\\…\\\\App.lnk"], "token": "…"}
+    Antwort:  {"ok": true, …}  bzw.  {"ok": false, "error": "…"}
+
+    Eine Verbindung kann mehrere Anfragen nacheinander senden; jede bekommt
+    genau eine Antwortzeile. Befehle:
+
+        ping                       Antwort mit pid der laufenden Instanz
+        focus   [tile]             Kacheln nach vorne holen (tile: aufklappen)
+        add     tile, paths        Dateien in Kachel übernehmen (wie Drag & Drop)
+        restore [tile]             Verknüpfungen auf den Desktop zurücklegen
+        quit                       Widget beenden
+    """
+
+    COMMANDS = ("ping", "focus", "add", "restore", "quit")
+    MAX_LINE = 1 << 20
+
+    @staticmethod
+    def encode(message):
+        return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @classmethod
+    def decode(cls, line):
+        """Eine Zeile → dict; ValueError bei kaputtem JSON"""
+        if len(line) > cls.MAX_LINE:
+            raise ValueError("Nachricht zu lang")
+        message = json.loads(line.decode("utf-8"))
+        if not isinstance(message, dict):
+            raise ValueError("Nachricht ist kein Objekt")
+        return message
+
+    @classmethod
+    def validate(cls, message):
+        """
+        Prüft eine Anfrage und gibt sie normalisiert (ohne Token) zurück:
+        tile immer als String, paths als Liste von Strings.
+        """
+        cmd = message.get("cmd")
+        if cmd not in cls.COMMANDS:
+            raise ValueError(f"Unbekannter Befehl: {cmd!r}")
+        request = {"cmd": cmd}
+        tile = message.get("tile")
+        if tile is not None:
+            request["tile"] = str(tile)
+        if cmd == "add":
+            paths = message.get("paths")
+            if "tile" not in request:
+                raise ValueError("add braucht eine Kachel")
+            if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+                raise ValueError("add braucht eine Liste von Pfaden")
+            request["paths"] = paths
+        return request
+
+
+def _create_listener(socket_path):
+    """Unix-Domain-Socket wo möglich, sonst localhost mit freiem Port"""
+    if socket_path and hasattr(socket, "AF_UNIX") and not IS_WINDOWS:
+        path = str(socket_path)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)
+        try:
+            listener.bind(path)
+        finally:
+            os.umask(old_umask)
+        return listener, {"family": "unix", "address": path}
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    return listener, {"family": "tcp", "address": list(listener.getsockname())}
+
+
+def _connect(endpoint, timeout):
+    if endpoint["family"] == "unix":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = endpoint["address"]
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address = tuple(endpoint["address"])
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class CommandServer:
+    """
+    Nimmt Anfragen im Hintergrund-Thread an. handler(request) läuft in diesem
+    Thread und gibt das Antwort-dict zurück — für Tk also nur in eine Queue
+    legen, nicht direkt Fenster anfassen.
+
+        server = CommandServer(handler)
+        endpoint = server.start()   # {"family", "address", "token", "pid"}
+        ...
+        server.stop()
+    """
+
+    CLIENT_TIMEOUT = 2.0  # ein hängender Client blockiert den Server höchstens so lange
+
+    def __init__(self, handler, token=None, socket_path=None):
+        self.handler = handler
+        self.token = token or secrets.token_hex(16)
+        self.socket_path = socket_path  # None → immer localhost/TCP
+        self._listener = None
+        self._endpoint = None
+        self._closed = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._listener, self._endpoint = _create_listener(self.socket_path)
+        self._listener.listen(8)
+        # Mit Timeout, damit stop() den Thread ohne Verbindung beenden kann
+        self._listener.settimeout(0.2)
+        self._thread = threading.Thread(target=self._serve, name="instance-server", daemon=True)
+        self._thread.start()
+        return dict(self._endpoint, token=self.token, pid=os.getpid())
+
+    def _serve(self):
+        while not self._closed.is_set():
+            try:
+                conn, _ = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            with conn:
+                conn.settimeout(self.CLIENT_TIMEOUT)
+                try:
+                    self._handle(conn)
+                except OSError:
+                    pass
+
+    def _handle(self, conn):
+        stream = conn.makefile("rb")
+        while True:
+            # Höchstens MAX_LINE + 1 Bytes lesen — eine endlose Zeile füllt nicht den Speicher
+            line = stream.readline(InstanceProtocol.MAX_LINE + 1)
+            if not line:
+                return
+            try:
+                message = InstanceProtocol.decode(line)
+                if not secrets.compare_digest(str(message.get("token", "")), self.token):
+                    raise ValueError("Ungültiges Token")
+                reply = self.handler(InstanceProtocol.validate(message))
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+            conn.sendall(InstanceProtocol.encode(reply))
+            if len(line) > InstanceProtocol.MAX_LINE:
+                return  # Rest der überlangen Zeile ist keiner Anfrage mehr zuzuordnen
+
+    def stop(self):
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        if self._endpoint and self._endpoint["family"] == "unix":
+            try:
+                os.unlink(self._endpoint["address"])
+            except OSError:
+                pass
+
+
+class InstanceClient:
+    """Schickt Befehle an eine laufende Instanz (Endpunkt-dict wie von CommandServer.start)"""
+
+    def __init__(self, endpoint, timeout=2.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def request_many(self, requests):
+        """Alle Anfragen über eine Verbindung, Antworten in gleicher Reihenfolge"""
+        with _connect(self.endpoint, self.timeout) as sock:
+            payload = b"".join(InstanceProtocol.encode(dict(r, token=self.endpoint["token"]))
+                               for r in requests)
+            sock.sendall(payload)
+            sock.shutdown(socket.SHUT_WR)
+            stream = sock.makefile("rb")
+            replies = []
+            for _ in requests:
+                line = stream.readline(InstanceProtocol.MAX_LINE + 1)
+                if not line:
+                    raise InstanceError("Verbindung vorzeitig geschlossen")
+                replies.append(InstanceProtocol.decode(line))
+            return replies
+
+    def request(self, cmd, **args):
+        return self.request_many([dict(args, cmd=cmd)])[0]
+
+
+class InstanceLock:
+    """Exklusive, nicht blockierende Dateisperre für die Lebensdauer des Prozesses"""
+
+    def __init__(self, path=DEFAULT_LOCK_FILE):
+        self.path = Path(path)
+        self._file = None
+
+    @property
+    def held(self):
+        return self._file is not None
+
+    def acquire(self):
+        """True wenn diese Instanz die Sperre hat, False wenn eine andere sie hält"""
+        if self._file is not None:
+            return True
+        handle = open(self.path, "a+b")
+        try:
+            if IS_WINDOWS:
+                import msvcrt
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._file = handle
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            if IS_WINDOWS:
+                import msvcrt
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+        self._file.close()
+        self._file = None
+
+
+class SingleInstance:
+    """
+    Sperre + Befehls-Socket + Endpunkt-Datei zusammen:
+
+        instance = SingleInstance()
+        if instance.acquire():
+            instance.serve(handler)          # erste Instanz
+        else:
+            instance.forward("focus")        # weitere Instanz: weiterleiten, beenden
+    """
+
+    # So lange wartet eine weitere Instanz, bis die erste ihren Socket geöffnet hat
+    CONNECT_WAIT = 3.0
+
+    def __init__(self, lock_file=DEFAULT_LOCK_FILE, endpoint_file=DEFAULT_ENDPOINT_FILE):
+        self.lock = InstanceLock(lock_file)
+        self.endpoint_file = Path(endpoint_file)
+        self.server = None
+
+    def acquire(self):
+        return self.lock.acquire()
+
+    def serve(self, handler):
+        """Socket öffnen und Endpunkt-Datei (atomar) schreiben; nur mit Sperre"""
+        if not self.lock.held:
+            raise InstanceError("Sperre wird von einer anderen Instanz gehalten")
+        self.server = CommandServer(handler, socket_path=self.endpoint_file.with_suffix(".sock"))
+        endpoint = self.server.start()
+        tmp = self.endpoint_file.with_name(self.endpoint_file.name + ".tmp")
+        tmp.write_text(json.dumps(endpoint), encoding="utf-8")
+        if not IS_WINDOWS:
+            os.chmod(tmp, 0o600)
+        os.replace(tmp, self.endpoint_file)
+        return endpoint
+
+    def read_endpoint(self):
+        try:
+            return json.loads(self.endpoint_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def forward_many(self, requests, wait=None):
+        """
+        Schickt Anfragen an die laufende Instanz. Startet diese gerade erst
+        (Endpunkt fehlt oder ist veraltet), wird bis zu CONNECT_WAIT Sekunden
+        erneut versucht.
+        """
+        deadline = time.monotonic() + (self.CONNECT_WAIT if wait is None else wait)
+        last_error = None
+        while True:
+            endpoint = self.read_endpoint()
+            if endpoint is not None:
+                try:
+                    replies = InstanceClient(endpoint).request_many(requests)
+                    if not any(r.get("error") == "Ungültiges Token" for r in replies):
+                        return replies
+                    last_error = InstanceError("Endpunkt-Datei veraltet")
+                except (OSError, ValueError, InstanceError) as e:
+                    last_error = e
+            if time.monotonic() >= deadline:
+                raise InstanceError(f"Laufende Instanz nicht erreichbar: {last_error}")
+            time.sleep(0.05)
+
+    def forward(self, cmd, wait=None, **args):
+        return self.forward_many([dict(args, cmd=cmd)], wait)[0]
+
+    def release(self):
+        if self.server is not None:
+            self.server.stop()
+            self.server = None
+            try:
+                self.endpoint_file.unlink()
+            except OSError:
+                pass
+        self.lock.release()
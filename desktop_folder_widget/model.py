@@ -0,0 +1,381 @@
+"""
+Konfigurationsmodell: versioniertes Schema, Kacheln, Verknüpfungen, Pfad-Index
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+CONFIG_SCHEMA_VERSION = 2
+
+
+def _migrate_v1_to_v2(data):
+    """v1 → v2: Prozent-Skalierung und quadratische Icon-Größen in Pixel (Breite/Höhe)"""
+    for tile in data.get("tiles", {}).values():
+        if "collapsed_tile_w" not in tile:
+            old_sc = tile.get("collapsed_scale", 100) / 100.0
+            tile["collapsed_tile_w"] = max(40, int(150 * old_sc))
+            tile["collapsed_tile_h"] = max(40, int(150 * old_sc))
+        if "expanded_tile_w" not in tile:
+            old_se = tile.get("expanded_scale", 100) / 100.0
+            tile["expanded_tile_w"] = max(80, int(245 * old_se))
+            tile["expanded_tile_h"] = max(100, int(280 * old_se))
+        if "collapsed_icon_w" not in tile:
+            old_size = tile.get("collapsed_icon_size", 48)
+            tile["collapsed_icon_w"] = old_size
+            tile["collapsed_icon_h"] = old_size
+        if "expanded_icon_w" not in tile:
+            old_size = tile.get("expanded_icon_size", 36)
+            tile["expanded_icon_w"] = old_size
+            tile["expanded_icon_h"] = old_size
+        for old_key in ("collapsed_scale", "expanded_scale", "collapsed_icon_size", "expanded_icon_size"):
+            tile.pop(old_key, None)
+
+
+# Migrationskette: Version → Funktion, die auf Version + 1 hebt
+CONFIG_MIGRATIONS = {
+    1: _migrate_v1_to_v2,
+}
+
+
+def migrate_config(data):
+    """
+    Hebt ein geladenes Konfigurations-Dict auf CONFIG_SCHEMA_VERSION.
+    Konfigurationen ohne Versionsangabe gelten als Version 1.
+    Gibt True zurück, wenn migriert wurde (→ sofort neu speichern).
+    """
+    version = data.get("schema_version", 1)
+    if not data.get("tiles"):
+        data["schema_version"] = max(version, CONFIG_SCHEMA_VERSION)
+        return False
+    if version > CONFIG_SCHEMA_VERSION:
+        print(f"⚠ Konfiguration hat neuere Schema-Version {version} (unterstützt: {CONFIG_SCHEMA_VERSION})")
+        return False
+    migrated = False
+    while version < CONFIG_SCHEMA_VERSION:
+        CONFIG_MIGRATIONS[version](data)
+        version += 1
+        migrated = True
+    data["schema_version"] = version
+    if migrated:
+        print(f"Konfiguration auf Schema-Version {version} migriert")
+    return migrated
+
+
+def normalize_path(path):
+    """Normalisierter Pfad als Vergleichsschlüssel (Groß/Klein egal, wie unter Windows)"""
+    return os.path.normpath(path).replace("/", "\\").casefold()
+
+
+def _clamp_int(value, default, low, high):
+    try:
+        return max(low, min(high, int(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(slots=True)
+class Shortcut:
+    """Eine Verknüpfung in einer Kachel"""
+
+    name: str
+    path: str
+    # Unbekannte Felder aus der Datei bleiben beim Speichern erhalten
+    extra: dict = field(default_factory=dict)
+    # Position auf dem Desktop beim Aufnehmen (Bildschirmkoordinaten) oder None
+    desktop_pos: tuple = None
+    # Vorberechnet
+    norm_path: str = field(init=False)
+    ext: str = field(init=False)
+    letter: str = field(init=False)
+    # Laufzeit-Status (nicht gespeichert): Datei bei der letzten Prüfung nicht gefunden
+    missing: bool = field(init=False, default=False)
+
+    def __post_init__(self):
+        self.norm_path = normalize_path(self.path)
+        self.ext = os.path.splitext(self.path)[1].lower()
+        self.letter = self.name[0].upper() if self.name else "?"
+
+    @classmethod
+    def from_dict(cls, data):
+        path = str(data.get("path") or "")
+        name = str(data.get("name") or Path(path).stem)
+        extra = {k: v for k, v in data.items() if k not in ("name", "path", "desktop_pos")}
+        desktop_pos = None
+        pos = data.get("desktop_pos")
+        if isinstance(pos, (list, tuple)) and len(pos) == 2:
+            try:
+                desktop_pos = (int(pos[0]), int(pos[1]))
+            except (TypeError, ValueError):
+                pass
+        return cls(name, path, extra, desktop_pos)
+
+    def to_dict(self):
+        data = {"name": self.name, "path": self.path}
+        if self.desktop_pos is not None:
+            data["desktop_pos"] = list(self.desktop_pos)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
+class TileConfig:
+    """Einstellungen und Inhalt einer Kachel (validiert beim Laden)"""
+
+    name: str = "Ordner"
+    pos_x: int = None
+    pos_y: int = None
+
+    # Kachelgröße in Pixeln
+    collapsed_tile_w: int = 150
+    collapsed_tile_h: int = 150
+    expanded_tile_w: int = 245
+    expanded_tile_h: int = 280
+
+    # Icon-Größe in Pixeln
+    collapsed_icon_w: int = 48
+    collapsed_icon_h: int = 48
+    expanded_icon_w: int = 36
+    expanded_icon_h: int = 36
+
+    # Seitenverhältnis beibehalten
+    lock_aspect_collapsed_tile: bool = True
+    lock_aspect_expanded_tile: bool = True
+    lock_aspect_collapsed_icon: bool = True
+    lock_aspect_expanded_icon: bool = True
+
+    # Schriftgröße für Icon-Namen
+    collapsed_name_font_size: int = 8
+    expanded_name_font_size: int = 8
+
+    # Verknüpfungsnamen in der verkleinerten Ansicht ausblenden
+    hide_shortcut_names: bool = True
+
+    # None = noch nicht geladen (SQLite lädt Kacheln außerhalb des Bildschirms später)
+    shortcuts: list = field(default_factory=list)
+    extra: dict = field(default_factory=dict)
+
+    # Wertebereiche (wie in den Größen-Slidern)
+    INT_RANGES = {
+        "collapsed_tile_w": (40, 1000), "collapsed_tile_h": (40, 1000),
+        "expanded_tile_w": (80, 1500), "expanded_tile_h": (100, 1500),
+        "collapsed_icon_w": (16, 128), "collapsed_icon_h": (16, 128),
+        "expanded_icon_w": (16, 128), "expanded_icon_h": (16, 128),
+        "collapsed_name_font_size": (6, 24), "expanded_name_font_size": (6, 24),
+    }
+    BOOL_FIELDS = (
+        "lock_aspect_collapsed_tile", "lock_aspect_expanded_tile",
+        "lock_aspect_collapsed_icon", "lock_aspect_expanded_icon",
+        "hide_shortcut_names",
+    )
+
+    @classmethod
+    def from_dict(cls, data):
+        tile = cls()
+        tile.name = str(data.get("name") or "Ordner")
+        if data.get("pos_x") is not None:
+            tile.pos_x = _clamp_int(data["pos_x"], 0, -100000, 100000)
+        if data.get("pos_y") is not None:
+            tile.pos_y = _clamp_int(data["pos_y"], 0, -100000, 100000)
+        for key, (low, high) in cls.INT_RANGES.items():
+            if key in data:
+                setattr(tile, key, _clamp_int(data[key], getattr(tile, key), low, high))
+        for key in cls.BOOL_FIELDS:
+            if key in data:
+                setattr(tile, key, bool(data[key]))
+        if "shortcuts" in data:
+            tile.shortcuts = [Shortcut.from_dict(s) for s in data["shortcuts"]
+                              if isinstance(s, dict) and s.get("path")]
+        else:
+            tile.shortcuts = None
+        known = {"name", "pos_x", "pos_y", "shortcuts"} | set(cls.INT_RANGES) | set(cls.BOOL_FIELDS)
+        tile.extra = {k: v for k, v in data.items() if k not in known}
+        return tile
+
+    def to_dict(self):
+        data = dict(self.extra)
+        data["name"] = self.name
+        if self.pos_x is not None:
+            data["pos_x"] = self.pos_x
+        if self.pos_y is not None:
+            data["pos_y"] = self.pos_y
+        for key in self.INT_RANGES:
+            data[key] = getattr(self, key)
+        for key in self.BOOL_FIELDS:
+            data[key] = getattr(self, key)
+        if self.shortcuts is not None:
+            data["shortcuts"] = [s.to_dict() for s in self.shortcuts]
+        return data
+
+
+def config_from_dict(data):
+    """Wandelt ein (migriertes) Konfigurations-Dict in das Modell um"""
+    return {
+        "schema_version": data.get("schema_version", CONFIG_SCHEMA_VERSION),
+        "tiles": {str(tile_id): TileConfig.from_dict(tile)
+                  for tile_id, tile in data.get("tiles", {}).items()},
+    }
+
+
+def config_to_dict(config):
+    """Serialisiert das Konfigurationsmodell (Kacheln als TileConfig oder Dict)"""
+    data = {k: v for k, v in config.items() if k != "tiles"}
+    data["tiles"] = {
+        tile_id: tile.to_dict() if isinstance(tile, TileConfig) else tile
+        for tile_id, tile in config.get("tiles", {}).items()
+    }
+    return data
+
+
+class ShortcutPathIndex:
+    """
+    Globaler Index über alle Kacheln: normalisierter Pfad → (tile_id, Position).
+
+    Wird bei jedem Hinzufügen/Entfernen inkrementell aktualisiert (nur die
+    Positionen ab der geänderten Stelle) und erlaubt Duplikat-Prüfungen und
+    "In welcher Kachel liegt diese Datei?"-Abfragen in O(1).
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return normalize_path(path) in self._entries
+
+    def lookup(self, path):
+        """Gibt (tile_id, Position) zurück oder None"""
+        return self._entries.get(normalize_path(path))
+
+    def rebuild(self, tiles):
+        """Baut den Index aus allen geladenen Kacheln neu auf"""
+        self._entries.clear()
+        for tile_id, tile_config in tiles.items():
+            if tile_config.shortcuts:
+                self.reindex_tile(tile_id, tile_config.shortcuts)
+
+    def reindex_tile(self, tile_id, shortcuts, start=0):
+        """Aktualisiert die Positionen einer Kachel ab start"""
+        entries = self._entries
+        for i in range(start, len(shortcuts)):
+            entries[shortcuts[i].norm_path] = (tile_id, i)
+
+    def discard(self, tile_id, shortcut):
+        """Entfernt eine Verknüpfung (nur wenn sie dieser Kachel zugeordnet ist)"""
+        entry = self._entries.get(shortcut.norm_path)
+        if entry is not None and entry[0] == tile_id:
+            del self._entries[shortcut.norm_path]
+
+    def discard_tile(self, tile_id, shortcuts):
+        for shortcut in shortcuts:
+            self.discard(tile_id, shortcut)
+
+
+@dataclass(slots=True)
+class PathState:
+    """Ergebnis der Prüfung eines Pfads"""
+
+    exists: bool
+    mtime_ns: int = 0
+    size: int = 0
+    # st_file_attributes (nur Windows)
+    attributes: int = 0
+
+    @classmethod
+    def from_stat(cls, st):
+        return cls(True, st.st_mtime_ns, st.st_size, getattr(st, "st_file_attributes", 0))
+
+    @property
+    def stamp(self):
+        return (self.mtime_ns, self.size)
+
+
+class ShortcutValidator:
+    """
+    Prüft viele Pfade mit einem scandir() pro Verzeichnis statt einem
+    exists()/stat() pro Datei. Unter Windows liefert die Verzeichnisliste
+    Attribute, Größe und mtime gleich mit — auf einem umgeleiteten
+    Netzwerk-Desktop ein Roundtrip pro Verzeichnis statt pro Verknüpfung.
+    Die Verzeichnisse laufen parallel in einem Thread-Pool.
+
+    Verzeichnisse mit weniger als MIN_SCAN_NAMES gesuchten Dateien (z.B. eine
+    einzelne Verknüpfung nach System32) werden einzeln per stat() geprüft.
+
+    Dateinamen werden nur unter Windows ohne Groß-/Kleinschreibung
+    verglichen; jeder übergebene Pfad bekommt einen eigenen Eintrag.
+    """
+
+    MAX_WORKERS = 8
+    MIN_SCAN_NAMES = 4
+    FOLD_CASE = os.name == "nt"
+
+    def __init__(self, max_workers=MAX_WORKERS, min_scan_names=MIN_SCAN_NAMES, fold_case=FOLD_CASE):
+        self.max_workers = max(1, max_workers)
+        self.min_scan_names = min_scan_names
+        self.fold_case = fold_case
+        # Austauschbar (Benchmarks simulieren damit Netzwerk-Latenz)
+        self.scandir = os.scandir
+        self.stat = os.stat
+
+    def scan(self, paths, details=True):
+        """
+        Gibt {Pfad: PathState} für alle Pfade zurück. details=False prüft nur
+        die Existenz (spart unter Linux das stat() pro gefundener Datei).
+        """
+        groups = {}
+        split = os.path.split
+        fold = str.casefold if self.fold_case else str
+        for path in paths:
+            if path:
+                directory, name = split(path)
+                groups.setdefault(directory, {}).setdefault(fold(name), []).append(path)
+        items = list(groups.items())
+        if len(items) <= 1 or self.max_workers == 1:
+            parts = [self._scan_directory(d, names, details) for d, names in items]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items)),
+                                    thread_name_prefix="scan") as pool:
+                parts = list(pool.map(lambda item: self._scan_directory(*item, details), items))
+        results = {}
+        for part in parts:
+            results.update(part)
+        return results
+
+    def _stat_one(self, path):
+        try:
+            return PathState.from_stat(self.stat(path))
+        except (FileNotFoundError, NotADirectoryError):
+            return PathState(False)
+        except OSError:
+            return PathState(True)  # unbekannt (z.B. keine Rechte) — nicht als fehlend melden
+
+    def _scan_directory(self, directory, names, details=True):
+        """names: {Dateiname (unter Windows casefold): [Pfade]}"""
+        if sum(map(len, names.values())) < self.min_scan_names:
+            return {path: self._stat_one(path) for paths in names.values() for path in paths}
+        found = {}
+        fold = str.casefold if self.fold_case else str
+        try:
+            with self.scandir(directory or ".") as it:
+                for entry in it:
+                    key = fold(entry.name)
+                    if key not in names:
+                        continue
+                    if not details:
+                        found[key] = PathState(True)
+                        continue
+                    try:
+                        found[key] = PathState.from_stat(entry.stat())
+                    except OSError:
+                        pass  # z.B. defekter Symlink = fehlt
+        except (FileNotFoundError, NotADirectoryError):
+            pass  # ganzes Verzeichnis weg
+        except OSError:
+            return {path: self._stat_one(path) for paths in names.values() for path in paths}
+        missing = PathState(False)
+        return {path: found.get(key, missing) for key, paths in names.items() for path in paths}
@@ -0,0 +1,507 @@
+"""
+Persistenz: JSON-Snapshot + Änderungsjournal oder SQLite
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from .diagnostics import METRICS
+from .model import config_to_dict, migrate_config
+
+DEFAULT_CONFIG_FILE = Path.home() / ".desktop_folder_widget_v3.json"
+DEFAULT_JOURNAL_FILE = Path.home() / ".desktop_folder_widget_v3.journal"
+DEFAULT_DB_FILE = Path.home() / ".desktop_folder_widget_v3.sqlite3"
+
+
+class ConfigJournal:
+    """
+    Append-only Änderungsprotokoll neben der Konfigurationsdatei.
+
+    Jede Änderung wird als eine JSON-Zeile angehängt, statt die komplette
+    Konfiguration neu zu schreiben (Aufwand O(Änderung) statt O(alle Shortcuts)).
+    Beim Laden wird das Journal auf den Snapshot angewendet; wird es größer als
+    COMPACT_THRESHOLD, verdichtet der Manager es in einen neuen Snapshot.
+
+    Jede Operation trägt eine fortlaufende Nummer ("seq"). Der Snapshot merkt
+    sich die zuletzt enthaltene Nummer, sodass ein Absturz zwischen Snapshot-
+    Schreiben und Journal-Leeren keine Operation doppelt anwendet.
+    """
+
+    COMPACT_THRESHOLD = 64 * 1024  # Bytes
+
+    # Operationstypen
+    OP_ADD_SHORTCUT = "add_shortcut"
+    OP_REMOVE_SHORTCUT = "remove_shortcut"
+    OP_CLEAR_SHORTCUTS = "clear_shortcuts"
+    OP_MOVE = "move"
+    OP_RESIZE = "resize"
+    OP_RENAME = "rename"
+    OP_SET = "set"
+    OP_CREATE_TILE = "create_tile"
+    OP_DELETE_TILE = "delete_tile"
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.seq = 0
+        self.size = 0
+        self._repair_tail()
+
+    def _repair_tail(self):
+        """Schneidet eine beim Absturz abgebrochene letzte Zeile ab"""
+        try:
+            with open(self.path, "r+b") as f:
+                data = f.read()
+                end = data.rfind(b"\n") + 1
+                if end != len(data):
+                    f.truncate(end)
+                self.size = end
+        except OSError:
+            self.size = 0
+
+    def append(self, ops):
+        """Hängt Operationen an und schreibt sie sofort auf die Platte (ein fsync)"""
+        lines = []
+        for op in ops:
+            self.seq += 1
+            op["seq"] = self.seq
+            lines.append(json.dumps(op, ensure_ascii=False, separators=(",", ":")) + "\n")
+        data = "".join(lines).encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.size += len(data)
+        METRICS.inc("config.journal_writes")
+        METRICS.inc("config.journal_bytes", len(data))
+
+    def read_ops(self):
+        """Liest alle vollständigen Operationen (eine abgebrochene letzte Zeile wird ignoriert)"""
+        ops = []
+        try:
+            with open(self.path, "rb") as f:
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # Absturz mitten im Schreiben
+                    try:
+                        ops.append(json.loads(raw.decode("utf-8")))
+                    except ValueError:
+                        break
+        except OSError:
+            pass
+        return ops
+
+    def needs_compaction(self):
+        """True wenn das Journal in einen Snapshot verdichtet werden sollte"""
+        return self.size >= self.COMPACT_THRESHOLD
+
+    def truncate(self):
+        """Leert das Journal (nach erfolgreichem Snapshot)"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self.size = 0
+
+    @staticmethod
+    def apply(config, op):
+        """Wendet eine Operation auf ein Konfigurations-Dict an"""
+        kind = op.get("op")
+        tiles = config.setdefault("tiles", {})
+        if kind == ConfigJournal.OP_CREATE_TILE:
+            tiles[op["tile"]] = op["config"]
+            return True
+        if kind == ConfigJournal.OP_DELETE_TILE:
+            return tiles.pop(op.get("tile"), None) is not None
+
+        tile = tiles.get(op.get("tile"))
+        if tile is None:
+            return False
+
+        if kind == ConfigJournal.OP_ADD_SHORTCUT:
+            shortcuts = tile.setdefault("shortcuts", [])
+            index = max(0, min(op.get("index", len(shortcuts)), len(shortcuts)))
+            shortcuts.insert(index, op["shortcut"])
+        elif kind == ConfigJournal.OP_REMOVE_SHORTCUT:
+            shortcuts = tile.get("shortcuts", [])
+            index = op.get("index", -1)
+            path = op.get("path")
+            if 0 <= index < len(shortcuts) and shortcuts[index].get("path") == path:
+                del shortcuts[index]
+            else:
+                # Index passt nicht (mehr) — über den Pfad suchen
+                for i, s in enumerate(shortcuts):
+                    if s.get("path") == path:
+                        del shortcuts[i]
+                        break
+        elif kind == ConfigJournal.OP_CLEAR_SHORTCUTS:
+            tile["shortcuts"] = []
+        elif kind == ConfigJournal.OP_MOVE:
+            tile["pos_x"] = op["pos_x"]
+            tile["pos_y"] = op["pos_y"]
+        elif kind == ConfigJournal.OP_RENAME:
+            tile["name"] = op["name"]
+        elif kind in (ConfigJournal.OP_RESIZE, ConfigJournal.OP_SET):
+            tile.update(op.get("values", {}))
+        else:
+            return False
+        return True
+
+
+class JsonConfigStore:
+    """
+    Standard-Persistenz: JSON-Snapshot plus Änderungsjournal (ConfigJournal).
+    """
+
+    def __init__(self, config_file, journal_file):
+        self.config_file = Path(config_file)
+        self.journal = ConfigJournal(journal_file)
+
+    def load(self, visible_rect=None):
+        """Lädt Snapshot + Journal (der JSON-Snapshot wird immer komplett gelesen)"""
+        config = {"tiles": {}}
+        if self.config_file.exists():
+            try:
+                with open(self.config_file, "r", encoding="utf-8") as f:
+                    config = json.load(f)
+            except:
+                pass
+
+        # Journal-Operationen nach dem Snapshot nachspielen
+        snapshot_seq = config.get("journal_seq", 0)
+        self.journal.seq = snapshot_seq
+        replayed = 0
+        for op in self.journal.read_ops():
+            seq = op.get("seq", 0)
+            if seq <= snapshot_seq:
+                continue  # bereits im Snapshot enthalten
+            ConfigJournal.apply(config, op)
+            self.journal.seq = max(self.journal.seq, seq)
+            replayed += 1
+        if replayed:
+            print(f"Journal: {replayed} Änderung(en) nachgeladen")
+
+        for tile in config.get("tiles", {}).values():
+            tile.setdefault("shortcuts", [])
+
+        if self.journal.needs_compaction():
+            self.save(config)
+        return config
+
+    def load_shortcuts(self, tile_id):
+        """JSON lädt alle Kacheln sofort — hier gibt es nichts nachzuladen"""
+        return []
+
+    def save(self, config):
+        """Schreibt einen vollständigen Snapshot und leert das Journal"""
+        config["journal_seq"] = self.journal.seq
+        data = config_to_dict(config)
+        # Atomar schreiben: erst temporäre Datei, dann ersetzen
+        tmp_file = self.config_file.with_name(self.config_file.name + ".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+            written = os.fstat(f.fileno()).st_size
+        os.replace(tmp_file, self.config_file)
+        METRICS.inc("config.snapshots")
+        METRICS.inc("config.snapshot_bytes", written)
+        self.journal.truncate()
+
+    def record(self, config, ops):
+        """Hängt Änderungen ans Journal an, verdichtet bei Bedarf"""
+        METRICS.inc("config.records", len(ops))
+        self.journal.append(ops)
+        if self.journal.needs_compaction():
+            self.save(config)
+
+    def close(self):
+        pass
+
+
+class SQLiteConfigStore:
+    """
+    Alternative Persistenz in einer SQLite-Datenbank (WAL-Modus).
+
+    Kacheln und Verknüpfungen liegen in eigenen Tabellen. Verknüpfungen
+    tragen einen Sortierschlüssel (position), daher ist Einfügen oder
+    Entfernen an beliebiger Stelle ein einzelnes INSERT/DELETE. Die
+    Operationen aus ConfigJournal werden direkt in Zeilen-Statements
+    übersetzt.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS tiles (
+            tile_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL DEFAULT 'Ordner',
+            pos_x INTEGER,
+            pos_y INTEGER,
+            settings TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE TABLE IF NOT EXISTS shortcuts (
+            id INTEGER PRIMARY KEY,
+            tile_id TEXT NOT NULL REFERENCES tiles(tile_id) ON DELETE CASCADE,
+            position REAL NOT NULL,
+            name TEXT NOT NULL,
+            path TEXT NOT NULL,
+            extra TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_shortcuts_tile ON shortcuts(tile_id, position);
+        CREATE INDEX IF NOT EXISTS idx_shortcuts_path ON shortcuts(path);
+    """
+
+    # Abstand der Sortierschlüssel beim Neu-Nummerieren
+    POSITION_STEP = 1024.0
+
+    # Spalten der tiles-Tabelle; alle übrigen Kachel-Einstellungen liegen als JSON in "settings"
+    TILE_COLUMNS = ("name", "pos_x", "pos_y", "shortcuts")
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+    # --- Hilfsfunktionen ---
+
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @staticmethod
+    def _split_shortcut(shortcut):
+        """Trennt name/path von zusätzlichen Feldern (als JSON gespeichert)"""
+        extra = {k: v for k, v in shortcut.items() if k not in ("name", "path")}
+        return shortcut.get("name", ""), shortcut.get("path", ""), (json.dumps(extra, ensure_ascii=False) if extra else None)
+
+    @staticmethod
+    def _join_shortcut(name, path, extra):
+        shortcut = {"name": name, "path": path}
+        if extra:
+            shortcut.update(json.loads(extra))
+        return shortcut
+
+    def _tile_row(self, tile_id, tile):
+        settings = {k: v for k, v in tile.items() if k not in self.TILE_COLUMNS}
+        return (tile_id, tile.get("name", "Ordner"), tile.get("pos_x"), tile.get("pos_y"),
+                json.dumps(settings, ensure_ascii=False))
+
+    def _insert_tile(self, tile_id, tile):
+        # Upsert statt INSERT OR REPLACE — REPLACE würde per CASCADE die Verknüpfungen löschen
+        self.conn.execute(
+            "INSERT INTO tiles (tile_id, name, pos_x, pos_y, settings) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(tile_id) DO UPDATE SET name = excluded.name, pos_x = excluded.pos_x, "
+            "pos_y = excluded.pos_y, settings = excluded.settings",
+            self._tile_row(tile_id, tile)
+        )
+        if "shortcuts" in tile:
+            self._replace_shortcuts(tile_id, tile["shortcuts"])
+
+    def _replace_shortcuts(self, tile_id, shortcuts):
+        self.conn.execute("DELETE FROM shortcuts WHERE tile_id = ?", (tile_id,))
+        self.conn.executemany(
+            "INSERT INTO shortcuts (tile_id, position, name, path, extra) VALUES (?, ?, ?, ?, ?)",
+            [(tile_id, (i + 1) * self.POSITION_STEP) + self._split_shortcut(s)
+             for i, s in enumerate(shortcuts)]
+        )
+
+    def _renumber(self, tile_id):
+        """Verteilt die Sortierschlüssel einer Kachel neu (wenn kein Platz mehr zwischen zwei Einträgen ist)"""
+        ids = [row[0] for row in self.conn.execute(
+            "SELECT id FROM shortcuts WHERE tile_id = ? ORDER BY position", (tile_id,))]
+        self.conn.executemany(
+            "UPDATE shortcuts SET position = ? WHERE id = ?",
+            [((i + 1) * self.POSITION_STEP, row_id) for i, row_id in enumerate(ids)]
+        )
+
+    def _position_for_index(self, tile_id, index):
+        """Berechnet einen Sortierschlüssel, der den neuen Eintrag an Stelle index einordnet"""
+        # Ohne index oder hinter dem Ende → anhängen (wie ConfigJournal.apply)
+        count = self.conn.execute(
+            "SELECT COUNT(*) FROM shortcuts WHERE tile_id = ?", (tile_id,)).fetchone()[0]
+        index = count if index is None else min(max(0, index), count)
+        for _ in range(2):
+            offset = max(0, index - 1)
+            rows = [r[0] for r in self.conn.execute(
+                "SELECT position FROM shortcuts WHERE tile_id = ? ORDER BY position LIMIT 2 OFFSET ?",
+                (tile_id, offset))]
+            if index == 0:
+                before, after = None, (rows[0] if rows else None)
+            else:
+                before = rows[0] if rows else None
+                after = rows[1] if len(rows) > 1 else None
+
+            if before is None and after is None:
+                return self.POSITION_STEP
+            if before is None:
+                return after - self.POSITION_STEP
+            if after is None:
+                return before + self.POSITION_STEP
+            middle = (before + after) / 2
+            if before < middle < after:
+                return middle
+            self._renumber(tile_id)
+        return middle
+
+    @staticmethod
+    def _in_rect(tile, rect):
+        if rect is None:
+            return True
+        x, y = tile.get("pos_x"), tile.get("pos_y")
+        if x is None or y is None:
+            return True
+        left, top, right, bottom = rect
+        return left <= x < right and top <= y < bottom
+
+    # --- Öffentliche Schnittstelle (wie JsonConfigStore) ---
+
+    def load(self, visible_rect=None):
+        """
+        Lädt alle Kacheln, aber Verknüpfungen nur für Kacheln innerhalb von
+        visible_rect (left, top, right, bottom). Kacheln außerhalb haben keinen
+        "shortcuts"-Eintrag und werden über load_shortcuts() nachgeladen.
+        """
+        config = {"schema_version": int(self._get_meta("schema_version") or 1), "tiles": {}}
+        for tile_id, name, pos_x, pos_y, settings in self.conn.execute(
+                "SELECT tile_id, name, pos_x, pos_y, settings FROM tiles ORDER BY rowid"):
+            tile = json.loads(settings) if settings else {}
+            tile["name"] = name
+            if pos_x is not None:
+                tile["pos_x"] = pos_x
+            if pos_y is not None:
+                tile["pos_y"] = pos_y
+            config["tiles"][tile_id] = tile
+
+        visible = [tile_id for tile_id, tile in config["tiles"].items()
+                   if self._in_rect(tile, visible_rect)]
+        for tile_id in visible:
+            config["tiles"][tile_id]["shortcuts"] = []
+
+        if len(visible) == len(config["tiles"]):
+            rows = self.conn.execute(
+                "SELECT tile_id, name, path, extra FROM shortcuts ORDER BY tile_id, position")
+        else:
+            placeholders = ",".join("?" * len(visible))
+            rows = self.conn.execute(
+                f"SELECT tile_id, name, path, extra FROM shortcuts WHERE tile_id IN ({placeholders}) "
+                f"ORDER BY tile_id, position", visible)
+        for tile_id, name, path, extra in rows:
+            config["tiles"][tile_id]["shortcuts"].append(self._join_shortcut(name, path, extra))
+        return config
+
+    def load_shortcuts(self, tile_id):
+        """Lädt die Verknüpfungen einer einzelnen Kachel"""
+        return [self._join_shortcut(name, path, extra) for name, path, extra in self.conn.execute(
+            "SELECT name, path, extra FROM shortcuts WHERE tile_id = ? ORDER BY position", (tile_id,))]
+
+    def save(self, config):
+        """Synchronisiert die komplette Konfiguration in einer Transaktion"""
+        data = config_to_dict(config)
+        METRICS.inc("config.snapshots")
+        with self.conn:
+            if "schema_version" in data:
+                self._set_meta("schema_version", str(data["schema_version"]))
+            tiles = data.get("tiles", {})
+            for tile_id, tile in tiles.items():
+                self._insert_tile(tile_id, tile)
+            existing = [row[0] for row in self.conn.execute("SELECT tile_id FROM tiles")]
+            for tile_id in existing:
+                if tile_id not in tiles:
+                    self.conn.execute("DELETE FROM tiles WHERE tile_id = ?", (tile_id,))
+
+    def record(self, config, ops):
+        """Führt Änderungen als einzelne Zeilen-Statements in einer Transaktion aus"""
+        METRICS.inc("config.records", len(ops))
+        with self.conn:
+            for op in ops:
+                self.apply(op)
+
+    def apply(self, op):
+        """Übersetzt eine ConfigJournal-Operation in SQL"""
+        kind = op.get("op")
+        tile_id = op.get("tile")
+        if kind == ConfigJournal.OP_ADD_SHORTCUT:
+            position = self._position_for_index(tile_id, op.get("index"))
+            self.conn.execute(
+                "INSERT INTO shortcuts (tile_id, position, name, path, extra) VALUES (?, ?, ?, ?, ?)",
+                (tile_id, position) + self._split_shortcut(op["shortcut"])
+            )
+        elif kind == ConfigJournal.OP_REMOVE_SHORTCUT:
+            row = self.conn.execute(
+                "SELECT id, path FROM shortcuts WHERE tile_id = ? ORDER BY position LIMIT 1 OFFSET ?",
+                (tile_id, max(0, op.get("index", 0)))).fetchone()
+            if row and row[1] == op.get("path"):
+                self.conn.execute("DELETE FROM shortcuts WHERE id = ?", (row[0],))
+            else:
+                self.conn.execute(
+                    "DELETE FROM shortcuts WHERE id = (SELECT id FROM shortcuts "
+                    "WHERE tile_id = ? AND path = ? ORDER BY position LIMIT 1)",
+                    (tile_id, op.get("path")))
+        elif kind == ConfigJournal.OP_CLEAR_SHORTCUTS:
+            self.conn.execute("DELETE FROM shortcuts WHERE tile_id = ?", (tile_id,))
+        elif kind == ConfigJournal.OP_MOVE:
+            self.conn.execute("UPDATE tiles SET pos_x = ?, pos_y = ? WHERE tile_id = ?",
+                              (op["pos_x"], op["pos_y"], tile_id))
+        elif kind == ConfigJournal.OP_RENAME:
+            self.conn.execute("UPDATE tiles SET name = ? WHERE tile_id = ?", (op["name"], tile_id))
+        elif kind in (ConfigJournal.OP_RESIZE, ConfigJournal.OP_SET):
+            row = self.conn.execute("SELECT settings FROM tiles WHERE tile_id = ?", (tile_id,)).fetchone()
+            if row:
+                settings = json.loads(row[0]) if row[0] else {}
+                settings.update(op.get("values", {}))
+                self.conn.execute("UPDATE tiles SET settings = ? WHERE tile_id = ?",
+                                  (json.dumps(settings, ensure_ascii=False), tile_id))
+        elif kind == ConfigJournal.OP_CREATE_TILE:
+            self._insert_tile(tile_id, op["config"])
+        elif kind == ConfigJournal.OP_DELETE_TILE:
+            self.conn.execute("DELETE FROM shortcuts WHERE tile_id = ?", (tile_id,))
+            self.conn.execute("DELETE FROM tiles WHERE tile_id = ?", (tile_id,))
+
+    def import_json(self, config_file, journal_file):
+        """
+        Einmaliger Import einer bestehenden JSON-Konfiguration. Die JSON-Dateien
+        bleiben als Sicherung liegen. Gibt True zurück, wenn importiert wurde.
+        """
+        if self._get_meta("imported_json"):
+            return False
+        imported = False
+        if Path(config_file).exists() or Path(journal_file).exists():
+            config = JsonConfigStore(config_file, journal_file).load()
+            migrate_config(config)
+            self.save(config)
+            imported = True
+            count = sum(len(t.get("shortcuts", [])) for t in config.get("tiles", {}).values())
+            print(f"JSON-Konfiguration nach SQLite importiert ({count} Verknüpfungen)")
+        with self.conn:
+            self._set_meta("imported_json", "1")
+        return imported
+
+
+def create_config_store(backend=None, config_file=DEFAULT_CONFIG_FILE,
+                        journal_file=DEFAULT_JOURNAL_FILE, db_file=DEFAULT_DB_FILE):
+    """
+    Persistenz-Backend nach Name ("json" oder "sqlite", sonst Umgebungsvariable
+    DESKTOP_FOLDER_STORE). SQLite übernimmt beim ersten Mal die JSON-Dateien.
+    """
+    backend = backend or os.environ.get("DESKTOP_FOLDER_STORE", "json")
+    if backend == "sqlite":
+        store = SQLiteConfigStore(db_file)
+        store.import_json(config_file, journal_file)
+        return store
+    return JsonConfigStore(config_file, journal_file)
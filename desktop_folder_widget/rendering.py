@@ -0,0 +1,373 @@
+"""
+Rendering: 3D-Kachelhintergrund, Icons und gecachte Kachelbilder
+(Pillow wird erst beim Zeichnen geladen)
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from .diagnostics import METRICS, timed
+
+
+@timed("render.tile_background")
+def create_3d_tile_background(width, height, base_color=(26, 26, 46), corner_radius=16):
+    """
+    Erstellt ein 3D-Kachel-Hintergrundbild mit Licht-, Schatten- und Glaseffekten.
+    Gibt ein PIL Image im RGBA-Modus zurück.
+    """
+    try:
+        from PIL import Image, ImageDraw, ImageFilter
+    except ImportError:
+        return None
+
+    # Größeres Bild für Anti-Aliasing
+    scale = 2
+    w, h = width * scale, height * scale
+    r = corner_radius * scale
+
+    img = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+
+    # --- Äußerer Schatten (Drop Shadow) ---
+    shadow = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    shadow_draw = ImageDraw.Draw(shadow)
+    shadow_offset = 6 * scale
+    shadow_draw.rounded_rectangle(
+        [shadow_offset, shadow_offset, w - 2 * scale, h - 2 * scale],
+        radius=r,
+        fill=(0, 0, 0, 100)
+    )
+    shadow = shadow.filter(ImageFilter.GaussianBlur(radius=8 * scale))
+    img = Image.alpha_composite(img, shadow)
+
+    # --- Hauptform (dunkler Hintergrund mit leichtem Gradient) ---
+    main = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    main_draw = ImageDraw.Draw(main)
+
+    # Gradient von oben (heller) nach unten (dunkler) simulieren
+    br, bg_c, bb = base_color
+    for i in range(h):
+        t = i / h
+        # Oben: etwas heller, unten: etwas dunkler
+        cr = int(br + (1 - t) * 18)
+        cg = int(bg_c + (1 - t) * 18)
+        cb = int(bb + (1 - t) * 24)
+        cr = min(255, max(0, cr))
+        cg = min(255, max(0, cg))
+        cb = min(255, max(0, cb))
+
+    # Einfacher Gradient: Zwei Rechtecke überlagert
+    # Obere Hälfte heller
+    main_draw.rounded_rectangle(
+        [0, 0, w - 1, h - 1],
+        radius=r,
+        fill=(br + 12, bg_c + 12, bb + 18, 210)
+    )
+    # Untere Hälfte dunkler (Overlay)
+    gradient_overlay = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    go_draw = ImageDraw.Draw(gradient_overlay)
+    go_draw.rounded_rectangle(
+        [0, h // 3, w - 1, h - 1],
+        radius=r,
+        fill=(0, 0, 0, 40)
+    )
+    main = Image.alpha_composite(main, gradient_overlay)
+    img = Image.alpha_composite(img, main)
+
+    # --- Innerer Lichtrand oben (3D-Highlight) ---
+    highlight = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    hl_draw = ImageDraw.Draw(highlight)
+    # Heller Strich oben
+    hl_draw.rounded_rectangle(
+        [2 * scale, 2 * scale, w - 2 * scale, 6 * scale],
+        radius=r,
+        fill=(255, 255, 255, 35)
+    )
+    # Heller Rand oben und links (Licht von oben links)
+    hl_draw.rounded_rectangle(
+        [1 * scale, 1 * scale, w - 1 * scale, h // 4],
+        radius=r,
+        fill=(255, 255, 255, 15)
+    )
+    highlight = highlight.filter(ImageFilter.GaussianBlur(radius=3 * scale))
+    img = Image.alpha_composite(img, highlight)
+
+    # --- Glasglanz (Specular Highlight) ---
+    specular = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    spec_draw = ImageDraw.Draw(specular)
+    # Elliptischer Glanz oben
+    spec_draw.ellipse(
+        [w // 6, -h // 3, w * 5 // 6, h // 4],
+        fill=(255, 255, 255, 20)
+    )
+    specular = specular.filter(ImageFilter.GaussianBlur(radius=12 * scale))
+    img = Image.alpha_composite(img, specular)
+
+    # --- Rand (feiner heller Rand oben, dunkler unten = 3D) ---
+    border = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    bd_draw = ImageDraw.Draw(border)
+    # Äußerer Rand - helle Kante oben
+    bd_draw.rounded_rectangle(
+        [0, 0, w - 1, h - 1],
+        radius=r,
+        outline=(255, 255, 255, 40),
+        width=scale
+    )
+    # Dunkle Kante unten rechts
+    dark_edge = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    de_draw = ImageDraw.Draw(dark_edge)
+    de_draw.rounded_rectangle(
+        [1, h // 2, w - 1, h - 1],
+        radius=r,
+        outline=(0, 0, 0, 50),
+        width=scale
+    )
+    dark_edge = dark_edge.filter(ImageFilter.GaussianBlur(radius=2))
+    border = Image.alpha_composite(border, dark_edge)
+    img = Image.alpha_composite(img, border)
+
+    # Herunterskalieren für Anti-Aliasing
+    if hasattr(Image, 'Resampling'):
+        img = img.resize((width, height), Image.Resampling.LANCZOS)
+    else:
+        img = img.resize((width, height), Image.LANCZOS)
+
+    return img
+
+
+def faded_icon(img, opacity=0.35):
+    """Blasse Variante eines Icons (Verknüpfung, deren Datei fehlt)"""
+    img = img.convert("RGBA")
+    alpha = img.getchannel("A").point(lambda a: int(a * opacity))
+    img.putalpha(alpha)
+    return img
+
+
+@timed("render.folder_icon")
+def create_3d_folder_icon(width, height):
+    """Erstellt ein 3D-Ordner-Icon mit Licht und Schatten"""
+    try:
+        from PIL import Image, ImageDraw, ImageFilter
+    except ImportError:
+        return None
+
+    scale = 2
+    w, h = width * scale, height * scale
+    img = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+
+    cx, cy = w // 2, h // 2 - 15 * scale
+
+    fw = 80 * scale
+    fh = 60 * scale
+    tab_w = 34 * scale
+    tab_h = 14 * scale
+    r = 6 * scale
+
+    # --- Schatten unter dem Ordner ---
+    shadow = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    s_draw = ImageDraw.Draw(shadow)
+    s_draw.rounded_rectangle(
+        [cx - fw//2 + 4*scale, cy - fh//2 + 6*scale,
+         cx + fw//2 + 4*scale, cy + fh//2 + 6*scale],
+        radius=r,
+        fill=(0, 0, 0, 80)
+    )
+    shadow = shadow.filter(ImageFilter.GaussianBlur(radius=6*scale))
+    img = Image.alpha_composite(img, shadow)
+
+    # --- Tab (Lasche) mit 3D ---
+    tab = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    t_draw = ImageDraw.Draw(tab)
+    # Dunklere Basis
+    t_draw.rounded_rectangle(
+        [cx - fw//2, cy - fh//2 - tab_h,
+         cx - fw//2 + tab_w, cy - fh//2 + 2*scale],
+        radius=r//2,
+        fill=(230, 160, 0, 255)
+    )
+    # Heller Glanz
+    t_draw.rounded_rectangle(
+        [cx - fw//2 + 2*scale, cy - fh//2 - tab_h + 2*scale,
+         cx - fw//2 + tab_w - 2*scale, cy - fh//2 - tab_h//2],
+        radius=r//3,
+        fill=(255, 210, 80, 100)
+    )
+    img = Image.alpha_composite(img, tab)
+
+    # --- Ordner-Körper ---
+    body = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    b_draw = ImageDraw.Draw(body)
+
+    # Hauptfläche mit Gradient-Simulation
+    # Obere Hälfte heller
+    b_draw.rounded_rectangle(
+        [cx - fw//2, cy - fh//2, cx + fw//2, cy + fh//2],
+        radius=r,
+        fill=(255, 200, 30, 255)
+    )
+    # Untere Hälfte dunkler
+    b_draw.rounded_rectangle(
+        [cx - fw//2, cy, cx + fw//2, cy + fh//2],
+        radius=r,
+        fill=(235, 175, 10, 255)
+    )
+    img = Image.alpha_composite(img, body)
+
+    # --- Glanz oben auf dem Ordner ---
+    gloss = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    g_draw = ImageDraw.Draw(gloss)
+    g_draw.rounded_rectangle(
+        [cx - fw//2 + 4*scale, cy - fh//2 + 3*scale,
+         cx + fw//2 - 4*scale, cy - fh//2 + fh//3],
+        radius=r - 2*scale,
+        fill=(255, 255, 255, 60)
+    )
+    gloss = gloss.filter(ImageFilter.GaussianBlur(radius=3*scale))
+    img = Image.alpha_composite(img, gloss)
+
+    # --- Lichtreflexion (Specular) ---
+    spec = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    sp_draw = ImageDraw.Draw(spec)
+    sp_draw.ellipse(
+        [cx - fw//4, cy - fh//2 - 2*scale, cx + fw//4, cy - fh//6],
+        fill=(255, 255, 255, 30)
+    )
+    spec = spec.filter(ImageFilter.GaussianBlur(radius=6*scale))
+    img = Image.alpha_composite(img, spec)
+
+    # --- Feiner Rand ---
+    edge = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    e_draw = ImageDraw.Draw(edge)
+    e_draw.rounded_rectangle(
+        [cx - fw//2, cy - fh//2, cx + fw//2, cy + fh//2],
+        radius=r,
+        outline=(200, 150, 0, 80),
+        width=scale
+    )
+    img = Image.alpha_composite(img, edge)
+
+    # Herunterskalieren
+    if hasattr(Image, 'Resampling'):
+        img = img.resize((width, height), Image.Resampling.LANCZOS)
+    else:
+        img = img.resize((width, height), Image.LANCZOS)
+
+    return img
+
+
+class TileFace:
+    """
+    Fertig gezeichnete eingeklappte Kachel: ein Bild (Hintergrund + Icons)
+    und die darüber liegenden Canvas-Elemente (Texte, Ersatz-Rechtecke) als
+    (Art, args, kwargs). Wird beim Zeichnen mitgeschrieben und beim nächsten
+    Start ohne Icon-Extraktion wieder abgespielt.
+    """
+
+    def __init__(self, image, items=None):
+        self.image = image
+        self.items = items or []
+
+    @classmethod
+    def blank(cls, width, height):
+        from PIL import Image
+        return cls(Image.new("RGBA", (width, height), (0, 0, 0, 0)))
+
+    def paste(self, img, x, y, anchor="center"):
+        """Legt ein Bild auf (Koordinaten wie Canvas.create_image)"""
+        from PIL import Image
+        img = img.convert("RGBA")
+        if anchor == "center":
+            x -= img.width // 2
+            y -= img.height // 2
+        layer = self.image.copy()
+        layer.paste((0, 0, 0, 0), (0, 0) + layer.size)
+        layer.paste(img, (x, y))
+        self.image = Image.alpha_composite(self.image, layer)
+
+    def record(self, kind, args, kwargs):
+        self.items.append((kind, list(args), dict(kwargs)))
+
+    def replay(self, canvas):
+        """Zeichnet die Canvas-Elemente (das Bild legt der Aufrufer darunter)"""
+        for kind, args, kwargs in self.items:
+            if isinstance(kwargs.get("font"), list):
+                kwargs = dict(kwargs, font=tuple(kwargs["font"]))
+            getattr(canvas, f"create_{kind}")(*args, **kwargs)
+
+    def digest(self):
+        data = json.dumps(self.items, sort_keys=True).encode("utf-8")
+        return hashlib.sha1(self.image.tobytes() + data).hexdigest()
+
+
+class TileFaceCache:
+    """
+    Kachelbilder auf der Platte: <id>.png + <id>.json (Signatur, Elemente).
+    Die Signatur fasst alles zusammen, wovon das Bild abhängt; passt sie
+    nicht mehr, wird das alte Bild trotzdem gezeigt, bis das neue fertig ist.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._digests = {}  # tile_id → digest des zuletzt geschriebenen Bildes
+
+    @staticmethod
+    def signature(config, width, height):
+        shortcuts = config.shortcuts or []
+        data = [
+            1, width, height, config.name, config.hide_shortcut_names,
+            config.collapsed_icon_w, config.collapsed_icon_h, config.collapsed_name_font_size,
+            [(s.path, s.name, s.missing) for s in shortcuts[:4]],
+        ]
+        return hashlib.sha1(json.dumps(data).encode("utf-8")).hexdigest()
+
+    def _paths(self, tile_id):
+        return self.directory / f"{tile_id}.png", self.directory / f"{tile_id}.json"
+
+    def load(self, tile_id):
+        """Gibt (Signatur, TileFace) zurück oder None"""
+        png, meta = self._paths(tile_id)
+        try:
+            from PIL import Image
+            with open(meta, encoding="utf-8") as f:
+                data = json.load(f)
+            with Image.open(png) as img:
+                image = img.convert("RGBA")
+        except Exception:
+            METRICS.inc("render.faces.missing")
+            return None
+        METRICS.inc("render.faces.loaded")
+        face = TileFace(image, [tuple(item) for item in data.get("items", [])])
+        self._digests[tile_id] = data.get("digest")
+        return data.get("signature"), face
+
+    def store(self, tile_id, signature, face):
+        """Schreibt das Bild (atomar), falls es sich geändert hat"""
+        digest = face.digest()
+        if self._digests.get(tile_id) == digest:
+            METRICS.inc("render.faces.unchanged")
+            return False
+        png, meta = self._paths(tile_id)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            face.image.save(str(png) + ".tmp", format="PNG")
+            os.replace(str(png) + ".tmp", png)
+            with open(str(meta) + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"signature": signature, "digest": digest, "items": face.items}, f)
+            os.replace(str(meta) + ".tmp", meta)
+        except OSError as e:
+            print(f"Kachelbild konnte nicht gespeichert werden: {e}")
+            return False
+        self._digests[tile_id] = digest
+        METRICS.inc("render.faces.stored")
+        return True
+
+    def discard(self, tile_id):
+        self._digests.pop(tile_id, None)
+        for path in self._paths(tile_id):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
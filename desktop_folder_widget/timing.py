@@ -0,0 +1,192 @@
+"""
+Zeitmessung: Stufen der Start-Pipeline und Spans für spürbare Vorgänge
+"""
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+
+class StartupTimeline:
+    """
+    Zeitmarken ab Programmstart in Millisekunden.
+
+        timeline = StartupTimeline()
+        ...
+        timeline.mark("erste Kachel")
+        timeline.elapsed("erste Kachel")  # → 84.2
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.start = clock()
+        self.marks = []
+
+    def mark(self, name):
+        """Setzt eine Marke und gibt die Zeit seit dem Start zurück (ms)"""
+        elapsed = (self.clock() - self.start) * 1000
+        self.marks.append((name, elapsed))
+        return elapsed
+
+    def elapsed(self, name):
+        """Zeit der ersten Marke mit diesem Namen, sonst None"""
+        for mark, elapsed in self.marks:
+            if mark == name:
+                return elapsed
+        return None
+
+    def as_dict(self):
+        return {name: round(elapsed, 1) for name, elapsed in self.marks}
+
+    def report(self):
+        lines = ["Start-Zeiten:"]
+        previous = 0.0
+        for name, elapsed in self.marks:
+            lines.append(f"  {name:<34} {elapsed:>8.1f} ms  (+{elapsed - previous:.1f})")
+            previous = elapsed
+        return "\n".join(lines)
+
+
+# ============================================================================
+# Spans für spürbare Vorgänge (Chrome-Trace-Format)
+# ============================================================================
+
+# Ohne pathlib: timing gehört zum Importpfad des Starters
+DEFAULT_TRACE_FILE = os.path.join(os.path.expanduser("~"), ".desktop_folder_widget_v3.trace.json")
+
+
+class _NullSpan:
+    """Span bei ausgeschalteter Aufzeichnung — tut nichts"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Ein laufender Span; set() ergänzt Argumente, die erst unterwegs bekannt sind"""
+
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = self.tracer.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = self.tracer.clock()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.events.append((self.name, self.start, end - self.start,
+                                   threading.get_ident(), self.args))
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+class SpanTracer:
+    """
+    Zeichnet Spans in einem Ringpuffer fester Größe auf (die ältesten fallen
+    heraus). Ausgeschaltet kostet span() nur eine Abfrage:
+
+        with TRACER.span("expand", tile="0", items=12):
+            ...
+
+    Spans im selben Thread verschachteln sich über ihre Zeiten; dump()
+    schreibt sie als Chrome-Trace (chrome://tracing, Perfetto).
+    """
+
+    DEFAULT_CAPACITY = 20_000
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, enabled=False, clock=time.perf_counter):
+        self.clock = clock
+        self.enabled = enabled
+        self.events = deque(maxlen=capacity)
+
+    @classmethod
+    def from_environment(cls):
+        """
+        DESKTOP_FOLDER_TRACE: "1" schaltet ein, eine Zahl > 1 setzt zusätzlich
+        die Größe des Ringpuffers
+        """
+        value = os.environ.get("DESKTOP_FOLDER_TRACE", "")
+        try:
+            number = int(value or 0)
+        except ValueError:
+            number = 1
+        return cls(number if number > 1 else cls.DEFAULT_CAPACITY, enabled=number > 0)
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, args)
+
+    def add(self, name, start, duration, thread=None, **args):
+        """Trägt einen schon gemessenen Span nach (start wie clock(), Sekunden)"""
+        if self.enabled:
+            self.events.append((name, start, duration, thread or threading.get_ident(), args))
+
+    def clear(self):
+        self.events.clear()
+
+    def trace_events(self):
+        """Aufgezeichnete Spans als Chrome-Trace-Events (Zeiten in µs)"""
+        pid = os.getpid()
+        threads = {thread.ident: thread.name for thread in threading.enumerate()}
+        events = []
+        for tid in {event[3] for event in self.events}:
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": threads.get(tid, str(tid))}})
+        for name, start, duration, tid, args in list(self.events):
+            events.append({"name": name, "ph": "X", "pid": pid, "tid": tid,
+                           "ts": round(start * 1e6, 1), "dur": round(duration * 1e6, 1),
+                           "args": args})
+        return events
+
+    def dump(self, path=None):
+        """Schreibt den Ringpuffer als Chrome-Trace-JSON und gibt den Pfad zurück"""
+        import json  # nicht schon beim Start laden
+        path = str(path or os.environ.get("DESKTOP_FOLDER_TRACE_FILE") or DEFAULT_TRACE_FILE)
+        data = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return path
+
+
+TRACER = SpanTracer.from_environment()
+
+
+def traced(name, args=None):
+    """
+    Dekorator: die Funktion läuft in einem Span. args(*aufruf) liefert die
+    Span-Argumente (z.B. Kachel und Anzahl) und wird nur bei eingeschalteter
+    Aufzeichnung aufgerufen.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*call_args, **call_kwargs):
+            if not TRACER.enabled:
+                return fn(*call_args, **call_kwargs)
+            span_args = args(*call_args, **call_kwargs) if args else {}
+            with TRACER.span(name, **span_args):
+                return fn(*call_args, **call_kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,2699 @@
+"""
+Oberfläche: Ordner-Kacheln (Tk) und der Manager, der sie verwaltet
+"""
+
+import ctypes
+import os
+import queue
+import threading
+import tkinter as tk
+from ctypes import wintypes
+from pathlib import Path
+from tkinter import filedialog, messagebox, simpledialog
+
+try:
+    from PIL import Image, ImageTk
+except ImportError:
+    Image = ImageTk = None  # ohne Pillow: Ersatz-Rechtecke statt Icons
+
+from .attributes import DEFAULT_LEDGER_FILE, BulkAttributeEngine, HiddenFileLedger
+from .deps import HAS_SHELL, HAS_WIN32, HAS_WINDND
+from .desktop import DESKTOP_GRID_X, DESKTOP_MARGIN_X, DESKTOP_MARGIN_Y, WindowsDesktopAPI
+from .diagnostics import METRICS, MemoryTracker, MetricsWriter, StallDetector
+from .iconworker import IconWorkerClient
+from .icons import IconExtractor
+from .model import (
+    Shortcut, ShortcutPathIndex, ShortcutValidator, TileConfig, config_from_dict, migrate_config,
+    normalize_path,
+)
+from .persistence import (
+    DEFAULT_CONFIG_FILE, DEFAULT_DB_FILE, DEFAULT_JOURNAL_FILE, ConfigJournal, create_config_store,
+)
+from .rendering import TileFace, TileFaceCache, create_3d_folder_icon, create_3d_tile_background, faded_icon
+from .timing import TRACER, StartupTimeline, traced
+from .watcher import ChangeDebouncer, FileChange, create_directory_watcher
+from .winapi import enable_acrylic_blur, set_rounded_region, user32
+
+
+def _tile_span(tile, *args, **kwargs):
+    """Span-Argumente für Kachel-Methoden: Kachel und Anzahl Verknüpfungen"""
+    return {"tile": tile.tile_id, "items": len(tile.config.shortcuts or ())}
+
+
+def _drop_span(tile, files):
+    return dict(_tile_span(tile), dropped=len(files))
+
+
+def reusable_menu(master, name):
+    """
+    Menü mit festem Tk-Namen unter master: beim ersten Mal angelegt, danach
+    geleert und wiederverwendet — sonst bliebe pro Rechtsklick ein Menü übrig
+    """
+    menu = master.children.get(name)
+    if menu is None:
+        return tk.Menu(master, name=name, tearoff=0, bg="#12122a", fg="#d0d0e0",
+                       activebackground="#2a2a5a", activeforeground="white",
+                       relief="flat", bd=0)
+    menu.delete(0, "end")
+    return menu
+
+
+class FolderTile:
+    """Eine einzelne Ordner-Kachel auf dem Desktop"""
+    
+    def __init__(self, manager, tile_id, config, staged=False):
+        self.manager = manager
+        self.tile_id = tile_id
+        self.config = config
+        # staged=True: nur Fenster + gecachtes Kachelbild, den Rest erledigt
+        # die Start-Pipeline des Managers (wire_up, draw_tile_icon)
+        self.staged = staged
+        self.face_current = False
+        self._face = None
+        self._face_photo = None
+        
+        self.is_expanded = False
+        self.animation_running = False
+        self.drag_data = {"x": 0, "y": 0, "dragging": False}
+        self._collapsed_icon_images = []
+        self._expanded_icon_images = []
+        self.hwnd = None
+        self.is_embedded = False
+        self._footer_label = None
+        self._name_entry = None
+
+        # Aktuelle Größen berechnen
+        self.apply_scale()
+
+        self.create_window()
+
+    def apply_scale(self):
+        """Berechnet die Kachel-Größen aus den Pixel-Konfigurationswerten"""
+        self.tile_width = max(40, min(1000, self.config.collapsed_tile_w))
+        self.tile_height = max(40, min(1000, self.config.collapsed_tile_h))
+        self.expanded_width = max(80, min(1500, self.config.expanded_tile_w))
+        self.expanded_height = max(100, min(1500, self.config.expanded_tile_h))
+    
+    def create_window(self):
+        """Erstellt das Kachel-Fenster mit Glaseffekt und echt transparenten Ecken"""
+        self.window = tk.Toplevel(self.manager.root)
+        self.window.title(f"DesktopFolder_{self.tile_id}")
+        self.window.overrideredirect(True)
+        self.window.attributes("-alpha", 0.92)
+        
+        # Transparente Farbe für echte durchsichtige Ecken.
+        # Nur die winzigen Eck-Dreiecke (außerhalb der abgerundeten 3D-Hintergrund-
+        # grafik) haben diese Farbe → nur dort klickdurchlässig.
+        # Der gesamte Kachel-Körper wird vom 3D-Bild abgedeckt → Drag&Drop funktioniert.
+        self._transparent_color = "#010101"
+        self.window.config(bg=self._transparent_color)
+        self.window.attributes("-transparentcolor", self._transparent_color)
+        
+        # Position auf Grid snappen
+        x = self.config.pos_x
+        if x is None:
+            x = DESKTOP_MARGIN_X + int(self.tile_id) * self.tile_width
+        y = self.config.pos_y if self.config.pos_y is not None else DESKTOP_MARGIN_Y
+        x, y = WindowsDesktopAPI.snap_to_grid(x, y)
+        
+        x = max(10, min(x, 1800))
+        y = max(10, min(y, 1000))
+        
+        self.window.geometry(f"{self.tile_width}x{self.tile_height}+{x}+{y}")
+        
+        # Hauptframe — transparent für Ecken
+        self.main_frame = tk.Frame(
+            self.window,
+            bg=self._transparent_color,
+            highlightthickness=0,
+        )
+        self.main_frame.pack(fill="both", expand=True)
+        
+        # Canvas — transparent für Ecken, 3D-Bild deckt Körper ab
+        self.canvas = tk.Canvas(
+            self.main_frame,
+            width=self.tile_width,
+            height=self.tile_height,
+            bg=self._transparent_color,
+            highlightthickness=0
+        )
+        self.canvas.pack(fill="both", expand=True)
+        
+        # Expanded Frame (anfangs None)
+        self.expanded_frame = None
+        
+        # Hintergrundbild-Cache (normal + hover)
+        self._bg_image = None
+        self._normal_bg_photo = None
+        self._hover_bg_photo = None
+        self._is_hovered = False
+        
+        # Bindings
+        self.setup_bindings()
+        
+        if self.staged:
+            # Start-Stufe 1: letztes Kachelbild zeigen und sofort sichtbar machen
+            self.face_current = self.draw_cached_face()
+            self.show()
+            return
+        
+        # Icon zeichnen
+        self.draw_tile_icon()
+        
+        # Drag & Drop
+        self.setup_drag_drop()
+        
+        # Fenster sichtbar machen
+        self.window.after(100, self.setup_window_mode)
+    
+    def setup_window_mode(self):
+        """Macht das Fenster sichtbar, aktiviert Glaseffekt, runde Ecken und hält es im Hintergrund"""
+        if self.show():
+            self.enable_glass()
+            # Nach kurzer Verzögerung in Hintergrund
+            self.window.after(500, self.move_to_background)
+    
+    def show(self):
+        """Macht das Fenster sichtbar (mit runden Ecken) — ohne Glaseffekt"""
+        try:
+            self.window.update_idletasks()
+            self.window.deiconify()
+            self.window.lift()
+            
+            # HWND holen
+            self.hwnd = WindowsDesktopAPI.window_handle(self.window.winfo_id())
+            
+            # Abgerundete Ecken über SetWindowRgn
+            self.apply_rounded_corners()
+            return True
+        except Exception as e:
+            print(f"Fehler: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+    
+    def wire_up(self):
+        """Start-Stufe 2: Drag & Drop, Glaseffekt, Hintergrund-Ebene"""
+        self.setup_drag_drop()
+        self.enable_glass()
+        self.move_to_background()
+        self.staged = False
+    
+    def enable_glass(self):
+        """Aktiviert den Acrylic-Glaseffekt"""
+        try:
+            # Acrylic Blur (Glaseffekt) aktivieren
+            # Gradient: AABBGGRR - halbtransparentes dunkles Blau
+            blur_color = 0xB0201A0D  # Alpha=0xB0, B=0x20, G=0x1A, R=0x0D
+            if enable_acrylic_blur(self.hwnd, blur_color):
+                print(f"Kachel {self.tile_id}: Acrylic Blur aktiviert ✓")
+                # Bei Blur weniger Fenster-Transparenz nötig
+                self.window.attributes("-alpha", 0.98)
+            else:
+                print(f"Kachel {self.tile_id}: Acrylic Blur nicht verfügbar (Fallback)")
+            
+            print(f"Kachel {self.tile_id} erstellt bei ({self.window.winfo_x()}, {self.window.winfo_y()})")
+        except Exception as e:
+            print(f"Fehler: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def apply_rounded_corners(self, width=None, height=None, radius=16):
+        """Wendet abgerundete Ecken auf das Fenster an"""
+        if not self.hwnd:
+            return
+        w = width or self.window.winfo_width()
+        h = height or self.window.winfo_height()
+        set_rounded_region(self.hwnd, w, h, radius)
+    
+    def move_to_background(self):
+        """Bewegt das Fenster in den Hintergrund"""
+        try:
+            self.window.attributes("-topmost", False)
+            if self.hwnd:
+                WindowsDesktopAPI.set_window_bottom(self.hwnd)
+            
+            # Timer um im Hintergrund zu bleiben
+            self.keep_background_timer()
+        except:
+            pass
+    
+    def keep_background_timer(self):
+        """Hält das Fenster regelmäßig im Hintergrund"""
+        METRICS.inc("timers.keep_background")
+        try:
+            if not self.is_expanded and self.hwnd:
+                WindowsDesktopAPI.set_window_bottom(self.hwnd)
+            
+            if hasattr(self, 'window') and self.window.winfo_exists():
+                self.window.after(2000, self.keep_background_timer)
+        except:
+            pass
+    
+    def embed_in_desktop(self):
+        """Bettet das Fenster in den Desktop ein (experimentell)"""
+        try:
+            self.window.update_idletasks()
+            
+            # HWND des Fensters holen
+            raw_hwnd = WindowsDesktopAPI.window_handle(self.window.winfo_id())
+            self.hwnd = raw_hwnd
+            
+            # In Desktop einbetten
+            if WindowsDesktopAPI.set_parent_to_desktop(self.hwnd):
+                self.is_embedded = True
+                print(f"Kachel {self.tile_id} in Desktop eingebettet")
+            else:
+                print(f"Kachel {self.tile_id}: Einbettung fehlgeschlagen")
+                
+        except Exception as e:
+            print(f"Fehler beim Einbetten: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def setup_bindings(self):
+        """Event-Bindings"""
+        self.canvas.bind("<ButtonPress-1>", self.start_drag)
+        self.canvas.bind("<B1-Motion>", self.do_drag)
+        self.canvas.bind("<ButtonRelease-1>", self.stop_drag)
+        self.canvas.bind("<Button-3>", self.show_context_menu)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        # Hover: Expand/Collapse über Maus-Enter/Leave
+        self._hover_expand_timer = None
+        self._hover_collapse_timer = None
+        self._mouse_inside = False
+        self._size_dialog_open = False
+        
+        self.window.bind("<Enter>", self._on_window_enter)
+        self.window.bind("<Leave>", self._on_window_leave)
+    
+    def _on_window_enter(self, event):
+        """Maus betritt das Fenster — Hover-Expand starten"""
+        self._mouse_inside = True
+
+        # Collapse-Timer abbrechen falls aktiv
+        if self._hover_collapse_timer:
+            self.window.after_cancel(self._hover_collapse_timer)
+            self._hover_collapse_timer = None
+
+        if self.is_expanded or self.animation_running:
+            return
+
+        # Nicht expandieren wenn Mausbutton gedrückt ist (Drag aus anderer App)
+        if event.state & 0x100:  # Button1 gedrückt
+            return
+
+        # Visuellen Hover-Effekt sofort zeigen
+        self._draw_hover_state(True)
+
+        # Expand nach kurzer Verzögerung (150ms — schnell)
+        self._hover_expand_timer = self.window.after(150, self._hover_expand)
+    
+    def _on_window_leave(self, event):
+        """Maus verlässt das Fenster — Hover-Collapse starten"""
+        try:
+            x, y = self.window.winfo_pointerxy()
+            wx = self.window.winfo_rootx()
+            wy = self.window.winfo_rooty()
+            ww = self.window.winfo_width()
+            wh = self.window.winfo_height()
+            
+            if wx <= x <= wx + ww and wy <= y <= wy + wh:
+                return
+        except:
+            pass
+        
+        self._mouse_inside = False
+        
+        if self._hover_expand_timer:
+            self.window.after_cancel(self._hover_expand_timer)
+            self._hover_expand_timer = None
+        
+        if not self.is_expanded and not self.animation_running:
+            self._draw_hover_state(False)
+        
+        # Collapse nach 350ms
+        if self.is_expanded and not self.animation_running:
+            self._hover_collapse_timer = self.window.after(350, self._hover_collapse)
+    
+    def _hover_expand(self):
+        """Wird nach Hover-Verzögerung aufgerufen — expandiert die Kachel"""
+        self._hover_expand_timer = None
+        if not self._mouse_inside or self.is_expanded or self.animation_running:
+            return
+        self.expand()
+    
+    def _hover_collapse(self):
+        """Wird nach Leave-Verzögerung aufgerufen — klappt zusammen"""
+        self._hover_collapse_timer = None
+        if self._mouse_inside or not self.is_expanded or self.animation_running or self._size_dialog_open:
+            return
+        self.collapse()
+    
+    def photo_count(self):
+        """PhotoImages, die diese Kachel festhält (Icons und Hintergründe)"""
+        backgrounds = sum(1 for photo in (self._hover_bg_photo, self._normal_bg_photo) if photo)
+        return len(self._collapsed_icon_images) + len(self._expanded_icon_images) + backgrounds
+
+    def _draw_hover_state(self, hovered):
+        """Tauscht NUR den Hintergrund aus — Icons/Text bleiben unverändert (kein Zittern)"""
+        try:
+            if hovered:
+                # Hover-Hintergrund erzeugen (einmalig cachen)
+                if self._hover_bg_photo:
+                    METRICS.inc("render.hover_bg.reused")
+                else:
+                    METRICS.inc("render.hover_bg.built")
+                    bg_img = create_3d_tile_background(
+                        self.tile_width, self.tile_height,
+                        base_color=(22, 22, 44),
+                        corner_radius=14
+                    )
+                    if bg_img:
+                        from PIL import Image, ImageDraw
+                        glow = Image.new('RGBA', bg_img.size, (0, 0, 0, 0))
+                        g_draw = ImageDraw.Draw(glow)
+                        g_draw.rounded_rectangle(
+                            [0, 0, bg_img.width - 1, bg_img.height - 1],
+                            radius=14, outline=(120, 140, 255, 60), width=2
+                        )
+                        g_draw.rounded_rectangle(
+                            [1, 1, bg_img.width - 2, bg_img.height - 2],
+                            radius=13, outline=(180, 190, 255, 30), width=1
+                        )
+                        bg_img = Image.alpha_composite(bg_img, glow)
+                        self._hover_bg_photo = ImageTk.PhotoImage(bg_img)
+                
+                if self._hover_bg_photo:
+                    self.canvas.delete("bg_layer")
+                    self.canvas.create_image(0, 0, anchor="nw", image=self._hover_bg_photo, tags="bg_layer")
+                    self.canvas.tag_lower("bg_layer")
+            else:
+                # Normalen Hintergrund zurücksetzen (gecacht aus draw_tile_icon)
+                if self._normal_bg_photo:
+                    self.canvas.delete("bg_layer")
+                    self.canvas.create_image(0, 0, anchor="nw", image=self._normal_bg_photo, tags="bg_layer")
+                    self.canvas.tag_lower("bg_layer")
+        except Exception:
+            pass
+    
+    def setup_drag_drop(self):
+        """Drag & Drop aktivieren"""
+        if HAS_WINDND:
+            import windnd
+            windnd.hook_dropfiles(self.window, func=self.on_drop_files)
+    
+    @traced("on_drop_files", _drop_span)
+    def on_drop_files(self, files):
+        """Dateien wurden auf die Kachel gezogen — mit Positionserkennung"""
+        desktop_path = WindowsDesktopAPI.get_desktop_path()
+        added_count = 0
+        
+        # Einfüge-Position bestimmen
+        insert_index = len(self.config.shortcuts)  # Standard: am Ende
+        
+        if self.is_expanded and hasattr(self, 'icons_frame') and self.icons_frame:
+            try:
+                mx, my = self.window.winfo_pointerxy()
+                frame_x = self.icons_frame.winfo_rootx()
+                frame_y = self.icons_frame.winfo_rooty()
+                rel_x = mx - frame_x
+                rel_y = my - frame_y
+                
+                cols = 3
+                cell_width = max(30, self.config.expanded_icon_w + 22)
+                cell_height = max(30, self.config.expanded_icon_h + 28)
+                
+                col = max(0, min(int(rel_x // cell_width), cols - 1))
+                row = max(0, int(rel_y // cell_height))
+                calc_index = row * cols + col
+                insert_index = min(calc_index, len(self.config.shortcuts))
+            except:
+                pass
+        
+        path_index = self.manager.path_index
+        desktop_dir = Path(desktop_path)
+        new_shortcuts = []
+        to_hide = []
+        
+        for file_bytes in files:
+            try:
+                filepath = file_bytes.decode('utf-8')
+            except:
+                try:
+                    filepath = file_bytes.decode('gbk')
+                except:
+                    continue
+            
+            if not os.path.exists(filepath):
+                continue
+            
+            # Duplikat-Prüfung über den globalen Index (auch innerhalb dieses Drops)
+            name = Path(filepath).stem
+            shortcut = Shortcut(name, filepath)
+            existing = path_index.lookup(filepath)
+            if existing is not None:
+                if existing[0] != self.tile_id:
+                    other = self.manager.tiles.get(existing[0])
+                    other_name = other.config.name if other else existing[0]
+                    print(f"Bereits in Kachel '{other_name}': {name}")
+                continue
+            
+            # An der berechneten Position einfügen (Nächste Datei danach)
+            path_index.reindex_tile(self.tile_id, [shortcut], 0)
+            new_shortcuts.append(shortcut)
+            
+            if Path(filepath).parent == desktop_dir:
+                to_hide.append(shortcut)
+            
+            added_count += 1
+        
+        if added_count > 0:
+            # Desktop-Positionen merken, bevor die Icons verschwinden
+            positions = WindowsDesktopAPI.get_desktop_icon_positions(
+                [Path(s.path).name for s in to_hide])
+            for shortcut in to_hide:
+                shortcut.desktop_pos = positions.get(Path(shortcut.path).name)
+            ops = [{"op": ConfigJournal.OP_ADD_SHORTCUT, "tile": self.tile_id,
+                    "index": insert_index + k, "shortcut": shortcut.to_dict()}
+                   for k, shortcut in enumerate(new_shortcuts)]
+            
+            # Einmal einfügen statt pro Datei (O(n + m) statt O(n·m))
+            self.config.shortcuts[insert_index:insert_index] = new_shortcuts
+            path_index.reindex_tile(self.tile_id, self.config.shortcuts, insert_index)
+            self.manager.record_changes(ops)
+            # Alle Desktop-Icons gemeinsam verstecken, eine Desktop-Aktualisierung
+            report = self.manager.attributes.hide([s.path for s in to_hide])
+            if to_hide:
+                print(f"{report.ok} Desktop-Icon(s) versteckt")
+            for path, error in report.failed:
+                print(f"  ✗ Fehler bei {Path(path).stem}: {error}")
+            
+            # Caches invalidieren (neue Icons)
+            self._hover_bg_photo = None
+            self._normal_bg_photo = None
+
+            if self.is_expanded:
+                # Expandierte Ansicht aktualisieren
+                self.refresh_expanded_view()
+            else:
+                # Kachel-Icon aktualisieren und automatisch expandieren
+                self.draw_tile_icon()
+                self.canvas.update_idletasks()
+                self.window.update()
+                self.window.after(200, self.expand)
+            
+            print(f"{added_count} Verknüpfung(en) hinzugefügt")
+    
+    @traced("draw_tile_icon", _tile_span)
+    def draw_tile_icon(self):
+        """Zeichnet das Kachel-Icon mit 3D-Hintergrund, Licht und Schatten"""
+        self.canvas.delete("all")
+        self._collapsed_icon_images.clear()
+        self._face_photo = None
+
+        shortcuts = self.config.shortcuts
+        width = self.tile_width
+        height = self.tile_height
+        
+        # Das fertige Bild wird für den nächsten Start mitgeschrieben
+        try:
+            self._face = TileFace.blank(width, height)
+        except Exception:
+            self._face = None
+
+        # --- 3D-Hintergrund zeichnen (mit Tag für Hover-Swap) ---
+        try:
+            bg_img = create_3d_tile_background(width, height, base_color=(13, 13, 26), corner_radius=14)
+            if bg_img:
+                self._normal_bg_photo = ImageTk.PhotoImage(bg_img)
+                self.canvas.create_image(0, 0, anchor="nw", image=self._normal_bg_photo, tags="bg_layer")
+                if self._face is not None:
+                    self._face.paste(bg_img, 0, 0, anchor="nw")
+        except Exception as e:
+            pass
+
+        if not shortcuts:
+            self.draw_empty_folder(width, height)
+        else:
+            self.draw_icon_grid(shortcuts[:4], width, height)
+
+        self._draw_tile_name(width, height)
+        
+        face, self._face = self._face, None
+        self.face_current = True
+        if face is not None:
+            self.manager.faces.store(self.tile_id, TileFaceCache.signature(self.config, width, height), face)
+    
+    def _draw_tile_name(self, width, height):
+        """Ordnername unten mit Schatten"""
+        name = self.config.name
+        if len(name) > 12:
+            name = name[:11] + "…"
+
+        name_font_size = max(6, self.config.collapsed_name_font_size + 1)
+        self._face_item(
+            "text", width // 2 + 1, height - 9,
+            text=name, fill="#000000",
+            font=("Segoe UI Semibold", name_font_size), anchor="s"
+        )
+        self._face_item(
+            "text", width // 2, height - 10,
+            text=name, fill="#e0e0e0",
+            font=("Segoe UI Semibold", name_font_size), anchor="s"
+        )
+    
+    def _face_item(self, kind, *args, **kwargs):
+        """Canvas-Element zeichnen und für das gecachte Kachelbild merken"""
+        if self._face is not None:
+            self._face.record(kind, args, kwargs)
+        return getattr(self.canvas, f"create_{kind}")(*args, **kwargs)
+    
+    def _face_image(self, pil_img, photo, x, y, anchor="center"):
+        """Bild zeichnen und in das gecachte Kachelbild einfügen"""
+        if self._face is not None:
+            self._face.paste(pil_img, x, y, anchor)
+        return self.canvas.create_image(x, y, anchor=anchor, image=photo)
+    
+    def draw_cached_face(self):
+        """
+        Zeigt das beim letzten Lauf gespeicherte Kachelbild (ohne Hintergrund-
+        Rendering und Icon-Extraktion). True wenn es zur aktuellen Konfiguration
+        passt; ohne Cache gibt es eine schlichte Fläche mit dem Namen.
+        """
+        self.canvas.delete("all")
+        width, height = self.tile_width, self.tile_height
+        cached = self.manager.faces.load(self.tile_id)
+        if cached is None or ImageTk is None:
+            self.canvas.create_rectangle(1, 1, width - 1, height - 1, fill="#0d0d1a", outline="#1e1e3a")
+            self._draw_tile_name(width, height)
+            return False
+        signature, face = cached
+        self._face_photo = ImageTk.PhotoImage(face.image)
+        self.canvas.create_image(0, 0, anchor="nw", image=self._face_photo)
+        face.replay(self.canvas)
+        return signature == TileFaceCache.signature(self.config, width, height)
+    
+    def draw_empty_folder(self, width, height):
+        """Zeichnet 3D-Ordner-Icon mit Licht und Schatten"""
+        try:
+            folder_img = create_3d_folder_icon(width, height)
+            if folder_img:
+                self._folder_photo = ImageTk.PhotoImage(folder_img)
+                self._face_image(folder_img, self._folder_photo, 0, 0, anchor="nw")
+                return
+        except:
+            pass
+        
+        # Fallback: einfaches Ordner-Icon
+        cx, cy = width // 2, height // 2 - 15
+        folder_color = "#FFC107"
+        w, h = 80, 60
+        tab_w, tab_h = 32, 12
+        
+        self._face_item(
+            "rectangle", cx - w//2, cy - h//2 - tab_h,
+            cx - w//2 + tab_w, cy - h//2,
+            fill="#FFA000", outline=""
+        )
+        self._face_item(
+            "rectangle", cx - w//2, cy - h//2, cx + w//2, cy + h//2,
+            fill=folder_color, outline=""
+        )
+    
+    def draw_icon_grid(self, shortcuts, width, height):
+        """Zeichnet 2x2 Icon-Grid wie Desktop-Icons"""
+        # Verfügbarer Platz — immer Platz für Ordnername unten reservieren,
+        # plus zusätzlichen Platz wenn Shortcut-Namen sichtbar sind
+        folder_name_reserve = 22
+        shortcut_name_extra = 0 if self.config.hide_shortcut_names else 18
+        available_height = height - folder_name_reserve - shortcut_name_extra
+
+        # Icon-Größe direkt aus Pixelwerten
+        icon_w = max(16, self.config.collapsed_icon_w)
+        icon_h = max(16, self.config.collapsed_icon_h)
+        icon_fetch_size = max(icon_w, icon_h)
+        cell_width = width // 2
+        cell_height = available_height // 2
+        IconExtractor.get_icons([s.path for s in shortcuts[:4]], icon_fetch_size)
+
+        for i, shortcut in enumerate(shortcuts[:4]):
+            row = i // 2
+            col = i % 2
+
+            # Zentrierte Position in der Zelle
+            cx = col * cell_width + cell_width // 2
+            cy = row * cell_height + cell_height // 2
+
+            # Icon laden
+            icon_img = None
+            try:
+                pil_img = IconExtractor.get_icon(shortcut.path, icon_fetch_size)
+                if pil_img:
+                    if hasattr(Image, 'Resampling'):
+                        pil_img = pil_img.resize((icon_w, icon_h), Image.Resampling.LANCZOS)
+                    else:
+                        pil_img = pil_img.resize((icon_w, icon_h), Image.LANCZOS)
+                    if shortcut.missing:
+                        pil_img = faded_icon(pil_img)
+                    icon_img = ImageTk.PhotoImage(pil_img)
+                    self._collapsed_icon_images.append(icon_img)
+            except:
+                pass
+
+            if icon_img:
+                self._face_image(pil_img, icon_img, cx, cy)
+            else:
+                # Fallback: Farbiges Rechteck
+                colors = {'.exe': '#0078D4', '.lnk': '#0078D4', '.bat': '#FFA500'}
+                color = colors.get(shortcut.ext, '#0078D4')
+
+                self._face_item(
+                    "rectangle", cx - icon_w//2, cy - icon_h//2,
+                    cx + icon_w//2, cy + icon_h//2,
+                    fill=color, outline=""
+                )
+
+                letter = shortcut.letter
+                letter_font_size = max(8, min(icon_w, icon_h) // 3)
+                self._face_item(
+                    "text", cx, cy,
+                    text=letter,
+                    fill="white",
+                    font=("Segoe UI", letter_font_size, "bold")
+                )
+
+            # Name unter Icon (nur wenn nicht ausgeblendet)
+            if not self.config.hide_shortcut_names:
+                name = shortcut.name
+                if len(name) > 8:
+                    name = name[:7] + "…"
+
+                self._face_item(
+                    "text", cx, cy + icon_h//2,
+                    text=name,
+                    fill="white",
+                    font=("Segoe UI", max(6, self.config.collapsed_name_font_size)),
+                    anchor="n"
+                )
+    
+    def on_click(self, event):
+        """Klick-Handler — bei collapsed wird manuell expandiert (Fallback)"""
+        if self.drag_data.get("dragging"):
+            return
+        
+        if not self.is_expanded:
+            self.expand()
+    
+    def start_drag(self, event):
+        """Drag starten"""
+        self.drag_data["x"] = event.x
+        self.drag_data["y"] = event.y
+        self.drag_data["dragging"] = False
+        self.drag_data["start_x"] = event.x_root
+        self.drag_data["start_y"] = event.y_root
+    
+    def do_drag(self, event):
+        """Drag durchführen"""
+        dx = abs(event.x_root - self.drag_data.get("start_x", event.x_root))
+        dy = abs(event.y_root - self.drag_data.get("start_y", event.y_root))
+        
+        if dx > 5 or dy > 5:
+            self.drag_data["dragging"] = True
+            x = self.window.winfo_x() + (event.x - self.drag_data["x"])
+            y = self.window.winfo_y() + (event.y - self.drag_data["y"])
+            self.window.geometry(f"+{x}+{y}")
+    
+    def stop_drag(self, event):
+        """Drag beenden - auf Grid einrasten"""
+        was_dragging = self.drag_data.get("dragging", False)
+        self.drag_data["dragging"] = False
+        
+        if was_dragging:
+            # Auf Grid einrasten
+            x = self.window.winfo_x()
+            y = self.window.winfo_y()
+            snap_x, snap_y = WindowsDesktopAPI.snap_to_grid(x, y)
+            
+            self.window.geometry(f"+{snap_x}+{snap_y}")
+            
+            self.config.pos_x = snap_x
+            self.config.pos_y = snap_y
+            self.manager.record_change(ConfigJournal.OP_MOVE, self.tile_id,
+                                       pos_x=snap_x, pos_y=snap_y)
+        else:
+            self.window.after(50, lambda: self.on_click(event))
+    
+    @traced("expand", _tile_span)
+    def expand(self):
+        """Kachel expandieren"""
+        if self.is_expanded or self.animation_running:
+            return
+        
+        self.animation_running = True
+        self.is_expanded = True
+        
+        # Collapse-Timer abbrechen falls noch aktiv
+        if self._hover_collapse_timer:
+            self.window.after_cancel(self._hover_collapse_timer)
+            self._hover_collapse_timer = None
+        
+        # Fenster nach vorne bringen (ohne focus_force um andere Apps nicht zu stören)
+        self.window.attributes("-topmost", True)
+        self.window.attributes("-alpha", 0.96)
+        self.window.lift()
+        
+        # Fenster temporär aus Desktop lösen wenn eingebettet
+        if self.is_embedded and self.hwnd:
+            try:
+                WindowsDesktopAPI.detach_from_desktop(self.hwnd)
+            except:
+                pass
+        
+        x = self.window.winfo_x()
+        y = self.window.winfo_y()
+        
+        self.animate_size(
+            self.tile_width, self.tile_height,
+            self.expanded_width, self.expanded_height,
+            x, y,
+            callback=self.show_expanded_content
+        )
+    
+    @traced("show_expanded_content", _tile_span)
+    def show_expanded_content(self):
+        """Zeigt Desktop-ähnliche Icon-Ansicht — Titel unten wie collapsed"""
+        self.canvas.pack_forget()
+
+        glass_bg = "#0d0d1a"
+
+        self.expanded_frame = tk.Frame(self.main_frame, bg=glass_bg)
+        self.expanded_frame.pack(fill="both", expand=True)
+
+        # Acrylic Blur für expandiertes Fenster
+        if self.hwnd:
+            blur_color = 0xC0281E10
+            enable_acrylic_blur(self.hwnd, blur_color)
+
+        # === Titel unten zuerst packen (side=bottom), damit er nicht abgeschnitten wird ===
+        display_name = self._truncated_name(self.expanded_width)
+        self._footer_label = tk.Label(
+            self.expanded_frame, text=display_name,
+            font=("Segoe UI Semibold", 9), bg=glass_bg, fg="#e0e0e0",
+            anchor="center", cursor="hand2"
+        )
+        self._footer_label.pack(side="bottom", fill="x", pady=(3, 8))
+
+        # Trennlinie über dem Titel
+        tk.Frame(self.expanded_frame, bg="#3a3a5a", height=1).pack(side="bottom", fill="x", padx=10, pady=(2, 0))
+
+        # === Icon-Grid Container füllt den restlichen Platz ===
+        grid_container = tk.Frame(self.expanded_frame, bg=glass_bg)
+        grid_container.pack(fill="both", expand=True, padx=5, pady=(8, 0))
+
+        canvas = tk.Canvas(grid_container, bg=glass_bg, highlightthickness=0)
+        scrollbar = tk.Scrollbar(grid_container, orient="vertical", command=canvas.yview)
+
+        self.icons_frame = tk.Frame(canvas, bg=glass_bg)
+
+        def _update_scroll_region(e):
+            canvas.configure(scrollregion=canvas.bbox("all"))
+            # Scrollbar nur anzeigen wenn Inhalt größer als sichtbarer Bereich
+            canvas.update_idletasks()
+            bbox = canvas.bbox("all")
+            if bbox and bbox[3] > canvas.winfo_height():
+                scrollbar.pack(side="right", fill="y")
+            else:
+                scrollbar.pack_forget()
+
+        self.icons_frame.bind("<Configure>", _update_scroll_region)
+
+        canvas.create_window((0, 0), window=self.icons_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        canvas.pack(side="left", fill="both", expand=True)
+
+        canvas.bind("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1 * (e.delta / 120)), "units"))
+
+        shortcuts = self.config.shortcuts
+
+        if not shortcuts:
+            empty = tk.Label(
+                self.icons_frame,
+                text="Leer\n\nDateien vom Desktop\nhierher ziehen",
+                font=("Segoe UI", 10), bg=glass_bg, fg="#555570", justify="center",
+                wraplength=200
+            )
+            empty.pack(pady=40)
+            empty.bind("<Button-3>", self.show_context_menu)
+            empty.bind("<ButtonPress-1>", self._start_bg_drag)
+            empty.bind("<B1-Motion>", self._do_bg_drag)
+            empty.bind("<ButtonRelease-1>", self._stop_bg_drag)
+        else:
+            self.create_desktop_icon_grid(shortcuts)
+        self._footer_label.bind("<Button-1>", lambda e: self._start_name_edit())
+
+        # Drag per Klicken-und-Halten auf freie Flächen
+        for bg_widget in [self.expanded_frame, grid_container, canvas, self.icons_frame]:
+            bg_widget.bind("<ButtonPress-1>", self._start_bg_drag)
+            bg_widget.bind("<B1-Motion>", self._do_bg_drag)
+            bg_widget.bind("<ButtonRelease-1>", self._stop_bg_drag)
+
+        # Rechtsklick-Kontextmenü auf Hintergrundflächen der expandierten Ansicht
+        for bg_widget in [self.expanded_frame, grid_container, canvas, self.icons_frame, self._footer_label]:
+            bg_widget.bind("<Button-3>", self.show_context_menu)
+
+        self.animation_running = False
+
+    def _truncated_name(self, available_width):
+        """Gibt den Kachelnamen zurück, ggf. gekürzt passend zur verfügbaren Breite"""
+        name = self.config.name
+        # ~7px pro Zeichen bei Segoe UI Semibold 9, abzgl. Padding
+        max_chars = max(6, (available_width - 30) // 7)
+        if len(name) > max_chars:
+            name = name[:max_chars - 1] + "…"
+        return name
+
+    def create_desktop_icon_grid(self, shortcuts):
+        """Erstellt Desktop-ähnliches Icon-Grid mit Glas-Hover-Effekten"""
+        glass_bg = "#0d0d1a"
+        hover_bg = "#1e1e3a"
+        active_bg = "#2a2a4a"
+
+        cols = 3
+        icon_w = max(16, self.config.expanded_icon_w)
+        icon_h = max(16, self.config.expanded_icon_h)
+        icon_fetch_size = max(icon_w, icon_h)
+        cell_width = max(30, icon_w + 22)
+        cell_height = max(30, icon_h + 28)
+        IconExtractor.get_icons([s.path for s in shortcuts], icon_fetch_size)
+
+        for i, shortcut in enumerate(shortcuts):
+            row = i // cols
+            col = i % cols
+
+            # Container wie auf dem Desktop - ohne highlightthickness um Layout-Shift zu vermeiden
+            icon_frame = tk.Frame(
+                self.icons_frame,
+                bg=glass_bg,
+                width=cell_width,
+                height=cell_height,
+                highlightthickness=0,
+                bd=0,
+            )
+            icon_frame.grid(row=row, column=col, padx=2, pady=2)
+            icon_frame.grid_propagate(False)
+
+            # Icon zentriert oben
+            icon_container = tk.Frame(icon_frame, bg=glass_bg)
+            icon_container.pack(pady=(3, 1))
+
+            icon_label = None
+            try:
+                pil_img = IconExtractor.get_icon(shortcut.path, icon_fetch_size)
+                if pil_img:
+                    if hasattr(Image, 'Resampling'):
+                        pil_img = pil_img.resize((icon_w, icon_h), Image.Resampling.LANCZOS)
+                    else:
+                        pil_img = pil_img.resize((icon_w, icon_h), Image.LANCZOS)
+                    if shortcut.missing:
+                        pil_img = faded_icon(pil_img)
+                    icon_img = ImageTk.PhotoImage(pil_img)
+                    self._expanded_icon_images.append(icon_img)
+                    icon_label = tk.Label(icon_container, image=icon_img, bg=glass_bg)
+            except Exception as e:
+                print(f"Icon-Fehler für {shortcut.name}: {e}")
+
+            if icon_label:
+                icon_label.pack()
+            else:
+                # Fallback: Canvas-Icon mit Buchstabe
+                canvas = tk.Canvas(
+                    icon_container,
+                    width=icon_w,
+                    height=icon_h,
+                    bg=glass_bg,
+                    highlightthickness=0
+                )
+                canvas.pack()
+
+                # Abgerundetes Rechteck
+                canvas.create_rectangle(
+                    2, 2, icon_w-2, icon_h-2,
+                    fill="#0078D4", outline="#0078D4"
+                )
+
+                # Buchstabe
+                letter = shortcut.letter
+                exp_letter_font = max(8, min(icon_w, icon_h) // 3)
+                canvas.create_text(
+                    icon_w//2, icon_h//2,
+                    text=letter,
+                    fill="white",
+                    font=("Segoe UI", exp_letter_font, "bold")
+                )
+                icon_label = canvas
+
+            # Name (kürzer, keine Umbrüche)
+            name = shortcut.name
+            if len(name) > 10:
+                name = name[:9] + "…"
+
+            name_label = tk.Label(
+                icon_frame,
+                text=name,
+                font=("Segoe UI", max(6, self.config.expanded_name_font_size)),
+                bg=glass_bg,
+                fg="#66667a" if shortcut.missing else "#d0d0e0",
+                anchor="center"
+            )
+            name_label.pack()
+            
+            # Event-Handler mit Drag-Out Funktion und Geister-Fenster
+            def make_handlers(idx, path, shortcut_name, frame, name_lbl, icon_lbl):
+                drag_data = {
+                    'dragging': False, 
+                    'start_x': 0, 
+                    'start_y': 0,
+                    'ghost_window': None,
+                    'active': False  # Verhindert Leave-Reset während Drag
+                }
+                
+                def on_enter(e):
+                    if not drag_data['active']:
+                        frame.config(bg="#1e1e3a")
+                        name_lbl.config(bg="#1e1e3a")
+                        try:
+                            icon_lbl.config(bg="#1e1e3a")
+                        except:
+                            pass
+
+                def on_leave(e):
+                    if not drag_data['active']:
+                        frame.config(bg="#0d0d1a")
+                        name_lbl.config(bg="#0d0d1a")
+                        try:
+                            icon_lbl.config(bg="#0d0d1a")
+                        except:
+                            pass
+                
+                def on_press(e):
+                    drag_data['start_x'] = e.x_root
+                    drag_data['start_y'] = e.y_root
+                    drag_data['dragging'] = False
+                    drag_data['active'] = True
+                
+                def create_ghost_window():
+                    """Erstellt ein halbtransparentes Geister-Fenster mit Glaseffekt"""
+                    ghost = tk.Toplevel(self.window)
+                    ghost.overrideredirect(True)
+                    ghost.attributes("-alpha", 0.75)
+                    ghost.attributes("-topmost", True)
+                    ghost.geometry("60x70")
+                    ghost.config(bg="#1a1a3a")
+                    
+                    # Icon und Name im Geisterfenster
+                    ghost_frame = tk.Frame(ghost, bg="#1a1a3a")
+                    ghost_frame.pack(fill="both", expand=True, padx=3, pady=3)
+                    
+                    # Mini-Icon
+                    ghost_canvas = tk.Canvas(ghost_frame, width=40, height=40, 
+                                            bg="#1a1a3a", highlightthickness=0)
+                    ghost_canvas.pack(pady=(2, 0))
+                    ghost_canvas.create_rectangle(2, 2, 38, 38, fill="#0078D4", outline="")
+                    letter = shortcut_name[0].upper() if shortcut_name else "?"
+                    ghost_canvas.create_text(20, 20, text=letter, fill="white", 
+                                           font=("Segoe UI", 14, "bold"))
+                    
+                    # Name
+                    short_name = shortcut_name[:8] + "…" if len(shortcut_name) > 8 else shortcut_name
+                    tk.Label(ghost_frame, text=short_name, font=("Segoe UI", 7),
+                            bg="#1a1a3a", fg="#d0d0e0").pack()
+                    
+                    return ghost
+                
+                def on_motion(e):
+                    dx = abs(e.x_root - drag_data['start_x'])
+                    dy = abs(e.y_root - drag_data['start_y'])
+                    
+                    if dx > 15 or dy > 15:
+                        if not drag_data['dragging']:
+                            # Drag beginnt - Geister-Fenster erstellen
+                            drag_data['dragging'] = True
+                            drag_data['ghost_window'] = create_ghost_window()
+                            
+                            # Ursprüngliches Icon markieren
+                            frame.config(bg="#2a2a4a", highlightbackground="#6a6aaa")
+                            name_lbl.config(bg="#2a2a4a")
+                            try:
+                                icon_lbl.config(bg="#2a2a4a")
+                            except:
+                                pass
+                        
+                        # Geister-Fenster folgt der Maus
+                        if drag_data['ghost_window']:
+                            drag_data['ghost_window'].geometry(
+                                f"+{e.x_root - 30}+{e.y_root - 35}"
+                            )
+                            # Andere Kacheln expandieren wenn Cursor darüber
+                            self.expand_tile_under_cursor(e.x_root, e.y_root)
+                
+                def on_release(e):
+                    was_dragging = drag_data['dragging']
+                    
+                    # Geister-Fenster zerstören
+                    if drag_data['ghost_window']:
+                        drag_data['ghost_window'].destroy()
+                        drag_data['ghost_window'] = None
+                    
+                    # Farben zurücksetzen
+                    frame.config(bg="#0d0d1a", highlightbackground="#0d0d1a")
+                    name_lbl.config(bg="#0d0d1a")
+                    try:
+                        icon_lbl.config(bg="#0d0d1a")
+                    except:
+                        pass
+                    
+                    drag_data['dragging'] = False
+                    drag_data['active'] = False
+                    
+                    if was_dragging:
+                        # Drag beendet - auf Desktop an Mausposition wiederherstellen
+                        drop_x = e.x_root
+                        drop_y = e.y_root
+                        print(f"Drag-Out erkannt für: {shortcut_name} an Position ({drop_x}, {drop_y})")
+                        self.restore_to_desktop_at_position(idx, drop_x, drop_y)
+                    else:
+                        # Normaler Klick - Programm starten
+                        self.launch_shortcut(path)
+                
+                def on_right_click(e):
+                    self.show_item_context_menu(e, idx, path)
+                
+                return on_enter, on_leave, on_press, on_motion, on_release, on_right_click
+            
+            enter, leave, press, motion, release, right_click = make_handlers(
+                i, shortcut.path, shortcut.name, icon_frame, name_label, icon_label
+            )
+            
+            # Bindings für alle Elemente
+            for widget in [icon_frame, name_label, icon_container, icon_label]:
+                try:
+                    widget.bind("<Enter>", enter)
+                    widget.bind("<Leave>", leave)
+                    widget.bind("<ButtonPress-1>", press)
+                    widget.bind("<B1-Motion>", motion)
+                    widget.bind("<ButtonRelease-1>", release)
+                    widget.bind("<Button-3>", right_click)
+                    widget.config(cursor="hand2")
+                except:
+                    pass
+    
+    def show_item_context_menu(self, event, index, path):
+        """Kontextmenü für einzelnes Item"""
+        menu = reusable_menu(self.window, "item_menu")
+        
+        menu.add_command(label="▶️ Öffnen", command=lambda: self.launch_shortcut(path))
+        menu.add_command(label="📤 Auf Desktop wiederherstellen",
+                        command=lambda: self.restore_to_desktop(index))
+        menu.add_separator()
+        menu.add_command(label="🗑️ Aus Ordner entfernen",
+                        command=lambda: self.remove_shortcut(index))
+        
+        menu.tk_popup(event.x_root, event.y_root)
+    
+    def restore_to_desktop(self, index):
+        """Stellt Verknüpfung auf Desktop wieder her (macht sie sichtbar)"""
+        self.restore_to_desktop_at_position(index, None, None)
+    
+    @traced("restore_to_desktop_at_position", _tile_span)
+    def restore_to_desktop_at_position(self, index, drop_x=None, drop_y=None):
+        """Stellt Verknüpfung auf Desktop an bestimmter Position wieder her"""
+        shortcuts = self.config.shortcuts
+        if 0 <= index < len(shortcuts):
+            filepath = shortcuts[index].path
+            name = shortcuts[index].name
+            
+            print(f"Stelle wieder her: {name}")
+            
+            # Ohne Drop-Punkt an die beim Aufnehmen gemerkte Stelle
+            if drop_x is None and shortcuts[index].desktop_pos is not None:
+                drop_x, drop_y = shortcuts[index].desktop_pos
+            
+            # Hidden-Attribut entfernen
+            report = self.manager.attributes.unhide([filepath])
+            if report.ok:
+                print(f"  ✓ Hidden-Attribut entfernt")
+            else:
+                print(f"  ✗ Fehler beim Entfernen des Hidden-Attributs")
+            
+            # Icon-Position auf dem Desktop setzen, sobald der Explorer es aufgenommen hat
+            if drop_x is not None and drop_y is not None:
+                print(f"  → Drop-Position: ({drop_x}, {drop_y})")
+                WindowsDesktopAPI.notifications().flush()
+                self.manager.set_icon_position_when_listed(Path(filepath).name, drop_x, drop_y)
+            
+            # Aus Kachel entfernen
+            self.manager.path_index.discard(self.tile_id, shortcuts[index])
+            del shortcuts[index]
+            self.manager.path_index.reindex_tile(self.tile_id, shortcuts, index)
+            self.manager.record_change(ConfigJournal.OP_REMOVE_SHORTCUT, self.tile_id,
+                                       index=index, path=filepath)
+            
+            # UI sofort aktualisieren
+            self.refresh_expanded_view()
+            
+            print(f"  ✓ Auf Desktop wiederhergestellt: {name}")
+    
+    @traced("refresh_expanded_view", _tile_span)
+    def refresh_expanded_view(self):
+        """Aktualisiert die expandierte Ansicht"""
+        if not self.is_expanded:
+            self.draw_tile_icon()
+            return
+        
+        # icons_frame leeren und neu aufbauen
+        if hasattr(self, 'icons_frame') and self.icons_frame:
+            # Alte Widgets löschen
+            for widget in self.icons_frame.winfo_children():
+                widget.destroy()
+            
+            # Icon-Images leeren um Speicher freizugeben
+            self._expanded_icon_images.clear()
+            
+            shortcuts = self.config.shortcuts
+            if not shortcuts:
+                empty = tk.Label(
+                    self.icons_frame,
+                    text="Leer\n\nDateien vom Desktop\nhierher ziehen\noder Icon nach außen\nziehen zum Wiederherstellen",
+                    font=("Segoe UI", 10), bg="#0d0d1a", fg="#555570", justify="center",
+                    wraplength=200
+                )
+                empty.pack(pady=50)
+            else:
+                self.create_desktop_icon_grid(shortcuts)
+            
+            # Tkinter zwingen, sofort zu aktualisieren
+            self.icons_frame.update_idletasks()
+            self.window.update()
+        
+        # Auch das Kachel-Icon aktualisieren
+        self.draw_tile_icon()
+    
+    def start_header_drag(self, event):
+        """Start des Header-Drags (für Verschieben oder Klick-zum-Schließen)"""
+        self.drag_data["x"] = event.x
+        self.drag_data["y"] = event.y
+        self.drag_data["dragging"] = False
+        self.drag_data["start_x"] = event.x_root
+        self.drag_data["start_y"] = event.y_root
+    
+    def do_header_drag(self, event):
+        """Führt Header-Drag durch (Fenster verschieben)"""
+        dx = abs(event.x_root - self.drag_data.get("start_x", event.x_root))
+        dy = abs(event.y_root - self.drag_data.get("start_y", event.y_root))
+        
+        if dx > 5 or dy > 5:
+            self.drag_data["dragging"] = True
+            x = self.window.winfo_x() + (event.x - self.drag_data["x"])
+            y = self.window.winfo_y() + (event.y - self.drag_data["y"])
+            self.window.geometry(f"+{x}+{y}")
+    
+    def stop_header_drag(self, event):
+        """Beendet Header-Drag - bei Klick (kein Drag) wird geschlossen"""
+        was_dragging = self.drag_data.get("dragging", False)
+        self.drag_data["dragging"] = False
+        
+        if was_dragging:
+            # Es wurde gedraggt - Position speichern
+            x = self.window.winfo_x()
+            y = self.window.winfo_y()
+            snap_x, snap_y = WindowsDesktopAPI.snap_to_grid(x, y)
+            self.window.geometry(f"+{snap_x}+{snap_y}")
+            self.config.pos_x = snap_x
+            self.config.pos_y = snap_y
+            self.manager.record_change(ConfigJournal.OP_MOVE, self.tile_id,
+                                       pos_x=snap_x, pos_y=snap_y)
+        else:
+            # Es war ein Klick - Kachel schließen
+            self.collapse()
+    
+    def stop_drag_header(self, event):
+        """Alias für Kompatibilität"""
+        self.stop_header_drag(event)
+
+    # === Drag auf freie Fläche der expandierten Kachel ===
+
+    def _start_bg_drag(self, event):
+        """Drag starten bei Klick auf freie Fläche (expandiert)"""
+        self.drag_data["x"] = event.x_root - self.window.winfo_x()
+        self.drag_data["y"] = event.y_root - self.window.winfo_y()
+        self.drag_data["dragging"] = False
+        self.drag_data["start_x"] = event.x_root
+        self.drag_data["start_y"] = event.y_root
+
+    def _do_bg_drag(self, event):
+        """Drag durchführen auf freie Fläche (expandiert)"""
+        dx = abs(event.x_root - self.drag_data.get("start_x", event.x_root))
+        dy = abs(event.y_root - self.drag_data.get("start_y", event.y_root))
+
+        if dx > 5 or dy > 5:
+            self.drag_data["dragging"] = True
+            x = event.x_root - self.drag_data["x"]
+            y = event.y_root - self.drag_data["y"]
+            self.window.geometry(f"+{x}+{y}")
+
+    def _stop_bg_drag(self, event):
+        """Drag beenden auf freie Fläche — nur Position speichern, kein Collapse"""
+        was_dragging = self.drag_data.get("dragging", False)
+        self.drag_data["dragging"] = False
+
+        if was_dragging:
+            x = self.window.winfo_x()
+            y = self.window.winfo_y()
+            snap_x, snap_y = WindowsDesktopAPI.snap_to_grid(x, y)
+            self.window.geometry(f"+{snap_x}+{snap_y}")
+            self.config.pos_x = snap_x
+            self.config.pos_y = snap_y
+            self.manager.record_change(ConfigJournal.OP_MOVE, self.tile_id,
+                                       pos_x=snap_x, pos_y=snap_y)
+
+    # === Inline-Umbenennung per Klick auf den Namen ===
+
+    def _start_name_edit(self):
+        """Ersetzt das Footer-Label durch ein Eingabefeld zum Umbenennen"""
+        if not hasattr(self, '_footer_label') or not self._footer_label:
+            return
+
+        glass_bg = "#0d0d1a"
+        current_name = self.config.name
+
+        # Label verstecken
+        self._footer_label.pack_forget()
+
+        # Entry-Widget an gleicher Stelle einfügen
+        self._name_entry = tk.Entry(
+            self.expanded_frame,
+            font=("Segoe UI Semibold", 9),
+            bg="#1a1a34", fg="#e0e0e0",
+            insertbackground="#e0e0e0",
+            relief="flat", justify="center",
+            highlightthickness=1, highlightcolor="#5566aa",
+            highlightbackground="#3a3a5a"
+        )
+        self._name_entry.insert(0, current_name)
+        self._name_entry.pack(fill="x", padx=10, pady=(3, 8))
+        self._name_entry.select_range(0, "end")
+        self._name_entry.focus_set()
+
+        self._name_entry.bind("<Return>", lambda e: self._finish_name_edit())
+        self._name_entry.bind("<Escape>", lambda e: self._cancel_name_edit())
+        self._name_entry.bind("<FocusOut>", lambda e: self._finish_name_edit())
+
+    def _finish_name_edit(self):
+        """Übernimmt den neuen Namen aus dem Eingabefeld"""
+        if not hasattr(self, '_name_entry') or not self._name_entry:
+            return
+
+        new_name = self._name_entry.get().strip()
+        if new_name:
+            self.config.name = new_name
+            self.manager.record_change(ConfigJournal.OP_RENAME, self.tile_id, name=new_name)
+
+        self._name_entry.destroy()
+        self._name_entry = None
+
+        # Footer-Label mit neuem Namen wiederherstellen
+        self._rebuild_footer_label()
+
+        # Auch das minimierte Icon aktualisieren
+        self.draw_tile_icon()
+
+    def _cancel_name_edit(self):
+        """Bricht die Umbenennung ab, stellt altes Label wieder her"""
+        if hasattr(self, '_name_entry') and self._name_entry:
+            self._name_entry.destroy()
+            self._name_entry = None
+
+        self._rebuild_footer_label()
+
+    def _rebuild_footer_label(self):
+        """Erstellt das Footer-Label mit gekürztem Namen neu"""
+        glass_bg = "#0d0d1a"
+        display_name = self._truncated_name(self.expanded_width)
+        self._footer_label = tk.Label(
+            self.expanded_frame, text=display_name,
+            font=("Segoe UI Semibold", 9), bg=glass_bg, fg="#e0e0e0",
+            anchor="center", cursor="hand2"
+        )
+        self._footer_label.pack(fill="x", pady=(3, 8))
+        self._footer_label.bind("<Button-1>", lambda e: self._start_name_edit())
+        self._footer_label.bind("<Button-3>", self.show_context_menu)
+
+    def launch_shortcut(self, path):
+        """Startet Verknüpfung"""
+        try:
+            os.startfile(path)
+        except Exception as e:
+            messagebox.showerror("Fehler", f"Konnte nicht öffnen:\n{e}")
+    
+    def remove_shortcut(self, index):
+        """Entfernt Verknüpfung (ohne wiederherzustellen)"""
+        shortcuts = self.config.shortcuts
+        if 0 <= index < len(shortcuts):
+            path = shortcuts[index].path
+            self.manager.path_index.discard(self.tile_id, shortcuts[index])
+            del shortcuts[index]
+            self.manager.path_index.reindex_tile(self.tile_id, shortcuts, index)
+            self.manager.record_change(ConfigJournal.OP_REMOVE_SHORTCUT, self.tile_id,
+                                       index=index, path=path)
+            self.refresh_expanded_view()
+    
+    def add_shortcut_dialog(self):
+        """Dialog zum Hinzufügen"""
+        filepath = filedialog.askopenfilename(
+            title="Verknüpfung auswählen",
+            filetypes=[("Alle Dateien", "*.*"), ("Programme", "*.exe"), ("Verknüpfungen", "*.lnk")]
+        )
+        
+        if filepath:
+            name = Path(filepath).stem
+            
+            # Prüfen ob schon vorhanden (in irgendeiner Kachel)
+            existing = self.manager.path_index.lookup(filepath)
+            if existing is not None:
+                if existing[0] != self.tile_id:
+                    other = self.manager.tiles.get(existing[0])
+                    other_name = other.config.name if other else existing[0]
+                    messagebox.showinfo("Bereits vorhanden",
+                                        f"Die Datei liegt bereits in der Kachel '{other_name}'.")
+                return
+            
+            shortcut = Shortcut(name, filepath)
+            desktop = WindowsDesktopAPI.get_desktop_path()
+            on_desktop = Path(filepath).parent == Path(desktop)
+            if on_desktop:
+                # Position merken, bevor das Icon verschwindet
+                filename = Path(filepath).name
+                shortcut.desktop_pos = WindowsDesktopAPI.get_desktop_icon_positions([filename]).get(filename)
+            
+            self.config.shortcuts.append(shortcut)
+            self.manager.path_index.reindex_tile(self.tile_id, self.config.shortcuts,
+                                                 len(self.config.shortcuts) - 1)
+            self.manager.record_change(ConfigJournal.OP_ADD_SHORTCUT, self.tile_id,
+                                       index=len(self.config.shortcuts) - 1,
+                                       shortcut=shortcut.to_dict())
+            
+            # Falls auf Desktop, verstecken
+            if on_desktop:
+                self.manager.attributes.hide([filepath])
+            
+            self.collapse()
+            self.draw_tile_icon()
+            self.window.after(100, self.expand)
+    
+    @traced("collapse", _tile_span)
+    def collapse(self):
+        """Kachel zusammenklappen"""
+        if not self.is_expanded or self.animation_running:
+            return
+        
+        self.animation_running = True
+        self.is_expanded = False
+        
+        if self.expanded_frame:
+            self.expanded_frame.destroy()
+            self.expanded_frame = None
+        self._expanded_icon_images.clear()
+
+        self.canvas.pack(fill="both", expand=True)
+        
+        x = self.window.winfo_x()
+        y = self.window.winfo_y()
+        snap_x, snap_y = WindowsDesktopAPI.snap_to_grid(x, y)
+        
+        self.animate_size(
+            self.expanded_width, self.expanded_height,
+            self.tile_width, self.tile_height,
+            snap_x, snap_y,
+            callback=self.finish_collapse
+        )
+    
+    def finish_collapse(self):
+        """Collapse abschließen"""
+        # Hover-Cache invalidieren (Shortcuts können sich geändert haben)
+        self._hover_bg_photo = None
+        
+        self.draw_tile_icon()
+        self.animation_running = False
+        
+        # Abgerundete Ecken für die kleine Kachel
+        self.apply_rounded_corners(self.tile_width, self.tile_height)
+        
+        # Blur für collapsed-Zustand erneut aktivieren
+        if self.hwnd:
+            blur_color = 0xB0201A0D
+            enable_acrylic_blur(self.hwnd, blur_color)
+        
+        # Zurück in den Hintergrund
+        self.window.attributes("-topmost", False)
+        self.window.attributes("-alpha", 0.92)
+        self.window.after(100, self.move_to_background)
+    
+    def animate_size(self, from_w, from_h, to_w, to_h, x, y, callback=None):
+        """Größenanimation mit Ease-Out-Kurve für flüssigen 3D-Effekt"""
+        steps = 12
+        step_time = 10
+        
+        import math
+        
+        def ease_out(t):
+            """Cubic ease-out für natürliche Verzögerung"""
+            return 1 - (1 - t) ** 3
+        
+        def step(i):
+            if i <= steps:
+                t = ease_out(i / steps)
+                new_w = int(from_w + (to_w - from_w) * t)
+                new_h = int(from_h + (to_h - from_h) * t)
+                self.window.geometry(f"{new_w}x{new_h}+{x}+{y}")
+                # Abgerundete Ecken bei jedem Resize-Schritt aktualisieren
+                self.apply_rounded_corners(new_w, new_h)
+                self.window.after(step_time, lambda: step(i + 1))
+            else:
+                if callback:
+                    callback()
+        
+        step(1)
+    
+    def expand_tile_under_cursor(self, mx, my):
+        """Expandiert eine andere Kachel, wenn der Cursor während eines Drags darüber ist"""
+        for tile_id, tile in self.manager.tiles.items():
+            if tile is self:
+                continue
+            if tile.is_expanded or tile.animation_running:
+                continue
+            try:
+                tx = tile.window.winfo_rootx()
+                ty = tile.window.winfo_rooty()
+                tw = tile.window.winfo_width()
+                th = tile.window.winfo_height()
+                if tx <= mx <= tx + tw and ty <= my <= ty + th:
+                    tile.expand()
+                    return
+            except:
+                pass
+
+    def show_context_menu(self, event):
+        """Kontextmenü der Kachel (collapsed und expanded)"""
+        menu = reusable_menu(self.window, "tile_menu")
+
+        # Toggle für Verknüpfungsnamen in verkleinerter Ansicht
+        names_label = "✅ Icon-Namen ausblenden" if self.config.hide_shortcut_names else "⬜ Icon-Namen ausblenden"
+
+        if self.is_expanded:
+            # === Kontextmenü für expandierte Kachel ===
+            menu.add_command(label="📏 Größe anpassen…", command=self.show_size_dialog)
+            menu.add_separator()
+            menu.add_command(label="✏️ Umbenennen", command=self.rename)
+            menu.add_command(label=names_label, command=self._toggle_hide_shortcut_names)
+            menu.add_separator()
+            menu.add_command(label="📤 Alle wiederherstellen", command=self.restore_all_to_desktop)
+            menu.add_command(label="🗑️ Kachel löschen", command=self.delete_tile)
+            menu.add_separator()
+            self.manager.add_diagnostics_menu(menu)
+            menu.add_command(label="❌ Widget beenden", command=self.manager.quit)
+        else:
+            # === Kontextmenü für eingeklappte Kachel ===
+            menu.add_command(label="📂 Öffnen", command=self.expand)
+            menu.add_command(label="✏️ Umbenennen", command=self.rename)
+            menu.add_separator()
+            menu.add_command(label="📏 Größe anpassen…", command=self.show_size_dialog)
+            menu.add_command(label=names_label, command=self._toggle_hide_shortcut_names)
+            menu.add_separator()
+            menu.add_command(label="🆕 Neue Kachel", command=self.manager.create_new_tile)
+            menu.add_separator()
+            menu.add_command(label="📤 Alle wiederherstellen", command=self.restore_all_to_desktop)
+            menu.add_command(label="🗑️ Kachel löschen", command=self.delete_tile)
+            menu.add_separator()
+            self.manager.add_diagnostics_menu(menu)
+            menu.add_command(label="❌ Widget beenden", command=self.manager.quit)
+
+        menu.tk_popup(event.x_root, event.y_root)
+
+    def _toggle_hide_shortcut_names(self):
+        """Schaltet das Ausblenden der Verknüpfungsnamen in der verkleinerten Ansicht um"""
+        self.config.hide_shortcut_names = not self.config.hide_shortcut_names
+        self.manager.record_change(ConfigJournal.OP_SET, self.tile_id,
+                                   values={"hide_shortcut_names": self.config.hide_shortcut_names})
+        self._normal_bg_photo = None
+        self._hover_bg_photo = None
+        self.draw_tile_icon()
+
+    def show_size_dialog(self):
+        """Öffnet Slider-Dialog zur Größeneinstellung mit Pixel-Werten, Seitenverhältnis und Schriftgröße"""
+        self._size_dialog_open = True
+        dlg = tk.Toplevel(self.window)
+        dlg.title("Kachelgröße")
+        dlg.overrideredirect(True)
+        dlg.attributes("-topmost", True)
+        dlg.config(bg="#12122a")
+
+        style_fg = "#d0d0e0"
+        style_bg = "#12122a"
+        slider_trough = "#2a2a5a"
+        slider_fg = "#6a6aff"
+        sep_color = "#3a3a5a"
+
+        # --- Scrollbarer Inhalt ---
+        dlg_w = 280
+        outer = tk.Frame(dlg, bg=style_bg)
+        outer.pack(fill="both", expand=True)
+
+        dlg_canvas = tk.Canvas(outer, bg=style_bg, highlightthickness=0, width=dlg_w - 2)
+        dlg_scrollbar = tk.Scrollbar(outer, orient="vertical", command=dlg_canvas.yview)
+        content = tk.Frame(dlg_canvas, bg=style_bg)
+        content.bind("<Configure>", lambda e: dlg_canvas.configure(scrollregion=dlg_canvas.bbox("all")))
+        dlg_canvas.create_window((0, 0), window=content, anchor="nw", width=dlg_w - 16)
+        dlg_canvas.configure(yscrollcommand=dlg_scrollbar.set)
+        dlg_canvas.pack(side="left", fill="both", expand=True)
+        dlg_scrollbar.pack(side="right", fill="y")
+        dlg_canvas.bind("<MouseWheel>", lambda e: dlg_canvas.yview_scroll(int(-1 * (e.delta / 120)), "units"))
+
+        # Hilfsfunktion: Slider-Zeile erzeugen
+        def make_slider(parent, label_text, value, from_, to_):
+            frame = tk.Frame(parent, bg=style_bg)
+            frame.pack(fill="x", padx=14, pady=(2, 0))
+            lbl = tk.Label(frame, text=label_text, font=("Segoe UI", 8), bg=style_bg, fg=style_fg, anchor="w")
+            lbl.pack(fill="x")
+            var = tk.IntVar(value=value)
+            tk.Scale(
+                frame, from_=from_, to=to_, orient="horizontal",
+                variable=var, showvalue=False,
+                bg=style_bg, fg=style_fg, troughcolor=slider_trough,
+                highlightthickness=0, bd=0, sliderrelief="flat",
+                activebackground=slider_fg, length=200
+            ).pack(fill="x")
+            return var, lbl
+
+        # Hilfsfunktion: Seitenverhältnis-Checkbox
+        def make_lock_cb(parent, value):
+            var = tk.BooleanVar(value=value)
+            cb = tk.Checkbutton(
+                parent, text="Seitenverhältnis beibehalten", variable=var,
+                font=("Segoe UI", 8), bg=style_bg, fg="#8888aa",
+                activebackground=style_bg, activeforeground="#8888aa",
+                selectcolor="#2a2a5a", highlightthickness=0, bd=0
+            )
+            cb.pack(padx=14, pady=(0, 2), anchor="w")
+            return var
+
+        # ===== KACHELGRÖSSE =====
+        tk.Label(content, text="Kachelgröße", font=("Segoe UI Semibold", 10),
+                 bg=style_bg, fg=style_fg).pack(pady=(8, 2))
+        tk.Frame(content, bg=sep_color, height=1).pack(fill="x", padx=12)
+
+        # -- Verkleinert --
+        tk.Label(content, text="Verkleinert", font=("Segoe UI Semibold", 9),
+                 bg=style_bg, fg="#8888cc").pack(pady=(6, 0), anchor="w", padx=14)
+
+        ct_w_var, ct_w_lbl = make_slider(content, f"Breite: {self.config.collapsed_tile_w}px", self.config.collapsed_tile_w, 40, 1000)
+        ct_h_var, ct_h_lbl = make_slider(content, f"Höhe: {self.config.collapsed_tile_h}px", self.config.collapsed_tile_h, 40, 1000)
+        ct_lock_var = make_lock_cb(content, self.config.lock_aspect_collapsed_tile)
+
+        # -- Expandiert --
+        tk.Label(content, text="Expandiert", font=("Segoe UI Semibold", 9),
+                 bg=style_bg, fg="#8888cc").pack(pady=(6, 0), anchor="w", padx=14)
+
+        et_w_var, et_w_lbl = make_slider(content, f"Breite: {self.config.expanded_tile_w}px", self.config.expanded_tile_w, 80, 1500)
+        et_h_var, et_h_lbl = make_slider(content, f"Höhe: {self.config.expanded_tile_h}px", self.config.expanded_tile_h, 100, 1500)
+        et_lock_var = make_lock_cb(content, self.config.lock_aspect_expanded_tile)
+
+        # ===== ICON-GRÖSSE =====
+        tk.Frame(content, bg=sep_color, height=1).pack(fill="x", padx=12, pady=(6, 0))
+        tk.Label(content, text="Icon-Größe", font=("Segoe UI Semibold", 10),
+                 bg=style_bg, fg=style_fg).pack(pady=(6, 2))
+        tk.Frame(content, bg=sep_color, height=1).pack(fill="x", padx=12)
+
+        # -- Verkleinert --
+        tk.Label(content, text="Verkleinert", font=("Segoe UI Semibold", 9),
+                 bg=style_bg, fg="#8888cc").pack(pady=(6, 0), anchor="w", padx=14)
+
+        ci_w_var, ci_w_lbl = make_slider(content, f"Breite: {self.config.collapsed_icon_w}px", self.config.collapsed_icon_w, 16, 128)
+        ci_h_var, ci_h_lbl = make_slider(content, f"Höhe: {self.config.collapsed_icon_h}px", self.config.collapsed_icon_h, 16, 128)
+        ci_lock_var = make_lock_cb(content, self.config.lock_aspect_collapsed_icon)
+
+        # -- Expandiert --
+        tk.Label(content, text="Expandiert", font=("Segoe UI Semibold", 9),
+                 bg=style_bg, fg="#8888cc").pack(pady=(6, 0), anchor="w", padx=14)
+
+        ei_w_var, ei_w_lbl = make_slider(content, f"Breite: {self.config.expanded_icon_w}px", self.config.expanded_icon_w, 16, 128)
+        ei_h_var, ei_h_lbl = make_slider(content, f"Höhe: {self.config.expanded_icon_h}px", self.config.expanded_icon_h, 16, 128)
+        ei_lock_var = make_lock_cb(content, self.config.lock_aspect_expanded_icon)
+
+        # ===== SCHRIFTGRÖSSE =====
+        tk.Frame(content, bg=sep_color, height=1).pack(fill="x", padx=12, pady=(6, 0))
+        tk.Label(content, text="Schriftgröße", font=("Segoe UI Semibold", 10),
+                 bg=style_bg, fg=style_fg).pack(pady=(6, 2))
+        tk.Frame(content, bg=sep_color, height=1).pack(fill="x", padx=12)
+
+        fn_c_var, fn_c_lbl = make_slider(content, f"Verkleinert: {self.config.collapsed_name_font_size}pt", self.config.collapsed_name_font_size, 6, 24)
+        fn_e_var, fn_e_lbl = make_slider(content, f"Expandiert: {self.config.expanded_name_font_size}pt", self.config.expanded_name_font_size, 6, 24)
+
+        # ===== OPTIONEN =====
+        tk.Frame(content, bg=sep_color, height=1).pack(fill="x", padx=12, pady=(6, 0))
+
+        hide_names_var = tk.BooleanVar(value=self.config.hide_shortcut_names)
+        tk.Checkbutton(
+            content, text="Icon-Namen ausblenden", variable=hide_names_var,
+            font=("Segoe UI", 9), bg=style_bg, fg=style_fg,
+            activebackground=style_bg, activeforeground=style_fg,
+            selectcolor="#2a2a5a", highlightthickness=0, bd=0
+        ).pack(padx=14, pady=(6, 8), anchor="w")
+
+        # --- Seitenverhältnis-Tracking: letzte Werte für Ratio-Berechnung ---
+        _last = {
+            'ct_w': self.config.collapsed_tile_w, 'ct_h': self.config.collapsed_tile_h,
+            'et_w': self.config.expanded_tile_w, 'et_h': self.config.expanded_tile_h,
+            'ci_w': self.config.collapsed_icon_w, 'ci_h': self.config.collapsed_icon_h,
+            'ei_w': self.config.expanded_icon_w, 'ei_h': self.config.expanded_icon_h,
+        }
+        _updating = {'active': False}
+
+        # --- Live-Update Callbacks ---
+        def _apply_pair(w_var, h_var, w_lbl, h_lbl, lock_var, last_w_key, last_h_key,
+                        w_key, h_key, w_min, w_max, h_min, h_max,
+                        unit, is_w_change, refresh_fn):
+            if _updating['active']:
+                return
+            _updating['active'] = True
+            try:
+                w = w_var.get()
+                h = h_var.get()
+                if lock_var.get():
+                    old_w = _last[last_w_key]
+                    old_h = _last[last_h_key]
+                    if old_w > 0 and old_h > 0:
+                        ratio = old_h / old_w
+                        if is_w_change:
+                            h = max(h_min, min(h_max, int(w * ratio)))
+                            h_var.set(h)
+                        else:
+                            w = max(w_min, min(w_max, int(h / ratio)))
+                            w_var.set(w)
+                w_lbl.config(text=f"Breite: {w}{unit}")
+                h_lbl.config(text=f"Höhe: {h}{unit}")
+                _last[last_w_key] = w
+                _last[last_h_key] = h
+                setattr(self.config, w_key, w)
+                setattr(self.config, h_key, h)
+                refresh_fn()
+                self.manager.record_change(ConfigJournal.OP_RESIZE, self.tile_id,
+                                           values={w_key: w, h_key: h})
+            finally:
+                _updating['active'] = False
+
+        def _ensure_collapsed():
+            """Kachel sofort verkleinern (ohne Animation) damit Änderungen sichtbar sind"""
+            if self.is_expanded and not self.animation_running:
+                self.is_expanded = False
+                if self.expanded_frame:
+                    self.expanded_frame.destroy()
+                    self.expanded_frame = None
+                self._expanded_icon_images.clear()
+                self.canvas.pack(fill="both", expand=True)
+                x = self.window.winfo_x()
+                y = self.window.winfo_y()
+                self.window.geometry(f"{self.tile_width}x{self.tile_height}+{x}+{y}")
+                self.apply_rounded_corners(self.tile_width, self.tile_height)
+                self._hover_bg_photo = None
+                self.draw_tile_icon()
+                if self.hwnd:
+                    enable_acrylic_blur(self.hwnd, 0xB0201A0D)
+
+        def _ensure_expanded():
+            """Kachel sofort expandieren (ohne Animation) damit Änderungen sichtbar sind"""
+            if not self.is_expanded and not self.animation_running:
+                self.is_expanded = True
+                self.window.attributes("-topmost", True)
+                self.window.attributes("-alpha", 0.96)
+                self.window.lift()
+                x = self.window.winfo_x()
+                y = self.window.winfo_y()
+                self.window.geometry(f"{self.expanded_width}x{self.expanded_height}+{x}+{y}")
+                self.apply_rounded_corners(self.expanded_width, self.expanded_height)
+                if self.hwnd:
+                    enable_acrylic_blur(self.hwnd, 0xC0281E10)
+                self.canvas.pack_forget()
+                self.show_expanded_content()
+
+        def refresh_collapsed():
+            _ensure_collapsed()
+            self.apply_scale()
+            self._normal_bg_photo = None
+            self._hover_bg_photo = None
+            self.canvas.config(width=self.tile_width, height=self.tile_height)
+            self.draw_tile_icon()
+            if not self.is_expanded:
+                x = self.window.winfo_x()
+                y = self.window.winfo_y()
+                self.window.geometry(f"{self.tile_width}x{self.tile_height}+{x}+{y}")
+                self.apply_rounded_corners(self.tile_width, self.tile_height)
+                if self.hwnd:
+                    enable_acrylic_blur(self.hwnd, 0xB0201A0D)
+
+        def refresh_expanded():
+            _ensure_expanded()
+            self.apply_scale()
+            if self.is_expanded:
+                x = self.window.winfo_x()
+                y = self.window.winfo_y()
+                self.window.geometry(f"{self.expanded_width}x{self.expanded_height}+{x}+{y}")
+                self.apply_rounded_corners(self.expanded_width, self.expanded_height)
+                self.refresh_expanded_view()
+
+        def refresh_collapsed_icons():
+            _ensure_collapsed()
+            self._normal_bg_photo = None
+            self._hover_bg_photo = None
+            self.draw_tile_icon()
+
+        def refresh_expanded_icons():
+            _ensure_expanded()
+            if self.is_expanded:
+                self.refresh_expanded_view()
+
+        # Kachelgröße: Verkleinert
+        ct_w_var.trace_add("write", lambda *_: _apply_pair(
+            ct_w_var, ct_h_var, ct_w_lbl, ct_h_lbl, ct_lock_var, 'ct_w', 'ct_h',
+            'collapsed_tile_w', 'collapsed_tile_h',
+            40, 1000, 40, 1000, 'px', True, refresh_collapsed))
+        ct_h_var.trace_add("write", lambda *_: _apply_pair(
+            ct_w_var, ct_h_var, ct_w_lbl, ct_h_lbl, ct_lock_var, 'ct_w', 'ct_h',
+            'collapsed_tile_w', 'collapsed_tile_h',
+            40, 1000, 40, 1000, 'px', False, refresh_collapsed))
+
+        # Kachelgröße: Expandiert
+        et_w_var.trace_add("write", lambda *_: _apply_pair(
+            et_w_var, et_h_var, et_w_lbl, et_h_lbl, et_lock_var, 'et_w', 'et_h',
+            'expanded_tile_w', 'expanded_tile_h',
+            80, 1500, 100, 1500, 'px', True, refresh_expanded))
+        et_h_var.trace_add("write", lambda *_: _apply_pair(
+            et_w_var, et_h_var, et_w_lbl, et_h_lbl, et_lock_var, 'et_w', 'et_h',
+            'expanded_tile_w', 'expanded_tile_h',
+            80, 1500, 100, 1500, 'px', False, refresh_expanded))
+
+        # Icon-Größe: Verkleinert
+        ci_w_var.trace_add("write", lambda *_: _apply_pair(
+            ci_w_var, ci_h_var, ci_w_lbl, ci_h_lbl, ci_lock_var, 'ci_w', 'ci_h',
+            'collapsed_icon_w', 'collapsed_icon_h',
+            16, 128, 16, 128, 'px', True, refresh_collapsed_icons))
+        ci_h_var.trace_add("write", lambda *_: _apply_pair(
+            ci_w_var, ci_h_var, ci_w_lbl, ci_h_lbl, ci_lock_var, 'ci_w', 'ci_h',
+            'collapsed_icon_w', 'collapsed_icon_h',
+            16, 128, 16, 128, 'px', False, refresh_collapsed_icons))
+
+        # Icon-Größe: Expandiert
+        ei_w_var.trace_add("write", lambda *_: _apply_pair(
+            ei_w_var, ei_h_var, ei_w_lbl, ei_h_lbl, ei_lock_var, 'ei_w', 'ei_h',
+            'expanded_icon_w', 'expanded_icon_h',
+            16, 128, 16, 128, 'px', True, refresh_expanded_icons))
+        ei_h_var.trace_add("write", lambda *_: _apply_pair(
+            ei_w_var, ei_h_var, ei_w_lbl, ei_h_lbl, ei_lock_var, 'ei_w', 'ei_h',
+            'expanded_icon_w', 'expanded_icon_h',
+            16, 128, 16, 128, 'px', False, refresh_expanded_icons))
+
+        # Schriftgröße
+        def on_fn_c_change(*_):
+            _ensure_collapsed()
+            val = fn_c_var.get()
+            fn_c_lbl.config(text=f"Verkleinert: {val}pt")
+            self.config.collapsed_name_font_size = val
+            self._normal_bg_photo = None
+            self._hover_bg_photo = None
+            self.draw_tile_icon()
+            self.manager.record_change(ConfigJournal.OP_SET, self.tile_id,
+                                       values={"collapsed_name_font_size": val})
+
+        def on_fn_e_change(*_):
+            _ensure_expanded()
+            val = fn_e_var.get()
+            fn_e_lbl.config(text=f"Expandiert: {val}pt")
+            self.config.expanded_name_font_size = val
+            if self.is_expanded:
+                self.refresh_expanded_view()
+            self.manager.record_change(ConfigJournal.OP_SET, self.tile_id,
+                                       values={"expanded_name_font_size": val})
+
+        fn_c_var.trace_add("write", on_fn_c_change)
+        fn_e_var.trace_add("write", on_fn_e_change)
+
+        # Icon-Namen ausblenden
+        def on_hide_names_change(*_):
+            self.config.hide_shortcut_names = hide_names_var.get()
+            self._normal_bg_photo = None
+            self._hover_bg_photo = None
+            self.draw_tile_icon()
+            self.manager.record_change(ConfigJournal.OP_SET, self.tile_id,
+                                       values={"hide_shortcut_names": self.config.hide_shortcut_names})
+
+        hide_names_var.trace_add("write", on_hide_names_change)
+
+        # Seitenverhältnis-Locks speichern
+        def save_lock(key, var):
+            def _save(*_):
+                setattr(self.config, key, var.get())
+                self.manager.record_change(ConfigJournal.OP_SET, self.tile_id,
+                                           values={key: var.get()})
+            return _save
+
+        ct_lock_var.trace_add("write", save_lock('lock_aspect_collapsed_tile', ct_lock_var))
+        et_lock_var.trace_add("write", save_lock('lock_aspect_expanded_tile', et_lock_var))
+        ci_lock_var.trace_add("write", save_lock('lock_aspect_collapsed_icon', ci_lock_var))
+        ei_lock_var.trace_add("write", save_lock('lock_aspect_expanded_icon', ei_lock_var))
+
+        # --- Dialog positionieren und anzeigen ---
+        dlg.update_idletasks()
+        content_h = content.winfo_reqheight()
+        dlg_h = min(content_h + 4, self.window.winfo_screenheight() - 80)
+        wx = self.window.winfo_x() + self.window.winfo_width() + 8
+        wy = self.window.winfo_y()
+        if wy + dlg_h > self.window.winfo_screenheight() - 40:
+            wy = max(0, self.window.winfo_screenheight() - dlg_h - 40)
+        dlg.geometry(f"{dlg_w}x{dlg_h}+{wx}+{wy}")
+
+        # --- Schließen bei Klick außerhalb ---
+        def close_dialog():
+            self._size_dialog_open = False
+            dlg.destroy()
+
+        def on_focus_out(e):
+            try:
+                focused = dlg.focus_get()
+                if focused and str(focused).startswith(str(dlg)):
+                    return
+            except:
+                pass
+            close_dialog()
+
+        dlg.bind("<FocusOut>", on_focus_out)
+        dlg.bind("<Escape>", lambda e: close_dialog())
+        dlg.protocol("WM_DELETE_WINDOW", close_dialog)
+        dlg.focus_force()
+    
+    def restore_all_to_desktop(self):
+        """Stellt alle Verknüpfungen auf Desktop wieder her"""
+        report = self.manager.attributes.unhide(s.path for s in self.config.shortcuts)
+        for path, error in report.failed:
+            print(f"  ✗ Fehler bei {Path(path).stem}: {error}")
+        WindowsDesktopAPI.notifications().flush()
+        self.manager.restore_desktop_positions(self.config.shortcuts)
+        
+        self.manager.path_index.discard_tile(self.tile_id, self.config.shortcuts)
+        self.config.shortcuts = []
+        self.manager.record_change(ConfigJournal.OP_CLEAR_SHORTCUTS, self.tile_id)
+        self.draw_tile_icon()
+    
+    def rename(self):
+        """Kachel umbenennen"""
+        new_name = simpledialog.askstring(
+            "Umbenennen", "Neuer Name:",
+            initialvalue=self.config.name,
+            parent=self.window
+        )
+        if new_name:
+            self.config.name = new_name
+            self.manager.record_change(ConfigJournal.OP_RENAME, self.tile_id, name=new_name)
+            self.draw_tile_icon()
+    
+    def delete_tile(self):
+        """Kachel löschen"""
+        if messagebox.askyesno("Löschen",
+            "Kachel löschen?\n\nVerknüpfungen werden auf dem Desktop wiederhergestellt."):
+            self.restore_all_to_desktop()
+            self.manager.delete_tile(self.tile_id)
+    
+    def close(self):
+        """Fenster schließen"""
+        self.window.destroy()
+
+
+class DesktopFolderManager:
+    """Verwaltet alle Ordner-Kacheln"""
+    
+    CONFIG_FILE = DEFAULT_CONFIG_FILE
+    JOURNAL_FILE = DEFAULT_JOURNAL_FILE
+    DB_FILE = DEFAULT_DB_FILE
+    LEDGER_FILE = DEFAULT_LEDGER_FILE
+
+    # Persistenz: "json" (Snapshot + Journal) oder "sqlite"
+    STORAGE_BACKEND = os.environ.get("DESKTOP_FOLDER_STORE", "json")
+    # Icons in einem Hilfsprozess extrahieren ("0" = im eigenen Prozess)
+    ICON_WORKER = os.environ.get("DESKTOP_FOLDER_ICON_WORKER", "1") != "0"
+    # Wie oft die gesammelten Änderungen des Desktop-Watchers abgeholt werden (ms)
+    WATCH_POLL_MS = 250
+    # Gecachte Kachelbilder für den schnellen Start
+    FACE_DIR = Path.home() / ".desktop_folder_widget_v3.faces"
+    # Spätestens dann soll die erste Kachel sichtbar und bedienbar sein (ms ab Start)
+    FIRST_TILE_BUDGET_MS = 300
+    # Kacheln pro Leerlauf-Schritt in Start-Stufe 2 und 3
+    STARTUP_BATCH = 2
+    # Wie oft von weiteren Starts weitergeleitete Befehle abgeholt werden (ms)
+    COMMAND_POLL_MS = 100
+    
+    def __init__(self, timeline=None, commands=None):
+        self.timeline = timeline or StartupTimeline()
+        # queue.Queue mit Anfragen aus instance.CommandServer (None: kein Socket)
+        self.commands = commands
+        self.root = tk.Tk()
+        self.root.withdraw()
+        
+        self.tiles = {}
+        self.faces = TileFaceCache(self.FACE_DIR)
+        self.startup_done = False
+        self.hidden_restored = False  # quit() hat alle Dateien wieder sichtbar gemacht
+        WindowsDesktopAPI.notifications().scheduler = self.root.after
+        if self.ICON_WORKER:
+            IconExtractor.worker = IconWorkerClient()
+        self.ledger = HiddenFileLedger(self.LEDGER_FILE)
+        self.attributes = BulkAttributeEngine(ledger=self.ledger)
+        self.store = self.create_store()
+        self.config = self.load_config()
+        self.path_index = ShortcutPathIndex()
+        self.path_index.rebuild(self.config["tiles"])
+        self.validator = ShortcutValidator()
+        self.path_states = {}  # normalisierter Pfad → PathState der letzten Prüfung
+        self.timeline.mark("Konfiguration geladen")
+        
+        # Erste Kachel erstellen falls keine vorhanden
+        if not self.config.get("tiles"):
+            self.config["tiles"] = {
+                "0": TileConfig(name="Apps", pos_x=DESKTOP_MARGIN_X, pos_y=DESKTOP_MARGIN_Y)
+            }
+            self.save_config()
+        
+        # Start-Stufe 1: alle Fenster mit dem zuletzt gespeicherten Bild zeigen.
+        # Kacheln außerhalb des Bildschirms werden erst im Leerlauf geladen.
+        deferred = []
+        for tile_id, tile_config in self.config["tiles"].items():
+            if tile_config.shortcuts is None:
+                deferred.append(tile_id)
+                continue
+            self.tiles[tile_id] = FolderTile(self, tile_id, tile_config, staged=True)
+            if len(self.tiles) == 1:
+                self.root.update_idletasks()
+                first_ms = self.timeline.mark("erste Kachel sichtbar")
+                if first_ms > self.FIRST_TILE_BUDGET_MS:
+                    print(f"⚠ Erste Kachel erst nach {first_ms:.0f} ms (Budget {self.FIRST_TILE_BUDGET_MS} ms)")
+        self.timeline.mark("Stufe 1: alle Kacheln sichtbar")
+        self.root.after_idle(lambda: self._startup_stage(self._wire_up_tiles, self._staged_tiles(), 2))
+        if deferred:
+            self.root.after_idle(lambda: self._load_deferred_tiles(deferred))
+        # Nach den nachgeladenen Kacheln: Reste eines Absturzes aufräumen,
+        # dann alle Pfade im Hintergrund prüfen
+        self.root.after_idle(self.reconcile_hidden_ledger)
+        self.root.after_idle(self.start_validation)
+        
+        # Desktop-Ordner überwachen (gelöschte/umbenannte/ersetzte Verknüpfungen)
+        self.watcher = None
+        self.desktop_changes = ChangeDebouncer()
+        self.root.after_idle(self.start_desktop_watcher)
+        
+        # Befehle weiterer Starts erst nach den nachgeladenen Kacheln ausführen
+        if self.commands is not None:
+            self.root.after_idle(self._poll_commands)
+
+        self.check_dependencies()
+
+        # Drag-Erkennung: Periodisch prüfen ob Maus mit gedrückter Taste über Kachel ist
+        self._drag_expand_timer = None
+        self.start_drag_detection()
+
+        # Wachhund für Hänger der Tk-Schleife (startet mit der Hauptschleife)
+        self.stalls = StallDetector.from_environment(self.root.after)
+        if self.stalls is not None:
+            self.root.after_idle(self.stalls.start)
+
+        # Kennzahlen regelmäßig in eine Textdatei schreiben
+        self.register_metrics()
+        self.metrics_writer = MetricsWriter.from_environment(self.root.after)
+        if self.metrics_writer is not None:
+            self.root.after_idle(self.metrics_writer.start)
+
+        # Speicher-Aufnahmen (tracemalloc) für Lecks über lange Laufzeiten
+        self.memory = MemoryTracker.from_environment(self.root.after)
+        if self.memory is not None:
+            self.root.after_idle(self.memory.start)
+    
+    def check_dependencies(self):
+        """Prüft Abhängigkeiten"""
+        missing = []
+        if not HAS_WINDND:
+            missing.append("windnd")
+        if not HAS_WIN32:
+            missing.append("pywin32 + Pillow")
+        if not HAS_SHELL:
+            missing.append("pywin32 (Shell)")
+
+        if missing:
+            print(f"\n⚠️ Fehlende Abhängigkeiten: {', '.join(missing)}")
+            print("   pip install windnd pywin32 Pillow\n")
+
+    def start_drag_detection(self):
+        """Startet periodische Drag-Erkennung für externe Datei-Drags"""
+        self._check_drag_over_tiles()
+
+    def _check_drag_over_tiles(self):
+        """Prüft ob die Maus mit gedrückter Taste über einer eingeklappten Kachel ist"""
+        try:
+            # Linke Maustaste gedrückt? (GetAsyncKeyState Bit 0x8000 = gedrückt)
+            lmb_state = user32.GetAsyncKeyState(0x01)  # VK_LBUTTON
+            if lmb_state & 0x8000:
+                # Mausposition holen
+                point = wintypes.POINT()
+                user32.GetCursorPos(ctypes.byref(point))
+                mx, my = point.x, point.y
+
+                # Prüfe ob irgendeine Kachel gerade gedraggt wird (Tile-Verschiebung)
+                any_dragging = any(
+                    t.drag_data.get("dragging", False) for t in self.tiles.values()
+                )
+                if not any_dragging:
+                    # Prüfe alle Kacheln
+                    for tile_id, tile in self.tiles.items():
+                        if tile.is_expanded or tile.animation_running:
+                            continue
+                        try:
+                            tx = tile.window.winfo_rootx()
+                            ty = tile.window.winfo_rooty()
+                            tw = tile.window.winfo_width()
+                            th = tile.window.winfo_height()
+                            if tx <= mx <= tx + tw and ty <= my <= ty + th:
+                                tile.expand()
+                                break
+                        except:
+                            pass
+        except:
+            pass
+
+        # Alle 200ms erneut prüfen
+        METRICS.inc("drag.polls")
+        self._drag_expand_timer = self.root.after(200, self._check_drag_over_tiles)
+    
+    def create_store(self):
+        """Erstellt das Persistenz-Backend (JSON + Journal oder SQLite)"""
+        return create_config_store(self.STORAGE_BACKEND, self.CONFIG_FILE, self.JOURNAL_FILE, self.DB_FILE)
+
+    def load_config(self):
+        """Lädt Konfiguration (nur Kacheln im sichtbaren Bereich vollständig)"""
+        visible_rect = (0, 0, self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        try:
+            data = self.store.load(visible_rect)
+        except Exception as e:
+            print(f"Ladefehler: {e}")
+            data = {"tiles": {}}
+
+        # Schema-Migration läuft nur einmal — danach steht die Version in der Datei
+        migrated = migrate_config(data)
+        config = config_from_dict(data)
+        if migrated:
+            try:
+                self.store.save(config)
+            except Exception as e:
+                print(f"Speicherfehler: {e}")
+        return config
+
+    def _load_deferred_tiles(self, tile_ids):
+        """Lädt Kacheln außerhalb des sichtbaren Bereichs nach"""
+        for tile_id in tile_ids:
+            tile_config = self.config["tiles"].get(tile_id)
+            if tile_config is None or tile_id in self.tiles:
+                continue
+            tile_config.shortcuts = [Shortcut.from_dict(s) for s in self.store.load_shortcuts(tile_id)]
+            self.path_index.reindex_tile(tile_id, tile_config.shortcuts)
+            self.tiles[tile_id] = FolderTile(self, tile_id, tile_config, staged=True)
+    
+    def _staged_tiles(self):
+        return [tile for tile in self.tiles.values() if tile.staged]
+    
+    def _startup_stage(self, step, tiles, stage):
+        """
+        Führt step(Kacheln) in Leerlauf-Schritten zu je STARTUP_BATCH Kacheln
+        aus, damit die Oberfläche dazwischen auf Eingaben reagiert. Danach
+        folgt die nächste Stufe (2 → 3). Nachgeladene Kacheln, die während
+        einer Stufe dazukommen, werden mitgenommen.
+        """
+        batch, rest = tiles[:self.STARTUP_BATCH], tiles[self.STARTUP_BATCH:]
+        step([tile for tile in batch if tile.window.winfo_exists()])
+        if not rest and stage == 2:
+            rest = self._staged_tiles()
+        if rest:
+            self.root.after_idle(lambda: self._startup_stage(step, rest, stage))
+        elif stage == 2:
+            self.timeline.mark("Stufe 2: Drag & Drop, Glaseffekt")
+            self.root.after_idle(lambda: self._startup_stage(
+                self._refresh_tile_faces, self._face_priority(), 3))
+        else:
+            stale = [tile for tile in self.tiles.values()
+                     if not tile.face_current and not tile.is_expanded]
+            if stale:
+                # Nachgeladene Kacheln ohne aktuelles Bild
+                self.root.after_idle(lambda: self._startup_stage(self._refresh_tile_faces, stale, 3))
+                return
+            self.timeline.mark("Stufe 3: Icons aktuell")
+            self.startup_done = True
+            print(self.timeline.report())
+    
+    def _wire_up_tiles(self, tiles):
+        for tile in tiles:
+            tile.wire_up()
+    
+    def _refresh_tile_faces(self, tiles):
+        for tile in tiles:
+            # Aufgeklappte Kacheln zeichnen ihr Icon beim Zuklappen ohnehin neu
+            if not tile.is_expanded:
+                tile.draw_tile_icon()
+    
+    def _face_priority(self):
+        """
+        Reihenfolge für Stufe 3: Kacheln mit veraltetem oder fehlendem Bild
+        zuerst, dann sichtbare vor nicht sichtbaren, jeweils von oben links.
+        """
+        screen_w, screen_h = self.root.winfo_screenwidth(), self.root.winfo_screenheight()
+        
+        def key(tile):
+            x, y = tile.config.pos_x or 0, tile.config.pos_y or 0
+            on_screen = 0 <= x < screen_w and 0 <= y < screen_h
+            return (tile.face_current, not on_screen, y, x)
+        return sorted(self.tiles.values(), key=key)
+
+    def reconcile_hidden_ledger(self):
+        """
+        Gleicht das Ledger beim Start ab: Dateien, die versteckt wurden, aber in
+        keiner Kachel mehr liegen (Absturz), werden wieder sichtbar gemacht.
+        """
+        orphans = [path for path in self.ledger.paths() if path not in self.path_index]
+        if not orphans:
+            return
+        report = self.attributes.unhide(orphans)
+        print(f"Ledger: {report.ok} verwaiste Datei(en) wieder sichtbar gemacht")
+        for path, error in report.failed:
+            print(f"  ✗ Fehler bei {Path(path).stem}: {error}")
+
+    def start_desktop_watcher(self):
+        """Startet die Überwachung des Desktop-Ordners"""
+        desktop_path = WindowsDesktopAPI.get_desktop_path()
+        if not desktop_path or not os.path.isdir(desktop_path):
+            return
+        try:
+            self.watcher = create_directory_watcher(desktop_path, self._on_desktop_changes)
+        except OSError as e:
+            print(f"Desktop-Überwachung nicht möglich: {e}")
+            return
+        if self.watcher is not None:
+            self._poll_desktop_changes()
+    
+    def _on_desktop_changes(self, changes):
+        """Watcher-Thread: ListView-Cache verwerfen, Änderungen für die Tk-Schleife sammeln"""
+        WindowsDesktopAPI.invalidate_listview()
+        self.desktop_changes.push(changes)
+    
+    def _poll_desktop_changes(self):
+        changes = self.desktop_changes.drain()
+        if changes:
+            try:
+                self.apply_desktop_changes(changes)
+            except Exception as e:
+                print(f"Fehler beim Übernehmen von Desktop-Änderungen: {e}")
+        self._watch_timer = self.root.after(self.WATCH_POLL_MS, self._poll_desktop_changes)
+    
+    def _poll_commands(self):
+        while True:
+            try:
+                request = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self.handle_command(request)
+            except Exception as e:
+                print(f"Fehler bei Befehl '{request.get('cmd')}': {e}")
+        self._command_timer = self.root.after(self.COMMAND_POLL_MS, self._poll_commands)
+    
+    def handle_command(self, request):
+        """Führt einen weitergeleiteten Befehl aus (siehe instance.InstanceProtocol)"""
+        cmd = request["cmd"]
+        tile = self.tiles.get(request.get("tile"))
+        if "tile" in request and tile is None:
+            print(f"Befehl '{cmd}': Kachel {request['tile']} nicht gefunden")
+            return
+        print(f"Befehl von weiterem Start: {cmd}")
+        if cmd == "focus":
+            for other in self.tiles.values():
+                other.window.lift()
+            if tile is not None:
+                tile.expand()
+        elif cmd == "add":
+            # Gleicher Weg wie Drag & Drop (Duplikate, Verstecken, Journal)
+            tile.on_drop_files([path.encode("utf-8") for path in request["paths"]])
+        elif cmd == "restore":
+            for target in [tile] if tile is not None else list(self.tiles.values()):
+                target.restore_all_to_desktop()
+        elif cmd == "quit":
+            self.quit()
+    
+    def _rescan_changes(self, directory):
+        """Nach verlorenen Ereignissen: fehlende Verknüpfungen im Verzeichnis als gelöscht melden"""
+        directory = normalize_path(directory)
+        paths = [shortcut.path
+                 for tile_config in self.config["tiles"].values()
+                 for shortcut in tile_config.shortcuts or []
+                 if os.path.dirname(shortcut.norm_path) == directory]
+        states = self.validator.scan(paths, details=False)
+        return [FileChange(FileChange.REMOVED, path) for path in paths if not states[path].exists]
+    
+    def all_shortcuts(self):
+        return [shortcut
+                for tile_config in self.config.get("tiles", {}).values()
+                for shortcut in tile_config.shortcuts or []]
+    
+    def start_validation(self):
+        """Prüft alle Verknüpfungen in einem Hintergrund-Thread (ein scandir pro Verzeichnis)"""
+        shortcuts = self.all_shortcuts()
+        if not shortcuts:
+            return
+        result = {}
+        thread = threading.Thread(
+            target=lambda: result.update(self.validator.scan([s.path for s in shortcuts])),
+            name="validate", daemon=True)
+        thread.start()
+        
+        def poll():
+            if thread.is_alive():
+                self.root.after(50, poll)
+            else:
+                self.apply_path_states(shortcuts, result)
+        self.root.after(50, poll)
+    
+    def apply_path_states(self, shortcuts, states):
+        """
+        Markiert fehlende Verknüpfungen und verwirft Icons geänderter Dateien.
+        Zeichnet nur Kacheln neu, deren Inhalt sich dadurch ändert.
+        """
+        touched = set()
+        stale = []
+        missing = 0
+        for shortcut in shortcuts:
+            state = states.get(shortcut.path)
+            if state is None:
+                continue
+            previous = self.path_states.get(shortcut.norm_path)
+            self.path_states[shortcut.norm_path] = state
+            changed = shortcut.missing != (not state.exists)
+            if previous is not None and state.exists and previous.stamp != state.stamp:
+                stale.append(shortcut.path)
+                changed = True
+            shortcut.missing = not state.exists
+            missing += shortcut.missing
+            if changed:
+                entry = self.path_index.lookup(shortcut.path)
+                if entry is not None:
+                    touched.add(entry[0])
+        if stale:
+            IconExtractor.invalidate(stale)
+        if missing:
+            print(f"{missing} Verknüpfung(en) nicht gefunden")
+        for tile_id in touched:
+            tile = self.tiles.get(tile_id)
+            if tile is not None:
+                tile.refresh_expanded_view()
+        return touched
+    
+    def apply_desktop_changes(self, changes):
+        """
+        Übernimmt Änderungen im Desktop-Ordner inkrementell in die Kacheln:
+        gelöschte Verknüpfungen fallen heraus, umbenannte werden nachgeführt,
+        ersetzte bekommen ihr Icon neu (und werden wieder versteckt).
+        Gibt die Menge der geänderten Kachel-IDs zurück.
+        """
+        expanded = []
+        for change in changes:
+            if change.kind == FileChange.RESCAN:
+                expanded.extend(self._rescan_changes(change.path))
+            else:
+                expanded.append(change)
+        
+        ops = []
+        touched = set()
+        stale = []
+        rehide = []
+        forget = []
+        renamed = {}  # neuer Pfad → alter Pfad
+        for change in expanded:
+            source = change.old_path if change.kind == FileChange.RENAMED else change.path
+            entry = self.path_index.lookup(source)
+            if entry is None:
+                continue
+            tile_id, index = entry
+            shortcuts = self.config["tiles"][tile_id].shortcuts
+            old = shortcuts[index]
+            stale.append(old.path)
+            touched.add(tile_id)
+            
+            if change.kind == FileChange.REMOVED or (
+                    change.kind == FileChange.RENAMED and change.path in self.path_index
+                    and normalize_path(change.path) != old.norm_path):
+                self.path_index.discard(tile_id, old)
+                del shortcuts[index]
+                self.path_index.reindex_tile(tile_id, shortcuts, index)
+                ops.append({"op": ConfigJournal.OP_REMOVE_SHORTCUT, "tile": tile_id,
+                            "index": index, "path": old.path})
+                forget.append(old.path)
+                print(f"  − Verknüpfung entfernt (gelöscht): {Path(old.path).stem}")
+            elif change.kind == FileChange.RENAMED:
+                # Vom Nutzer vergebene Namen bleiben, sonst dem Dateinamen folgen
+                name = Path(change.path).stem if old.name == Path(old.path).stem else old.name
+                new = Shortcut(name, change.path, old.extra, old.desktop_pos)
+                self.path_index.discard(tile_id, old)
+                shortcuts[index] = new
+                self.path_index.reindex_tile(tile_id, shortcuts, index)
+                ops.append({"op": ConfigJournal.OP_REMOVE_SHORTCUT, "tile": tile_id,
+                            "index": index, "path": old.path})
+                ops.append({"op": ConfigJournal.OP_ADD_SHORTCUT, "tile": tile_id,
+                            "index": index, "shortcut": new.to_dict()})
+                forget.append(old.path)
+                renamed[new.path] = old.path
+                print(f"  ↻ Verknüpfung umbenannt: {Path(old.path).stem} → {name}")
+            else:
+                # Neu angelegt oder ersetzt — eine neue Datei ist nicht versteckt
+                old.missing = False
+                rehide.append(old.path)
+        
+        if not touched:
+            return touched
+        
+        IconExtractor.invalidate(stale)
+        self.record_changes(ops)
+        if renamed:
+            # Versteckt unter neuem Namen — Original-Attribute übernehmen
+            self.ledger.record_hide(list(renamed), {new: self.ledger.original(old)
+                                                    for new, old in renamed.items()})
+        if forget:
+            self.ledger.forget(forget)
+        if rehide:
+            self.attributes.hide(rehide)
+        for tile_id in touched:
+            tile = self.tiles.get(tile_id)
+            if tile is not None:
+                tile.refresh_expanded_view()
+        return touched
+    
+    @traced("save_config", lambda manager: {"tiles": len(manager.config["tiles"])})
+    def save_config(self):
+        """Speichert die vollständige Konfiguration (Snapshot)"""
+        try:
+            self.store.save(self.config)
+        except Exception as e:
+            print(f"Speicherfehler: {e}")
+
+    def record_change(self, op, tile_id, **fields):
+        """
+        Speichert eine einzelne Änderung (Journal-Zeile bzw. SQL-Statement)
+        statt die gesamte Konfiguration zu schreiben. Die Änderung muss in
+        self.config bereits durchgeführt sein.
+        """
+        entry = {"op": op, "tile": tile_id}
+        entry.update(fields)
+        self.record_changes([entry])
+
+    def record_changes(self, entries):
+        """Speichert mehrere Änderungen gemeinsam (ein Schreibvorgang / eine Transaktion)"""
+        if not entries:
+            return
+        try:
+            self.store.record(self.config, entries)
+        except Exception as e:
+            print(f"Speicherfehler: {e}")
+            self.save_config()
+
+    def find_shortcut(self, path):
+        """Gibt (FolderTile, Position) der Kachel zurück, die die Datei enthält, sonst None"""
+        entry = self.path_index.lookup(path)
+        if entry is None:
+            return None
+        tile = self.tiles.get(entry[0])
+        return (tile, entry[1]) if tile else None
+    
+    def create_new_tile(self):
+        """Neue Kachel erstellen"""
+        existing = [int(i) for i in self.config["tiles"].keys()]
+        new_id = str(max(existing) + 1 if existing else 0)
+        
+        # Position: Neben der letzten Kachel
+        last = list(self.tiles.values())[-1] if self.tiles else None
+        if last:
+            x = last.window.winfo_x() + DESKTOP_GRID_X
+            y = last.window.winfo_y()
+        else:
+            x, y = DESKTOP_MARGIN_X, DESKTOP_MARGIN_Y
+        
+        x, y = WindowsDesktopAPI.snap_to_grid(x, y)
+        
+        tile_config = TileConfig(name=f"Ordner {new_id}", pos_x=x, pos_y=y)
+        
+        self.config["tiles"][new_id] = tile_config
+        self.record_change(ConfigJournal.OP_CREATE_TILE, new_id, config=tile_config.to_dict())
+        self.tiles[new_id] = FolderTile(self, new_id, tile_config)
+    
+    def delete_tile(self, tile_id):
+        """Kachel löschen"""
+        if tile_id in self.tiles:
+            tile = self.tiles[tile_id]
+            self.path_index.discard_tile(tile_id, tile.config.shortcuts or [])
+            tile.close()
+            del self.tiles[tile_id]
+            self.faces.discard(tile_id)
+        
+        if tile_id in self.config["tiles"]:
+            del self.config["tiles"][tile_id]
+            self.record_change(ConfigJournal.OP_DELETE_TILE, tile_id)
+        
+        if not self.tiles:
+            self.quit()
+    
+    def add_diagnostics_menu(self, parent):
+        """Untermenü "Diagnose" für das Kontextmenü der Kacheln"""
+        menu = reusable_menu(parent, "diagnose")
+        if TRACER.enabled:
+            menu.add_command(label="🧭 Trace speichern", command=self.save_trace)
+        else:
+            menu.add_command(label="🧭 Trace aufzeichnen", command=self.start_trace)
+        if self.stalls is not None:
+            menu.add_command(label="⏱️ Hänger-Bericht speichern", command=self.save_stall_report)
+        menu.add_command(label="📊 Kennzahlen anzeigen", command=self.show_metrics)
+        if self.memory is not None and self.memory.running:
+            menu.add_command(label="🧠 Speicherbericht speichern", command=self.save_memory_report)
+        else:
+            menu.add_command(label="🧠 Speicher-Aufnahme starten", command=self.start_memory_tracking)
+        parent.add_cascade(label="🩺 Diagnose", menu=menu)
+
+    def start_trace(self):
+        """Schaltet die Span-Aufzeichnung zur Laufzeit ein"""
+        TRACER.enabled = True
+        print("Trace-Aufzeichnung gestartet")
+
+    def save_trace(self):
+        """Schreibt die aufgezeichneten Spans als Chrome-Trace (chrome://tracing, Perfetto)"""
+        try:
+            path = TRACER.dump()
+        except OSError as e:
+            print(f"Trace konnte nicht gespeichert werden: {e}")
+            return None
+        print(f"Trace gespeichert: {path} ({len(TRACER.events)} Spans)")
+        return path
+
+    def register_metrics(self):
+        """Messwerte der Oberfläche: lebende Tk-Bilder, Widgets und Timer, Kacheln"""
+        METRICS.gauge("tk.images", lambda: len(self.root.tk.call("image", "names")))
+        METRICS.gauge("tk.widget_classes", lambda: self._count_widget_classes(self.root))
+        METRICS.gauge("tk.after_pending", lambda: len(self.root.tk.call("after", "info")))
+        METRICS.gauge("tk.widgets", lambda: {tile_id: self._count_widgets(tile.window)
+                                             for tile_id, tile in self.tiles.items()})
+        METRICS.gauge("tiles.photo_refs", lambda: {tile_id: tile.photo_count()
+                                                   for tile_id, tile in self.tiles.items()})
+        METRICS.gauge("tiles.count", lambda: len(self.tiles))
+        METRICS.gauge("tiles.shortcuts", lambda: len(self.path_index))
+        METRICS.gauge("stalls.count", lambda: self.stalls.stall_count if self.stalls else None)
+        METRICS.gauge("trace.spans", lambda: len(TRACER.events) if TRACER.enabled else None)
+
+    @staticmethod
+    def _count_widgets(widget):
+        count = 0
+        stack = [widget]
+        while stack:
+            current = stack.pop()
+            count += 1
+            stack.extend(current.winfo_children())
+        return count
+
+    @staticmethod
+    def _count_widget_classes(widget):
+        """Widgets pro Tk-Klasse — wachsende Menu/Toplevel-Zahlen zeigen Geisterfenster"""
+        counts = {}
+        stack = [widget]
+        while stack:
+            current = stack.pop()
+            name = current.winfo_class()
+            counts[name] = counts.get(name, 0) + 1
+            stack.extend(current.winfo_children())
+        return counts
+
+    def show_metrics(self):
+        """Schreibt die Kennzahlen und zeigt sie an"""
+        text = METRICS.render()
+        if self.metrics_writer is not None:
+            self.metrics_writer.write()
+        print(text)
+        messagebox.showinfo("Diagnose – Kennzahlen", text)
+
+    def save_stall_report(self):
+        """Schreibt die nach Stack zusammengefassten Hänger der Tk-Schleife"""
+        try:
+            path = self.stalls.write_report()
+        except OSError as e:
+            print(f"Hänger-Bericht konnte nicht gespeichert werden: {e}")
+            return None
+        print(f"Hänger-Bericht gespeichert: {path} ({self.stalls.stall_count} Hänger)")
+        return path
+
+    def start_memory_tracking(self):
+        """Startet die Speicher-Aufnahmen zur Laufzeit (erste Aufnahme = Ausgangspunkt)"""
+        if self.memory is None:
+            self.memory = MemoryTracker(self.root.after)
+        self.memory.start()
+        print("Speicher-Aufnahme gestartet")
+
+    def save_memory_report(self):
+        """Nimmt eine Aufnahme und schreibt den Zuwachs seit Start und seit der vorletzten"""
+        try:
+            self.memory.take()
+            path = self.memory.write_report()
+        except OSError as e:
+            print(f"Speicherbericht konnte nicht gespeichert werden: {e}")
+            return None
+        print(f"Speicherbericht gespeichert: {path} ({self.memory.samples} Aufnahmen)")
+        return path
+
+    def quit(self):
+        """Beenden - Alle versteckten Dateien wiederherstellen"""
+        print("\n" + "=" * 50)
+        print("  Widget wird beendet...")
+        print("=" * 50)
+        
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        
+        # Alle versteckten Dateien wiederherstellen (parallel, eine Desktop-Aktualisierung);
+        # die Hauptschleife endet erst, wenn die Icon-Positionen gesetzt sind
+        report = self.restore_all_hidden(on_done=lambda placed: self.root.quit())
+        self.hidden_restored = True
+        for path in report.missing:
+            print(f"  ? Datei nicht gefunden: {Path(path).stem}")
+        for path, error in report.failed:
+            print(f"  ✗ Fehler bei {Path(path).stem}: {error}")
+        
+        print(f"\n{report.ok} Icons wiederhergestellt ({report.elapsed * 1000:.0f} ms).")
+        print("=" * 50)
+        
+        self.save_config()
+        self.store.close()
+        if TRACER.enabled and os.environ.get("DESKTOP_FOLDER_TRACE_FILE"):
+            self.save_trace()
+        if self.stalls is not None:
+            self.stalls.stop()
+            if os.environ.get("DESKTOP_FOLDER_STALL_FILE"):
+                self.save_stall_report()
+        if self.metrics_writer is not None:
+            self.metrics_writer.stop()
+            self.metrics_writer.write()
+        if self.memory is not None and self.memory.running:
+            if os.environ.get("DESKTOP_FOLDER_MEMORY_FILE"):
+                self.save_memory_report()
+            self.memory.stop()
+        if IconExtractor.worker is not None:
+            IconExtractor.worker.close()
+        
+        for tile in list(self.tiles.values()):
+            tile.close()
+    
+    def restore_all_hidden(self, on_done=None, background=True):
+        """
+        Entfernt das Hidden-Attribut aller Verknüpfungen in allen Kacheln.
+        Die Icon-Positionen folgen wie bei restore_desktop_positions.
+        """
+        shortcuts = self.all_shortcuts()
+        # Einmal pro Verzeichnis prüfen, fehlende Dateien gar nicht erst anfassen
+        states = self.validator.scan([s.path for s in shortcuts], details=False)
+        existing = [s for s in shortcuts if states[s.path].exists]
+        missing = [s.path for s in shortcuts if not states[s.path].exists]
+        report = self.attributes.unhide([s.path for s in existing])
+        report.missing.extend(missing)
+        self.ledger.forget(missing)
+        # Sofort senden — beim Beenden läuft die Tk-Schleife nicht mehr
+        WindowsDesktopAPI.notifications().flush()
+        self.restore_desktop_positions(existing, states, on_done, background)
+        return report
+    
+    def restore_desktop_positions(self, shortcuts, states=None, on_done=None, background=True):
+        """Setzt wiederhergestellte Desktop-Icons gesammelt an ihre alten bzw. freie Plätze"""
+        desktop_dir = Path(WindowsDesktopAPI.get_desktop_path())
+        shortcuts = [s for s in shortcuts if Path(s.path).parent == desktop_dir]
+        if states is None:
+            states = self.validator.scan([s.path for s in shortcuts], details=False)
+        items = [(Path(s.path).name, s.desktop_pos) for s in shortcuts
+                 if states[s.path].exists]
+        return self.place_desktop_icons(items, on_done, background)
+    
+    def set_icon_position_when_listed(self, filename, screen_x, screen_y, attempts=15):
+        """
+        Setzt die Position eines eben eingeblendeten Icons (Bildschirmkoordinaten,
+        Multi-Monitor), sobald der Explorer es in die Liste aufgenommen hat —
+        bis dahin alle RETRY_MS erneut über root.after statt blockierend.
+        """
+        try:
+            listed = WindowsDesktopAPI.listview_session().find(filename) >= 0
+        except Exception:
+            listed = True  # Fehler meldet set_desktop_icon_position
+        if not listed and attempts > 1:
+            self.root.after(WindowsDesktopAPI.RETRY_MS, lambda: self.set_icon_position_when_listed(
+                filename, screen_x, screen_y, attempts - 1))
+            return
+        if WindowsDesktopAPI.set_desktop_icon_position(filename, screen_x, screen_y):
+            print(f"  ✓ Icon-Position gesetzt: {filename}")
+        else:
+            print("  ⚠ Icon-Position konnte nicht gesetzt werden (Windows-Einschränkung)")
+    
+    def place_desktop_icons(self, items, on_done=None, background=True):
+        """
+        Platziert Desktop-Icons ([(Dateiname, Wunschposition oder None)]).
+        background: Wiederholungen für noch fehlende Icons über root.after
+        statt blockierend — der Explorer nimmt sie erst verzögert auf.
+        on_done(Anzahl) wird aufgerufen, sobald alle Versuche beendet sind.
+        """
+        def done(placed):
+            if items:
+                print(f"{placed} Icon-Position(en) wiederhergestellt")
+            if on_done is not None:
+                on_done(placed)
+        
+        try:
+            screen_size = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        except tk.TclError:
+            screen_size = (1920, 1080)
+        return WindowsDesktopAPI.restore_desktop_icon_positions(
+            items, screen_size, scheduler=self.root.after if background else None, on_done=done)
+    
+    def run(self):
+        """Hauptschleife"""
+        self.root.mainloop()
@@ -0,0 +1,438 @@
+"""
+Dateisystem-Überwachung des Desktop-Ordners
+"""
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+from .model import normalize_path
+from .winapi import IS_WINDOWS, kernel32
+
+
+@dataclass(slots=True)
+class FileChange:
+    """Eine Änderung im überwachten Verzeichnis"""
+
+    ADDED = "added"
+    REMOVED = "removed"
+    MODIFIED = "modified"
+    RENAMED = "renamed"
+    # Ereignisse gingen verloren (Puffer übergelaufen) — Verzeichnis neu prüfen
+    RESCAN = "rescan"
+
+    kind: str
+    path: str
+    old_path: str = None
+
+
+class DirectoryWatcher:
+    """
+    Überwacht ein Verzeichnis (nicht rekursiv) in einem Hintergrund-Thread.
+    callback(changes) wird aus diesem Thread mit einer Liste von FileChange
+    aufgerufen — der Empfänger muss threadsicher sein (z.B. ChangeDebouncer).
+    """
+
+    name = "base"
+
+    def __init__(self, path, callback):
+        self.path = str(path)
+        self.callback = callback
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._open()
+        self._thread = threading.Thread(target=self._loop, name=f"watch-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._close()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                changes = self._read()
+            except OSError as e:
+                if self._stop.is_set():
+                    break
+                print(f"Überwachung von {self.path} beendet: {e}")
+                break
+            if changes and not self._stop.is_set():
+                self.callback(changes)
+
+    def _open(self):
+        pass
+
+    def _read(self):
+        """Blockiert bis Änderungen vorliegen (oder stop()) und gibt sie zurück"""
+        raise NotImplementedError
+
+    def _wake(self):
+        pass
+
+    def _close(self):
+        pass
+
+
+class Win32DirectoryWatcher(DirectoryWatcher):
+    """ReadDirectoryChangesW (synchron im Thread; stop() bricht per CancelIoEx ab)"""
+
+    name = "win32"
+
+    FILE_LIST_DIRECTORY = 0x0001
+    FILE_SHARE_ALL = 0x00000001 | 0x00000002 | 0x00000004
+    OPEN_EXISTING = 3
+    FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+    # Attribut-Änderungen (unser eigenes Verstecken) bewusst nicht
+    NOTIFY_FILTER = 0x0001 | 0x0002 | 0x0008 | 0x0010  # FILE_NAME | DIR_NAME | SIZE | LAST_WRITE
+    BUFFER_SIZE = 64 * 1024
+
+    ACTIONS = {1: FileChange.ADDED, 2: FileChange.REMOVED, 3: FileChange.MODIFIED}
+    ACTION_RENAMED_OLD = 4
+    ACTION_RENAMED_NEW = 5
+
+    def __init__(self, path, callback):
+        super().__init__(path, callback)
+        self.handle = None
+        # DWORD-ausgerichteter Puffer (Pflicht für FILE_NOTIFY_INFORMATION)
+        self._buffer = (ctypes.c_uint32 * (self.BUFFER_SIZE // 4))()
+
+    def _open(self):
+        handle = kernel32.CreateFileW(self.path, self.FILE_LIST_DIRECTORY, self.FILE_SHARE_ALL, None,
+                                      self.OPEN_EXISTING, self.FILE_FLAG_BACKUP_SEMANTICS, None)
+        if not handle or handle == self.INVALID_HANDLE_VALUE:
+            raise OSError(f"Verzeichnis kann nicht überwacht werden: {self.path}")
+        self.handle = handle
+
+    def _read(self):
+        returned = ctypes.c_uint32(0)
+        if not kernel32.ReadDirectoryChangesW(self.handle, self._buffer, self.BUFFER_SIZE, False,
+                                              self.NOTIFY_FILTER, ctypes.byref(returned), None, None):
+            raise OSError("ReadDirectoryChangesW fehlgeschlagen")
+        if returned.value == 0:
+            return [FileChange(FileChange.RESCAN, self.path)]
+        return self.parse(bytes(self._buffer)[:returned.value], self.path)
+
+    @classmethod
+    def parse(cls, data, directory):
+        """Zerlegt FILE_NOTIFY_INFORMATION-Einträge in FileChange-Objekte"""
+        changes = []
+        old_path = None
+        offset = 0
+        while offset + 12 <= len(data):
+            next_offset, action, name_len = struct.unpack_from("<III", data, offset)
+            name = data[offset + 12:offset + 12 + name_len].decode("utf-16-le", "replace")
+            path = os.path.join(directory, name)
+            if action == cls.ACTION_RENAMED_OLD:
+                old_path = path
+            elif action == cls.ACTION_RENAMED_NEW:
+                if old_path is not None:
+                    changes.append(FileChange(FileChange.RENAMED, path, old_path))
+                else:
+                    changes.append(FileChange(FileChange.ADDED, path))
+                old_path = None
+            elif action in cls.ACTIONS:
+                changes.append(FileChange(cls.ACTIONS[action], path))
+            if not next_offset:
+                break
+            offset += next_offset
+        if old_path is not None:
+            changes.append(FileChange(FileChange.REMOVED, old_path))
+        return changes
+
+    def _wake(self):
+        if self.handle:
+            kernel32.CancelIoEx(self.handle, None)
+
+    def _close(self):
+        if self.handle:
+            kernel32.CloseHandle(self.handle)
+            self.handle = None
+
+
+class InotifyDirectoryWatcher(DirectoryWatcher):
+    """inotify über ctypes (Linux); stop() weckt den Thread über eine Pipe"""
+
+    name = "inotify"
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    # Kein IN_ATTRIB — unser eigenes Verstecken soll keine Ereignisse auslösen
+    WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+                  | IN_DELETE_SELF | IN_MOVE_SELF)
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, path, callback):
+        super().__init__(path, callback)
+        self.fd = None
+        self._wake_r = self._wake_w = None
+
+    @staticmethod
+    def available():
+        return sys.platform.startswith("linux")
+
+    def _open(self):
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 fehlgeschlagen")
+        if libc.inotify_add_watch(fd, os.fsencode(self.path), self.WATCH_MASK) < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, f"inotify_add_watch fehlgeschlagen: {self.path}")
+        self.fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+
+    def _read(self):
+        readable, _, _ = select.select([self.fd, self._wake_r], [], [])
+        if self.fd not in readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        return self.parse(data, self.path)
+
+    @classmethod
+    def parse(cls, data, directory):
+        """Zerlegt inotify_event-Einträge; MOVED_FROM/MOVED_TO mit gleichem Cookie = Umbenennung"""
+        changes = []
+        moved_from = {}
+        offset = 0
+        header = cls.EVENT_HEADER
+        while offset + header.size <= len(data):
+            _, mask, cookie, name_len = header.unpack_from(data, offset)
+            raw = data[offset + header.size:offset + header.size + name_len]
+            offset += header.size + name_len
+            name = os.fsdecode(raw.rstrip(b"\0"))
+            path = os.path.join(directory, name) if name else directory
+            if mask & cls.IN_Q_OVERFLOW or mask & (cls.IN_DELETE_SELF | cls.IN_MOVE_SELF):
+                changes.append(FileChange(FileChange.RESCAN, directory))
+            elif mask & cls.IN_MOVED_FROM:
+                moved_from[cookie] = path
+            elif mask & cls.IN_MOVED_TO:
+                old_path = moved_from.pop(cookie, None)
+                if old_path is not None:
+                    changes.append(FileChange(FileChange.RENAMED, path, old_path))
+                else:
+                    changes.append(FileChange(FileChange.ADDED, path))
+            elif mask & cls.IN_CREATE:
+                changes.append(FileChange(FileChange.ADDED, path))
+            elif mask & cls.IN_DELETE:
+                changes.append(FileChange(FileChange.REMOVED, path))
+            elif mask & (cls.IN_MODIFY | cls.IN_CLOSE_WRITE):
+                changes.append(FileChange(FileChange.MODIFIED, path))
+        # Aus dem Verzeichnis hinaus verschoben
+        for old_path in moved_from.values():
+            changes.append(FileChange(FileChange.REMOVED, old_path))
+        return changes
+
+    def _wake(self):
+        if self._wake_w is not None:
+            os.write(self._wake_w, b"x")
+
+    def _close(self):
+        for fd in (self.fd, self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self.fd = self._wake_r = self._wake_w = None
+
+
+class PollingDirectoryWatcher(DirectoryWatcher):
+    """
+    Fallback: vergleicht alle INTERVAL Sekunden zwei scandir-Schnappschüsse
+    (Name → Inode, mtime, Größe). Umbenennungen erkennt es an der Inode.
+    """
+
+    name = "polling"
+    INTERVAL = 2.0
+
+    def __init__(self, path, callback, interval=INTERVAL):
+        super().__init__(path, callback)
+        self.interval = interval
+        self._snapshot = None
+
+    def snapshot(self):
+        entries = {}
+        with os.scandir(self.path) as it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                entries[entry.name] = (st.st_ino, st.st_mtime_ns, st.st_size)
+        return entries
+
+    def _open(self):
+        self._snapshot = self.snapshot()
+
+    def _read(self):
+        if self._stop.wait(self.interval):
+            return []
+        try:
+            current = self.snapshot()
+        except OSError:
+            return []  # z.B. Netzlaufwerk kurz weg — nächster Durchlauf vergleicht erneut
+        previous, self._snapshot = self._snapshot, current
+        return self.diff(previous, current, self.path)
+
+    @staticmethod
+    def diff(previous, current, directory):
+        """Änderungen zwischen zwei Schnappschüssen"""
+        changes = []
+        removed = {name: info for name, info in previous.items() if name not in current}
+        removed_by_inode = {info[0]: name for name, info in removed.items() if info[0]}
+        for name, info in current.items():
+            old = previous.get(name)
+            if old is None:
+                old_name = removed_by_inode.pop(info[0], None) if info[0] else None
+                if old_name is not None:
+                    del removed[old_name]
+                    changes.append(FileChange(FileChange.RENAMED, os.path.join(directory, name),
+                                              os.path.join(directory, old_name)))
+                else:
+                    changes.append(FileChange(FileChange.ADDED, os.path.join(directory, name)))
+            elif old != info:
+                changes.append(FileChange(FileChange.MODIFIED, os.path.join(directory, name)))
+        for name in removed:
+            changes.append(FileChange(FileChange.REMOVED, os.path.join(directory, name)))
+        return changes
+
+
+DIRECTORY_WATCHERS = {
+    "win32": Win32DirectoryWatcher,
+    "inotify": InotifyDirectoryWatcher,
+    "polling": PollingDirectoryWatcher,
+}
+
+
+def create_directory_watcher(path, callback, name=None):
+    """
+    Watcher nach Name (Umgebungsvariable DESKTOP_FOLDER_WATCHER), sonst
+    Plattform-Standard. "off" schaltet die Überwachung ab (gibt None zurück).
+    Lässt sich der native Watcher nicht starten, wird auf Polling gewechselt.
+    """
+    name = name or os.environ.get("DESKTOP_FOLDER_WATCHER")
+    if name == "off":
+        return None
+    if not name:
+        name = "win32" if IS_WINDOWS else ("inotify" if InotifyDirectoryWatcher.available() else "polling")
+    watcher_cls = DIRECTORY_WATCHERS.get(name)
+    if watcher_cls is None:
+        print(f"Unbekannter Watcher '{name}', verwende 'polling'")
+        watcher_cls = PollingDirectoryWatcher
+    watcher = watcher_cls(path, callback)
+    try:
+        watcher.start()
+    except (OSError, AttributeError) as e:
+        if watcher_cls is PollingDirectoryWatcher:
+            raise
+        print(f"Watcher '{name}' nicht verfügbar ({e}), verwende 'polling'")
+        watcher = PollingDirectoryWatcher(path, callback)
+        watcher.start()
+    return watcher
+
+
+class ChangeDebouncer:
+    """
+    Sammelt Änderungen aus dem Watcher-Thread und fasst sie pro Pfad zusammen.
+    drain() gibt sie erst heraus, wenn DELAY Sekunden lang nichts mehr kam
+    (spätestens nach MAX_DELAY) — ein Installer, der eine Verknüpfung löscht
+    und neu anlegt, ergibt so eine einzige MODIFIED-Änderung.
+    """
+
+    DELAY = 0.3
+    MAX_DELAY = 2.0
+
+    def __init__(self, delay=DELAY, max_delay=MAX_DELAY, clock=time.monotonic):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self._pending = {}   # normalisierter Pfad → FileChange
+        self._rescan = {}
+        self._first = None
+        self._last = None
+        self._lock = threading.Lock()
+
+    def push(self, changes):
+        with self._lock:
+            now = self.clock()
+            if self._first is None:
+                self._first = now
+            self._last = now
+            for change in changes:
+                self._merge(change)
+
+    def _merge(self, change):
+        pending = self._pending
+        if change.kind == FileChange.RESCAN:
+            self._rescan[normalize_path(change.path)] = change
+            return
+        key = normalize_path(change.path)
+        if change.kind == FileChange.RENAMED:
+            before = pending.pop(normalize_path(change.old_path), None)
+            if before is not None and before.kind == FileChange.ADDED:
+                change = FileChange(FileChange.ADDED, change.path)
+            elif before is not None and before.kind == FileChange.RENAMED:
+                if normalize_path(before.old_path) == key:
+                    return  # zurückbenannt — netto keine Änderung
+                change = FileChange(FileChange.RENAMED, change.path, before.old_path)
+            pending[key] = change
+            return
+
+        before = pending.get(key)
+        if before is None:
+            pending[key] = change
+        elif change.kind == FileChange.REMOVED:
+            if before.kind == FileChange.ADDED:
+                del pending[key]
+            elif before.kind == FileChange.RENAMED:
+                # Umbenannt und dann gelöscht = die alte Datei ist weg
+                del pending[key]
+                pending[normalize_path(before.old_path)] = FileChange(FileChange.REMOVED, before.old_path)
+            else:
+                pending[key] = change
+        elif change.kind == FileChange.ADDED:
+            if before.kind == FileChange.REMOVED:
+                pending[key] = FileChange(FileChange.MODIFIED, change.path)  # ersetzt
+            else:
+                pending[key] = change
+        elif before.kind == FileChange.REMOVED:
+            pending[key] = change
+        # MODIFIED nach ADDED/RENAMED/MODIFIED: bleibt wie es ist
+
+    def drain(self, now=None):
+        """Gibt die zusammengefassten Änderungen zurück, wenn es ruhig geworden ist, sonst []"""
+        with self._lock:
+            if self._first is None:
+                return []
+            now = self.clock() if now is None else now
+            if now - self._last < self.delay and now - self._first < self.max_delay:
+                return []
+            changes = list(self._rescan.values()) + list(self._pending.values())
+            self._pending = {}
+            self._rescan = {}
+            self._first = self._last = None
+        return changes
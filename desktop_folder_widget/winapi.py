@@ -0,0 +1,262 @@
+"""
+Windows-API: ctypes-Prototypen, Konstanten und Fenster-Effekte
+==============================================================
+Nur unter Windows gibt es ctypes.windll — auf anderen Systemen bleibt das
+Modul importierbar, user32/kernel32 sind dann None.
+"""
+
+import ctypes
+import sys
+import threading
+
+
+IS_WINDOWS = sys.platform == "win32"
+
+# Typen für 64-Bit Kompatibilität
+if ctypes.sizeof(ctypes.c_void_p) == 8:
+    # 64-Bit
+    HWND = ctypes.c_uint64
+    LONG_PTR = ctypes.c_int64
+else:
+    # 32-Bit
+    HWND = ctypes.c_uint32
+    LONG_PTR = ctypes.c_int32
+
+# Rechteck-Struktur (GetWindowRect)
+class RECT(ctypes.Structure):
+    _fields_ = [
+        ("left", ctypes.c_long),
+        ("top", ctypes.c_long),
+        ("right", ctypes.c_long),
+        ("bottom", ctypes.c_long),
+    ]
+
+if IS_WINDOWS:
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+
+    # Funktions-Signaturen definieren
+    user32.FindWindowW.argtypes = [ctypes.c_wchar_p, ctypes.c_wchar_p]
+    user32.FindWindowW.restype = HWND
+
+    user32.FindWindowExW.argtypes = [HWND, HWND, ctypes.c_wchar_p, ctypes.c_wchar_p]
+    user32.FindWindowExW.restype = HWND
+
+    user32.SetParent.argtypes = [HWND, HWND]
+    user32.SetParent.restype = HWND
+
+    user32.GetParent.argtypes = [HWND]
+    user32.GetParent.restype = HWND
+
+    user32.GetWindowLongPtrW = user32.GetWindowLongPtrW if hasattr(user32, 'GetWindowLongPtrW') else user32.GetWindowLongW
+    user32.GetWindowLongPtrW.argtypes = [HWND, ctypes.c_int]
+    user32.GetWindowLongPtrW.restype = LONG_PTR
+
+    user32.SetWindowLongPtrW = user32.SetWindowLongPtrW if hasattr(user32, 'SetWindowLongPtrW') else user32.SetWindowLongW
+    user32.SetWindowLongPtrW.argtypes = [HWND, ctypes.c_int, LONG_PTR]
+    user32.SetWindowLongPtrW.restype = LONG_PTR
+
+    user32.SetWindowPos.argtypes = [HWND, HWND, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_uint]
+    user32.SetWindowPos.restype = ctypes.c_bool
+
+    user32.SendMessageTimeoutW.argtypes = [HWND, ctypes.c_uint, ctypes.c_ulonglong, ctypes.c_longlong, ctypes.c_uint, ctypes.c_uint, ctypes.POINTER(ctypes.c_ulong)]
+    user32.SendMessageTimeoutW.restype = ctypes.c_long
+
+    kernel32.GetFileAttributesW.argtypes = [ctypes.c_wchar_p]
+    kernel32.GetFileAttributesW.restype = ctypes.c_uint32
+
+    kernel32.SetFileAttributesW.argtypes = [ctypes.c_wchar_p, ctypes.c_uint32]
+    kernel32.SetFileAttributesW.restype = ctypes.c_bool
+
+    # Prozess-Memory Funktionen für Desktop-Icon-Positionierung
+    kernel32.OpenProcess.argtypes = [ctypes.c_uint32, ctypes.c_bool, ctypes.c_uint32]
+    kernel32.OpenProcess.restype = ctypes.c_void_p
+
+    kernel32.CloseHandle.argtypes = [ctypes.c_void_p]
+    kernel32.CloseHandle.restype = ctypes.c_bool
+
+    kernel32.VirtualAllocEx.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint32, ctypes.c_uint32]
+    kernel32.VirtualAllocEx.restype = ctypes.c_void_p
+
+    kernel32.VirtualFreeEx.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint32]
+    kernel32.VirtualFreeEx.restype = ctypes.c_bool
+
+    kernel32.WriteProcessMemory.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t)]
+    kernel32.WriteProcessMemory.restype = ctypes.c_bool
+
+    kernel32.ReadProcessMemory.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t)]
+    kernel32.ReadProcessMemory.restype = ctypes.c_bool
+
+    user32.GetWindowThreadProcessId.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ulong)]
+    user32.GetWindowThreadProcessId.restype = ctypes.c_uint32
+
+    # GetWindowRect für Multi-Monitor-Unterstützung
+    user32.GetWindowRect.argtypes = [ctypes.c_void_p, ctypes.POINTER(RECT)]
+    user32.GetWindowRect.restype = ctypes.c_bool
+
+    # SetWindowRgn für abgerundete Fenster
+    try:
+        user32.SetWindowRgn.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_bool]
+        user32.SetWindowRgn.restype = ctypes.c_int
+    except:
+        pass
+
+    # Verzeichnisüberwachung (ReadDirectoryChangesW)
+    kernel32.CreateFileW.argtypes = [ctypes.c_wchar_p, ctypes.c_uint32, ctypes.c_uint32, ctypes.c_void_p,
+                                     ctypes.c_uint32, ctypes.c_uint32, ctypes.c_void_p]
+    kernel32.CreateFileW.restype = ctypes.c_void_p
+    kernel32.ReadDirectoryChangesW.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint32, ctypes.c_bool,
+                                               ctypes.c_uint32, ctypes.POINTER(ctypes.c_uint32),
+                                               ctypes.c_void_p, ctypes.c_void_p]
+    kernel32.ReadDirectoryChangesW.restype = ctypes.c_bool
+    kernel32.CancelIoEx.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+    kernel32.CancelIoEx.restype = ctypes.c_bool
+
+    # EnumWindows callback type
+    WNDENUMPROC = ctypes.WINFUNCTYPE(ctypes.c_bool, HWND, ctypes.c_void_p)
+    user32.EnumWindows.argtypes = [WNDENUMPROC, ctypes.c_void_p]
+    user32.EnumWindows.restype = ctypes.c_bool
+else:
+    user32 = None
+    kernel32 = None
+    WNDENUMPROC = None
+
+# Window Styles
+GWL_EXSTYLE = -20
+GWL_STYLE = -16
+WS_EX_TOOLWINDOW = 0x00000080
+WS_EX_NOACTIVATE = 0x08000000
+WS_EX_LAYERED = 0x00080000
+WS_CHILD = 0x40000000
+WS_POPUP = 0x80000000
+
+# SetWindowPos Flags
+SWP_NOMOVE = 0x0002
+SWP_NOSIZE = 0x0001
+SWP_NOACTIVATE = 0x0010
+SWP_SHOWWINDOW = 0x0040
+HWND_BOTTOM = HWND(1)
+
+# File Attributes
+FILE_ATTRIBUTE_HIDDEN = 0x02
+FILE_ATTRIBUTE_NORMAL = 0x80
+
+# ============================================================================
+# Windows Acrylic/Blur API für Glaseffekt
+# ============================================================================
+
+class ACCENT_POLICY(ctypes.Structure):
+    _fields_ = [
+        ('AccentState', ctypes.c_int),
+        ('AccentFlags', ctypes.c_int),
+        ('GradientColor', ctypes.c_uint),
+        ('AnimationId', ctypes.c_int),
+    ]
+
+class WINDOWCOMPOSITIONATTRIBDATA(ctypes.Structure):
+    _fields_ = [
+        ('Attribute', ctypes.c_int),
+        ('Data', ctypes.POINTER(ACCENT_POLICY)),
+        ('SizeOfData', ctypes.c_size_t),
+    ]
+
+# Accent States
+ACCENT_DISABLED = 0
+ACCENT_ENABLE_BLURBEHIND = 3           # Windows 10 Blur
+ACCENT_ENABLE_ACRYLICBLURBEHIND = 4    # Windows 10 1803+ Acrylic
+ACCENT_ENABLE_HOSTBACKDROP = 5         # Windows 11 Mica
+
+# Window Composition Attribute
+WCA_ACCENT_POLICY = 19
+
+def enable_acrylic_blur(hwnd, gradient_color=0x80000000):
+    """
+    Aktiviert Acrylic Blur (Glaseffekt) für ein Fenster.
+    gradient_color: AABBGGRR Format (Alpha, Blue, Green, Red)
+    Standard: 0x80000000 = halbtransparentes Schwarz
+    """
+    try:
+        accent = ACCENT_POLICY()
+        accent.AccentState = ACCENT_ENABLE_ACRYLICBLURBEHIND
+        accent.AccentFlags = 2  # ACCENT_FLAG_DRAW_ALL
+        accent.GradientColor = gradient_color
+        accent.AnimationId = 0
+
+        data = WINDOWCOMPOSITIONATTRIBDATA()
+        data.Attribute = WCA_ACCENT_POLICY
+        data.Data = ctypes.pointer(accent)
+        data.SizeOfData = ctypes.sizeof(accent)
+
+        result = ctypes.windll.user32.SetWindowCompositionAttribute(
+            int(hwnd), ctypes.byref(data)
+        )
+        return bool(result)
+    except Exception as e:
+        print(f"    Acrylic Blur fehlgeschlagen: {e}")
+        # Fallback: Standard-Blur versuchen
+        try:
+            accent = ACCENT_POLICY()
+            accent.AccentState = ACCENT_ENABLE_BLURBEHIND
+            accent.AccentFlags = 2
+            accent.GradientColor = gradient_color
+            accent.AnimationId = 0
+
+            data = WINDOWCOMPOSITIONATTRIBDATA()
+            data.Attribute = WCA_ACCENT_POLICY
+            data.Data = ctypes.pointer(accent)
+            data.SizeOfData = ctypes.sizeof(accent)
+
+            result = ctypes.windll.user32.SetWindowCompositionAttribute(
+                int(hwnd), ctypes.byref(data)
+            )
+            return bool(result)
+        except Exception as e2:
+            print(f"    Blur-Fallback fehlgeschlagen: {e2}")
+            return False
+
+
+def set_rounded_region(hwnd, width, height, radius=16):
+    """
+    Setzt eine abgerundete Fensterregion (zusätzlich zu -transparentcolor).
+    Belt-and-suspenders: transparentcolor macht Ecken visuell transparent,
+    SetWindowRgn verhindert Maus-Events in den Ecken.
+    """
+    try:
+        gdi32 = ctypes.windll.gdi32
+        # CreateRoundRectRgn(left, top, right, bottom, widthEllipse, heightEllipse)
+        rgn = gdi32.CreateRoundRectRgn(0, 0, width + 1, height + 1, radius, radius)
+        if rgn:
+            # SetWindowRgn(hWnd, hRgn, bRedraw)
+            user32.SetWindowRgn(int(hwnd), rgn, True)
+            return True
+    except Exception as e:
+        print(f"    SetWindowRgn fehlgeschlagen: {e}")
+    return False
+
+
+def enable_dpi_awareness():
+    """Windows DPI Awareness (vor dem ersten Fenster aufrufen)"""
+    try:
+        ctypes.windll.shcore.SetProcessDpiAwareness(1)
+    except Exception:
+        pass
+
+
+# COM pro Thread (SHGetFileInfo & Co. setzen ein initialisiertes Apartment voraus)
+COINIT_APARTMENTTHREADED = 0x2
+_com_state = threading.local()
+
+
+def ensure_com_initialized():
+    """
+    CoInitializeEx einmal pro Thread. Früher erledigte das nebenbei der
+    Import von pythoncom; seit den verzögerten Importen nicht mehr.
+    """
+    if not IS_WINDOWS or getattr(_com_state, "done", False):
+        return
+    try:
+        # S_OK/S_FALSE, oder RPC_E_CHANGED_MODE (Thread hat schon ein MTA) — alles brauchbar
+        ctypes.windll.ole32.CoInitializeEx(None, COINIT_APARTMENTTHREADED)
+    except Exception as e:
+        print(f"    CoInitializeEx fehlgeschlagen: {e}")
+    _com_state.done = True
@@ -9,21 +9,24 @@ echo ========================================
 echo   Desktop Icons Wiederherstellen
 echo ========================================
 echo.
-echo Dieses Skript macht alle versteckten Dateien
-echo auf dem Desktop wieder sichtbar.
+echo Dieses Skript macht die vom Widget versteckten
+echo Dateien auf dem Desktop wieder sichtbar.
 echo.
 
-:: Desktop-Pfad ermitteln
-set DESKTOP=%USERPROFILE%\Desktop
+cd /d "%~dp0"
 
-echo Desktop-Pfad: %DESKTOP%
-echo.
-echo Stelle versteckte Dateien wieder her...
-echo.
+:: Gezielt nur die im Ledger vermerkten Dateien wiederherstellen
+python desktop_folder_widget_v3.py --restore
+if %errorlevel% equ 0 goto fertig
 
-:: Alle versteckten Dateien auf dem Desktop sichtbar machen
+:: Fallback (kein Python / Ledger defekt): alle Desktop-Dateien sichtbar machen
+echo.
+echo Gezielte Wiederherstellung fehlgeschlagen - verwende attrib...
+set DESKTOP=%USERPROFILE%\Desktop
+echo Desktop-Pfad: %DESKTOP%
 attrib -H "%DESKTOP%\*.*" /S
 
+:fertig
 echo.
 echo Fertig! Alle Desktop-Dateien sollten jetzt sichtbar sein.
 echo.
@@ -0,0 +1,95 @@
+"""
+Baut .lnk-Dateien (MS-SHLLINK) für Tests und Benchmarks — ohne Windows.
+
+    data = build_shell_link("C:\\Program Files\\App\\app.exe", arguments="--x")
+    data = build_shell_link(network="\\\\server\\share", suffix="Tools\\app.exe")
+    data = build_shell_link(env_target="%ProgramFiles%\\App\\app.exe")
+"""
+
+import struct
+
+from desktop_folder_widget import ShellLinkParser
+
+ANSI = "cp1252"
+
+
+def string_data(value, unicode=True):
+    if unicode:
+        return struct.pack("<H", len(value)) + value.encode("utf-16-le")
+    raw = value.encode(ANSI)
+    return struct.pack("<H", len(raw)) + raw
+
+
+def link_info(target="", network="", suffix="", unicode_paths=False):
+    """
+    LinkInfo mit VolumeID + LocalBasePath (target) oder mit
+    CommonNetworkRelativeLink (network, z.B. "\\\\server\\share") und
+    CommonPathSuffix. unicode_paths: Header 0x24 mit zusätzlichen
+    UTF-16-Pfaden (ANSI-Teile dann leer).
+    """
+    header_size = 0x24 if unicode_paths else 0x1C
+    body = b""
+    fields = {"volume": 0, "local": 0, "network": 0, "suffix": 0, "local_u": 0, "suffix_u": 0}
+
+    def put(name, raw):
+        nonlocal body
+        fields[name] = header_size + len(body)
+        body += raw
+
+    if network:
+        flags = 0x2
+        put("network", struct.pack("<5I", 0x14 + len(network) + 1, 0x2, 0x14, 0, 0x20000)
+            + network.encode(ANSI) + b"\0")
+    else:
+        flags = 0x1
+        put("volume", struct.pack("<4I", 0x10, 3, 0, 0x10))
+        put("local", b"\0" if unicode_paths else target.encode(ANSI) + b"\0")
+    put("suffix", b"\0" if unicode_paths else suffix.encode(ANSI) + b"\0")
+    if unicode_paths:
+        if not network:
+            put("local_u", target.encode("utf-16-le") + b"\0\0")
+        put("suffix_u", suffix.encode("utf-16-le") + b"\0\0")
+
+    header = struct.pack("<7I", header_size + len(body), header_size, flags, fields["volume"],
+                         fields["local"], fields["network"], fields["suffix"])
+    if unicode_paths:
+        header += struct.pack("<2I", fields["local_u"], fields["suffix_u"])
+    return header + body
+
+
+def environment_block(signature, value):
+    """EnvironmentVariableDataBlock bzw. IconEnvironmentDataBlock (0x314 Bytes)"""
+    ansi = value.encode(ANSI)[:259].ljust(260, b"\0")
+    wide = value.encode("utf-16-le")[:518].ljust(520, b"\0")
+    return struct.pack("<2I", 0x314, signature) + ansi + wide
+
+
+def build_shell_link(target="", arguments="", working_dir="", icon_location="", icon_index=0,
+                     description="", relative_path="", network="", suffix="",
+                     unicode_paths=False, unicode=True, id_list=b"",
+                     env_target="", env_icon=""):
+    """Baut eine minimale, gültige .lnk-Datei; leere Felder werden weggelassen"""
+    flags = ShellLinkParser.IS_UNICODE if unicode else 0
+    body = b""
+    if id_list:
+        flags |= ShellLinkParser.HAS_LINK_TARGET_ID_LIST
+        body += struct.pack("<H", len(id_list)) + id_list
+    if target or network:
+        flags |= ShellLinkParser.HAS_LINK_INFO
+        body += link_info(target, network, suffix, unicode_paths)
+    for flag, value in ((ShellLinkParser.HAS_NAME, description),
+                        (ShellLinkParser.HAS_RELATIVE_PATH, relative_path),
+                        (ShellLinkParser.HAS_WORKING_DIR, working_dir),
+                        (ShellLinkParser.HAS_ARGUMENTS, arguments),
+                        (ShellLinkParser.HAS_ICON_LOCATION, icon_location)):
+        if value:
+            flags |= flag
+            body += string_data(value, unicode)
+    if env_target:
+        body += environment_block(ShellLinkParser.ENVIRONMENT_BLOCK, env_target)
+    if env_icon:
+        body += environment_block(ShellLinkParser.ICON_ENVIRONMENT_BLOCK, env_icon)
+
+    header = struct.pack("<I16sII", ShellLinkParser.HEADER_SIZE, ShellLinkParser.LINK_CLSID, flags, 0)
+    header += b"\x00" * 24 + struct.pack("<IiIH", 0, icon_index, 1, 0) + b"\x00" * 10
+    return header + body + struct.pack("<I", 0)
@@ -0,0 +1,29 @@
+"""Kommandozeile: Schutz vor gleichzeitigem Schreiben neben dem laufenden Widget"""
+
+import pytest
+
+from desktop_folder_widget import cli
+from desktop_folder_widget.instance import InstanceLock
+
+
+@pytest.mark.parametrize("argv, read_only", [
+    (["list"], True),
+    (["validate"], True),
+    (["validate", "--prune"], False),
+    (["new", "Spiele"], False),
+    (["add", "Spiele", "a.lnk"], False),
+])
+def test_read_only_commands(argv, read_only):
+    assert cli.is_read_only(cli.build_parser().parse_args(argv)) is read_only
+
+
+def test_prune_refused_while_widget_runs(tmp_path, monkeypatch, capsys):
+    lock_file = tmp_path / "widget.lock"
+    running = InstanceLock(lock_file)
+    assert running.acquire()
+    monkeypatch.setattr(cli, "InstanceLock", lambda: InstanceLock(lock_file))
+    try:
+        assert cli.cli_main(["validate", "--prune"]) == 1
+    finally:
+        running.release()
+    assert "Das Widget läuft" in capsys.readouterr().out
@@ -0,0 +1,147 @@
+"""JsonConfigStore + ConfigJournal: Nachspielen, seq-Abgleich, abgebrochene Zeilen, Verdichtung"""
+
+import json
+
+import pytest
+
+from desktop_folder_widget.persistence import ConfigJournal, JsonConfigStore
+
+
+@pytest.fixture
+def files(tmp_path):
+    return tmp_path / "config.json", tmp_path / "config.journal"
+
+
+def open_store(files):
+    return JsonConfigStore(*files)
+
+
+def create_tile(tile_id="t1", name="Spiele"):
+    return {"op": ConfigJournal.OP_CREATE_TILE, "tile": tile_id,
+            "config": {"name": name, "pos_x": 0, "pos_y": 0, "shortcuts": []}}
+
+
+def add_shortcut(name, tile_id="t1"):
+    return {"op": ConfigJournal.OP_ADD_SHORTCUT, "tile": tile_id,
+            "shortcut": {"name": name, "path": f"C:\\Desktop\\{name}.lnk"}}
+
+
+def names(config, tile_id="t1"):
+    return [s["name"] for s in config["tiles"][tile_id]["shortcuts"]]
+
+
+def test_journal_replayed_on_load(files):
+    store = open_store(files)
+    config = store.load()
+    store.record(config, [create_tile(), add_shortcut("a"), add_shortcut("b")])
+    store.record(config, [{"op": ConfigJournal.OP_MOVE, "tile": "t1", "pos_x": 40, "pos_y": 50}])
+    assert not files[0].exists()
+
+    config = open_store(files).load()
+
+    assert names(config) == ["a", "b"]
+    assert (config["tiles"]["t1"]["pos_x"], config["tiles"]["t1"]["pos_y"]) == (40, 50)
+
+
+def test_snapshot_and_journal_round_trip(files):
+    store = open_store(files)
+    config = store.load()
+    ops = [create_tile(), add_shortcut("a")]
+    store.record(config, ops)
+    for op in ops:
+        ConfigJournal.apply(config, op)
+    store.save(config)
+    assert not files[1].exists()
+    assert json.loads(files[0].read_text(encoding="utf-8"))["journal_seq"] == 2
+
+    store.record(config, [add_shortcut("b")])
+    assert [op["seq"] for op in store.journal.read_ops()] == [3]
+
+    reloaded = open_store(files)
+    config = reloaded.load()
+    assert names(config) == ["a", "b"]
+    assert reloaded.journal.seq == 3
+    reloaded.record(config, [add_shortcut("c")])
+    assert [op["seq"] for op in reloaded.journal.read_ops()] == [3, 4]
+
+
+def test_ops_already_in_snapshot_are_not_applied_twice(files, monkeypatch):
+    store = open_store(files)
+    config = store.load()
+    ops = [create_tile(), add_shortcut("a"), add_shortcut("b")]
+    store.record(config, ops)
+    for op in ops:
+        ConfigJournal.apply(config, op)
+
+    # Absturz zwischen Snapshot-Schreiben und Journal-Leeren
+    monkeypatch.setattr(ConfigJournal, "truncate", lambda self: None)
+    store.save(config)
+    monkeypatch.undo()
+    store.record(config, [add_shortcut("c")])
+    assert [op["seq"] for op in store.journal.read_ops()] == [1, 2, 3, 4]
+
+    reloaded = open_store(files)
+    config = reloaded.load()
+    assert names(config) == ["a", "b", "c"]
+    assert reloaded.journal.seq == 4
+
+
+def test_torn_last_line_is_cut_off(files):
+    store = open_store(files)
+    config = store.load()
+    store.record(config, [create_tile(), add_shortcut("a")])
+    with open(files[1], "ab") as f:
+        f.write(b'{"op":"add_shortcut","tile":"t1","shortcut":{"name":"hal')
+    complete = files[1].stat().st_size - len(b'{"op":"add_shortcut","tile":"t1","shortcut":{"name":"hal')
+
+    reloaded = open_store(files)
+    assert files[1].stat().st_size == complete
+    config = reloaded.load()
+    assert names(config) == ["a"]
+
+    # Neue Zeilen landen nicht hinter dem abgebrochenen Rest
+    reloaded.record(config, [add_shortcut("b")])
+    assert names(open_store(files).load()) == ["a", "b"]
+
+
+def test_read_ops_stops_at_torn_line_without_repair(files):
+    journal = ConfigJournal(files[1])
+    journal.append([create_tile(), add_shortcut("a")])
+    with open(files[1], "ab") as f:
+        f.write(b'{"op":"mo')
+    assert [op["seq"] for op in journal.read_ops()] == [1, 2]
+
+
+def test_compaction_writes_snapshot_and_empties_journal(files, monkeypatch):
+    monkeypatch.setattr(ConfigJournal, "COMPACT_THRESHOLD", 200)
+    store = open_store(files)
+    config = store.load()
+    ops = [create_tile()] + [add_shortcut(f"s{i}") for i in range(5)]
+    for op in ops:
+        ConfigJournal.apply(config, op)
+        store.record(config, [op])
+        if not files[1].exists():
+            break
+    else:
+        pytest.fail("Journal wurde nicht verdichtet")
+
+    snapshot = json.loads(files[0].read_text(encoding="utf-8"))
+    assert snapshot["journal_seq"] == store.journal.seq
+    assert store.journal.size == 0
+
+    store.record(config, [add_shortcut("danach")])
+    reloaded = open_store(files).load()
+    assert names(reloaded) == names(snapshot) + ["danach"]
+
+
+def test_load_compacts_oversized_journal(files, monkeypatch):
+    store = open_store(files)
+    config = store.load()
+    store.record(config, [create_tile()] + [add_shortcut(f"s{i}") for i in range(20)])
+
+    monkeypatch.setattr(ConfigJournal, "COMPACT_THRESHOLD", 100)
+    config = open_store(files).load()
+
+    assert not files[1].exists()
+    assert len(names(config)) == 20
+    assert names(open_store(files).load()) == names(config)
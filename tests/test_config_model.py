@@ -0,0 +1,124 @@
+"""Konfigurationsmodell: v1→v2-Migration, TileConfig/Shortcut, Wertebereiche, unbekannte Felder"""
+
+import copy
+import json
+
+from desktop_folder_widget.model import (
+    CONFIG_SCHEMA_VERSION, Shortcut, TileConfig, config_from_dict, config_to_dict, migrate_config,
+)
+
+V1_CONFIG = {
+    "tiles": {
+        "1700000000": {
+            "name": "Spiele",
+            "pos_x": 120,
+            "pos_y": 80,
+            "collapsed_scale": 120,
+            "expanded_scale": 50,
+            "collapsed_icon_size": 64,
+            "expanded_icon_size": 32,
+            "hide_shortcut_names": False,
+            "farbe": "#336699",
+            "shortcuts": [
+                {"name": "Spiel", "path": "C:\\Spiele\\Spiel.lnk", "desktop_pos": [10, 20], "pinned": True},
+                {"path": "C:/Spiele/Ohne Name.lnk"},
+                {"name": "Kaputt"},
+                "kein Dict",
+            ],
+        },
+        "1700000001": {"name": "Leer", "collapsed_scale": 10},
+    },
+}
+
+
+def migrated_v1():
+    data = copy.deepcopy(V1_CONFIG)
+    assert migrate_config(data) is True
+    return data
+
+
+def test_v1_migration():
+    data = migrated_v1()
+    tile = data["tiles"]["1700000000"]
+
+    assert data["schema_version"] == CONFIG_SCHEMA_VERSION == 2
+    assert (tile["collapsed_tile_w"], tile["collapsed_tile_h"]) == (180, 180)
+    assert (tile["expanded_tile_w"], tile["expanded_tile_h"]) == (122, 140)
+    assert (tile["collapsed_icon_w"], tile["collapsed_icon_h"]) == (64, 64)
+    assert (tile["expanded_icon_w"], tile["expanded_icon_h"]) == (32, 32)
+    for old_key in ("collapsed_scale", "expanded_scale", "collapsed_icon_size", "expanded_icon_size"):
+        assert old_key not in tile
+    # Untergrenzen bei sehr kleiner Skalierung
+    assert data["tiles"]["1700000001"]["collapsed_tile_w"] == 40
+
+
+def test_migration_is_idempotent_and_skips_newer_versions():
+    data = migrated_v1()
+    before = copy.deepcopy(data)
+    assert migrate_config(data) is False
+    assert data == before
+
+    newer = {"schema_version": CONFIG_SCHEMA_VERSION + 1, "tiles": {"t": {"collapsed_scale": 50}}}
+    assert migrate_config(newer) is False
+    assert newer["tiles"]["t"] == {"collapsed_scale": 50}
+
+    empty = {}
+    assert migrate_config(empty) is False
+    assert empty["schema_version"] == CONFIG_SCHEMA_VERSION
+
+
+def test_round_trip_of_migrated_v1():
+    config = config_from_dict(migrated_v1())
+    tile = config["tiles"]["1700000000"]
+
+    assert isinstance(tile, TileConfig)
+    assert tile.hide_shortcut_names is False
+    assert tile.extra == {"farbe": "#336699"}
+    assert [s.name for s in tile.shortcuts] == ["Spiel", "Ohne Name"]
+    assert tile.shortcuts[0].desktop_pos == (10, 20)
+    assert tile.shortcuts[0].extra == {"pinned": True}
+
+    data = json.loads(json.dumps(config_to_dict(config)))
+    assert data["tiles"]["1700000000"]["farbe"] == "#336699"
+    assert data["tiles"]["1700000000"]["shortcuts"][0] == {
+        "name": "Spiel", "path": "C:\\Spiele\\Spiel.lnk", "desktop_pos": [10, 20], "pinned": True}
+    again = config_from_dict(data)
+    assert again["tiles"]["1700000000"] == tile
+    assert again["tiles"]["1700000001"] == config["tiles"]["1700000001"]
+
+
+def test_values_clamped_to_ranges():
+    tile = TileConfig.from_dict({
+        "pos_x": 10**9, "pos_y": "-12",
+        "collapsed_tile_w": 5, "expanded_tile_h": 99999, "collapsed_icon_w": "64",
+        "expanded_icon_w": "groß", "collapsed_name_font_size": 100,
+        "lock_aspect_collapsed_tile": 0, "hide_shortcut_names": "ja",
+    })
+
+    assert (tile.pos_x, tile.pos_y) == (100000, -12)
+    assert tile.collapsed_tile_w == 40
+    assert tile.expanded_tile_h == 1500
+    assert tile.collapsed_icon_w == 64
+    assert tile.expanded_icon_w == 36  # ungültig → Standard
+    assert tile.collapsed_name_font_size == 24
+    assert tile.lock_aspect_collapsed_tile is False and tile.hide_shortcut_names is True
+    assert tile.extra == {}
+
+
+def test_deferred_tile_keeps_shortcuts_none():
+    tile = TileConfig.from_dict({"name": "Später", "pos_x": 0, "pos_y": 0})
+
+    assert tile.shortcuts is None
+    assert "shortcuts" not in tile.to_dict()
+    assert TileConfig.from_dict(tile.to_dict()).shortcuts is None
+    assert TileConfig.from_dict({"shortcuts": []}).shortcuts == []
+
+
+def test_shortcut_fields():
+    shortcut = Shortcut.from_dict({"path": "C:/Users/Anna/Desktop/Editor.LNK", "desktop_pos": ["x", 1]})
+
+    assert shortcut.name == "Editor"
+    assert shortcut.desktop_pos is None
+    assert shortcut.ext == ".lnk" and shortcut.letter == "E"
+    assert shortcut.norm_path == "c:\\users\\anna\\desktop\\editor.lnk"
+    assert shortcut.to_dict() == {"name": "Editor", "path": "C:/Users/Anna/Desktop/Editor.LNK"}
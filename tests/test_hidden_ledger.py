@@ -0,0 +1,150 @@
+"""HiddenFileLedger + BulkAttributeEngine: Original-Attribute vermerken und wiederherstellen"""
+
+import errno
+import json
+import threading
+
+import pytest
+
+from desktop_folder_widget.attributes import (
+    AttributeBackend, BulkAttributeEngine, HiddenFileLedger, MemoryAttributeBackend,
+)
+from desktop_folder_widget.winapi import FILE_ATTRIBUTE_HIDDEN
+
+READONLY = 0x1
+ARCHIVE = 0x20
+
+
+class BitsBackend(AttributeBackend):
+    """Vollständige Attribut-Bits im Speicher (wie GetFileAttributesW/SetFileAttributesW)"""
+
+    name = "bits"
+
+    def __init__(self, files):
+        self.attrs = dict(files)
+        self._lock = threading.Lock()
+
+    def get_attributes(self, path):
+        if path not in self.attrs:
+            raise FileNotFoundError(errno.ENOENT, "Datei nicht gefunden", path)
+        return self.attrs[path]
+
+    def set_attributes(self, path, attrs):
+        self.get_attributes(path)
+        with self._lock:
+            self.attrs[path] = attrs
+        return True
+
+    def get_hidden(self, path):
+        return bool(self.get_attributes(path) & FILE_ATTRIBUTE_HIDDEN)
+
+    def set_hidden(self, path, hidden):
+        attrs = self.get_attributes(path)
+        new = attrs | FILE_ATTRIBUTE_HIDDEN if hidden else attrs & ~FILE_ATTRIBUTE_HIDDEN
+        self.attrs[path] = new
+        return new != attrs
+
+
+@pytest.fixture
+def ledger_file(tmp_path):
+    return tmp_path / "hidden.jsonl"
+
+
+def engine_for(backend, ledger_file):
+    return BulkAttributeEngine(backend, refresh=lambda paths: None,
+                               ledger=HiddenFileLedger(ledger_file))
+
+
+def test_hide_records_original_attributes(ledger_file):
+    backend = BitsBackend({"a.lnk": READONLY | ARCHIVE, "b.lnk": ARCHIVE})
+    engine = engine_for(backend, ledger_file)
+
+    report = engine.hide(["a.lnk", "b.lnk"])
+
+    assert sorted(report.changed) == ["a.lnk", "b.lnk"]
+    assert backend.attrs["a.lnk"] == READONLY | ARCHIVE | FILE_ATTRIBUTE_HIDDEN
+    records = [json.loads(line) for line in ledger_file.read_text().splitlines()]
+    assert {r["path"]: r["attrs"] for r in records} == {"a.lnk": READONLY | ARCHIVE, "b.lnk": ARCHIVE}
+
+
+def test_restore_after_crash_uses_recorded_attributes(ledger_file):
+    backend = BitsBackend({"a.lnk": READONLY | ARCHIVE})
+    engine_for(backend, ledger_file).hide(["a.lnk"])
+
+    # Neuer Prozess (z.B. --restore nach Absturz) liest nur den Ledger
+    ledger = HiddenFileLedger(ledger_file)
+    assert ledger.original("a.lnk") == READONLY | ARCHIVE
+    report = BulkAttributeEngine(backend, refresh=lambda paths: None, ledger=ledger).unhide(ledger.paths())
+
+    assert report.changed == ["a.lnk"]
+    assert backend.attrs["a.lnk"] == READONLY | ARCHIVE
+    assert len(HiddenFileLedger(ledger_file)) == 0
+
+
+def test_bits_changed_meanwhile_are_kept(ledger_file):
+    backend = BitsBackend({"a.lnk": READONLY | ARCHIVE})
+    engine = engine_for(backend, ledger_file)
+    engine.hide(["a.lnk"])
+    backend.attrs["a.lnk"] &= ~READONLY  # Benutzer hebt den Schreibschutz auf
+
+    engine.unhide(["a.lnk"])
+
+    assert backend.attrs["a.lnk"] == ARCHIVE
+
+
+def test_user_hidden_file_is_not_recorded_or_unhidden(ledger_file):
+    backend = BitsBackend({"a.lnk": FILE_ATTRIBUTE_HIDDEN})
+    engine = engine_for(backend, ledger_file)
+
+    report = engine.hide(["a.lnk"])
+
+    assert report.unchanged == ["a.lnk"]
+    assert len(engine.ledger) == 0
+
+
+def test_unhide_leaves_user_hidden_file_hidden(ledger_file):
+    backend = BitsBackend({"a.lnk": ARCHIVE | FILE_ATTRIBUTE_HIDDEN, "b.lnk": ARCHIVE})
+    engine = engine_for(backend, ledger_file)
+    engine.hide(["a.lnk", "b.lnk"])
+
+    report = engine.unhide(["a.lnk", "b.lnk"])
+
+    assert report.changed == ["b.lnk"]
+    assert report.unchanged == ["a.lnk"]
+    assert backend.attrs == {"a.lnk": ARCHIVE | FILE_ATTRIBUTE_HIDDEN, "b.lnk": ARCHIVE}
+    assert len(engine.ledger) == 0
+
+
+def test_unhide_with_memory_backend_keeps_user_hidden(ledger_file):
+    backend = MemoryAttributeBackend(["a.lnk", "b.lnk"])
+    backend.set_hidden("a.lnk", True)
+    engine = BulkAttributeEngine(backend, refresh=lambda paths: None, ledger=HiddenFileLedger(ledger_file))
+
+    engine.hide(["a.lnk", "b.lnk"])
+    engine.unhide(["a.lnk", "b.lnk"])
+
+    assert backend.get_hidden("a.lnk") is True
+    assert backend.get_hidden("b.lnk") is False
+
+
+def test_old_ledger_without_attributes_clears_hidden_bit(ledger_file):
+    ledger_file.write_text('{"op":"hide","path":"a.lnk"}\n')
+    backend = BitsBackend({"a.lnk": ARCHIVE | FILE_ATTRIBUTE_HIDDEN})
+    engine = engine_for(backend, ledger_file)
+    assert engine.ledger.original("a.lnk") is None
+
+    engine.unhide(engine.ledger.paths())
+
+    assert backend.attrs["a.lnk"] == ARCHIVE
+
+
+def test_compaction_keeps_attributes(ledger_file, monkeypatch):
+    monkeypatch.setattr(HiddenFileLedger, "COMPACT_THRESHOLD", 1)
+    backend = BitsBackend({"a.lnk": READONLY, "b.lnk": 0})
+    engine = engine_for(backend, ledger_file)
+    engine.hide(["a.lnk", "b.lnk"])
+    engine.unhide(["b.lnk"])
+
+    ledger = HiddenFileLedger(ledger_file)
+    assert ledger.paths() == ["a.lnk"]
+    assert ledger.original("a.lnk") == READONLY
@@ -0,0 +1,61 @@
+"""IconExtractor.get_icons: Standard-Icons nach Fristüberschreitung nicht dauerhaft cachen"""
+
+import pytest
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+from desktop_folder_widget import IconExtractor  # noqa: E402
+
+
+class FlakyWorker:
+    """Hilfsprozess-Ersatz: liefert None (Frist überschritten), solange slow gesetzt ist"""
+
+    def __init__(self):
+        self.slow = True
+        self.requests = []
+
+    def request_many(self, paths, size):
+        self.requests.append(list(paths))
+        if self.slow:
+            return [None] * len(paths)
+        return [Image.new("RGBA", (size, size), (255, 0, 0, 255)) for _ in paths]
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    worker = FlakyWorker()
+    monkeypatch.setattr(IconExtractor, "worker", worker)
+    monkeypatch.setattr(IconExtractor, "ICON_CACHE", {})
+    monkeypatch.setattr(IconExtractor, "FAILED", {})
+    return worker
+
+
+PATH = "\\\\server\\share\\Bericht.pdf"
+
+
+def test_timeout_shows_default_without_caching(worker):
+    icon = IconExtractor.get_icons([PATH], 32)[0]
+    assert icon is not None and icon.size == (32, 32)
+    assert IconExtractor.ICON_CACHE == {}
+
+
+def test_failed_icon_retried_after_interval(worker, monkeypatch):
+    IconExtractor.get_icons([PATH], 32)
+    IconExtractor.get_icons([PATH], 32)
+    assert len(worker.requests) == 1  # innerhalb der Frist nicht erneut
+
+    worker.slow = False
+    monkeypatch.setattr(IconExtractor, "FAILED_RETRY_S", 0)
+    icon = IconExtractor.get_icons([PATH], 32)[0]
+    assert len(worker.requests) == 2
+    assert icon.getpixel((0, 0)) == (255, 0, 0, 255)
+    assert IconExtractor.FAILED == {}
+
+
+def test_invalidate_drops_failed_entries(worker):
+    IconExtractor.get_icons([PATH], 32)
+    IconExtractor.invalidate([PATH])
+    assert IconExtractor.FAILED == {}
+    IconExtractor.get_icons([PATH], 32)
+    assert len(worker.requests) == 2
@@ -0,0 +1,225 @@
+"""IconResourceDecoder gegen selbst gebaute .ico- und PE-Dateien (läuft ohne Windows)"""
+
+import io
+import struct
+
+import pytest
+
+pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+from desktop_folder_widget import IconResourceDecoder  # noqa: E402
+
+RED = (255, 0, 0)
+GREEN = (0, 200, 0)
+BLUE = (0, 0, 255)
+YELLOW = (255, 255, 0)
+
+
+# --- Bausteine ---
+
+def png_entry(size, color):
+    """(Breite, Höhe, Farbtiefe, Bytes) eines PNG-Eintrags"""
+    buf = io.BytesIO()
+    Image.new("RGBA", (size, size), color + (255,)).save(buf, "PNG")
+    return size, size, 32, buf.getvalue()
+
+
+def bmp_entry(size, color, transparent_left=0):
+    """
+    24-Bit-BMP-Eintrag mit AND-Maske (ohne BITMAPFILEHEADER, doppelte Höhe
+    im Header wie in .ico). Die linken transparent_left Spalten sind in der
+    Maske gesetzt, also durchsichtig.
+    """
+    header = struct.pack("<IiiHHIIiiII", 40, size, size * 2, 1, 24, 0, 0, 0, 0, 0, 0)
+    row = bytes((color[2], color[1], color[0])) * size
+    row += b"\0" * (-len(row) % 4)
+    mask_row = bytearray((size + 7) // 8)
+    for x in range(transparent_left):
+        mask_row[x // 8] |= 0x80 >> (x % 8)
+    mask_row += b"\0" * (-len(mask_row) % 4)
+    return size, size, 24, header + row * size + bytes(mask_row) * size
+
+
+def ico_file(entries):
+    data = struct.pack("<3H", 0, 1, len(entries))
+    offset = 6 + 16 * len(entries)
+    blobs = b""
+    for width, height, bit_count, image in entries:
+        data += struct.pack("<4B2H2I", width % 256, height % 256, 0, 0, 1, bit_count,
+                            len(image), offset + len(blobs))
+        blobs += image
+    return data + blobs
+
+
+def group_icon(entries, first_id):
+    """RT_GROUP_ICON-Daten (GRPICONDIR) für Einträge mit IDs ab first_id"""
+    data = struct.pack("<3H", 0, 1, len(entries))
+    for i, (width, height, bit_count, image) in enumerate(entries):
+        data += struct.pack("<4B2HIH", width % 256, height % 256, 0, 0, 1, bit_count,
+                            len(image), first_id + i)
+    return data
+
+
+def resource_section(tree, section_rva):
+    """
+    .rsrc-Sektion: tree = {Typ: {ID: Bytes}}, jeweils mit einer Sprache
+    (0x409). Verzeichnis-Offsets relativ zum Wurzelverzeichnis, Daten als RVA.
+    """
+    buf = bytearray()
+    leaves = []
+
+    def directory(entries):
+        offset = len(buf)
+        buf.extend(struct.pack("<2I4H", 0, 0, 0, 0, 0, len(entries)))
+        slots = []
+        for key, _ in entries:
+            slots.append(len(buf))
+            buf.extend(struct.pack("<2I", key, 0))
+        for (_, child), slot in zip(entries, slots):
+            if isinstance(child, dict):
+                struct.pack_into("<I", buf, slot + 4, directory(sorted(child.items())) | 0x80000000)
+            else:
+                struct.pack_into("<I", buf, slot + 4, len(buf))
+                leaves.append((len(buf), child))
+                buf.extend(struct.pack("<4I", 0, len(child), 0, 0))
+        return offset
+
+    directory(sorted((kind, {key: {0x409: data} for key, data in items.items()})
+                     for kind, items in tree.items()))
+    for entry, data in leaves:
+        buf.extend(b"\0" * (-len(buf) % 4))
+        struct.pack_into("<I", buf, entry, section_rva + len(buf))
+        buf.extend(data)
+    return bytes(buf)
+
+
+def pe_file(groups):
+    """
+    Minimale PE32-Datei mit einer .rsrc-Sektion. groups: {Gruppen-ID: Einträge};
+    die RT_ICON-IDs werden fortlaufend vergeben.
+    """
+    rt_icon, rt_group = {}, {}
+    next_id = 1
+    for group_id, entries in groups.items():
+        rt_group[group_id] = group_icon(entries, next_id)
+        for entry in entries:
+            rt_icon[next_id] = entry[3]
+            next_id += 1
+    section_rva, raw_ptr = 0x1000, 0x200
+    rsrc = resource_section({IconResourceDecoder.RT_ICON: rt_icon,
+                             IconResourceDecoder.RT_GROUP_ICON: rt_group}, section_rva)
+    raw_size = len(rsrc) + (-len(rsrc) % 0x200)
+
+    dos = bytearray(0x40)
+    dos[:2] = b"MZ"
+    struct.pack_into("<I", dos, 0x3C, 0x40)
+    optional = bytearray(224)
+    struct.pack_into("<H", optional, 0, 0x10B)
+    struct.pack_into("<2I", optional, 96 + 2 * 8, section_rva, len(rsrc))
+    coff = struct.pack("<2H3I2H", 0x14C, 1, 0, 0, 0, len(optional), 0x2102)
+    section = struct.pack("<8s4I2I2HI", b".rsrc", len(rsrc), section_rva, raw_size, raw_ptr,
+                          0, 0, 0, 0, 0x40000040)
+    headers = bytes(dos) + b"PE\0\0" + coff + bytes(optional) + section
+    return headers.ljust(raw_ptr, b"\0") + rsrc.ljust(raw_size, b"\0")
+
+
+def center(img):
+    return img.getpixel((img.width // 2, img.height // 2))
+
+
+def assert_color(img, color):
+    r, g, b, a = center(img)
+    assert a == 255
+    assert all(abs(x - y) <= 2 for x, y in zip((r, g, b), color)), (r, g, b)
+
+
+@pytest.fixture
+def write(tmp_path):
+    def write(name, data):
+        path = tmp_path / name
+        path.write_bytes(data)
+        return str(path)
+    return write
+
+
+# --- .ico ---
+
+@pytest.fixture
+def sized_ico(write):
+    return write("app.ico", ico_file([
+        png_entry(16, RED), bmp_entry(24, GREEN), png_entry(32, BLUE), png_entry(48, YELLOW),
+    ]))
+
+
+@pytest.mark.parametrize("size, color", [
+    (16, RED),      # exakt
+    (20, GREEN),    # kleinster größerer Eintrag (BMP)
+    (32, BLUE),
+    (40, YELLOW),
+    (64, YELLOW),   # nichts groß genug → größter
+])
+def test_ico_size_selection(sized_ico, size, color):
+    img = IconResourceDecoder.load(sized_ico, size)
+    assert img.size == (size, size) and img.mode == "RGBA"
+    assert_color(img, color)
+
+
+def test_higher_bit_depth_wins_tie(write):
+    path = write("tie.ico", ico_file([bmp_entry(32, GREEN), png_entry(32, BLUE)]))
+    assert_color(IconResourceDecoder.load(path, 32), BLUE)
+
+
+def test_bmp_alpha_from_and_mask(write):
+    path = write("mask.ico", ico_file([bmp_entry(32, RED, transparent_left=12)]))
+    img = IconResourceDecoder.load(path, 32)
+    assert img.getpixel((5, 16))[3] == 0
+    assert img.getpixel((11, 0))[3] == 0
+    assert img.getpixel((12, 31)) == RED + (255,)
+    assert img.getpixel((31, 16)) == RED + (255,)
+
+
+def test_not_an_icon(write):
+    assert IconResourceDecoder.load(write("kaputt.ico", b"\x00\x00\x02\x00"), 32) is None
+    assert IconResourceDecoder.load(write("leer.ico", b""), 32) is None
+
+
+# --- PE ---
+
+@pytest.fixture
+def program(write):
+    return write("programm.exe", pe_file({
+        101: [png_entry(16, RED), png_entry(32, RED)],
+        205: [bmp_entry(32, GREEN, transparent_left=8), png_entry(48, BLUE)],
+    }))
+
+
+def test_pe_first_group_by_default(program):
+    assert_color(IconResourceDecoder.load(program, 32), RED)
+
+
+def test_pe_positive_index_is_nth_group(program):
+    img = IconResourceDecoder.load(program, 32, index=1)
+    assert_color(img, GREEN)
+    assert img.getpixel((2, 16))[3] == 0  # AND-Maske auch aus RT_ICON
+    assert_color(IconResourceDecoder.load(program, 48, index=1), BLUE)
+
+
+def test_pe_negative_index_is_resource_id(program):
+    assert_color(IconResourceDecoder.load(program, 32, index=-205), GREEN)
+    assert_color(IconResourceDecoder.load(program, 32, index=-101), RED)
+
+
+@pytest.mark.parametrize("index", [2, -1, -102])
+def test_pe_unknown_index(program, index):
+    assert IconResourceDecoder.load(program, 32, index=index) is None
+
+
+def test_pe_without_resources(write):
+    data = bytearray(pe_file({1: [png_entry(16, RED)]}))
+    struct.pack_into("<I", data, 0x40 + 24 + 96 + 16, 0)  # Ressourcen-Verzeichnis leeren
+    assert IconResourceDecoder.load(write("ohne.dll", bytes(data)), 32) is None
+
+
+def test_not_a_pe(write):
+    assert IconResourceDecoder.load(write("text.exe", b"MZ" + b"\0" * 100), 32) is None
@@ -0,0 +1,94 @@
+"""restore_desktop_icon_positions: Wiederholungen für verzögert aufgenommene Icons"""
+
+import pytest
+
+from desktop_folder_widget import SimulatedDesktop, WindowsDesktopAPI
+
+DESKTOP = "C:\\Users\\test\\Desktop"
+SCREEN = (1920, 1080)
+
+
+class FakeScheduler:
+    """Sammelt after()-Rückrufe, statt sie zu warten"""
+
+    def __init__(self):
+        self.pending = []
+
+    def __call__(self, ms, callback):
+        self.pending.append((ms, callback))
+
+    def run_next(self):
+        _, callback = self.pending.pop(0)
+        callback()
+
+
+@pytest.fixture
+def desktop():
+    desktop = SimulatedDesktop(DESKTOP, [f"{DESKTOP}\\App {i}.lnk" for i in range(20)])
+    for i in range(3):
+        desktop.add_file(f"{DESKTOP}\\Neu {i}.lnk", hidden=True)
+    desktop.refresh_items()
+    WindowsDesktopAPI.set_backend(desktop)
+    yield desktop
+    WindowsDesktopAPI.set_backend(None)
+
+
+def unhide_silently(desktop):
+    """Eingeblendet, aber der Explorer hat die Liste noch nicht neu gelesen"""
+    for i in range(3):
+        desktop.attributes.set_hidden(f"{DESKTOP}\\Neu {i}.lnk", False)
+
+
+ITEMS = [(f"Neu {i}.lnk", (500, 100 + 100 * i)) for i in range(3)]
+
+
+def test_all_listed_places_synchronously(desktop):
+    unhide_silently(desktop)
+    desktop.refresh_items()
+    done = []
+    scheduler = FakeScheduler()
+
+    placed = WindowsDesktopAPI.restore_desktop_icon_positions(
+        ITEMS, SCREEN, scheduler=scheduler, on_done=done.append)
+
+    assert placed == 3 and done == [3]
+    assert scheduler.pending == []
+    assert desktop.positions["Neu 0"] == WindowsDesktopAPI.snap_to_grid(500, 100)
+
+
+def test_missing_icons_retry_in_event_loop(desktop):
+    unhide_silently(desktop)
+    done = []
+    scheduler = FakeScheduler()
+
+    result = WindowsDesktopAPI.restore_desktop_icon_positions(
+        ITEMS, SCREEN, scheduler=scheduler, on_done=done.append)
+
+    assert result is None and done == []
+    assert scheduler.pending[0][0] == WindowsDesktopAPI.RETRY_MS
+
+    scheduler.run_next()  # Explorer hat noch nicht neu gelesen
+    assert done == [] and len(scheduler.pending) == 1
+
+    desktop.refresh_items()
+    scheduler.run_next()
+    assert done == [3]
+    assert scheduler.pending == []
+
+
+def test_gives_up_after_timeout(desktop):
+    unhide_silently(desktop)
+    done = []
+    scheduler = FakeScheduler()
+
+    WindowsDesktopAPI.restore_desktop_icon_positions(
+        ITEMS, SCREEN, timeout=0, scheduler=scheduler, on_done=done.append)
+
+    assert done == [0]
+    assert scheduler.pending == []
+
+
+def test_empty_items_report_done(desktop):
+    done = []
+    assert WindowsDesktopAPI.restore_desktop_icon_positions([], SCREEN, on_done=done.append) == 0
+    assert done == [0]
@@ -0,0 +1,154 @@
+"""Icon-Hilfsprozess: COM-Initialisierung und IconWorkerClient mit dem Fake-Backend"""
+
+import threading
+import time
+
+import pytest
+
+from desktop_folder_widget import iconworker, winapi
+from desktop_folder_widget.iconworker import IconWorkerClient
+
+
+class FakeOle32:
+    def __init__(self):
+        self.calls = []
+
+    def CoInitializeEx(self, reserved, flags):
+        self.calls.append((threading.get_ident(), flags))
+        return 0
+
+
+def fake_windows(monkeypatch):
+    ole32 = FakeOle32()
+    monkeypatch.setattr(winapi, "IS_WINDOWS", True)
+    monkeypatch.setattr(winapi, "_com_state", threading.local())
+    monkeypatch.setattr(winapi.ctypes, "windll", type("windll", (), {"ole32": ole32}), raising=False)
+    return ole32
+
+
+def test_com_initialized_once_per_thread(monkeypatch):
+    ole32 = fake_windows(monkeypatch)
+
+    winapi.ensure_com_initialized()
+    winapi.ensure_com_initialized()
+    thread = threading.Thread(target=winapi.ensure_com_initialized)
+    thread.start()
+    thread.join()
+
+    assert len(ole32.calls) == 2
+    assert {flags for _, flags in ole32.calls} == {winapi.COINIT_APARTMENTTHREADED}
+    assert len({ident for ident, _ in ole32.calls}) == 2
+
+
+def test_worker_initializes_com_before_reading(monkeypatch):
+    ole32 = fake_windows(monkeypatch)
+    monkeypatch.setattr(iconworker.sys, "stdin", type("stdin", (), {"buffer": _EmptyStream()}))
+    monkeypatch.setattr(iconworker.sys, "stdout", type("stdout", (), {"buffer": _EmptyStream()}))
+
+    assert iconworker.icon_worker_main("fake") == 0
+    assert len(ole32.calls) == 1
+
+
+def test_noop_off_windows(monkeypatch):
+    monkeypatch.setattr(winapi, "IS_WINDOWS", False)
+    monkeypatch.setattr(winapi, "_com_state", threading.local())
+    winapi.ensure_com_initialized()
+    assert not getattr(winapi._com_state, "done", False)
+
+
+class _EmptyStream:
+    def read(self, size):
+        return b""
+
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
+
+
+# --- IconWorkerClient (echter Hilfsprozess, FakeIconBackend) ---
+
+SIZE = 16
+
+
+def color_of(path):
+    return tuple(path.encode("utf-8")[-3:].rjust(3, b"\x00")) + (255,)
+
+
+@pytest.fixture
+def client():
+    pytest.importorskip("PIL")
+    client = IconWorkerClient("fake", deadline=2.0)
+    yield client
+    client.close()
+
+
+def test_batch_results_in_order(client):
+    paths = ["C:\\Apps\\abc.lnk", "none:leer", "C:\\Apps\\xyz.lnk"]
+    images = client.request_many(paths, SIZE)
+
+    assert images[1] is None
+    for path, img in zip(paths[::2], images[::2]):
+        assert img.size == (SIZE, SIZE)
+        assert img.getpixel((0, 0)) == color_of(path)
+    assert client.timeouts == client.crashes == 0
+
+
+def test_deadline_falls_back_and_restarts(client):
+    assert client.request_many(["warm"], SIZE)[0] is not None
+    first = client._proc
+
+    start = time.monotonic()
+    images = client.request_many(["vorher", "sleep:10:netz", "nachher"], SIZE, deadline=0.5)
+
+    assert time.monotonic() - start < 2.0
+    assert images[0].getpixel((0, 0)) == color_of("vorher")
+    assert images[1] is None and images[2] is None
+    assert client.timeouts == 1 and not client.running
+
+    # Neuer Prozess; nichts aus dem abgebrochenen Stapel landet im nächsten
+    images = client.request_many(["abc", "def"], SIZE)
+    assert [img.getpixel((0, 0)) for img in images] == [color_of("abc"), color_of("def")]
+    assert client._proc is not first
+    assert client._results == {}
+
+
+def test_crash_is_detected_and_restarted(client):
+    images = client.request_many(["ok", "crash:", "danach"], SIZE)
+
+    assert images[1:] == [None, None]
+    assert client.crashes == 1 and client.timeouts == 0
+
+    images = client.request_many(["wieder da"], SIZE)
+    assert images[0].getpixel((0, 0)) == color_of("wieder da")
+
+
+def test_restart_limit(client, monkeypatch):
+    monkeypatch.setattr(IconWorkerClient, "MAX_RESTARTS", 2)
+
+    for _ in range(2):
+        assert client.request_many(["crash:"], SIZE) == [None]
+    assert client.crashes == 2
+
+    # Limit erreicht: kein neuer Prozess, nur noch None
+    assert client.request_many(["abc"], SIZE) == [None]
+    assert client._proc is None and len(client._starts) == 2
+
+    # Nach RESTART_WINDOW wieder erlaubt
+    client._starts = [t - IconWorkerClient.RESTART_WINDOW for t in client._starts]
+    assert client.request_many(["abc"], SIZE)[0] is not None
+
+
+def test_get_icons_uses_default_for_timeouts(client, monkeypatch):
+    from desktop_folder_widget import IconExtractor
+    client.deadline = 0.5
+    monkeypatch.setattr(IconExtractor, "worker", client)
+    monkeypatch.setattr(IconExtractor, "ICON_CACHE", {})
+    monkeypatch.setattr(IconExtractor, "FAILED", {})
+
+    icons = IconExtractor.get_icons(["abc.lnk", "sleep:10:netz.lnk"], SIZE)
+
+    assert icons[0].getpixel((0, 0)) == color_of("abc.lnk")
+    assert icons[1] is not None and icons[1].size == (SIZE, SIZE)  # Standard-Icon
+    assert list(IconExtractor.FAILED) == [IconExtractor.cache_key("sleep:10:netz.lnk", SIZE)]
@@ -0,0 +1,123 @@
+"""Befehls-Socket der Einzelinstanz: echter CommandServer auf Temp-Socket bzw. Port"""
+
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from desktop_folder_widget.instance import (
+    CommandServer, InstanceClient, InstanceError, InstanceProtocol, SingleInstance,
+)
+
+
+class Recorder:
+    """Handler wie im Manager: Anfragen merken, sofort antworten"""
+
+    def __init__(self):
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        with self.lock:
+            self.requests.append(request)
+        if request["cmd"] == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        return {"ok": True}
+
+
+@pytest.fixture(params=["unix", "tcp"])
+def server(request, tmp_path):
+    if request.param == "unix" and not hasattr(socket, "AF_UNIX"):
+        pytest.skip("keine Unix-Domain-Sockets")
+    handler = Recorder()
+    server = CommandServer(handler, socket_path=tmp_path / "w.sock" if request.param == "unix" else None)
+    endpoint = server.start()
+    assert endpoint["family"] == request.param
+    server.handler_log = handler
+    server.endpoint = endpoint
+    yield server
+    server.stop()
+
+
+def raw_exchange(endpoint, payload, replies):
+    """Schickt Bytes ohne Client-Hilfen und liest bis zu replies Antwortzeilen"""
+    if endpoint["family"] == "unix":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(endpoint["address"])
+    else:
+        sock = socket.create_connection(tuple(endpoint["address"]))
+    with sock:
+        sock.settimeout(5)
+        sock.sendall(payload)
+        sock.shutdown(socket.SHUT_WR)
+        stream = sock.makefile("rb")
+        lines = [stream.readline() for _ in range(replies)]
+        return [json.loads(line) for line in lines if line], stream.read()
+
+
+def test_ping_add_quit(server):
+    client = InstanceClient(server.endpoint)
+    assert client.request("ping") == {"ok": True, "pid": os.getpid()}
+    replies = client.request_many([
+        {"cmd": "add", "tile": 3, "paths": ["C:\\Users\\a\\Desktop\\App.lnk"]},
+        {"cmd": "quit"},
+    ])
+    assert replies == [{"ok": True}, {"ok": True}]
+    assert server.handler_log.requests == [
+        {"cmd": "ping"},
+        {"cmd": "add", "tile": "3", "paths": ["C:\\Users\\a\\Desktop\\App.lnk"]},
+        {"cmd": "quit"},
+    ]
+
+
+def test_wrong_token_rejected(server):
+    client = InstanceClient(dict(server.endpoint, token="falsch"))
+    assert client.request("quit") == {"ok": False, "error": "Ungültiges Token"}
+    assert server.handler_log.requests == []
+
+
+@pytest.mark.parametrize("message, error", [
+    ({"cmd": "format"}, "Unbekannter Befehl"),
+    ({"cmd": "add", "paths": ["a"]}, "Kachel"),
+    ({"cmd": "add", "tile": "0", "paths": "a"}, "Liste"),
+])
+def test_invalid_requests(server, message, error):
+    reply = InstanceClient(server.endpoint).request(**message)
+    assert reply["ok"] is False and error in reply["error"]
+    assert server.handler_log.requests == []
+
+
+def test_malformed_lines_answered_and_connection_continues(server):
+    ping = InstanceProtocol.encode({"cmd": "ping", "token": server.endpoint["token"]})
+    replies, _ = raw_exchange(server.endpoint, b"{kaputt\n" + b"[1, 2]\n" + b"\xff\xfe\n" + ping, 4)
+    assert [r["ok"] for r in replies] == [False, False, False, True]
+    assert "kein Objekt" in replies[1]["error"]
+    assert server.handler_log.requests == [{"cmd": "ping"}]
+
+
+def test_oversized_line_rejected_and_connection_closed(server, monkeypatch):
+    monkeypatch.setattr(InstanceProtocol, "MAX_LINE", 1024)
+    ping = InstanceProtocol.encode({"cmd": "ping", "token": server.endpoint["token"]})
+    replies, rest = raw_exchange(server.endpoint, b"x" * 5000 + b"\n" + ping, 2)
+    assert replies == [{"ok": False, "error": "Nachricht zu lang"}]
+    assert rest == b""
+    assert server.handler_log.requests == []
+
+
+def test_single_instance_forwarding(tmp_path):
+    files = dict(lock_file=tmp_path / "w.lock", endpoint_file=tmp_path / "w.endpoint")
+    first, second = SingleInstance(**files), SingleInstance(**files)
+    handler = Recorder()
+    assert first.acquire()
+    try:
+        first.serve(handler)
+        assert not second.acquire()
+        assert second.forward("ping", wait=1)["pid"] == os.getpid()
+        assert second.forward("focus", tile="2", wait=1) == {"ok": True}
+        assert handler.requests[-1] == {"cmd": "focus", "tile": "2"}
+    finally:
+        first.release()
+    with pytest.raises(InstanceError):
+        second.forward("ping", wait=0)
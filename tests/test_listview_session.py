@@ -0,0 +1,80 @@
+"""DesktopListViewSession gegen den simulierten Desktop: Anzahl der ListView-Aufrufe"""
+
+import pytest
+
+from desktop_folder_widget import SimulatedDesktop, WindowsDesktopAPI
+
+DESKTOP = "C:\\Users\\test\\Desktop"
+ICONS = 300
+
+
+@pytest.fixture
+def desktop():
+    paths = [f"{DESKTOP}\\App {i}.lnk" for i in range(ICONS)]
+    desktop = SimulatedDesktop(DESKTOP, paths)
+    WindowsDesktopAPI.set_backend(desktop)
+    yield desktop
+    WindowsDesktopAPI.set_backend(None)
+
+
+def listview_calls(desktop, fn):
+    before = desktop.calls["listview"]
+    result = fn()
+    return result, desktop.calls["listview"] - before
+
+
+def test_find_uses_stem_for_shortcuts(desktop):
+    session = WindowsDesktopAPI.listview_session()
+    assert session.find("App 7.lnk") == 7
+    assert session.find("app 7.LNK") == 7
+    assert session.find("Fehlt.lnk") == -1
+
+
+def test_missing_names_rebuild_at_most_once_per_pass(desktop):
+    session = WindowsDesktopAPI.listview_session()
+    session.find("App 0.lnk")
+    rebuilds = session.rebuilds
+
+    missing, calls = listview_calls(desktop, lambda: session.set_positions(
+        {f"Fehlt {i}.lnk": (100, 100) for i in range(20)}))
+
+    assert len(missing) == 20
+    assert session.rebuilds == rebuilds + 1
+    # ein Neuaufbau (count + ICONS Texte) statt einem pro fehlendem Namen
+    assert calls <= ICONS + 5
+
+
+def test_present_names_cost_one_call_each(desktop):
+    session = WindowsDesktopAPI.listview_session()
+    session.find("App 0.lnk")
+    placements = {f"App {i}.lnk": (100 + i, 100) for i in range(20)}
+
+    missing, calls = listview_calls(desktop, lambda: session.set_positions(placements))
+
+    assert missing == []
+    # count + je Icon Text prüfen und Position setzen
+    assert calls == 1 + 2 * len(placements)
+
+
+def test_notification_flush_invalidates_session(desktop):
+    session = WindowsDesktopAPI.listview_session()
+    session.find("App 0.lnk")
+    rebuilds = session.rebuilds
+
+    WindowsDesktopAPI.notifications().add_dir(DESKTOP)
+    WindowsDesktopAPI.notifications().flush()
+    session.find("App 0.lnk")
+
+    assert session.rebuilds == rebuilds + 1
+
+
+def test_unhidden_icon_found_after_notification(desktop):
+    path = f"{DESKTOP}\\Neu.lnk"
+    desktop.add_file(path, hidden=True)
+    desktop.refresh_items()
+    session = WindowsDesktopAPI.listview_session()
+    assert session.find("Neu.lnk") == -1
+
+    desktop.attributes.set_hidden(path, False)
+    WindowsDesktopAPI.notifications().add_paths([path])
+    assert session.find("Neu.lnk") == ICONS
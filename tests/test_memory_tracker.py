@@ -0,0 +1,130 @@
+"""MemoryTracker: Aufnahmen und Zuwachs-Reihenfolge im Bericht"""
+
+import tracemalloc
+
+import pytest
+
+from desktop_folder_widget.diagnostics import MemoryTracker, MetricsRegistry
+
+
+class Leaky:
+    """Wächst im Test stark"""
+
+
+class Slow:
+    """Wächst im Test wenig"""
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, ms, callback):
+        self.calls.append((ms, callback))
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    registry.state = {"widgets": {"t1": 10, "t2": 10}, "images": 5}
+    registry.gauge("tk.widgets", lambda: registry.state["widgets"])
+    registry.gauge("tk.photo_images", lambda: registry.state["images"])
+    registry.gauge("config.unrelated", lambda: 999)
+    return registry
+
+
+@pytest.fixture
+def tracker(registry):
+    tracker = MemoryTracker(registry=registry)
+    was_tracing = tracemalloc.is_tracing()
+    tracker.start()
+    yield tracker
+    tracker.stop()
+    assert tracemalloc.is_tracing() == was_tracing
+
+
+def type_name(cls):
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def test_take_keeps_baseline_and_previous(tracker):
+    first = tracker.baseline
+    assert tracker.latest is first and tracker.previous is None and tracker.samples == 1
+
+    second = tracker.take()
+    third = tracker.take()
+
+    assert tracker.baseline is first
+    assert (tracker.previous, tracker.latest) == (second, third)
+    assert tracker.samples == 3
+
+
+def test_only_memory_gauges_are_recorded(tracker):
+    assert tracker.latest.metrics == {"tk.widgets{t1}": 10, "tk.widgets{t2}": 10, "tk.photo_images": 5}
+
+
+def test_growth_sorted_largest_first(tracker, registry):
+    kept = [Leaky() for _ in range(3000)] + [Slow() for _ in range(300)]
+    blob = [bytes(1000) for _ in range(500)]  # ~500 KB an dieser Zeile
+    registry.state["widgets"]["t2"] = 400
+    registry.state["images"] = 25
+    tracker.take()
+
+    sites, types, metrics = tracker.diff(tracker.baseline, tracker.latest)
+
+    names = [name for name, _, _ in types]
+    assert names.index(type_name(Leaky)) < names.index(type_name(Slow))
+    leaky = types[names.index(type_name(Leaky))]
+    assert leaky[1] == 3000 and leaky[2] >= 3000
+    assert [name for name, _, _ in metrics] == ["tk.widgets{t2}", "tk.photo_images"]
+    assert metrics[0][1:] == (390, 400)
+    assert all(a.size_diff >= b.size_diff for a, b in zip(sites, sites[1:]))
+    assert sites[0].size_diff >= 400_000
+    assert sites[0].traceback[0].filename == __file__
+    del kept, blob
+
+
+def test_report_sections(tracker, registry):
+    assert "Seit" not in tracker.report()
+
+    registry.state["images"] = 50
+    tracker.take()
+    one = tracker.report()
+    assert one.startswith("Speicher-Aufnahmen: 2")
+    assert "Seit der ersten Aufnahme" in one and "Seit der vorletzten" not in one
+    assert "+45  tk.photo_images (50)" in one
+
+    registry.state["widgets"]["t1"] = 30
+    tracker.take()
+    two = tracker.report()
+    first, _, latest = two.partition("Seit der vorletzten Aufnahme")
+    assert "tk.photo_images" in first and "tk.widgets{t1}" in first
+    # Seit der vorletzten Aufnahme ist nur t1 gewachsen
+    assert "tk.widgets{t1}" in latest and "tk.photo_images" not in latest
+
+
+def test_report_without_samples():
+    assert MemoryTracker().report() == "Keine Speicher-Aufnahme vorhanden"
+
+
+def test_tick_takes_writes_and_reschedules(registry, tmp_path, monkeypatch):
+    monkeypatch.setenv("DESKTOP_FOLDER_MEMORY_FILE", str(tmp_path / "memory.txt"))
+    scheduler = FakeScheduler()
+    tracker = MemoryTracker(scheduler, interval_s=60, registry=registry)
+    tracker.start()
+    try:
+        assert [ms for ms, _ in scheduler.calls] == [60_000]
+        scheduler.calls.pop()[1]()
+        assert tracker.samples == 2 and len(scheduler.calls) == 1
+        assert (tmp_path / "memory.txt").read_text(encoding="utf-8").startswith("Speicher-Aufnahmen: 2")
+    finally:
+        tracker.stop()
+    scheduler.calls.pop()[1]()
+    assert tracker.samples == 2 and scheduler.calls == []
+
+
+@pytest.mark.parametrize("value, interval_ms", [("0", None), ("x", None), ("1.5", 90_000)])
+def test_from_environment(monkeypatch, value, interval_ms):
+    monkeypatch.setenv("DESKTOP_FOLDER_MEMORY_MIN", value)
+    tracker = MemoryTracker.from_environment(FakeScheduler())
+    assert (tracker and tracker.interval_ms) == interval_ms
@@ -0,0 +1,48 @@
+"""Kontextmenüs werden wiederverwendet statt pro Rechtsklick neu angelegt (braucht Tk mit Bildschirm)"""
+
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+from desktop_folder_widget.ui import reusable_menu  # noqa: E402
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"kein Bildschirm: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def build(root):
+    """Wie show_context_menu + add_diagnostics_menu"""
+    menu = reusable_menu(root, "tile_menu")
+    menu.add_command(label="Öffnen")
+    menu.add_separator()
+    diagnose = reusable_menu(menu, "diagnose")
+    diagnose.add_command(label="Kennzahlen anzeigen")
+    menu.add_cascade(label="Diagnose", menu=diagnose)
+    return menu, diagnose
+
+
+def count_menus(widget):
+    return sum(isinstance(child, tk.Menu) + count_menus(child) for child in widget.children.values())
+
+
+def test_menus_reused_and_cleared(root):
+    first, first_diagnose = build(root)
+    for _ in range(20):
+        menu, diagnose = build(root)
+
+    assert menu is first and diagnose is first_diagnose
+    assert count_menus(root) == 2
+    assert menu.index("end") == 2 and diagnose.index("end") == 0
+    assert menu.entrycget(2, "menu") == str(diagnose)
+
+
+def test_separate_names_separate_menus(root):
+    assert reusable_menu(root, "tile_menu") is not reusable_menu(root, "item_menu")
@@ -0,0 +1,96 @@
+"""ShortcutPathIndex: Positionen nach Einfügen/Entfernen in der Mitte, Pfad-Varianten"""
+
+import pytest
+
+from desktop_folder_widget.model import Shortcut, ShortcutPathIndex, TileConfig
+
+
+def shortcuts(*names, folder="C:\\Users\\Anna\\Desktop"):
+    return [Shortcut(name, f"{folder}\\{name}.lnk") for name in names]
+
+
+def assert_consistent(index, tiles):
+    """Jede Verknüpfung steht mit ihrer aktuellen Position im Index — und nichts sonst"""
+    expected = {s.norm_path: (tile_id, i)
+                for tile_id, items in tiles.items() for i, s in enumerate(items)}
+    assert len(index) == len(expected)
+    for items in tiles.values():
+        for s in items:
+            assert index.lookup(s.path) == expected[s.norm_path]
+
+
+@pytest.fixture
+def tiles():
+    return {"t1": shortcuts("a", "b", "c", "d"), "t2": shortcuts("x", "y", folder="D:\\Apps")}
+
+
+@pytest.fixture
+def index(tiles):
+    index = ShortcutPathIndex()
+    index.rebuild({tile_id: TileConfig(shortcuts=items) for tile_id, items in tiles.items()})
+    return index
+
+
+def test_rebuild(index, tiles):
+    assert_consistent(index, tiles)
+    empty = ShortcutPathIndex()
+    empty.rebuild({"t": TileConfig(shortcuts=None), "u": TileConfig(shortcuts=[])})
+    assert len(empty) == 0
+
+
+def test_insert_in_the_middle(index, tiles):
+    # Wie on_drop_files: Block einfügen, ab der Einfügestelle neu nummerieren
+    new = shortcuts("n1", "n2")
+    tiles["t1"][2:2] = new
+    index.reindex_tile("t1", tiles["t1"], 2)
+
+    assert [s.name for s in tiles["t1"]] == ["a", "b", "n1", "n2", "c", "d"]
+    assert_consistent(index, tiles)
+
+
+def test_remove_from_the_middle(index, tiles):
+    # Wie restore_to_desktop: discard, löschen, ab der Stelle neu nummerieren
+    removed = tiles["t1"][1]
+    index.discard("t1", removed)
+    del tiles["t1"][1]
+    index.reindex_tile("t1", tiles["t1"], 1)
+
+    assert removed.path not in index
+    assert_consistent(index, tiles)
+
+
+def test_move_between_tiles(index, tiles):
+    moved = tiles["t1"].pop(0)
+    index.discard("t1", moved)
+    index.reindex_tile("t1", tiles["t1"], 0)
+    tiles["t2"].insert(1, moved)
+    index.reindex_tile("t2", tiles["t2"], 1)
+
+    assert index.lookup(moved.path) == ("t2", 1)
+    assert_consistent(index, tiles)
+
+
+def test_discard_only_for_owning_tile(index, tiles):
+    index.discard("t2", tiles["t1"][0])
+    assert index.lookup(tiles["t1"][0].path) == ("t1", 0)
+
+
+def test_discard_tile(index, tiles):
+    index.discard_tile("t1", tiles.pop("t1"))
+    assert_consistent(index, tiles)
+
+
+@pytest.mark.parametrize("variant", [
+    "C:\\Users\\Anna\\Desktop\\c.lnk",
+    "c:\\users\\anna\\desktop\\C.LNK",
+    "C:/Users/Anna/Desktop/c.lnk",
+    "C:/Users//Anna/./Desktop/c.lnk",
+])
+def test_lookup_with_case_and_separator_variants(index, variant):
+    assert variant in index
+    assert index.lookup(variant) == ("t1", 2)
+
+
+def test_unknown_path(index):
+    assert index.lookup("C:\\Users\\Anna\\Desktop\\fehlt.lnk") is None
+    assert "D:\\Apps\\a.lnk" not in index
@@ -0,0 +1,94 @@
+"""recover_alpha gegen eine Pixel-für-Pixel-Referenz"""
+
+import itertools
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from desktop_folder_widget import recover_alpha  # noqa: E402
+
+
+def reference_pixel(black, white):
+    """Formel aus dem Docstring, ein Pixel, reines Python"""
+    diff = sum(white) - sum(black)
+    alpha = min(255, max(0, 255 - -(-diff // 3)))  # 255 - ceil(diff / 3)
+    if alpha == 0:
+        return (0, 0, 0, 0)
+    return tuple(min(255, c * 255 // alpha) for c in black) + (alpha,)
+
+
+def reference(black, white):
+    flat_b = black.reshape(-1, 3).tolist()
+    flat_w = white.reshape(-1, 3).tolist()
+    out = [reference_pixel(b, w) for b, w in zip(flat_b, flat_w)]
+    return np.array(out, dtype=np.uint8).reshape(black.shape[:-1] + (4,))
+
+
+def drawn(rgb, alpha):
+    """RGBA auf Schwarz und auf Weiß gezeichnet (wie DrawIcon)"""
+    black = (rgb * alpha + 127) // 255
+    white = black + ((255 - alpha) * 255 + 127) // 255
+    return black.astype(np.uint8), white.astype(np.uint8)
+
+
+def test_random_batch_matches_reference():
+    rng = np.random.default_rng(7)
+    rgb = rng.integers(0, 256, (8, 16, 16, 3))
+    alpha = rng.integers(0, 256, (8, 16, 16, 1))
+    black, white = drawn(rgb, alpha)
+
+    result = recover_alpha(black, white)
+
+    assert result.shape == (8, 16, 16, 4) and result.dtype == np.uint8
+    np.testing.assert_array_equal(result, reference(black, white))
+
+
+def test_arbitrary_black_white_pairs():
+    # Auch physikalisch unmögliche Paare (weiß < schwarz) folgen der Formel
+    rng = np.random.default_rng(11)
+    black = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    white = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    np.testing.assert_array_equal(recover_alpha(black, white), reference(black, white))
+
+
+EDGES = (0, 1, 127, 128, 254, 255)
+
+
+def test_edge_values():
+    pairs = list(itertools.product(EDGES, repeat=2))
+    black = np.array([[b] * 3 for b, _ in pairs], dtype=np.uint8)[None]
+    white = np.array([[w] * 3 for _, w in pairs], dtype=np.uint8)[None]
+    np.testing.assert_array_equal(recover_alpha(black, white), reference(black, white))
+
+
+@pytest.mark.parametrize("value", EDGES)
+def test_black_equals_white_is_opaque(value):
+    pixel = np.full((1, 1, 3), value, dtype=np.uint8)
+    assert recover_alpha(pixel, pixel)[0, 0].tolist() == [value] * 3 + [255]
+
+
+def test_fully_transparent_is_zero():
+    black = np.zeros((4, 4, 3), dtype=np.uint8)
+    white = np.full((4, 4, 3), 255, dtype=np.uint8)
+    assert not recover_alpha(black, white).any()
+
+
+def test_round_trip_of_opaque_and_transparent_pixels():
+    rng = np.random.default_rng(3)
+    rgb = rng.integers(0, 256, (4, 8, 8, 3))
+    alpha = np.where(rng.random((4, 8, 8, 1)) < 0.5, 0, 255)
+    black, white = drawn(rgb, alpha)
+
+    result = recover_alpha(black, white)
+
+    np.testing.assert_array_equal(result[..., 3:], alpha)
+    opaque = alpha[..., 0] == 255
+    np.testing.assert_array_equal(result[..., :3][opaque], rgb[opaque])
+
+
+def test_rejects_mismatched_shapes():
+    with pytest.raises(ValueError):
+        recover_alpha(np.zeros((2, 2, 3)), np.zeros((2, 3, 3)))
+    with pytest.raises(ValueError):
+        recover_alpha(np.zeros((2, 2, 4)), np.zeros((2, 2, 4)))
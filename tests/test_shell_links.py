@@ -0,0 +1,183 @@
+"""ShellLinkParser und ShellLinkCache gegen selbst gebaute .lnk-Dateien"""
+
+import os
+
+import pytest
+
+from desktop_folder_widget import ShellLinkCache, ShellLinkParser
+from tests.lnk_builder import build_shell_link
+
+APP = "C:\\Program Files\\App\\app.exe"
+
+
+def test_local_link_info_and_string_data():
+    link = ShellLinkParser.parse(build_shell_link(
+        APP, arguments="--profile 2", working_dir="C:\\Program Files\\App",
+        icon_location="C:\\Windows\\System32\\shell32.dll", icon_index=-3,
+        description="Meine App", relative_path="..\\App\\app.exe"))
+    assert link.target_path == APP
+    assert link.arguments == "--profile 2"
+    assert link.working_dir == "C:\\Program Files\\App"
+    assert link.icon_location == "C:\\Windows\\System32\\shell32.dll"
+    assert link.icon_index == -3
+    assert link.description == "Meine App"
+    assert link.relative_path == "..\\App\\app.exe"
+    assert link.display_name == "Meine App"
+
+
+def test_local_path_with_suffix():
+    link = ShellLinkParser.parse(build_shell_link("C:\\Program Files\\", suffix="App\\app.exe"))
+    assert link.target_path == APP
+
+
+def test_unicode_local_path():
+    target = "C:\\Программы\\日本\\app.exe"
+    link = ShellLinkParser.parse(build_shell_link(target, unicode_paths=True))
+    assert link.target_path == target
+    assert link.display_name == "app"
+
+
+@pytest.mark.parametrize("suffix, expected", [
+    ("Tools\\app.exe", "\\\\server\\share\\Tools\\app.exe"),
+    ("", "\\\\server\\share"),
+])
+def test_network_link_info(suffix, expected):
+    link = ShellLinkParser.parse(build_shell_link(network="\\\\server\\share", suffix=suffix))
+    assert link.target_path == expected
+
+
+def test_ansi_string_data():
+    link = ShellLinkParser.parse(build_shell_link(APP, arguments="--größe 3", description="Übersicht",
+                                                  unicode=False))
+    assert link.arguments == "--größe 3"
+    assert link.description == "Übersicht"
+
+
+def test_target_id_list_is_skipped():
+    link = ShellLinkParser.parse(build_shell_link(APP, id_list=b"\x14\x00" + b"\xab" * 20 + b"\0\0"))
+    assert link.target_path == APP
+
+
+def test_environment_extra_data(monkeypatch):
+    monkeypatch.setenv("DFW_APPS", "D:\\Apps")
+    link = ShellLinkParser.parse(build_shell_link(
+        env_target="%DFW_APPS%\\tool.exe", env_icon="%DFW_APPS%\\icons.dll", icon_index=4))
+    assert link.target_path == "D:\\Apps\\tool.exe"
+    assert link.icon_location == "D:\\Apps\\icons.dll"
+    assert link.icon_key == ("d:\\apps\\icons.dll", 4)
+
+
+def test_link_info_wins_over_environment_target(monkeypatch):
+    monkeypatch.setenv("DFW_APPS", "D:\\Apps")
+    link = ShellLinkParser.parse(build_shell_link(APP, env_target="%DFW_APPS%\\tool.exe"))
+    assert link.target_path == APP
+
+
+def test_icon_location_expands_variables(monkeypatch):
+    monkeypatch.setenv("DFW_ROOT", "C:\\Windows")
+    link = ShellLinkParser.parse(build_shell_link(APP, icon_location="%DFW_ROOT%\\shell32.dll"))
+    assert link.icon_location == "C:\\Windows\\shell32.dll"
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\x4c\x00\x00\x00" + b"\0" * 100,                      # falsche CLSID
+    build_shell_link(APP, arguments="abgeschnitten")[:-20],  # StringData abgeschnitten
+])
+def test_invalid_links(data):
+    with pytest.raises(ValueError):
+        ShellLinkParser.parse(data)
+
+
+def test_shared_icon_key():
+    a = ShellLinkParser.parse(build_shell_link(APP, arguments="--a"))
+    b = ShellLinkParser.parse(build_shell_link(APP.upper(), arguments="--b"))
+    assert a.icon_key == b.icon_key
+
+
+# --- ShellLinkCache ---
+
+@pytest.fixture
+def lnk(tmp_path):
+    path = tmp_path / "App.lnk"
+    path.write_bytes(build_shell_link(APP, arguments="--eins"))
+    return path
+
+
+def test_cache_hit_without_reparse(lnk):
+    cache = ShellLinkCache()
+    first = cache.get(str(lnk))
+    assert cache.get(str(lnk)) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_invalidated_on_size_change(lnk):
+    cache = ShellLinkCache()
+    cache.get(str(lnk))
+    stat = lnk.stat()
+    lnk.write_bytes(build_shell_link(APP, arguments="--zwei-länger"))
+    os.utime(lnk, ns=(stat.st_atime_ns, stat.st_mtime_ns))  # gleiche mtime, andere Größe
+    assert cache.get(str(lnk)).arguments == "--zwei-länger"
+    assert cache.misses == 2
+
+
+def test_cache_invalidated_on_mtime_change(lnk):
+    cache = ShellLinkCache()
+    cache.get(str(lnk))
+    lnk.write_bytes(build_shell_link(APP, arguments="--drei"))  # gleiche Größe
+    stat = lnk.stat()
+    os.utime(lnk, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get(str(lnk)).arguments == "--drei"
+    assert cache.misses == 2
+
+
+def test_cache_remembers_invalid_files(tmp_path):
+    path = tmp_path / "kaputt.lnk"
+    path.write_bytes(b"keine Verknuepfung")
+    cache = ShellLinkCache()
+    assert cache.get(str(path)) is None
+    assert cache.get(str(path)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_peek_discard_and_missing(lnk):
+    cache = ShellLinkCache()
+    link = cache.get(str(lnk))
+    lnk.unlink()
+    assert cache.get(str(lnk)) is None
+    assert cache.peek(str(lnk)) is link
+    cache.discard(str(lnk))
+    assert cache.peek(str(lnk)) is None
+    assert len(cache) == 0
+
+
+# --- IconExtractor.cache_key ---
+
+@pytest.fixture
+def link_cache(monkeypatch):
+    from desktop_folder_widget import icons
+    cache = ShellLinkCache()
+    monkeypatch.setattr(icons, "SHELL_LINK_CACHE", cache)
+    return cache
+
+
+def test_cache_key_without_stat_once_read(lnk, link_cache, monkeypatch):
+    from desktop_folder_widget import IconExtractor
+    key = IconExtractor.cache_key(str(lnk), 32)
+    assert key[0] == "lnk"
+
+    def no_stat(path, *args, **kwargs):
+        raise AssertionError(f"stat({path}) auf dem Cache-Treffer-Pfad")
+    monkeypatch.setattr(os, "stat", no_stat)
+    assert IconExtractor.cache_key(str(lnk), 32) == key
+    assert IconExtractor.cache_key(str(lnk), 48) == key[:-1] + (48,)
+
+
+def test_cache_key_follows_invalidate(lnk, link_cache):
+    from desktop_folder_widget import IconExtractor
+    old = IconExtractor.cache_key(str(lnk), 32)
+    lnk.write_bytes(build_shell_link("C:\\Andere\\tool.exe"))
+
+    assert IconExtractor.cache_key(str(lnk), 32) == old  # bis zur Meldung
+    IconExtractor.invalidate([str(lnk)])
+    assert IconExtractor.cache_key(str(lnk), 32) != old
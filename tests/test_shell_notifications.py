@@ -0,0 +1,104 @@
+"""ShellNotificationCoalescer mit RecordingShellNotifier"""
+
+import pytest
+
+from desktop_folder_widget.desktop import RecordingShellNotifier, ShellNotificationCoalescer
+
+DESKTOP = "C:\\Users\\Anna\\Desktop"
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.pending = []
+
+    def __call__(self, ms, callback):
+        self.pending.append((ms, callback))
+
+    def run(self):
+        pending, self.pending = self.pending, []
+        for _, callback in pending:
+            callback()
+
+
+@pytest.fixture
+def notifier():
+    return RecordingShellNotifier()
+
+
+def on_desktop(*names):
+    return [f"{DESKTOP}\\{name}" for name in names]
+
+
+def test_few_items_notified_one_by_one(notifier):
+    coalescer = ShellNotificationCoalescer(notifier, max_items=3)
+    coalescer.add_paths(on_desktop("a.lnk", "b.lnk"))
+    coalescer.add_paths(on_desktop("c.lnk"), kind="item")
+
+    assert notifier.events == [("attributes", p) for p in on_desktop("a.lnk", "b.lnk")] + \
+        [("item", on_desktop("c.lnk")[0])]
+
+
+def test_many_items_one_update_per_directory(notifier):
+    scheduler = FakeScheduler()
+    coalescer = ShellNotificationCoalescer(notifier, scheduler, max_items=3)
+    coalescer.add_paths(on_desktop("a.lnk", "b.lnk", "c.lnk"))
+    coalescer.add_paths(["D:\\Public\\Desktop\\x.lnk", "d:/public/desktop/y.lnk"])
+    scheduler.run()
+
+    assert notifier.events == [("dir", DESKTOP), ("dir", "D:\\Public\\Desktop")]
+
+
+def test_assoc_changed_only_after_full_refresh_request(notifier):
+    scheduler = FakeScheduler()
+    coalescer = ShellNotificationCoalescer(notifier, scheduler)
+    coalescer.add_paths(on_desktop("a.lnk"))
+    coalescer.add_dir(DESKTOP)
+    scheduler.run()
+    assert ("assoc", None) not in notifier.events
+
+    coalescer.request_full_refresh()
+    scheduler.run()
+    assert notifier.events[-1] == ("assoc", None)
+    assert notifier.events.count(("assoc", None)) == 1
+
+
+def test_duplicate_paths_coalesced(notifier):
+    scheduler = FakeScheduler()
+    coalescer = ShellNotificationCoalescer(notifier, scheduler)
+    coalescer.add_paths(on_desktop("a.lnk", "A.LNK"))
+    coalescer.add_paths([f"{DESKTOP}/a.lnk"], kind="item")
+    scheduler.run()
+
+    assert notifier.events == [("attributes", on_desktop("a.lnk")[0])]
+
+
+def test_directory_update_covers_its_items(notifier):
+    scheduler = FakeScheduler()
+    coalescer = ShellNotificationCoalescer(notifier, scheduler)
+    coalescer.add_paths(on_desktop("a.lnk") + ["C:\\Anderswo\\b.lnk"])
+    coalescer.add_dir(DESKTOP)
+    scheduler.run()
+
+    assert notifier.events == [("attributes", "C:\\Anderswo\\b.lnk"), ("dir", DESKTOP)]
+
+
+def test_scheduler_defers_and_batches(notifier):
+    scheduler = FakeScheduler()
+    flushed = []
+    coalescer = ShellNotificationCoalescer(notifier, scheduler, window_ms=25,
+                                           on_flush=lambda: flushed.append(len(notifier.events)))
+    coalescer.add_paths(on_desktop("a.lnk"))
+    coalescer.add_paths(on_desktop("b.lnk"))
+    coalescer.add_dir("C:\\Temp")
+
+    assert notifier.events == [] and flushed == []
+    assert [ms for ms, _ in scheduler.pending] == [25]  # nur einmal geplant
+
+    scheduler.run()
+    assert len(notifier.events) == 3 and flushed == [3]
+
+    # Leeres Senden ruft on_flush nicht auf, danach wird neu geplant
+    coalescer.flush()
+    assert flushed == [3]
+    coalescer.add_paths(on_desktop("c.lnk"))
+    assert len(scheduler.pending) == 1
@@ -0,0 +1,78 @@
+"""ShortcutValidator über ein echtes Verzeichnis (tmp_path)"""
+
+import os
+
+import pytest
+
+from desktop_folder_widget.model import PathState, ShortcutValidator
+
+
+@pytest.fixture
+def desktop(tmp_path):
+    for name in ("App.lnk", "app.lnk", "Editor.lnk", "Notizen.txt", "Spiel.lnk"):
+        (tmp_path / name).write_bytes(b"x" * 10)
+    return tmp_path
+
+
+def paths_in(desktop, *names):
+    return [str(desktop / name) for name in names]
+
+
+@pytest.fixture(params=[1, 8], ids=["stat", "scandir"])
+def validator(request):
+    # min_scan_names=1: immer scandir, sonst immer einzelne stat()-Aufrufe
+    return ShortcutValidator(max_workers=2, min_scan_names=request.param, fold_case=False)
+
+
+def test_existing_and_missing(desktop, validator):
+    paths = paths_in(desktop, "Editor.lnk", "Spiel.lnk", "Weg.lnk", "Notizen.txt")
+    paths.append(str(desktop / "fehlt" / "Auch weg.lnk"))
+
+    states = validator.scan(paths)
+
+    assert set(states) == set(paths)
+    assert {os.path.basename(p) for p, s in states.items() if not s.exists} == {"Weg.lnk", "Auch weg.lnk"}
+    assert states[paths[0]].size == 10 and states[paths[0]].mtime_ns > 0
+
+
+def test_case_variants_get_own_entries(desktop, validator):
+    paths = paths_in(desktop, "App.lnk", "app.lnk", "APP.lnk")
+
+    states = validator.scan(paths)
+
+    assert {p: s.exists for p, s in states.items()} == dict(zip(paths, (True, True, False)))
+
+
+def test_case_folded_on_windows(desktop):
+    validator = ShortcutValidator(min_scan_names=1, fold_case=True)
+    paths = paths_in(desktop, "EDITOR.lnk", "editor.LNK", "Weg.lnk")
+
+    states = validator.scan(paths)
+
+    assert [states[p].exists for p in paths] == [True, True, False]
+
+
+def test_duplicate_paths(desktop, validator):
+    path = str(desktop / "Editor.lnk")
+    assert validator.scan([path, path, ""]) == {path: validator.scan([path])[path]}
+
+
+def test_changed_stamp(desktop, validator):
+    path = desktop / "Editor.lnk"
+    before = validator.scan([str(path)])[str(path)]
+
+    path.write_bytes(b"y" * 20)
+    os.utime(path, ns=(before.mtime_ns + 5_000_000_000,) * 2)
+    after = validator.scan([str(path)])[str(path)]
+
+    assert after.stamp != before.stamp
+    assert after.stamp == (before.mtime_ns + 5_000_000_000, 20)
+
+
+def test_details_false_only_checks_existence(desktop):
+    validator = ShortcutValidator(min_scan_names=1, fold_case=False)
+    paths = paths_in(desktop, "Editor.lnk", "Weg.lnk")
+
+    states = validator.scan(paths, details=False)
+
+    assert states == {paths[0]: PathState(True), paths[1]: PathState(False)}
@@ -0,0 +1,153 @@
+"""SimulatedDesktop: Latenz und Zähler pro Bereich, Dateien/Attribute, Icon-Liste, Fenster"""
+
+import time
+
+import pytest
+
+from desktop_folder_widget.backend import SimulatedDesktop, create_desktop_backend
+from desktop_folder_widget.desktop import DESKTOP_GRID_Y
+
+DESKTOP = "C:\\Users\\test\\Desktop"
+
+
+def on_desktop(*names):
+    return [f"{DESKTOP}\\{name}" for name in names]
+
+
+@pytest.fixture
+def desktop():
+    return SimulatedDesktop(DESKTOP, on_desktop("Editor.lnk", "Web.url", "Notiz.txt") + ["D:\\Anderswo\\x.lnk"])
+
+
+def elapsed(fn, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+# --- Latenz und Zähler ---
+
+def test_latency_per_kind():
+    desktop = SimulatedDesktop(DESKTOP, on_desktop("a.lnk"), latency={"listview": 0.02})
+    listview = desktop.create_listview()
+    path = on_desktop("a.lnk")[0]
+
+    assert desktop.latency == {"window": 0.0, "attributes": 0.0, "listview": 0.02, "notify": 0.0, "icons": 0.0}
+    assert elapsed(listview.item_count) >= 0.02
+    assert elapsed(lambda: desktop.attributes.get_hidden(path)) < 0.01
+
+
+def test_scalar_latency_applies_to_all_kinds():
+    desktop = SimulatedDesktop(DESKTOP, latency=0.01)
+    assert set(desktop.latency.values()) == {0.01}
+    assert elapsed(desktop.desktop_window, repeat=3) >= 0.01
+
+
+def test_calls_counted_per_kind(desktop):
+    path = on_desktop("Editor.lnk")[0]
+    listview = desktop.create_listview()
+    notifier = desktop.create_notifier()
+
+    desktop.attributes.get_hidden(path)
+    desktop.attributes.set_hidden(path, True)
+    listview.item_count()
+    listview.item_text(0)
+    listview.item_position(0)
+    notifier.attributes_changed(path)
+    desktop.desktop_window()
+    desktop.shell_icons([path, path], 32)
+
+    assert dict(desktop.calls) == {"attributes": 2, "listview": 3, "notify": 1, "window": 1, "icons": 2}
+
+
+# --- Dateien und Icon-Liste ---
+
+def test_listview_shows_visible_desktop_files(desktop):
+    # .lnk/.url ohne Endung, andere Dateien mit; nur das Desktop-Verzeichnis
+    assert desktop.items == ["Editor", "Web", "Notiz.txt"]
+    assert desktop.positions == {"Editor": (0, 0), "Web": (0, DESKTOP_GRID_Y), "Notiz.txt": (0, 2 * DESKTOP_GRID_Y)}
+
+
+def test_changes_visible_only_after_notification(desktop):
+    editor = on_desktop("Editor.lnk")[0]
+    desktop.attributes.set_hidden(editor, True)
+    desktop.add_file(on_desktop("Neu.lnk")[0])
+    assert desktop.items == ["Editor", "Web", "Notiz.txt"]
+
+    desktop.create_notifier().dir_updated(DESKTOP)
+
+    assert desktop.items == ["Web", "Notiz.txt", "Neu"]
+    # Der freie Platz des ausgeblendeten Icons wird wieder vergeben
+    assert desktop.positions["Neu"] == (0, 0)
+    assert desktop.is_hidden(editor) is True
+
+
+def test_hidden_file_and_removal(desktop):
+    desktop.add_file(on_desktop("Versteckt.lnk")[0], hidden=True)
+    desktop.remove_file(on_desktop("Web.url")[0])
+    desktop.refresh_items()
+
+    assert desktop.items == ["Editor", "Notiz.txt"]
+    assert desktop.is_hidden(on_desktop("Web.url")[0]) is None
+    with pytest.raises(FileNotFoundError):
+        desktop.attributes.get_hidden(on_desktop("Web.url")[0])
+
+
+def test_listview_positions(desktop):
+    listview = desktop.create_listview()
+
+    assert listview.item_count() == 3
+    assert listview.item_text(1) == "Web" and listview.item_text(9) == ""
+    assert listview.set_item_position(1, 300, 150) is True
+    assert listview.item_position(1) == (300, 150) == desktop.positions["Web"]
+    assert listview.set_item_position(9, 0, 0) is False and listview.item_position(9) is None
+
+
+def test_explorer_restart_invalidates_listview(desktop):
+    listview = desktop.create_listview()
+    assert listview.is_valid()
+    desktop.restart_explorer()
+    assert not listview.is_valid()
+    assert desktop.create_listview().is_valid()
+
+
+def test_notifier_records_events(desktop):
+    notifier = desktop.create_notifier()
+    notifier.item_updated(on_desktop("Editor.lnk")[0])
+    notifier.assoc_changed()
+    assert notifier.events == [("item", on_desktop("Editor.lnk")[0]), ("assoc", None)]
+
+
+# --- Fenster und Icons ---
+
+def test_windows_parent_and_z_order(desktop):
+    a, b = desktop.create_window(), desktop.create_window()
+    assert desktop.z_order == [a, b]
+
+    assert desktop.embed_window(b) is True
+    assert desktop.windows[b] == SimulatedDesktop.DESKTOP_WINDOW
+    desktop.send_to_bottom(b)
+    assert desktop.z_order == [b, a]
+    desktop.detach_window(b)
+    assert desktop.windows[b] == 0
+    assert desktop.window_handle(0x1234) == 0x1234 and desktop.z_order[-1] == 0x1234
+
+
+def test_shell_icons(desktop):
+    pytest.importorskip("PIL")
+    known, unknown = on_desktop("Editor.lnk")[0], on_desktop("Fehlt.lnk")[0]
+
+    first, missing = desktop.shell_icons([known, unknown], 24)
+
+    assert missing is None
+    assert first.size == (24, 24) and first.getpixel((0, 0))[3] == 255
+    assert desktop.shell_icons([known.upper()], 24)[0].getpixel((0, 0)) == first.getpixel((0, 0))
+
+
+def test_create_backend_from_environment(monkeypatch):
+    monkeypatch.setenv("DESKTOP_FOLDER_SIM_LATENCY_MS", "4")
+    backend = create_desktop_backend("simulated")
+    assert isinstance(backend, SimulatedDesktop)
+    assert set(backend.latency.values()) == {0.004}
+    assert isinstance(create_desktop_backend("gibt-es-nicht"), SimulatedDesktop)
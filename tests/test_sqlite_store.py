@@ -0,0 +1,57 @@
+"""SQLiteConfigStore: Einfügen an Stelle index über Sortierschlüssel"""
+
+import pytest
+
+from desktop_folder_widget.persistence import ConfigJournal, SQLiteConfigStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteConfigStore(tmp_path / "config.sqlite")
+    store.record(None, [{"op": ConfigJournal.OP_CREATE_TILE, "tile": "t1",
+                         "config": {"name": "Spiele", "shortcuts": []}}])
+    yield store
+    store.close()
+
+
+def add(store, name, index=None):
+    op = {"op": ConfigJournal.OP_ADD_SHORTCUT, "tile": "t1",
+          "shortcut": {"name": name, "path": f"C:\\Desktop\\{name}.lnk"}}
+    if index is not None:
+        op["index"] = index
+    store.record(None, [op])
+
+
+def names(store):
+    return [s["name"] for s in store.load_shortcuts("t1")]
+
+
+def test_insert_positions(store):
+    for name in ("b", "d"):
+        add(store, name)
+    add(store, "a", index=0)
+    add(store, "c", index=2)
+    assert names(store) == ["a", "b", "c", "d"]
+
+
+def test_index_past_end_appends(store):
+    for name in ("a", "b", "c"):
+        add(store, name)
+    add(store, "z", index=10)
+    assert names(store) == ["a", "b", "c", "z"]
+
+
+def test_index_past_end_on_empty_tile(store):
+    add(store, "a", index=5)
+    add(store, "b", index=5)
+    assert names(store) == ["a", "b"]
+
+
+def test_renumber_when_keys_run_out(store):
+    add(store, "a")
+    add(store, "z")
+    for i in range(60):
+        add(store, f"m{i:02d}", index=1)
+    result = names(store)
+    assert result[0] == "a" and result[-1] == "z"
+    assert result[1:-1] == [f"m{i:02d}" for i in reversed(range(60))]
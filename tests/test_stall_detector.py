@@ -0,0 +1,152 @@
+"""StallDetector: _tick mit künstlicher Uhr und Scheduler, Signaturen, Standby"""
+
+import threading
+import time
+
+import pytest
+
+from desktop_folder_widget import timing
+from desktop_folder_widget.diagnostics import PACKAGE_DIR, StallDetector
+from desktop_folder_widget.timing import SpanTracer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, ms, callback):
+        self.calls.append((ms, callback))
+        return len(self.calls)
+
+
+def stack(*functions, filename=f"{PACKAGE_DIR}/ui.py", line=10):
+    return tuple((filename, line + i, name, f"{name}()") for i, name in enumerate(functions))
+
+
+DRAW = stack("mainloop", "on_expand", "draw_icon_grid")
+SAVE = stack("mainloop", "on_drop", "save_config")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def detector(clock, monkeypatch):
+    monkeypatch.setattr(timing, "TRACER", SpanTracer(enabled=False))
+    detector = StallDetector(FakeScheduler(), threshold_ms=100, interval_ms=50, clock=clock)
+    detector._expected = clock.now + 0.05
+    return detector
+
+
+def tick(detector, clock, late_ms, samples=()):
+    """Rückruf kommt late_ms nach seiner geplanten Zeit; samples = Stacks des Wachhunds"""
+    clock.now = detector._expected + late_ms / 1000
+    detector._samples = list(samples)
+    detector._tick()
+
+
+def test_punctual_ticks_are_not_stalls(detector, clock):
+    for _ in range(5):
+        tick(detector, clock, 20)
+    assert detector.stall_count == 0 and detector.stalls == {}
+    # Jeder Rückruf plant den nächsten
+    assert [ms for ms, _ in detector.scheduler.calls] == [50] * 5
+    assert detector._expected == pytest.approx(clock.now + 0.05)
+
+
+def test_stalls_aggregated_by_signature(detector, clock):
+    tick(detector, clock, 150, [DRAW])
+    tick(detector, clock, 400, [stack("mainloop", "on_expand", "draw_icon_grid", line=99), DRAW, DRAW])
+    tick(detector, clock, 120, [SAVE])
+
+    assert detector.stall_count == 3
+    draw = detector.stalls[StallDetector.signature(DRAW)]
+    assert draw["count"] == 2
+    assert draw["total_ms"] == pytest.approx(550)
+    assert draw["max_ms"] == pytest.approx(400)
+    assert draw["samples"] == 4  # Zeilennummern gehören nicht zur Signatur
+    assert draw["stack"][-1][1] == 101  # Stack des längsten Hängers
+
+    first, second = detector.snapshot()
+    assert first["signature"] == StallDetector.signature(DRAW)
+    assert second["count"] == 1 and second["total_ms"] == pytest.approx(120)
+    assert [entry[1] for entry in detector.history] == [150.0, 400.0, 120.0]
+
+
+def test_stall_without_samples(detector, clock):
+    tick(detector, clock, 200)
+    entry, = detector.snapshot()
+    assert entry["stack"] == () and entry["count"] == 1
+    assert "(ohne Stack)" in detector.report()
+
+
+def test_standby_discards_the_gap(detector, clock):
+    detector._discard = True
+    tick(detector, clock, 60_000, [DRAW])
+    assert detector.stall_count == 0
+
+    tick(detector, clock, 150, [DRAW])
+    assert detector.stall_count == 1
+
+
+def test_stopped_detector_does_not_reschedule(detector, clock):
+    detector._stop.set()
+    tick(detector, clock, 500, [DRAW])
+    assert detector.stall_count == 0 and detector.scheduler.calls == []
+
+
+def test_watchdog_detects_suspend_and_samples():
+    clock = FakeClock()
+    detector = StallDetector(FakeScheduler(), threshold_ms=20, interval_ms=10, clock=lambda: clock.now)
+    detector._expected = 0.0
+
+    def jumping_clock():
+        clock.now += StallDetector.SUSPEND_GAP + 1  # jeder Blick auf die Uhr: "aus dem Standby"
+        return clock.now
+    detector.clock = jumping_clock
+    watcher = threading.Thread(target=detector._watch)
+    watcher.start()
+    time.sleep(0.1)
+    detector._stop.set()
+    watcher.join()
+
+    assert detector._discard is True
+    assert detector.sample_count == len(detector._samples) > 0
+    assert detector._samples[0][-1][2] == "test_watchdog_detects_suspend_and_samples"
+
+
+def test_describe_prefers_package_frames():
+    mixed = stack("run") + (("/usr/lib/python3/tkinter/__init__.py", 1, "mainloop", ""),)
+    assert StallDetector.describe(mixed) == "run (ui.py:10)"
+    foreign = (("/usr/lib/python3/json/encoder.py", 5, "encode", ""),)
+    assert StallDetector.describe(foreign) == "encode (encoder.py:5)"
+
+
+def test_report_and_file(detector, clock, tmp_path):
+    tick(detector, clock, 300, [SAVE])
+    text = detector.report()
+    assert text.startswith("Hänger über 100 ms: 1")
+    assert "save_config (ui.py:12)" in text
+
+    path = detector.write_report(tmp_path / "stalls.txt")
+    assert path.read_text(encoding="utf-8").startswith("Hänger über 100 ms: 1")
+
+
+@pytest.mark.parametrize("value, threshold", [("250", 0.25), ("x", 0.1), ("0", None)])
+def test_from_environment(monkeypatch, value, threshold):
+    monkeypatch.setenv("DESKTOP_FOLDER_STALL_MS", value)
+    detector = StallDetector.from_environment(FakeScheduler())
+    if threshold is None:
+        assert detector is None
+    else:
+        assert detector.threshold == threshold and detector.interval_ms == max(10, int(threshold * 500))
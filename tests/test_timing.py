@@ -0,0 +1,123 @@
+"""SpanTracer und traced: ausgeschaltet, Ringpuffer, Chrome-Trace-Ausgabe"""
+
+import json
+import os
+import threading
+
+import pytest
+
+from desktop_folder_widget import timing
+from desktop_folder_widget.timing import _NULL_SPAN, SpanTracer, traced
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_disabled_tracer_returns_null_span(clock):
+    tracer = SpanTracer(enabled=False, clock=clock)
+
+    with tracer.span("egal", items=3) as span:
+        span.set(mehr=1)
+    tracer.add("nachgetragen", 1.0, 0.5)
+
+    assert tracer.span("egal") is _NULL_SPAN
+    assert len(tracer.events) == 0
+
+
+def test_span_records_duration_args_and_errors(clock):
+    tracer = SpanTracer(enabled=True, clock=clock)
+
+    with tracer.span("expand", tile="0") as span:
+        clock.now += 0.25
+        span.set(items=12)
+    with pytest.raises(KeyError):
+        with tracer.span("kaputt"):
+            raise KeyError("x")
+
+    (name, start, duration, tid, args), failed = tracer.events
+    assert (name, start, duration, args) == ("expand", 10.0, 0.25, {"tile": "0", "items": 12})
+    assert tid == threading.get_ident()
+    assert failed[0] == "kaputt" and failed[4] == {"error": "KeyError"}
+
+
+def test_ring_buffer_drops_oldest(clock):
+    tracer = SpanTracer(capacity=3, enabled=True, clock=clock)
+    for i in range(5):
+        tracer.add(f"s{i}", i, 0.001)
+
+    assert [event[0] for event in tracer.events] == ["s2", "s3", "s4"]
+    tracer.clear()
+    assert len(tracer.events) == 0
+
+
+def test_trace_events_format(clock):
+    tracer = SpanTracer(enabled=True, clock=clock)
+    tracer.add("icons.extract", 1.5, 0.0021, items=4)
+    other = threading.Thread(target=lambda: tracer.add("hintergrund", 2.0, 0.001), name="arbeiter")
+    other.start()
+    other.join()
+
+    events = tracer.trace_events()
+
+    metadata = [e for e in events if e["ph"] == "M"]
+    spans = [e for e in events if e["ph"] == "X"]
+    assert {e["tid"] for e in metadata} == {threading.get_ident(), other.ident}
+    assert {e["args"]["name"] for e in metadata} >= {threading.current_thread().name}
+    assert spans[0] == {"name": "icons.extract", "ph": "X", "pid": os.getpid(),
+                        "tid": threading.get_ident(), "ts": 1500000.0, "dur": 2100.0,
+                        "args": {"items": 4}}
+    assert spans[1]["name"] == "hintergrund" and spans[1]["tid"] == other.ident
+
+
+def test_dump_writes_chrome_trace(tmp_path, clock):
+    tracer = SpanTracer(enabled=True, clock=clock)
+    tracer.add("a", 0.0, 0.001)
+
+    path = tracer.dump(tmp_path / "trace.json")
+
+    data = json.loads(open(path, encoding="utf-8").read())
+    assert data["displayTimeUnit"] == "ms"
+    assert [e["name"] for e in data["traceEvents"] if e["ph"] == "X"] == ["a"]
+
+
+@pytest.mark.parametrize("value, enabled, capacity", [
+    ("", False, SpanTracer.DEFAULT_CAPACITY),
+    ("0", False, SpanTracer.DEFAULT_CAPACITY),
+    ("1", True, SpanTracer.DEFAULT_CAPACITY),
+    ("500", True, 500),
+    ("ja", True, SpanTracer.DEFAULT_CAPACITY),
+])
+def test_from_environment(monkeypatch, value, enabled, capacity):
+    monkeypatch.setenv("DESKTOP_FOLDER_TRACE", value)
+    tracer = SpanTracer.from_environment()
+    assert tracer.enabled is enabled and tracer.events.maxlen == capacity
+
+
+def test_traced_decorator(monkeypatch, clock):
+    tracer = SpanTracer(enabled=False, clock=clock)
+    monkeypatch.setattr(timing, "TRACER", tracer)
+    calls = []
+
+    @traced("redraw", args=lambda tile, items: calls.append("args") or {"tile": tile, "items": len(items)})
+    def redraw(tile, items):
+        """Zeichnet neu"""
+        return len(items)
+
+    assert redraw.__name__ == "redraw" and redraw.__doc__ == "Zeichnet neu"
+    assert redraw("t1", [1, 2]) == 2
+    assert calls == [] and len(tracer.events) == 0  # args() nur bei eingeschalteter Aufzeichnung
+
+    tracer.enabled = True
+    assert redraw("t1", [1, 2, 3]) == 3
+    assert calls == ["args"]
+    assert [(e[0], e[4]) for e in tracer.events] == [("redraw", {"tile": "t1", "items": 3})]
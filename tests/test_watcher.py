@@ -0,0 +1,253 @@
+"""ChangeDebouncer (mit eingespeister Uhr), inotify-/Polling-Auswertung, PollingDirectoryWatcher"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from desktop_folder_widget.watcher import (
+    ChangeDebouncer, FileChange, InotifyDirectoryWatcher, PollingDirectoryWatcher,
+)
+
+D = "C:\\Desktop"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def p(name):
+    return f"{D}\\{name}"
+
+
+def added(name):
+    return FileChange(FileChange.ADDED, p(name))
+
+
+def removed(name):
+    return FileChange(FileChange.REMOVED, p(name))
+
+
+def modified(name):
+    return FileChange(FileChange.MODIFIED, p(name))
+
+
+def renamed(old, new):
+    return FileChange(FileChange.RENAMED, p(new), p(old))
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def debouncer(clock):
+    return ChangeDebouncer(delay=0.3, max_delay=2.0, clock=clock)
+
+
+def settle(debouncer, clock, *changes):
+    debouncer.push(list(changes))
+    clock.now += 1.0
+    return debouncer.drain()
+
+
+# --- ChangeDebouncer: Zeitverhalten ---
+
+def test_waits_for_quiet_period(debouncer, clock):
+    debouncer.push([added("a.lnk")])
+    clock.now += 0.2
+    assert debouncer.drain() == []
+    debouncer.push([modified("a.lnk")])
+    clock.now += 0.2
+    assert debouncer.drain() == []
+    clock.now += 0.15
+    assert debouncer.drain() == [added("a.lnk")]
+    assert debouncer.drain() == []
+
+
+def test_max_delay_under_constant_changes(debouncer, clock):
+    for i in range(8):
+        debouncer.push([added(f"{i}.lnk")])
+        assert debouncer.drain() == []
+        clock.now += 0.25
+    # Nie ruhig geworden — nach MAX_DELAY kommt trotzdem alles heraus
+    debouncer.push([added("x.lnk")])
+    assert len(debouncer.drain()) == 9
+
+
+def test_drain_with_explicit_now(debouncer, clock):
+    debouncer.push([added("a.lnk")])
+    assert debouncer.drain(now=clock.now + 0.1) == []
+    assert debouncer.drain(now=clock.now + 0.31) == [added("a.lnk")]
+
+
+def test_empty_drain(debouncer):
+    assert debouncer.drain() == []
+
+
+# --- ChangeDebouncer: Zusammenfassen ---
+
+def test_added_then_removed_cancels(debouncer, clock):
+    assert settle(debouncer, clock, added("a.lnk"), modified("a.lnk"), removed("a.lnk")) == []
+
+
+def test_removed_then_added_is_modified(debouncer, clock):
+    # Installer löscht und legt neu an
+    assert settle(debouncer, clock, removed("a.lnk"), added("a.lnk")) == [modified("a.lnk")]
+
+
+def test_rename_back_is_no_change(debouncer, clock):
+    assert settle(debouncer, clock, renamed("a.lnk", "b.lnk"), renamed("b.lnk", "a.lnk")) == []
+
+
+def test_rename_chain_keeps_original_name(debouncer, clock):
+    assert settle(debouncer, clock, renamed("a.lnk", "b.lnk"), renamed("b.lnk", "c.lnk")) == \
+        [renamed("a.lnk", "c.lnk")]
+
+
+def test_rename_then_remove_is_removal_of_old_path(debouncer, clock):
+    assert settle(debouncer, clock, renamed("a.lnk", "b.lnk"), removed("b.lnk")) == [removed("a.lnk")]
+
+
+def test_added_then_renamed_is_added(debouncer, clock):
+    assert settle(debouncer, clock, added("neu.tmp"), renamed("neu.tmp", "Neu.lnk")) == [added("Neu.lnk")]
+
+
+def test_modified_after_added_stays_added(debouncer, clock):
+    assert settle(debouncer, clock, added("a.lnk"), modified("a.lnk")) == [added("a.lnk")]
+
+
+def test_removed_then_modified(debouncer, clock):
+    assert settle(debouncer, clock, removed("a.lnk"), modified("a.lnk")) == [modified("a.lnk")]
+
+
+def test_paths_compared_normalized(debouncer, clock):
+    changes = [FileChange(FileChange.ADDED, p("App.lnk")), FileChange(FileChange.REMOVED, "c:/desktop/app.LNK")]
+    assert settle(debouncer, clock, *changes) == []
+
+
+def test_rescan_first_and_once(debouncer, clock):
+    rescan = FileChange(FileChange.RESCAN, D)
+    assert settle(debouncer, clock, added("a.lnk"), rescan, rescan) == [rescan, added("a.lnk")]
+
+
+def test_push_from_threads(debouncer, clock):
+    threads = [threading.Thread(target=debouncer.push, args=([added(f"{t}-{i}.lnk") for i in range(50)],))
+               for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    clock.now += 1.0
+    assert len(debouncer.drain()) == 200
+
+
+# --- inotify-Ereignisse ---
+
+def event(mask, name="", cookie=0):
+    raw = name.encode() + b"\0" if name else b""
+    raw += b"\0" * (-len(raw) % 16)
+    return InotifyDirectoryWatcher.EVENT_HEADER.pack(1, mask, cookie, len(raw)) + raw
+
+
+def test_inotify_parse():
+    W = InotifyDirectoryWatcher
+    data = b"".join([
+        event(W.IN_CREATE, "a.lnk"),
+        event(W.IN_CLOSE_WRITE, "a.lnk"),
+        event(W.IN_MOVED_FROM, "b.lnk", cookie=7),
+        event(W.IN_MOVED_TO, "c.lnk", cookie=7),
+        event(W.IN_MOVED_TO, "von-aussen.lnk", cookie=8),
+        event(W.IN_MOVED_FROM, "nach-aussen.lnk", cookie=9),
+        event(W.IN_DELETE, "d.lnk"),
+    ])
+    j = os.path.join
+    assert W.parse(data, "/desk") == [
+        FileChange(FileChange.ADDED, j("/desk", "a.lnk")),
+        FileChange(FileChange.MODIFIED, j("/desk", "a.lnk")),
+        FileChange(FileChange.RENAMED, j("/desk", "c.lnk"), j("/desk", "b.lnk")),
+        FileChange(FileChange.ADDED, j("/desk", "von-aussen.lnk")),
+        FileChange(FileChange.REMOVED, j("/desk", "d.lnk")),
+        FileChange(FileChange.REMOVED, j("/desk", "nach-aussen.lnk")),
+    ]
+
+
+@pytest.mark.parametrize("mask", [InotifyDirectoryWatcher.IN_Q_OVERFLOW, InotifyDirectoryWatcher.IN_DELETE_SELF])
+def test_inotify_overflow_and_lost_directory(mask):
+    assert InotifyDirectoryWatcher.parse(event(mask), "/desk") == [FileChange(FileChange.RESCAN, "/desk")]
+
+
+def test_inotify_truncated_buffer():
+    data = event(InotifyDirectoryWatcher.IN_CREATE, "a.lnk")
+    assert InotifyDirectoryWatcher.parse(data + data[:10], "/desk") == [
+        FileChange(FileChange.ADDED, os.path.join("/desk", "a.lnk"))]
+
+
+# --- Polling ---
+
+def test_polling_diff():
+    j = os.path.join
+    previous = {"a.lnk": (1, 10, 5), "b.lnk": (2, 10, 5), "c.lnk": (3, 10, 5), "ohne-inode": (0, 1, 1)}
+    current = {"a.lnk": (1, 20, 5), "B neu.lnk": (2, 10, 5), "d.lnk": (4, 10, 5), "ohne-inode 2": (0, 1, 1)}
+
+    changes = PollingDirectoryWatcher.diff(previous, current, "/desk")
+
+    assert sorted(changes, key=lambda c: (c.kind, c.path)) == sorted([
+        FileChange(FileChange.MODIFIED, j("/desk", "a.lnk")),
+        FileChange(FileChange.RENAMED, j("/desk", "B neu.lnk"), j("/desk", "b.lnk")),
+        FileChange(FileChange.ADDED, j("/desk", "d.lnk")),
+        FileChange(FileChange.ADDED, j("/desk", "ohne-inode 2")),
+        FileChange(FileChange.REMOVED, j("/desk", "c.lnk")),
+        FileChange(FileChange.REMOVED, j("/desk", "ohne-inode")),
+    ], key=lambda c: (c.kind, c.path))
+
+
+def test_polling_watcher_on_directory(tmp_path):
+    (tmp_path / "alt.lnk").write_bytes(b"1")
+    (tmp_path / "weg.lnk").write_bytes(b"1")
+    (tmp_path / "bleibt.lnk").write_bytes(b"1")
+    received = []
+    done = threading.Event()
+
+    def callback(changes):
+        received.extend(changes)
+        done.set()
+
+    watcher = PollingDirectoryWatcher(tmp_path, callback, interval=0.05)
+    watcher.start()
+    try:
+        os.rename(tmp_path / "alt.lnk", tmp_path / "neu.lnk")
+        (tmp_path / "dazu.lnk").write_bytes(b"1")  # vor dem Löschen: sonst evtl. gleiche Inode
+        (tmp_path / "weg.lnk").unlink()
+        bleibt = tmp_path / "bleibt.lnk"
+        bleibt.write_bytes(b"22")
+        os.utime(bleibt, ns=(time.time_ns() + 10**9,) * 2)
+        assert done.wait(5)
+        time.sleep(0.15)  # evtl. zwischen zwei Schnappschüssen verteilt
+    finally:
+        watcher.stop()
+
+    debouncer = ChangeDebouncer(clock=lambda: 0.0)
+    debouncer.push(received)
+    result = {(c.kind, os.path.basename(c.path), c.old_path and os.path.basename(c.old_path))
+              for c in debouncer.drain(now=10.0)}
+    assert result == {
+        (FileChange.RENAMED, "neu.lnk", "alt.lnk"),
+        (FileChange.REMOVED, "weg.lnk", None),
+        (FileChange.ADDED, "dazu.lnk", None),
+        (FileChange.MODIFIED, "bleibt.lnk", None),
+    }
+
+
+def test_polling_watcher_stops_quickly(tmp_path):
+    watcher = PollingDirectoryWatcher(tmp_path, lambda changes: None, interval=30)
+    watcher.start()
+    start = time.monotonic()
+    watcher.stop()
+    assert time.monotonic() - start < 1.0